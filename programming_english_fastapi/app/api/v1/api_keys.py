@@ -0,0 +1,92 @@
+"""API密钥管理模块"""
+
+from fastapi import APIRouter, Depends, HTTPException, status
+from sqlmodel import Session
+
+from app.db.database import get_session
+from app.models.api_key import ApiKey, ApiKeyCreate, ApiKeyRead
+from app.models.user import Principal
+from app.services.api_key_service import API_KEY_SCOPES, ApiKeyService
+from app.utils.deps import get_current_active_user
+from app.utils.response_utils import success_response
+
+router = APIRouter()
+
+
+def _to_read(api_key: ApiKey) -> dict:
+    return ApiKeyRead.model_validate(
+        {**api_key.model_dump(), "scopes": api_key.scopes.split()}
+    ).model_dump(mode="json")
+
+
+@router.get("/scopes")
+def list_scopes():
+    """
+    获取可授予的权限范围
+    
+    Returns:
+        dict: 统一格式的权限范围及说明
+    """
+    return success_response(API_KEY_SCOPES)
+
+
+@router.post("", status_code=status.HTTP_201_CREATED)
+def create_api_key(
+    key_create: ApiKeyCreate,
+    session: Session = Depends(get_session),
+    current_user: Principal = Depends(get_current_active_user)
+):
+    """
+    创建API密钥，明文密钥只在本次响应中返回
+    
+    Args:
+        key_create: 密钥名称、权限范围和有效天数
+        session: 数据库会话
+        current_user: 当前用户（必须通过访问令牌登录）
+        
+    Returns:
+        dict: 统一格式的密钥响应，data.key为明文密钥
+    """
+    api_key, raw_key = ApiKeyService(session).create_key(current_user.id, key_create)
+    return success_response({**_to_read(api_key), "key": raw_key}, "API密钥创建成功，请妥善保存")
+
+
+@router.get("")
+def list_api_keys(
+    session: Session = Depends(get_session),
+    current_user: Principal = Depends(get_current_active_user)
+):
+    """
+    获取我的API密钥列表
+    
+    Args:
+        session: 数据库会话
+        current_user: 当前用户
+        
+    Returns:
+        dict: 统一格式的密钥列表（不含明文）
+    """
+    keys = ApiKeyService(session).list_keys(current_user.id)
+    return success_response([_to_read(api_key) for api_key in keys])
+
+
+@router.delete("/{key_id}")
+def revoke_api_key(
+    key_id: int,
+    session: Session = Depends(get_session),
+    current_user: Principal = Depends(get_current_active_user)
+):
+    """
+    吊销API密钥
+    
+    Args:
+        key_id: 密钥ID
+        session: 数据库会话
+        current_user: 当前用户
+        
+    Returns:
+        dict: 统一格式的吊销响应
+    """
+    if not ApiKeyService(session).revoke_key(current_user.id, key_id):
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="API key not found")
+    return success_response(None, "API密钥已吊销")
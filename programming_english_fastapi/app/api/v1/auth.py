@@ -1,24 +1,34 @@
 """认证API模块"""
 
-from fastapi import APIRouter, Depends, HTTPException, status
+import math
+from typing import Optional
+from fastapi import APIRouter, Depends, HTTPException, Request, status
+from fastapi.concurrency import run_in_threadpool
 from sqlmodel import Session
 from loguru import logger
 
+from app.core.rate_limit import login_guard, rate_limiter
 from app.db.database import get_session
-from app.services.user_service import UserService
-from app.schemas.auth import LoginRequest, Token
-from app.utils.jwt_utils import create_user_token
+from app.services.token_service import TokenService
+from app.services.user_service import UserService, login_key
+from app.schemas.auth import LoginRequest, LogoutRequest, RefreshRequest, Token
+from app.utils.deps import optional_oauth2_scheme
+from app.utils.jwt_utils import get_refresh_claims, verify_token
 
 router = APIRouter()
 
 
 @router.post("/login", response_model=dict)
-def login(login_data: LoginRequest, session: Session = Depends(get_session)):
+async def login(login_data: LoginRequest, request: Request, session: Session = Depends(get_session)):
     """
     用户登录
     
+    查询用户、签发令牌等数据库操作在anyio线程池中执行；密码哈希在专用哈希
+    线程池中计算并异步等待，等待期间不占用任何线程。
+    
     Args:
         login_data: 登录请求数据
+        request: 请求（用于取客户端IP）
         session: 数据库会话
         
     Returns:
@@ -28,18 +38,25 @@ def login(login_data: LoginRequest, session: Session = Depends(get_session)):
     if not login_data.username or not login_data.password:
         raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="用户名或密码错误")
     
-    user_service = UserService(session)
+    # 该来源对登录标识处于锁定期时直接拒绝，不查询数据库也不计算密码哈希
+    key, ip = login_key(login_data.username), rate_limiter.client_ip(request.scope)
+    retry_after = login_guard.retry_after(key, ip)
+    if retry_after:
+        raise HTTPException(
+            status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+            detail="登录失败次数过多，请稍后再试",
+            headers={"Retry-After": str(max(1, math.ceil(retry_after)))}
+        )
     
-    # 尝试通过用户名查找用户
-    user = user_service.get_user_by_username(login_data.username)
+    user_service = UserService(session)
     
-    # 如果用户名不存在，尝试通过邮箱查找
-    if not user:
-        user = user_service.get_user_by_email(login_data.username)
+    # 按用户名或邮箱查找用户（不区分大小写，一次查询）
+    user = await run_in_threadpool(user_service.get_user_by_login, login_data.username)
     
     # 验证用户存在且密码正确
-    if not user or not user_service.verify_password(login_data.password, user.hashed_password):
+    if not user or not await user_service.authenticate(login_data.password, user):
         logger.warning(f"登录失败 - 用户名: {login_data.username}")
+        login_guard.record_failure(key, ip)
         raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="用户名或密码错误")
     
     # 验证用户是否活跃
@@ -47,25 +64,60 @@ def login(login_data: LoginRequest, session: Session = Depends(get_session)):
         logger.warning(f"非活跃用户尝试登录 - 用户名: {login_data.username}")
         raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="用户已被禁用")
     
-    # 生成访问令牌
-    access_token = create_user_token(user.id, user.username)
+    login_guard.record_success(key, ip)
+    
+    # 生成访问令牌和刷新令牌
+    tokens = await run_in_threadpool(TokenService(session).issue_tokens, user.id, user.username)
     
     logger.info(f"用户登录成功 - 用户名: {login_data.username}")
     
     # 返回登录令牌（顶层字段符合测试期望）
-    return {
-        "access_token": access_token,
-        "token_type": "bearer"
-    }
+    return tokens
+
+
+@router.post("/refresh", response_model=dict)
+def refresh(refresh_data: RefreshRequest, session: Session = Depends(get_session)):
+    """
+    使用刷新令牌换取新的令牌对
+    
+    刷新令牌只能使用一次，使用后立即撤销并签发新的刷新令牌。
+    
+    Args:
+        refresh_data: 刷新请求数据
+        session: 数据库会话
+        
+    Returns:
+        dict: 新的访问令牌和刷新令牌
+    """
+    return TokenService(session).refresh(refresh_data.refresh_token)
 
 
 @router.post("/logout")
-def logout():
+def logout(
+    logout_data: Optional[LogoutRequest] = None,
+    token: Optional[str] = Depends(optional_oauth2_scheme),
+    session: Session = Depends(get_session)
+):
     """
-    用户登出
+    用户登出，撤销当前访问令牌及请求中的刷新令牌
     
+    Args:
+        logout_data: 登出请求数据（可选）
+        token: 当前访问令牌（可选）
+        session: 数据库会话
+        
     Returns:
         dict: 统一格式的登出响应
     """
+    token_service = TokenService(session)
+    if token:
+        claims = verify_token(token)
+        if claims is not None and claims.get("type") == "access":
+            token_service.revoke(claims)
+    if logout_data and logout_data.refresh_token:
+        claims = get_refresh_claims(logout_data.refresh_token)
+        if claims is not None:
+            token_service.revoke(claims)
+    
     logger.info("用户登出")
     return {"success": True, "message": "登出成功"}
\ No newline at end of file
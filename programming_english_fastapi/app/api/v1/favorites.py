@@ -0,0 +1,90 @@
+"""收藏API模块"""
+
+from fastapi import APIRouter, Depends, HTTPException, Query, status
+from sqlmodel import Session
+
+from app.db.database import get_session
+from app.models.user import Principal
+from app.models.word import WordRead
+from app.services.favorite_service import FavoriteService
+from app.services.word_service import WordService
+from app.utils.deps import get_current_active_user
+from app.utils.response_utils import (
+    success_response, cursor_pagination_response
+)
+
+router = APIRouter()
+
+
+@router.get("/")
+def list_favorites(
+    after: int = Query(None, description="上一页最后一个单词ID"),
+    limit: int = Query(20, ge=1, le=100),
+    session: Session = Depends(get_session),
+    current_user: Principal = Depends(get_current_active_user)
+):
+    """
+    获取收藏的单词列表（游标分页）
+    
+    Args:
+        after: 上一页最后一个单词ID
+        limit: 每页数量
+        session: 数据库会话
+        current_user: 当前用户
+        
+    Returns:
+        dict: 统一格式的游标分页响应
+    """
+    favorite_service = FavoriteService(session)
+    words, next_cursor = favorite_service.list_favorites(current_user.id, after, limit)
+    items = [
+        WordRead.model_validate({**word.model_dump(), "is_favorite": True}).model_dump(mode="json")
+        for word in words
+    ]
+    return cursor_pagination_response(items, next_cursor, limit)
+
+
+@router.put("/{word_id}")
+def add_favorite(
+    word_id: int,
+    session: Session = Depends(get_session),
+    current_user: Principal = Depends(get_current_active_user)
+):
+    """
+    收藏单词（幂等）
+    
+    Args:
+        word_id: 单词ID
+        session: 数据库会话
+        current_user: 当前用户
+        
+    Returns:
+        dict: 统一格式的收藏响应
+    """
+    if not WordService(session).get_word_by_id(word_id):
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Word not found")
+    
+    favorite = FavoriteService(session).add_favorite(current_user.id, word_id)
+    return success_response(favorite.model_dump(mode="json"), "收藏成功")
+
+
+@router.delete("/{word_id}")
+def remove_favorite(
+    word_id: int,
+    session: Session = Depends(get_session),
+    current_user: Principal = Depends(get_current_active_user)
+):
+    """
+    取消收藏单词
+    
+    Args:
+        word_id: 单词ID
+        session: 数据库会话
+        current_user: 当前用户
+        
+    Returns:
+        dict: 统一格式的取消收藏响应
+    """
+    if not FavoriteService(session).remove_favorite(current_user.id, word_id):
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Favorite not found")
+    return success_response(None, "取消收藏成功")
@@ -1,8 +1,12 @@
 """健康检查端点"""
 
-from fastapi import APIRouter, status
+from fastapi import APIRouter, Depends, status
 from pydantic import BaseModel
 
+from app.core.metrics import metrics
+from app.models.user import Principal
+from app.utils.deps import require_scope
+
 router = APIRouter()
 
 class HealthResponse(BaseModel):
@@ -24,4 +28,9 @@ async def root():
     return HealthResponse(
         status="healthy",
         message="Programming English API is running"
-    )
\ No newline at end of file
+    )
+
+@router.get("/metrics")
+async def get_metrics(current_user: Principal = Depends(require_scope("metrics:read", superuser=True))):
+    """进程内指标快照（队列深度、吞吐等，仅超级用户或授予metrics:read的超级用户密钥）"""
+    return metrics.snapshot()
@@ -0,0 +1,125 @@
+"""个人学习API模块"""
+
+from datetime import datetime
+from typing import Optional
+from fastapi import APIRouter, Depends, HTTPException, Query, status
+from sqlmodel import Session
+
+from app.db.database import get_session
+from app.models.user import Principal
+from app.schemas.learning import WordBookItem, PlanRequest
+from app.services.learning_service import LearningService
+from app.services.plan_service import PlanService
+from app.services.achievement_service import AchievementService
+from app.utils.deps import get_current_active_user
+from app.utils.response_utils import cursor_pagination_response, success_response
+
+router = APIRouter()
+
+
+@router.get("/words")
+def get_word_book(
+    mastery_level: Optional[int] = Query(None, ge=0, le=5),
+    reviewed_after: Optional[datetime] = Query(None, description="最近复习时间下限"),
+    reviewed_before: Optional[datetime] = Query(None, description="最近复习时间上限"),
+    after: Optional[int] = Query(None, description="上一页最后一个单词ID"),
+    limit: int = Query(20, ge=1, le=100),
+    session: Session = Depends(get_session),
+    current_user: Principal = Depends(get_current_active_user)
+):
+    """
+    获取我的单词本
+    
+    Args:
+        mastery_level: 掌握程度筛选
+        reviewed_after: 最近复习时间下限
+        reviewed_before: 最近复习时间上限
+        after: 上一页最后一个单词ID
+        limit: 每页数量
+        session: 数据库会话
+        current_user: 当前用户
+        
+    Returns:
+        dict: 统一格式的游标分页响应
+    """
+    learning_service = LearningService(session)
+    rows, next_cursor = learning_service.get_word_book(
+        current_user.id,
+        mastery_level=mastery_level,
+        reviewed_after=reviewed_after,
+        reviewed_before=reviewed_before,
+        after=after,
+        limit=limit
+    )
+    items = [
+        WordBookItem(word=word.model_dump(), record=record.model_dump()).model_dump(mode="json")
+        for record, word in rows
+    ]
+    return cursor_pagination_response(items, next_cursor, limit)
+
+
+@router.post("/plan")
+def create_plan(
+    plan_request: PlanRequest,
+    session: Session = Depends(get_session),
+    current_user: Principal = Depends(get_current_active_user)
+):
+    """
+    生成学习计划（按目标日期分配新词并模拟每日复习负荷）
+    
+    Args:
+        plan_request: 计划参数
+        session: 数据库会话
+        current_user: 当前用户
+        
+    Returns:
+        dict: 统一格式的学习计划响应
+    """
+    try:
+        plan = PlanService(session).create_plan(current_user.id, plan_request)
+    except ValueError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+    return success_response(plan.model_dump(mode="json"))
+
+
+@router.get("/plan")
+def get_plan(
+    session: Session = Depends(get_session),
+    current_user: Principal = Depends(get_current_active_user)
+):
+    """
+    获取学习计划（读取保存的计划，学习进度变化时已在写入路径上重新生成）
+    
+    Args:
+        session: 数据库会话
+        current_user: 当前用户
+        
+    Returns:
+        dict: 统一格式的学习计划响应
+    """
+    plan = PlanService(session).get_plan(current_user.id)
+    if plan is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="学习计划不存在或目标日期已过，请重新生成"
+        )
+    return success_response(plan.model_dump(mode="json"))
+
+
+@router.get("/achievements")
+def get_achievements(
+    session: Session = Depends(get_session),
+    current_user: Principal = Depends(get_current_active_user)
+):
+    """
+    获取全部成就及我的解锁状态
+    
+    Args:
+        session: 数据库会话
+        current_user: 当前用户
+        
+    Returns:
+        dict: 统一格式的成就列表响应
+    """
+    achievements = AchievementService(session).list_achievements(current_user.id)
+    return success_response([achievement.model_dump(mode="json") for achievement in achievements])
@@ -0,0 +1,78 @@
+"""测验API模块"""
+
+from fastapi import APIRouter, Depends
+from sqlmodel import Session
+
+from app.db.database import get_session
+from app.models.user import Principal
+from app.schemas.quiz import QuizStartRequest, QuizAnswerRequest
+from app.services.quiz_service import QuizService
+from app.utils.deps import get_current_active_user
+from app.utils.response_utils import success_response
+
+router = APIRouter()
+
+
+@router.post("/")
+def start_quiz(
+    quiz_request: QuizStartRequest,
+    session: Session = Depends(get_session),
+    current_user: Principal = Depends(get_current_active_user)
+):
+    """
+    开始测验（题目顺序和答案只保存在服务端）
+    
+    Args:
+        quiz_request: 题目数量
+        session: 数据库会话
+        current_user: 当前用户
+        
+    Returns:
+        dict: 统一格式的测验会话响应
+    """
+    quiz = QuizService(session).start(current_user.id, quiz_request.n)
+    return success_response(quiz.model_dump(mode="json"))
+
+
+@router.post("/{quiz_id}/answers")
+def submit_answer(
+    quiz_id: str,
+    answer: QuizAnswerRequest,
+    session: Session = Depends(get_session),
+    current_user: Principal = Depends(get_current_active_user)
+):
+    """
+    提交一道题的答案
+    
+    Args:
+        quiz_id: 测验ID
+        answer: 题号和答案
+        session: 数据库会话
+        current_user: 当前用户
+        
+    Returns:
+        dict: 统一格式的校验结果响应
+    """
+    result = QuizService(session).answer(current_user.id, quiz_id, answer.index, answer.answer)
+    return success_response(result.model_dump(mode="json"))
+
+
+@router.post("/{quiz_id}/finish")
+def finish_quiz(
+    quiz_id: str,
+    session: Session = Depends(get_session),
+    current_user: Principal = Depends(get_current_active_user)
+):
+    """
+    结束测验并保存结果
+    
+    Args:
+        quiz_id: 测验ID
+        session: 数据库会话
+        current_user: 当前用户
+        
+    Returns:
+        dict: 统一格式的测验结果响应
+    """
+    result = QuizService(session).finish(current_user.id, quiz_id)
+    return success_response(result.model_dump(mode="json"))
@@ -0,0 +1,81 @@
+"""学习报告API模块"""
+
+from fastapi import APIRouter, Depends, status
+from fastapi.responses import FileResponse
+from sqlmodel import Session
+from starlette.background import BackgroundTask
+
+from app.db.database import get_session
+from app.models.report import ReportJobCreate, ReportJobRead
+from app.models.user import Principal
+from app.services.report_service import ReportService
+from app.utils.deps import get_current_active_user
+from app.utils.response_utils import success_response
+
+router = APIRouter()
+
+
+@router.post("/", status_code=status.HTTP_202_ACCEPTED)
+def create_report(
+    report: ReportJobCreate,
+    session: Session = Depends(get_session),
+    current_user: Principal = Depends(get_current_active_user)
+):
+    """
+    提交月度学习报告生成任务（渲染在后台进程池中执行）
+    
+    Args:
+        report: 报告月份
+        session: 数据库会话
+        current_user: 当前用户
+        
+    Returns:
+        dict: 统一格式的任务响应，通过GET /me/reports/{job_id}轮询状态
+    """
+    job = ReportService(session).create_job(current_user, report.month)
+    return success_response(ReportJobRead.from_job(job).model_dump(mode="json"), "报告任务已提交")
+
+
+@router.get("/{job_id}")
+def get_report_job(
+    job_id: int,
+    session: Session = Depends(get_session),
+    current_user: Principal = Depends(get_current_active_user)
+):
+    """
+    查询报告任务状态
+    
+    Args:
+        job_id: 任务ID
+        session: 数据库会话
+        current_user: 当前用户
+        
+    Returns:
+        dict: 统一格式的任务响应
+    """
+    job = ReportService(session).get_job(current_user.id, job_id)
+    return success_response(ReportJobRead.from_job(job).model_dump(mode="json"))
+
+
+@router.get("/{job_id}/file")
+def download_report(
+    job_id: int,
+    session: Session = Depends(get_session),
+    current_user: Principal = Depends(get_current_active_user)
+):
+    """
+    下载已生成的报告文件（只能下载一次，发送后删除文件）
+    
+    Args:
+        job_id: 任务ID
+        session: 数据库会话
+        current_user: 当前用户
+        
+    Returns:
+        FileResponse: HTML报告
+    """
+    path, month = ReportService(session).take_file(current_user.id, job_id)
+    return FileResponse(
+        path, media_type="text/html", filename=f"report_{month}.html",
+        background=BackgroundTask(path.unlink, missing_ok=True)
+    )
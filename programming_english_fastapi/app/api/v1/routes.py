@@ -4,6 +4,14 @@ from fastapi import APIRouter
 from .auth import router as auth_router
 from .words import router as words_router
 from .health import router as health_router
+from .favorites import router as favorites_router
+from .learning import router as learning_router
+from .study_session import router as study_session_router
+from .reports import router as reports_router
+from .sync import router as sync_router
+from .quiz import router as quiz_router
+from .users import router as users_router
+from .api_keys import router as api_keys_router
 
 api_router = APIRouter()
 
@@ -21,9 +29,65 @@ api_router.include_router(
     tags=["认证"]
 )
 
+# 包含用户路由
+api_router.include_router(
+    users_router,
+    prefix="/users",
+    tags=["用户"]
+)
+
 # 包含单词路由
 api_router.include_router(
     words_router,
     prefix="/words",
     tags=["单词"]
-)
\ No newline at end of file
+)
+
+# 包含API密钥路由
+api_router.include_router(
+    api_keys_router,
+    prefix="/me/api-keys",
+    tags=["API密钥"]
+)
+
+# 包含收藏路由
+api_router.include_router(
+    favorites_router,
+    prefix="/me/favorites",
+    tags=["收藏"]
+)
+
+# 包含个人学习路由
+api_router.include_router(
+    learning_router,
+    prefix="/me",
+    tags=["学习"]
+)
+
+# 包含学习会话路由
+api_router.include_router(
+    study_session_router,
+    prefix="/session",
+    tags=["学习会话"]
+)
+
+# 包含学习报告路由
+api_router.include_router(
+    reports_router,
+    prefix="/me/reports",
+    tags=["学习报告"]
+)
+
+# 包含离线同步路由
+api_router.include_router(
+    sync_router,
+    prefix="/sync",
+    tags=["离线同步"]
+)
+
+# 包含测验路由
+api_router.include_router(
+    quiz_router,
+    prefix="/quiz",
+    tags=["测验"]
+)
@@ -0,0 +1,67 @@
+"""学习会话API模块"""
+
+from fastapi import APIRouter, Depends, HTTPException, Query, status
+from sqlmodel import Session
+
+from app.core.config import config
+from app.db.database import get_session
+from app.models.user import Principal
+from app.models.word import LearningRecordRead
+from app.schemas.learning import ReviewRequest
+from app.services.learning_service import LearningService
+from app.services.study_session_service import StudySessionService
+from app.services.word_service import WordService
+from app.utils.deps import get_current_active_user
+from app.utils.response_utils import success_response
+
+router = APIRouter()
+
+SESSION_MAX_CARDS = config.get('learning.session_max_cards', 50)
+
+
+@router.get("/next")
+def get_next_cards(
+    n: int = Query(10, ge=1, le=SESSION_MAX_CARDS),
+    session: Session = Depends(get_session),
+    current_user: Principal = Depends(get_current_active_user)
+):
+    """
+    预取下一批学习卡片（单词详情、选项与进度一次返回）
+    
+    Args:
+        n: 卡片数量
+        session: 数据库会话
+        current_user: 当前用户
+        
+    Returns:
+        dict: 统一格式的学习批次响应
+    """
+    batch = StudySessionService(session).next_batch(current_user.id, n)
+    return success_response(batch.model_dump(mode="json"))
+
+
+@router.post("/review")
+def submit_review(
+    review: ReviewRequest,
+    session: Session = Depends(get_session),
+    current_user: Principal = Depends(get_current_active_user)
+):
+    """
+    提交单词复习结果
+    
+    Args:
+        review: 复习结果
+        session: 数据库会话
+        current_user: 当前用户
+        
+    Returns:
+        dict: 统一格式的学习记录响应，附带本次解锁的成就编码
+    """
+    if not WordService(session).get_words_by_ids([review.word_id]):
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Word not found")
+    
+    learning_service = LearningService(session)
+    record = learning_service.record_review(current_user.id, review.word_id, review.correct)
+    data = LearningRecordRead.model_validate(record).model_dump(mode="json")
+    data["unlocked_achievements"] = learning_service.unlocked_achievements
+    return success_response(data)
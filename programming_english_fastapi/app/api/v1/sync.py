@@ -0,0 +1,34 @@
+"""离线同步API模块"""
+
+from fastapi import APIRouter, Depends
+from sqlmodel import Session
+
+from app.db.database import get_session
+from app.models.user import Principal
+from app.schemas.sync import SyncReviewsRequest
+from app.services.sync_service import SyncService
+from app.utils.deps import get_current_active_user
+from app.utils.response_utils import success_response
+
+router = APIRouter()
+
+
+@router.post("/reviews")
+def sync_reviews(
+    sync_request: SyncReviewsRequest,
+    session: Session = Depends(get_session),
+    current_user: Principal = Depends(get_current_active_user)
+):
+    """
+    上传离线复习记录并返回服务端增量
+    
+    Args:
+        sync_request: 设备ID、上次同步游标和各单词的累计状态
+        session: 数据库会话
+        current_user: 当前用户
+        
+    Returns:
+        dict: 统一格式的同步结果，客户端保存cursor用于下次同步
+    """
+    result = SyncService(session).sync_reviews(current_user.id, sync_request)
+    return success_response(result.model_dump(mode="json"))
@@ -0,0 +1,103 @@
+"""用户API模块"""
+
+from fastapi import APIRouter, Depends, File, UploadFile, status
+from fastapi.responses import FileResponse
+from sqlmodel import Session
+from starlette.background import BackgroundTask
+
+from app.db.database import get_session
+from app.models.user import Principal, UserCreate, UserRead
+from app.models.user_import import UserImportJobRead
+from app.services.user_import_service import UserImportJobService
+from app.services.user_service import UserService
+from app.utils.deps import require_scope
+from app.utils.response_utils import success_response
+
+router = APIRouter()
+
+
+@router.post("", status_code=status.HTTP_201_CREATED)
+async def register_user(user_create: UserCreate, session: Session = Depends(get_session)):
+    """
+    注册用户
+    
+    用户名和邮箱的唯一性（不区分大小写）由数据库约束保证，不做预查询。
+    密码哈希在专用哈希线程池中异步计算，数据库写入在anyio线程池中执行。
+    
+    Args:
+        user_create: 用户注册数据
+        session: 数据库会话
+        
+    Returns:
+        dict: 统一格式的用户响应
+    """
+    user = await UserService(session).create_user_async(user_create)
+    return success_response(UserRead.model_validate(user).model_dump(mode="json"), "注册成功")
+
+
+@router.post("/import", status_code=status.HTTP_202_ACCEPTED)
+def import_users(
+    file: UploadFile = File(..., description="CSV文件，列为username、email、password、full_name（可选）"),
+    session: Session = Depends(get_session),
+    current_user: Principal = Depends(require_scope("users:import", superuser=True))
+):
+    """
+    提交批量导入用户任务（仅超级用户，导入在后台执行）
+    
+    上传的CSV只在请求中检查表头，按块导入和密码哈希在后台线程中进行。
+    
+    Args:
+        file: 用户CSV文件
+        session: 数据库会话
+        current_user: 当前用户
+        
+    Returns:
+        dict: 统一格式的任务响应，通过GET /users/import/{job_id}轮询状态
+    """
+    job = UserImportJobService(session).create_job(current_user.id, file.file)
+    return success_response(UserImportJobRead.from_job(job).model_dump(mode="json"), "导入任务已提交")
+
+
+@router.get("/import/{job_id}")
+def get_import_job(
+    job_id: int,
+    session: Session = Depends(get_session),
+    current_user: Principal = Depends(require_scope("users:import", superuser=True))
+):
+    """
+    查询导入任务状态和汇总
+    
+    Args:
+        job_id: 任务ID
+        session: 数据库会话
+        current_user: 当前用户
+        
+    Returns:
+        dict: 统一格式的任务响应
+    """
+    job = UserImportJobService(session).get_job(current_user.id, job_id)
+    return success_response(UserImportJobRead.from_job(job).model_dump(mode="json"))
+
+
+@router.get("/import/{job_id}/file")
+def download_import_result(
+    job_id: int,
+    session: Session = Depends(get_session),
+    current_user: Principal = Depends(require_scope("users:import", superuser=True))
+):
+    """
+    下载逐行导入结果（只能下载一次，发送后删除文件）
+    
+    Args:
+        job_id: 任务ID
+        session: 数据库会话
+        current_user: 当前用户
+        
+    Returns:
+        FileResponse: 结果CSV
+    """
+    path = UserImportJobService(session).take_result(current_user.id, job_id)
+    return FileResponse(
+        path, media_type="text/csv", filename=f"import_{job_id}.csv",
+        background=BackgroundTask(path.unlink, missing_ok=True)
+    )
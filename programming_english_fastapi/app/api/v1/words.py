@@ -1,25 +1,100 @@
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Query, status
 from sqlmodel import Session
-from typing import List
+from typing import List, Optional
 from ...db.database import get_session
-from ...models.word import Word, WordCreate, WordUpdate, WordRead
+from ...models.word import Word, WordCreate, WordUpdate, WordRead, DifficultyLevel, Category
+from ...models.tag import TagRead
 from ...services.word_service import WordService
-from ...utils.deps import get_current_active_user
-from ...models.user import User
+from ...services.favorite_service import FavoriteService
+from ...services.tag_service import TagService
+from ...services.cloze_service import ClozeService
+from ...services.related_service import RelatedService, TOP_K
+from ...models.related import RelatedWordRead
+from ...services.search_service import SearchService, LOOKUP_LIMIT
+from ...schemas.search import WordMatch, TranslationMatch
+from ...models.exercise import ClozeExerciseRead, ClozeCheckRequest, ClozeCheckResult
+from ...utils.deps import get_current_user_optional, require_scope
+from ...models.user import Principal
 
-router = APIRouter(prefix="/words", tags=["words"])
+router = APIRouter()
+
+
+def _with_favorites(
+    words: List[Word],
+    with_favorite: bool,
+    current_user: Optional[Principal],
+    session: Session
+):
+    """按需为单词列表标注is_favorite（单次集合查找，不逐词查询）"""
+    if not with_favorite or current_user is None:
+        return words
+    return FavoriteService(session).annotate_favorites(current_user.id, words)
 
 
 @router.get("/", response_model=List[WordRead])
-async def get_words(
+def get_words(
     skip: int = 0,
     limit: int = 100,
-    session: Session = Depends(get_session)
+    tags: Optional[str] = Query(None, description="逗号分隔的标签，如python,concurrency"),
+    difficulty: Optional[DifficultyLevel] = None,
+    category: Optional[Category] = None,
+    with_favorite: bool = False,
+    session: Session = Depends(get_session),
+    current_user: Optional[Principal] = Depends(get_current_user_optional)
 ):
-    """获取单词列表"""
+    """获取单词列表，可按标签、难度、分类组合过滤"""
     word_service = WordService(session)
-    words = word_service.get_words(skip=skip, limit=limit)
-    return words
+    if tags or difficulty or category:
+        words = word_service.filter_words(
+            tags=tags.split(",") if tags else (),
+            difficulty=difficulty,
+            category=category,
+            skip=skip,
+            limit=limit
+        )
+    else:
+        words = word_service.get_words(skip=skip, limit=limit)
+    return _with_favorites(words, with_favorite, current_user, session)
+
+
+@router.get("/lookup", response_model=List[WordMatch])
+def lookup_words(
+    q: str = Query(..., min_length=1, max_length=100),
+    fuzzy: bool = False,
+    max_distance: Optional[int] = Query(None, ge=0, le=3),
+    limit: int = Query(LOOKUP_LIMIT, ge=1, le=50),
+    session: Session = Depends(get_session)
+):
+    """按单词文本查找，fuzzy=true时容忍拼写错误并按编辑距离排序"""
+    matches = SearchService(session).lookup(q, fuzzy=fuzzy, max_distance=max_distance, limit=limit)
+    return [WordMatch(word=word, distance=distance) for word, distance in matches]
+
+
+@router.get("/reverse", response_model=List[TranslationMatch])
+def reverse_lookup_words(
+    q: str = Query(..., min_length=1, max_length=50),
+    limit: int = Query(LOOKUP_LIMIT, ge=1, le=50),
+    session: Session = Depends(get_session)
+):
+    """按中文释义反查单词，如q=变量"""
+    matches = SearchService(session).reverse_lookup(q, limit=limit)
+    return [TranslationMatch(word=word, score=score) for word, score in matches]
+
+
+@router.get("/sounds-like", response_model=List[WordRead])
+async def sounds_like_words(
+    q: str = Query(..., min_length=1, max_length=100),
+    limit: int = Query(LOOKUP_LIMIT, ge=1, le=50),
+    session: Session = Depends(get_session)
+):
+    """按发音查找单词，如q=funkshun可以找到function"""
+    return SearchService(session).sounds_like(q, limit=limit)
+
+
+@router.get("/tags", response_model=List[TagRead])
+async def list_tags(session: Session = Depends(get_session)):
+    """获取全部标签及其单词数"""
+    return [TagRead(name=name, word_count=count) for name, count in TagService(session).list_tags()]
 
 
 @router.get("/{word_id}", response_model=WordRead)
@@ -39,10 +114,10 @@ async def get_word(
 
 
 @router.post("/", response_model=WordRead)
-async def create_word(
+def create_word(
     word_create: WordCreate,
     session: Session = Depends(get_session),
-    current_user: User = Depends(get_current_active_user)
+    current_user: Principal = Depends(require_scope("words:write"))
 ):
     """创建新单词"""
     word_service = WordService(session)
@@ -59,11 +134,11 @@ async def create_word(
 
 
 @router.put("/{word_id}", response_model=WordRead)
-async def update_word(
+def update_word(
     word_id: int,
     word_update: WordUpdate,
     session: Session = Depends(get_session),
-    current_user: User = Depends(get_current_active_user)
+    current_user: Principal = Depends(require_scope("words:write"))
 ):
     """更新单词"""
     word_service = WordService(session)
@@ -77,10 +152,10 @@ async def update_word(
 
 
 @router.delete("/{word_id}")
-async def delete_word(
+def delete_word(
     word_id: int,
     session: Session = Depends(get_session),
-    current_user: User = Depends(get_current_active_user)
+    current_user: Principal = Depends(require_scope("words:write"))
 ):
     """删除单词"""
     word_service = WordService(session)
@@ -93,6 +168,55 @@ async def delete_word(
     return {"message": "Word deleted successfully"}
 
 
+@router.get("/{word_id}/tags", response_model=List[str])
+async def get_word_tags(
+    word_id: int,
+    session: Session = Depends(get_session)
+):
+    """获取单词的标签"""
+    return TagService(session).get_word_tags(word_id)
+
+
+@router.get("/{word_id}/related", response_model=List[RelatedWordRead])
+async def get_related_words(
+    word_id: int,
+    n: int = Query(TOP_K, ge=1, le=TOP_K),
+    session: Session = Depends(get_session)
+):
+    """获取相关单词（读取预先计算的近邻表）"""
+    rows = RelatedService(session).get_related(word_id, n)
+    return [RelatedWordRead(word=word.model_dump(), score=related.score) for related, word in rows]
+
+
+@router.get("/{word_id}/cloze", response_model=List[ClozeExerciseRead])
+async def get_word_cloze(
+    word_id: int,
+    session: Session = Depends(get_session)
+):
+    """获取单词的填空题（预先生成）"""
+    return ClozeService(session).get_for_word(word_id)
+
+
+@router.post("/{word_id}/cloze/check", response_model=ClozeCheckResult)
+async def check_word_cloze(
+    word_id: int,
+    check: ClozeCheckRequest,
+    session: Session = Depends(get_session)
+):
+    """检查填空题答案"""
+    cloze_service = ClozeService(session)
+    exercise = cloze_service.get_variant(word_id, check.variant)
+    if not exercise:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Cloze exercise not found"
+        )
+    return ClozeCheckResult(
+        correct=cloze_service.check_answer(exercise, check.answer),
+        expected=exercise.answer
+    )
+
+
 @router.get("/random/", response_model=WordRead)
 async def get_random_word(
     session: Session = Depends(get_session)
@@ -111,20 +235,24 @@ async def get_random_word(
 @router.get("/category/{category}", response_model=List[WordRead])
 async def get_words_by_category(
     category: str,
-    session: Session = Depends(get_session)
+    with_favorite: bool = False,
+    session: Session = Depends(get_session),
+    current_user: Optional[Principal] = Depends(get_current_user_optional)
 ):
     """根据分类获取单词"""
     word_service = WordService(session)
     words = word_service.get_words_by_category(category)
-    return words
+    return _with_favorites(words, with_favorite, current_user, session)
 
 
 @router.get("/difficulty/{difficulty}", response_model=List[WordRead])
 async def get_words_by_difficulty(
     difficulty: str,
-    session: Session = Depends(get_session)
+    with_favorite: bool = False,
+    session: Session = Depends(get_session),
+    current_user: Optional[Principal] = Depends(get_current_user_optional)
 ):
     """根据难度获取单词"""
     word_service = WordService(session)
     words = word_service.get_words_by_difficulty(difficulty)
-    return words
\ No newline at end of file
+    return _with_favorites(words, with_favorite, current_user, session)
\ No newline at end of file
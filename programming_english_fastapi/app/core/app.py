@@ -1,24 +1,37 @@
 """FastAPI应用创建模块"""
 
+from typing import Callable, Optional
+
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 from loguru import logger
 
 from .config import config
 from .exception_handlers import setup_exception_handlers
+from .rate_limit import RateLimitMiddleware, rate_limiter
 
 
-def create_app() -> FastAPI:
-    """创建FastAPI应用实例"""
+def create_app(lifespan: Optional[Callable] = None) -> FastAPI:
+    """
+    创建FastAPI应用实例
+    
+    Args:
+        lifespan: 应用生命周期处理器（启动初始化与关闭清理）
+    """
     
     # 创建应用
     app = FastAPI(
         title=config.get('app.name', 'Programming English API'),
         version=config.get('app.version', '1.0.0'),
         description=config.get('app.description', 'A FastAPI application'),
-        debug=config.get('app.debug', False)
+        debug=config.get('app.debug', False),
+        lifespan=lifespan
     )
     
+    # 配置限流（先添加的中间件位于内层，CORS在外层以便429响应也带CORS头）
+    if config.get('rate_limit.enabled', True):
+        app.add_middleware(RateLimitMiddleware, limiter=rate_limiter)
+    
     # 配置CORS
     cors_config = config.get('cors', {})
     app.add_middleware(
@@ -0,0 +1,239 @@
+"""密码哈希模块 - 可配置的内存困难哈希，在专用有界线程池中执行"""
+
+import asyncio
+import base64
+import hashlib
+import hmac
+import os
+import threading
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Iterable, List, Optional
+
+from .config import config
+from .exception_handlers import BusinessException
+from .metrics import metrics
+
+QUEUE_DEPTH_METRIC = "password_hashing.queue_depth"
+REJECTED_METRIC = "password_hashing.rejected"
+
+SALT_BYTES = 16
+
+
+def _b64encode(data: bytes) -> str:
+    return base64.b64encode(data).decode("ascii").rstrip("=")
+
+
+def _b64decode(text: str) -> bytes:
+    return base64.b64decode(text + "=" * (-len(text) % 4))
+
+
+def is_legacy_hash(hashed_password: str) -> bool:
+    """是否为旧版无盐SHA-256格式（64位十六进制）"""
+    return (
+        hashed_password is not None
+        and len(hashed_password) == 64
+        and all(c in "0123456789abcdef" for c in hashed_password.lower())
+    )
+
+
+class PasswordHasher:
+    """
+    密码哈希器
+
+    支持scrypt（默认，内存困难）和pbkdf2_sha256两种算法，均来自标准库。
+    哈希格式为"算法$参数$盐$摘要"，参数随哈希保存，调整配置后旧哈希仍可
+    验证，并在登录成功时按新参数重新哈希。同时兼容旧版无盐SHA-256哈希。
+    """
+
+    def __init__(
+        self,
+        algorithm: str = "scrypt",
+        scrypt_n: int = 2 ** 14,
+        scrypt_r: int = 8,
+        scrypt_p: int = 1,
+        pbkdf2_iterations: int = 600000
+    ):
+        if algorithm not in ("scrypt", "pbkdf2_sha256"):
+            raise ValueError(f"不支持的密码哈希算法: {algorithm}")
+        if scrypt_n < 2 or scrypt_n & (scrypt_n - 1):
+            raise ValueError("scrypt_n必须是2的幂")
+        self.algorithm = algorithm
+        self.scrypt_n = scrypt_n
+        self.scrypt_r = scrypt_r
+        self.scrypt_p = scrypt_p
+        self.pbkdf2_iterations = pbkdf2_iterations
+
+    def _current_params(self) -> str:
+        if self.algorithm == "scrypt":
+            return f"n={self.scrypt_n},r={self.scrypt_r},p={self.scrypt_p}"
+        return f"i={self.pbkdf2_iterations}"
+
+    @staticmethod
+    def _derive(algorithm: str, params: Dict[str, int], password: str, salt: bytes) -> bytes:
+        password_bytes = password.encode("utf-8")
+        if algorithm == "scrypt":
+            n, r, p = params["n"], params["r"], params["p"]
+            # 所需内存约128*n*r字节，预留一倍余量
+            return hashlib.scrypt(password_bytes, salt=salt, n=n, r=r, p=p, maxmem=256 * n * r + 1024 * 1024, dklen=32)
+        if algorithm == "pbkdf2_sha256":
+            return hashlib.pbkdf2_hmac("sha256", password_bytes, salt, params["i"])
+        raise ValueError(f"不支持的密码哈希算法: {algorithm}")
+
+    @staticmethod
+    def _parse(hashed_password: str):
+        algorithm, params, salt, digest = hashed_password.split("$")
+        values = {key: int(value) for key, value in (item.split("=") for item in params.split(","))}
+        return algorithm, params, values, _b64decode(salt), _b64decode(digest)
+
+    def hash(self, password: str) -> str:
+        """
+        按当前配置哈希密码（CPU与内存密集，应在哈希线程池中调用）
+
+        Raises:
+            ValueError: 密码为None
+        """
+        if password is None:
+            raise ValueError("密码不能为None")
+        salt = os.urandom(SALT_BYTES)
+        params = self._current_params()
+        values = {key: int(value) for key, value in (item.split("=") for item in params.split(","))}
+        digest = self._derive(self.algorithm, values, password, salt)
+        return f"{self.algorithm}${params}${_b64encode(salt)}${_b64encode(digest)}"
+
+    def verify(self, password: str, hashed_password: str) -> bool:
+        """验证密码，兼容旧版SHA-256哈希；格式错误时返回False"""
+        if password is None or not hashed_password:
+            return False
+        if is_legacy_hash(hashed_password):
+            legacy = hashlib.sha256(password.encode("utf-8")).hexdigest()
+            return hmac.compare_digest(legacy, hashed_password.lower())
+        try:
+            algorithm, _, values, salt, digest = self._parse(hashed_password)
+            computed = self._derive(algorithm, values, password, salt)
+        except (ValueError, KeyError):
+            return False
+        return hmac.compare_digest(computed, digest)
+
+    def needs_rehash(self, hashed_password: str) -> bool:
+        """哈希是否为旧格式或参数与当前配置不同"""
+        if is_legacy_hash(hashed_password):
+            return True
+        try:
+            algorithm, params, _, _, _ = self._parse(hashed_password)
+        except ValueError:
+            return True
+        return algorithm != self.algorithm or params != self._current_params()
+
+
+class HashingExecutor:
+    """
+    密码哈希专用线程池
+
+    与anyio共享线程池隔离，登录高峰时哈希任务只占用固定数量的线程；
+    排队任务超过max_pending时直接拒绝，避免请求无限堆积。hashlib的
+    scrypt/pbkdf2在计算时释放GIL，线程池可以真正并行。
+    """
+
+    def __init__(self, hasher: PasswordHasher, max_workers: int = 4, max_pending: int = 64):
+        self.hasher = hasher
+        self.max_workers = max_workers
+        self.max_pending = max_pending
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._pending = 0
+        self._lock = threading.Lock()
+
+    @property
+    def queue_depth(self) -> int:
+        """排队及执行中的任务数"""
+        return self._pending
+
+    def _submit(self, fn, *args):
+        with self._lock:
+            if self._pending >= self.max_pending:
+                metrics.inc(REJECTED_METRIC)
+                raise BusinessException("服务繁忙，请稍后再试", 503)
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(
+                    max_workers=self.max_workers, thread_name_prefix="password-hash"
+                )
+            self._pending += 1
+            metrics.set_gauge(QUEUE_DEPTH_METRIC, self._pending)
+            executor = self._executor
+        future = executor.submit(fn, *args)
+        future.add_done_callback(self._on_done)
+        return future
+
+    def _on_done(self, _) -> None:
+        with self._lock:
+            self._pending -= 1
+            metrics.set_gauge(QUEUE_DEPTH_METRIC, self._pending)
+
+    def hash(self, password: str) -> str:
+        """在哈希线程池中哈希密码（同步等待，用于同步代码路径）"""
+        return self._submit(self.hasher.hash, password).result()
+
+    def verify(self, password: str, hashed_password: str) -> bool:
+        """在哈希线程池中验证密码（同步等待）"""
+        return self._submit(self.hasher.verify, password, hashed_password).result()
+
+    def hash_many(self, passwords: Iterable[str], window: Optional[int] = None) -> List[str]:
+        """
+        批量哈希密码（同步等待，用于批量导入）
+
+        同时占用的排队名额不超过window（默认为线程数），为登录和注册请求留出余量。
+
+        Args:
+            passwords: 密码列表
+            window: 同时提交的任务数上限
+
+        Returns:
+            List[str]: 与passwords顺序一致的哈希
+        """
+        window = window or self.max_workers
+        hashed: List[str] = []
+        in_flight = deque()
+        for password in passwords:
+            if len(in_flight) >= window:
+                hashed.append(in_flight.popleft().result())
+            in_flight.append(self._submit(self.hasher.hash, password))
+        hashed.extend(future.result() for future in in_flight)
+        return hashed
+
+    async def hash_async(self, password: str) -> str:
+        """在哈希线程池中哈希密码，不阻塞事件循环"""
+        return await asyncio.wrap_future(self._submit(self.hasher.hash, password))
+
+    async def verify_async(self, password: str, hashed_password: str) -> bool:
+        """在哈希线程池中验证密码，不阻塞事件循环"""
+        return await asyncio.wrap_future(self._submit(self.hasher.verify, password, hashed_password))
+
+    def needs_rehash(self, hashed_password: str) -> bool:
+        """哈希是否需要按当前配置重新生成"""
+        return self.hasher.needs_rehash(hashed_password)
+
+    def shutdown(self) -> None:
+        """关闭线程池（之后提交任务时会重新创建）"""
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=True)
+
+
+def create_password_hasher(options: Optional[dict] = None) -> PasswordHasher:
+    """按配置创建密码哈希器"""
+    options = options if options is not None else config.get('password_hashing', {}) or {}
+    return PasswordHasher(
+        algorithm=options.get('algorithm', 'scrypt'),
+        scrypt_n=options.get('scrypt_n', 2 ** 14),
+        scrypt_r=options.get('scrypt_r', 8),
+        scrypt_p=options.get('scrypt_p', 1),
+        pbkdf2_iterations=options.get('pbkdf2_iterations', 600000)
+    )
+
+
+password_hashing = HashingExecutor(
+    create_password_hasher(),
+    max_workers=config.get('password_hashing.max_workers', 4),
+    max_pending=config.get('password_hashing.max_pending', 64)
+)
@@ -1,13 +1,45 @@
-"""应用初始化模块"""
+"""应用初始化模块 - 多worker启动时由一个worker完成建表和超级用户初始化"""
+
+import os
+import time
+from pathlib import Path
+from typing import Optional
 
 from loguru import logger
+from sqlalchemy import inspect, text
 from sqlalchemy.exc import IntegrityError
 from ..db.database import engine
 from ..models.user import User, UserCreate
-from ..services.user_service import UserService
+from ..services.user_service import UserService, login_key
 from ..core.config import config
 from sqlmodel import SQLModel
-from sqlmodel import Session
+from sqlmodel import Session, select
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+
+
+def ensure_login_key_columns() -> None:
+    """旧数据库的user表没有登录键列时补建列和唯一索引"""
+    columns = {column["name"] for column in inspect(engine).get_columns("user")}
+    table = engine.dialect.identifier_preparer.quote(User.__tablename__)
+    with engine.begin() as connection:
+        for column in ("username_key", "email_key"):
+            if column not in columns:
+                connection.execute(text(f"ALTER TABLE {table} ADD COLUMN {column} VARCHAR"))
+                logger.info(f"已为user表添加{column}列")
+            connection.execute(text(f"CREATE UNIQUE INDEX IF NOT EXISTS ix_user_{column} ON {table} ({column})"))
+
+
+def login_keys_missing() -> bool:
+    """user表缺少登录键列，或有用户尚未回填登录键"""
+    columns = {column["name"] for column in inspect(engine).get_columns("user")}
+    if not {"username_key", "email_key"} <= columns:
+        return True
+    with Session(engine) as session:
+        return session.exec(select(User.id).where(User.username_key.is_(None)).limit(1)).first() is not None
 
 
 def initialize_application():
@@ -18,6 +50,15 @@ def initialize_application():
     SQLModel.metadata.create_all(engine)
     logger.success("数据库表创建成功")
     
+    # 旧数据库补建登录键并回填，登录查找只按登录键匹配
+    ensure_login_key_columns()
+    if login_keys_missing():
+        with Session(engine) as session:
+            backfilled, conflicts = UserService(session).backfill_login_keys()
+        logger.info(f"已为 {backfilled} 个用户回填登录键")
+        if conflicts:
+            logger.error(f"以下用户的用户名或邮箱与其他用户仅大小写不同，未回填登录键，请人工合并: {conflicts}")
+    
     # 初始化超级用户
     with Session(engine) as session:
         user_service = UserService(session)
@@ -28,4 +69,80 @@ def initialize_application():
         else:
             logger.warning("应用初始化完成，但超级用户创建失败")
     
-    return True
\ No newline at end of file
+    return True
+
+
+def is_initialized() -> bool:
+    """
+    检查数据库是否已完成初始化
+    
+    直接检查数据库本身：所有模型表都已存在，所有用户都有登录键，且配置了
+    超级用户时超级用户已存在。数据库被删除、新增模型表或从旧版本升级后返回False。
+    
+    Returns:
+        bool: 是否已初始化
+    """
+    existing = set(inspect(engine).get_table_names())
+    if not set(SQLModel.metadata.tables) <= existing:
+        return False
+    if login_keys_missing():
+        return False
+    username = config.get('superuser.username')
+    if not username:
+        return True
+    with Session(engine) as session:
+        return session.exec(select(User.id).where(User.username_key == login_key(username))).first() is not None
+
+
+def initialize_once(
+    lock_file: Optional[str] = None,
+    wait_timeout: Optional[float] = None,
+    poll_interval: float = 0.1
+) -> bool:
+    """
+    多worker安全的一次性初始化
+    
+    所有worker竞争同一个文件锁，拿到锁的worker先检查数据库，未初始化时
+    执行initialize_application；其余worker等待锁释放后同样检查数据库，
+    发现已初始化就直接返回，不再执行建表和超级用户初始化。持锁worker
+    异常退出时锁随进程释放，等待中的worker会接手初始化。
+    
+    Args:
+        lock_file: 锁文件路径，默认读取配置
+        wait_timeout: 等待其他worker完成初始化的最长秒数，默认读取配置
+        poll_interval: 轮询间隔（秒）
+        
+    Returns:
+        bool: 本进程是否执行了初始化
+        
+    Raises:
+        RuntimeError: 等待超时
+    """
+    lock_path = Path(lock_file or config.get('startup.lock_file', 'run/startup.lock'))
+    wait_timeout = wait_timeout if wait_timeout is not None else config.get('startup.wait_timeout_seconds', 120)
+    
+    if fcntl is None:
+        logger.warning("当前平台不支持文件锁，直接初始化（请以单worker启动）")
+        return initialize_application()
+    
+    deadline = time.monotonic() + wait_timeout
+    lock_path.parent.mkdir(parents=True, exist_ok=True)
+    with open(lock_path, "a") as lock:
+        while True:
+            try:
+                fcntl.flock(lock.fileno(), fcntl.LOCK_EX | fcntl.LOCK_NB)
+                break
+            except BlockingIOError:
+                if time.monotonic() >= deadline:
+                    raise RuntimeError(f"等待其他worker完成初始化超时（{wait_timeout}秒）")
+                time.sleep(poll_interval)
+        
+        try:
+            if is_initialized():
+                logger.info(f"数据库已初始化，跳过 - PID: {os.getpid()}")
+                return False
+            initialize_application()
+            logger.info(f"本worker完成初始化 - PID: {os.getpid()}")
+            return True
+        finally:
+            fcntl.flock(lock.fileno(), fcntl.LOCK_UN)
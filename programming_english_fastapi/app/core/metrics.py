@@ -0,0 +1,74 @@
+"""进程内指标模块 - 计数器、仪表和耗时统计"""
+
+import threading
+from typing import Any, Dict
+
+
+class MetricsRegistry:
+    """
+    线程安全的进程内指标注册表
+
+    计数器只增不减，仪表记录当前值（如队列深度），观测值记录次数、
+    总和与最大值。多worker部署时每个进程各自统计。
+    """
+
+    def __init__(self):
+        self._counters: Dict[str, float] = {}
+        self._gauges: Dict[str, float] = {}
+        self._observations: Dict[str, Dict[str, float]] = {}
+        self._lock = threading.Lock()
+
+    def inc(self, name: str, value: float = 1) -> None:
+        """计数器累加"""
+        with self._lock:
+            self._counters[name] = self._counters.get(name, 0) + value
+
+    def set_gauge(self, name: str, value: float) -> None:
+        """设置仪表当前值"""
+        with self._lock:
+            self._gauges[name] = value
+
+    def add_gauge(self, name: str, delta: float) -> None:
+        """仪表增减"""
+        with self._lock:
+            self._gauges[name] = self._gauges.get(name, 0) + delta
+
+    def observe(self, name: str, value: float) -> None:
+        """记录一次观测值（如耗时、吞吐）"""
+        with self._lock:
+            stats = self._observations.setdefault(name, {"count": 0, "sum": 0.0, "max": 0.0, "last": 0.0})
+            stats["count"] += 1
+            stats["sum"] += value
+            stats["max"] = max(stats["max"], value)
+            stats["last"] = value
+
+    def get(self, name: str, default: float = 0) -> float:
+        """读取计数器或仪表的当前值"""
+        with self._lock:
+            if name in self._gauges:
+                return self._gauges[name]
+            return self._counters.get(name, default)
+
+    def snapshot(self) -> Dict[str, Any]:
+        """
+        获取全部指标快照
+
+        Returns:
+            Dict: counters、gauges和observations三组指标
+        """
+        with self._lock:
+            return {
+                "counters": dict(self._counters),
+                "gauges": dict(self._gauges),
+                "observations": {name: dict(stats) for name, stats in self._observations.items()}
+            }
+
+    def reset(self) -> None:
+        """清空全部指标"""
+        with self._lock:
+            self._counters.clear()
+            self._gauges.clear()
+            self._observations.clear()
+
+
+metrics = MetricsRegistry()
@@ -0,0 +1,272 @@
+"""限流模块 - 按IP、用户和路由的令牌桶限流中间件与登录失败锁定"""
+
+import math
+import threading
+import time
+from dataclasses import dataclass
+from typing import Iterable, List, Optional, Tuple
+
+from loguru import logger
+from starlette.responses import JSONResponse
+from starlette.types import ASGIApp, Receive, Scope, Send
+
+from .config import config
+from .metrics import metrics
+from ..services.api_key_service import api_key_cache, hash_api_key
+from ..utils.bucket_store import BucketStore, create_bucket_store
+from ..utils.cache_utils import TTLCache
+from ..utils.jwt_utils import extract_token_from_authorization, verify_token
+from ..utils.response_utils import error_response
+
+LIMITED_METRIC = "rate_limit.limited"
+LOGIN_FAILURE_METRIC = "login.failures"
+LOGIN_LOCKOUT_METRIC = "login.lockouts"
+
+SCOPES = ("ip", "user", "route")
+
+
+@dataclass(frozen=True)
+class RateLimitRule:
+    """
+    限流规则
+
+    scope为ip/user时每个客户端一个令牌桶，为route时匹配该路由的所有请求
+    共用一个令牌桶；path为路径前缀，methods为空时匹配所有方法。
+    """
+    name: str
+    rate: float
+    burst: float
+    scope: str = "ip"
+    path: Optional[str] = None
+    methods: Tuple[str, ...] = ()
+
+    def matches(self, method: str, path: str) -> bool:
+        if self.path is not None and not path.startswith(self.path):
+            return False
+        return not self.methods or method in self.methods
+
+
+def parse_rules(items: Iterable[dict]) -> List[RateLimitRule]:
+    """
+    解析配置中的限流规则
+
+    Raises:
+        ValueError: scope不受支持或速率非法
+    """
+    rules = []
+    for item in items or []:
+        scope = item.get("scope", "ip")
+        if scope not in SCOPES:
+            raise ValueError(f"不支持的限流范围: {scope}")
+        if item.get("rate", 0) <= 0 or item.get("burst", 0) <= 0:
+            raise ValueError(f"限流规则 {item.get('name')} 的rate和burst必须大于0")
+        rules.append(RateLimitRule(
+            name=item["name"],
+            rate=float(item["rate"]),
+            burst=float(item["burst"]),
+            scope=scope,
+            path=item.get("path"),
+            methods=tuple(method.upper() for method in item.get("methods", []))
+        ))
+    return rules
+
+
+class RateLimiter:
+    """按规则依次检查令牌桶，任一规则超限即拒绝"""
+
+    def __init__(self, rules: List[RateLimitRule], store: BucketStore, trust_forwarded: bool = False):
+        self.rules = rules
+        self.store = store
+        self.trust_forwarded = trust_forwarded
+
+    def client_ip(self, scope: Scope) -> str:
+        """客户端IP，trust_forwarded时取X-Forwarded-For的第一个地址"""
+        if self.trust_forwarded:
+            for name, value in scope.get("headers", []):
+                if name == b"x-forwarded-for":
+                    return value.decode("latin-1").split(",")[0].strip()
+        client = scope.get("client")
+        return client[0] if client else "unknown"
+
+    @staticmethod
+    def _user_id(scope: Scope) -> Optional[int]:
+        """
+        请求所属用户ID，与认证依赖一样X-API-Key优先于Bearer令牌
+
+        API密钥只读进程内密钥缓存（认证依赖验证成功后写入），未命中的密钥
+        本次按未认证请求处理，不在中间件中查询数据库。
+        """
+        headers = dict(scope.get("headers", []))
+        api_key = headers.get(b"x-api-key")
+        if api_key:
+            entry = api_key_cache.get(hash_api_key(api_key.decode("latin-1")))
+            return entry[0] if entry else None
+        authorization = headers.get(b"authorization")
+        if authorization:
+            token = extract_token_from_authorization(authorization.decode("latin-1"))
+            # 已验证令牌有缓存，重复请求不会重复验签
+            claims = verify_token(token) if token else None
+            return claims.get("user_id") if claims else None
+        return None
+
+    def check(self, scope: Scope) -> Optional[Tuple[RateLimitRule, float]]:
+        """
+        检查请求是否超限
+
+        Args:
+            scope: ASGI请求scope
+
+        Returns:
+            Optional[Tuple[RateLimitRule, float]]: 超限时返回(规则, 需等待秒数)，否则None
+        """
+        method, path = scope.get("method", "GET"), scope.get("path", "")
+        ip, user_id, user_resolved = None, None, False
+        for rule in self.rules:
+            if not rule.matches(method, path):
+                continue
+            if rule.scope == "ip":
+                ip = ip or self.client_ip(scope)
+                key = f"{rule.name}:ip:{ip}"
+            elif rule.scope == "user":
+                if not user_resolved:
+                    user_id, user_resolved = self._user_id(scope), True
+                if user_id is None:
+                    # 未认证请求由ip规则约束
+                    continue
+                key = f"{rule.name}:user:{user_id}"
+            else:
+                key = f"{rule.name}:route"
+
+            allowed, retry_after = self.store.take(key, rule.rate, rule.burst)
+            if not allowed:
+                return rule, retry_after
+        return None
+
+
+class RateLimitMiddleware:
+    """限流ASGI中间件，超限时返回429及Retry-After头"""
+
+    def __init__(self, app: ASGIApp, limiter: "RateLimiter"):
+        self.app = app
+        self.limiter = limiter
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        limited = self.limiter.check(scope)
+        if limited is None:
+            await self.app(scope, receive, send)
+            return
+
+        rule, retry_after = limited
+        metrics.inc(LIMITED_METRIC)
+        metrics.inc(f"{LIMITED_METRIC}.{rule.name}")
+        logger.warning(f"请求被限流 - 规则: {rule.name}, 路径: {scope.get('path')}")
+        response = JSONResponse(
+            status_code=429,
+            content=error_response("请求过于频繁，请稍后再试", 429),
+            headers={"Retry-After": str(max(1, math.ceil(retry_after)))}
+        )
+        await response(scope, receive, send)
+
+
+class LoginGuard:
+    """
+    登录失败渐进锁定
+
+    按(登录标识, 客户端IP)计数：同一来源连续失败达到threshold次后开始锁定，
+    之后每次失败锁定时间翻倍，最长max_seconds，其他IP上的账户本人不受影响。
+    同一标识在所有来源上累计失败达到account_threshold次后再加一层软锁定，
+    锁定时间同样翻倍但不超过account_max_seconds：分散来源的猜测被放慢，
+    但无法借错误密码把账户长期锁死。登录成功后清除该来源和账户的失败记录。
+    锁定期间不查询数据库也不计算密码哈希。
+    """
+
+    def __init__(self, threshold: int = 5, base_seconds: float = 1.0, max_seconds: float = 900.0,
+                 account_threshold: int = 20, account_max_seconds: float = 60.0,
+                 maxsize: int = 100000):
+        self.threshold = threshold
+        self.base_seconds = base_seconds
+        self.max_seconds = max_seconds
+        self.account_threshold = account_threshold
+        self.account_max_seconds = account_max_seconds
+        # 失败记录在最后一次失败后保留两个最长锁定周期
+        self._failures = TTLCache(maxsize=maxsize, ttl=max_seconds * 2)
+        self._lock = threading.Lock()
+
+    def _remaining(self, key: Tuple[str, ...]) -> float:
+        state = self._failures.get(key)
+        if state is None:
+            return 0.0
+        return max(0.0, state[1] - time.monotonic())
+
+    def retry_after(self, login_key: str, ip: str) -> float:
+        """返回该来源登录该标识的剩余锁定秒数，未锁定返回0"""
+        return max(self._remaining((login_key, ip)), self._remaining((login_key,)))
+
+    def _fail(self, key: Tuple[str, ...], threshold: int, max_seconds: float) -> float:
+        """累加一次失败，返回本次失败后的锁定秒数（调用方持有锁）"""
+        failures, locked_until = self._failures.get(key, (0, 0.0))
+        failures += 1
+        lock_seconds = 0.0
+        if failures >= threshold:
+            lock_seconds = min(max_seconds, self.base_seconds * 2 ** (failures - threshold))
+            locked_until = time.monotonic() + lock_seconds
+        self._failures.set(key, (failures, locked_until))
+        return lock_seconds
+
+    def record_failure(self, login_key: str, ip: str) -> float:
+        """
+        记录一次登录失败
+
+        Args:
+            login_key: 登录标识
+            ip: 客户端IP
+
+        Returns:
+            float: 本次失败后该来源的锁定秒数，未锁定返回0
+        """
+        metrics.inc(LOGIN_FAILURE_METRIC)
+        with self._lock:
+            lock_seconds = self._fail((login_key, ip), self.threshold, self.max_seconds)
+            account_seconds = self._fail((login_key,), self.account_threshold, self.account_max_seconds)
+        lock_seconds = max(lock_seconds, account_seconds)
+        if lock_seconds:
+            metrics.inc(LOGIN_LOCKOUT_METRIC)
+            logger.warning(f"登录失败次数过多，锁定 {lock_seconds:.0f} 秒 - 标识: {login_key}, IP: {ip}")
+        return lock_seconds
+
+    def record_success(self, login_key: str, ip: str) -> None:
+        """登录成功后清除该来源和账户的失败记录"""
+        self._failures.delete((login_key, ip))
+        self._failures.delete((login_key,))
+
+    def clear(self) -> None:
+        """清空全部失败记录"""
+        self._failures.clear()
+
+
+def create_rate_limiter() -> RateLimiter:
+    """按配置创建限流器"""
+    store = create_bucket_store(
+        config.get('rate_limit.backend', 'memory'),
+        **(config.get('rate_limit.backend_options', {}) or {})
+    )
+    return RateLimiter(
+        parse_rules(config.get('rate_limit.rules', [])),
+        store,
+        trust_forwarded=config.get('rate_limit.trust_forwarded', False)
+    )
+
+
+rate_limiter = create_rate_limiter()
+
+login_guard = LoginGuard(
+    threshold=config.get('rate_limit.login_lockout.threshold', 5),
+    base_seconds=config.get('rate_limit.login_lockout.base_seconds', 1),
+    max_seconds=config.get('rate_limit.login_lockout.max_seconds', 900),
+    account_threshold=config.get('rate_limit.login_lockout.account_threshold', 20),
+    account_max_seconds=config.get('rate_limit.login_lockout.account_max_seconds', 60)
+)
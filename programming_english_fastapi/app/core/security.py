@@ -1,43 +1,28 @@
 """安全配置模块"""
-from datetime import datetime, timedelta
+from datetime import timedelta
 from typing import Optional
-from jose import JWTError, jwt
-from passlib.context import CryptContext
-from .config import SECRET_KEY, ALGORITHM, ACCESS_TOKEN_EXPIRE_MINUTES
-
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+from .hashing import password_hashing
+from ..utils.jwt_utils import create_access_token as create_jwt, verify_token as decode_verified_token
 
 
 def verify_password(plain_password: str, hashed_password: str) -> bool:
-    """验证密码"""
-    return pwd_context.verify(plain_password, hashed_password)
+    """验证密码（在专用哈希线程池中执行）"""
+    return password_hashing.verify(plain_password, hashed_password)
 
 
 def get_password_hash(password: str) -> str:
-    """生成密码哈希"""
-    return pwd_context.hash(password)
+    """生成密码哈希（在专用哈希线程池中执行）"""
+    return password_hashing.hash(password)
 
 
 def create_access_token(data: dict, expires_delta: Optional[timedelta] = None):
-    """创建访问令牌"""
-    to_encode = data.copy()
-    if expires_delta:
-        expire = datetime.utcnow() + expires_delta
-    else:
-        expire = datetime.utcnow() + timedelta(minutes=ACCESS_TOKEN_EXPIRE_MINUTES)
-    
-    to_encode.update({"exp": expire})
-    encoded_jwt = jwt.encode(to_encode, SECRET_KEY, algorithm=ALGORITHM)
-    return encoded_jwt
+    """创建访问令牌（使用统一的令牌编解码器签发）"""
+    return create_jwt(data, expires_delta)
 
 
 def verify_token(token: str) -> Optional[str]:
-    """验证令牌"""
-    try:
-        payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
-        username: str = payload.get("sub")
-        if username is None:
-            return None
-        return username
-    except JWTError:
-        return None
\ No newline at end of file
+    """验证令牌，返回用户名（与jwt_utils共享已验证令牌缓存）"""
+    payload = decode_verified_token(token)
+    if payload is None:
+        return None
+    return payload.get("sub")
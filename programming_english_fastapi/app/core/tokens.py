@@ -0,0 +1,237 @@
+"""令牌编解码模块 - 统一的JWT签发与验证，支持按kid轮换的非对称密钥"""
+
+import threading
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Dict, Optional, Tuple
+
+import jwt
+from jwt.algorithms import get_default_algorithms
+from loguru import logger
+
+from .config import SECRET_KEY, ALGORITHM, config
+
+# 密钥目录中的文件命名：<kid>.pem 为私钥（签发节点），<kid>.pub 为公钥（所有节点）
+PRIVATE_KEY_SUFFIX = ".pem"
+PUBLIC_KEY_SUFFIX = ".pub"
+
+ASYMMETRIC_ALGORITHMS = ("EdDSA", "RS256")
+
+
+@dataclass(frozen=True)
+class VerificationKey:
+    """预解析的验证密钥"""
+    kid: Optional[str]
+    algorithm: str
+    key: Any
+
+
+class KeySet:
+    """
+    按kid索引的密钥集合
+
+    公钥与私钥均在加载时解析一次并缓存，验证时只做字典查找。目录按
+    reload_interval秒的间隔重新扫描，只重新解析修改过的文件，因此新增或
+    删除公钥无需重启：轮换时先把新公钥分发到所有节点，再切换签发节点的
+    active_kid，旧公钥保留到其签发的令牌全部过期后再删除，会话不受影响。
+    """
+
+    def __init__(
+        self,
+        directory: Optional[str] = None,
+        algorithm: str = "EdDSA",
+        active_kid: Optional[str] = None,
+        legacy_secret: Optional[str] = None,
+        legacy_algorithm: str = "HS256",
+        reload_interval: float = 60.0
+    ):
+        """
+        初始化密钥集合
+
+        Args:
+            directory: 密钥目录，为空时只使用共享密钥
+            algorithm: 目录中密钥的签名算法（EdDSA或RS256）
+            active_kid: 用于签发的私钥kid，仅验证节点为空
+            legacy_secret: 共享HMAC密钥，用于无kid令牌；为None时不接受无kid令牌
+            legacy_algorithm: 共享密钥的算法
+            reload_interval: 重新扫描目录的间隔（秒）
+
+        Raises:
+            ValueError: 算法不受支持
+            RuntimeError: 未安装非对称算法所需的cryptography
+        """
+        if directory and algorithm not in ASYMMETRIC_ALGORITHMS:
+            raise ValueError(f"不支持的密钥算法: {algorithm}")
+        if directory and algorithm not in get_default_algorithms():
+            raise RuntimeError(f"{algorithm}签名需要安装cryptography（pip install 'pyjwt[crypto]'）")
+
+        self.directory = Path(directory) if directory else None
+        self.algorithm = algorithm
+        self.active_kid = active_kid or None
+        self.reload_interval = reload_interval
+        self._legacy: Optional[VerificationKey] = None
+        if legacy_secret is not None:
+            self._legacy = VerificationKey(None, legacy_algorithm, legacy_secret)
+
+        self._lock = threading.Lock()
+        self._verification_keys: Dict[str, VerificationKey] = {}
+        self._signing_key: Optional[VerificationKey] = None
+        self._parsed: Dict[Path, Tuple[float, Any]] = {}
+        self._next_scan = 0.0
+        self.reload()
+
+    @property
+    def can_sign(self) -> bool:
+        """本节点是否持有签发私钥（或共享密钥）"""
+        return self._signing_key is not None or (self.directory is None and self._legacy is not None)
+
+    @property
+    def kids(self) -> Tuple[str, ...]:
+        """当前可验证的kid列表"""
+        return tuple(sorted(self._verification_keys))
+
+    def _load(self, path: Path, mtime: float, parsed: Dict[Path, Tuple[float, Any]]) -> Optional[Any]:
+        """解析PEM文件为密钥对象，文件未修改时复用上次的解析结果"""
+        cached = self._parsed.get(path)
+        if cached is not None and cached[0] == mtime:
+            parsed[path] = cached
+            return cached[1]
+        try:
+            key = get_default_algorithms()[self.algorithm].prepare_key(path.read_bytes())
+        except (ValueError, TypeError) as exc:
+            logger.error(f"加载JWT密钥失败 {path.name}: {exc}")
+            return None
+        parsed[path] = (mtime, key)
+        return key
+
+    def reload(self) -> None:
+        """重新扫描密钥目录，只解析新增或修改过的文件"""
+        if self.directory is None:
+            return
+        with self._lock:
+            files = {}
+            if self.directory.is_dir():
+                files = {
+                    path: path.stat().st_mtime for path in self.directory.iterdir()
+                    if path.suffix in (PRIVATE_KEY_SUFFIX, PUBLIC_KEY_SUFFIX)
+                }
+
+            parsed: Dict[Path, Tuple[float, Any]] = {}
+            verification_keys: Dict[str, VerificationKey] = {}
+            signing_key = None
+            for path, mtime in files.items():
+                kid, private = path.stem, path.suffix == PRIVATE_KEY_SUFFIX
+                if private and kid != self.active_kid:
+                    # 只加载当前签发用的私钥
+                    continue
+                key = self._load(path, mtime, parsed)
+                if key is None:
+                    continue
+                if private:
+                    signing_key = VerificationKey(kid, self.algorithm, key)
+                    verification_keys.setdefault(kid, VerificationKey(kid, self.algorithm, key.public_key()))
+                else:
+                    verification_keys[kid] = VerificationKey(kid, self.algorithm, key)
+
+            removed = set(self._verification_keys) - set(verification_keys)
+            added = set(verification_keys) - set(self._verification_keys)
+            self._verification_keys = verification_keys
+            self._signing_key = signing_key
+            self._parsed = parsed
+            self._next_scan = time.monotonic() + self.reload_interval
+
+        if added or removed:
+            logger.info(f"JWT密钥已更新 - 新增: {sorted(added)}, 移除: {sorted(removed)}")
+        if self.active_kid and signing_key is None:
+            logger.warning(f"未找到签发私钥 {self.active_kid}{PRIVATE_KEY_SUFFIX}，本节点只能验证令牌")
+
+    def _maybe_reload(self) -> None:
+        if self.directory is not None and time.monotonic() >= self._next_scan:
+            self.reload()
+
+    def signing_key(self) -> VerificationKey:
+        """
+        获取签发密钥
+
+        Raises:
+            RuntimeError: 本节点没有签发密钥
+        """
+        self._maybe_reload()
+        if self._signing_key is not None:
+            return self._signing_key
+        if self.directory is None and self._legacy is not None:
+            return self._legacy
+        raise RuntimeError("本节点未配置签发私钥，只能验证令牌")
+
+    def verification_key(self, kid: Optional[str]) -> Optional[VerificationKey]:
+        """按kid查找验证密钥，无kid时使用共享密钥"""
+        if kid is None:
+            return self._legacy
+        key = self._verification_keys.get(kid)
+        if key is None and self.directory is not None:
+            # 未知kid可能是刚分发的新公钥，按扫描间隔重新加载
+            self._maybe_reload()
+            key = self._verification_keys.get(kid)
+        return key
+
+
+class TokenCodec:
+    """JWT编解码器，签发时写入kid头，验证时按kid选择预解析的密钥"""
+
+    def __init__(self, keys: KeySet):
+        self.keys = keys
+
+    def encode(self, claims: Dict[str, Any]) -> str:
+        """
+        签发令牌
+
+        Args:
+            claims: 令牌声明
+
+        Returns:
+            str: JWT字符串
+
+        Raises:
+            RuntimeError: 本节点没有签发密钥
+        """
+        key = self.keys.signing_key()
+        headers = {"kid": key.kid} if key.kid else None
+        return jwt.encode(claims, key.key, algorithm=key.algorithm, headers=headers)
+
+    def decode(self, token: str) -> Dict[str, Any]:
+        """
+        验证并解码令牌
+
+        Args:
+            token: JWT字符串
+
+        Returns:
+            Dict: 令牌声明
+
+        Raises:
+            jwt.PyJWTError: 令牌无效、已过期或kid未知
+        """
+        header = jwt.get_unverified_header(token)
+        key = self.keys.verification_key(header.get("kid"))
+        if key is None:
+            raise jwt.InvalidKeyError(f"未知的令牌密钥: {header.get('kid')}")
+        return jwt.decode(token, key.key, algorithms=[key.algorithm])
+
+
+def create_token_codec() -> TokenCodec:
+    """按配置创建令牌编解码器"""
+    directory = config.get('security.keys.directory') or None
+    accept_legacy = config.get('security.keys.accept_legacy', True)
+    keys = KeySet(
+        directory=directory,
+        algorithm=config.get('security.keys.algorithm', 'EdDSA'),
+        active_kid=config.get('security.keys.active_kid') or None,
+        legacy_secret=SECRET_KEY if directory is None or accept_legacy else None,
+        legacy_algorithm=ALGORITHM,
+        reload_interval=config.get('security.keys.reload_interval_seconds', 60)
+    )
+    return TokenCodec(keys)
+
+
+token_codec = create_token_codec()
@@ -1,4 +1,7 @@
 """数据库连接配置"""
+from sqlalchemy import insert
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.sql.dml import Insert
 from sqlmodel import SQLModel, Session, create_engine
 from ..core.config import DATABASE_URL, DATABASE_ECHO
 
@@ -14,4 +17,30 @@ def get_session() -> Session:
 
 def create_db_and_tables():
     """创建数据库和表"""
-    SQLModel.metadata.create_all(engine)
\ No newline at end of file
+    SQLModel.metadata.create_all(engine)
+
+def insert_ignore(session: Session, table) -> Insert:
+    """
+    按会话所连数据库的方言构造"唯一约束冲突时跳过该行"的INSERT
+
+    SQLite和PostgreSQL使用ON CONFLICT DO NOTHING，MySQL/MariaDB使用INSERT IGNORE。
+    冲突的行不会出现在RETURNING结果中，也不计入rowcount。
+
+    Args:
+        session: 数据库会话
+        table: 模型类或表
+
+    Returns:
+        Insert: 可继续调用values()/returning()的INSERT语句
+
+    Raises:
+        NotImplementedError: 不支持的数据库方言
+    """
+    dialect = session.get_bind().dialect.name
+    if dialect == "sqlite":
+        return sqlite.insert(table).on_conflict_do_nothing()
+    if dialect == "postgresql":
+        return postgresql.insert(table).on_conflict_do_nothing()
+    if dialect in ("mysql", "mariadb"):
+        return insert(table).prefix_with("IGNORE")
+    raise NotImplementedError(f"不支持的数据库方言: {dialect}")
@@ -1,36 +1,58 @@
 """FastAPI应用入口模块"""
 
+import asyncio
 import uvicorn
+from contextlib import asynccontextmanager
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 from pathlib import Path
 
 from app.core.app import create_app
-from app.core.initialization import initialize_application
+from app.core.initialization import initialize_once
 from app.api.v1.routes import api_router
-from app.db.database import create_db_and_tables
 from loguru import logger
 
-# 创建应用实例
-app = create_app()
-
-# 包含API路由 - 添加正确的v1前缀
-app.include_router(api_router, prefix="/api/v1")
 
-# 创建数据库表并初始化超级用户
-create_db_and_tables()
-initialize_application()
-
-@app.on_event("startup")
-async def startup_event():
-    """应用启动时的事件"""
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """应用生命周期：启动时初始化（多worker只有一个执行建表和超级用户初始化），关闭时释放资源"""
     logger.info("🚀 Programming English API starting up...")
     logger.info("📊 Database URL: sqlite:///./programming_english.db")
+    # 等待其他worker时会阻塞，放到线程中执行
+    await asyncio.to_thread(initialize_once)
+    
+    from sqlmodel import Session
+    from app.db.database import engine
+    from app.services.token_service import revocation_list
+    from app.services.related_service import RelatedService
+    from app.services.word_index import word_indexes
+    with Session(engine) as session:
+        revoked = revocation_list.rebuild(session)
+    logger.info(f"🔒 已加载 {revoked} 个已撤销令牌")
+
+    def load_word_models():
+        with Session(engine) as session:
+            RelatedService(session).ensure_model()
+            word_indexes.ensure(session)
 
-@app.on_event("shutdown")
-async def shutdown_event():
-    """应用关闭时的事件"""
+    # 相关词模型和检索索引构建耗时与单词数成正比，在线程中预先加载，避免首个请求阻塞
+    await asyncio.to_thread(load_word_models)
+    
+    yield
+    
     logger.info("🛑 Programming English API shutting down...")
+    from app.services.report_service import report_jobs
+    report_jobs.shutdown(wait=False)
+    from app.services.user_import_service import import_jobs
+    import_jobs.shutdown(wait=False)
+    from app.core.hashing import password_hashing
+    password_hashing.shutdown()
+
+# 创建应用实例
+app = create_app(lifespan=lifespan)
+
+# 包含API路由 - 添加正确的v1前缀
+app.include_router(api_router, prefix="/api/v1")
 
 # 中间件：记录访问日志
 @app.middleware("http")
@@ -0,0 +1,16 @@
+# 导入全部表模型，确保SQLModel.metadata.create_all能创建所有表
+from .user import User
+from .word import Word, LearningRecord
+from .favorite import Favorite
+from .exercise import ClozeExercise
+from .related import RelatedWord
+from .tag import Tag, WordTag
+from .achievement import UserCounter, UserAchievement
+from .report import ReportJob
+from .sync import DeviceReviewCounter
+from .reminder import ReminderOutbox, ReminderJobRun
+from .token import RevokedToken
+from .api_key import ApiKey
+from .plan import StudyPlan
+from .user_import import UserImportJob
+from .version import DataVersion
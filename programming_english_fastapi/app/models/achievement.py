@@ -0,0 +1,27 @@
+from sqlmodel import SQLModel, Field
+from datetime import datetime
+from typing import Optional
+
+
+class UserCounter(SQLModel, table=True):
+    """用户学习计数器（复习次数、连续天数、已掌握数等），随复习事件增量更新"""
+    user_id: int = Field(foreign_key="user.id", primary_key=True)
+    name: str = Field(primary_key=True, max_length=64)
+    value: int = Field(default=0)
+
+
+class UserAchievementBase(SQLModel):
+    user_id: int = Field(foreign_key="user.id", primary_key=True)
+    code: str = Field(primary_key=True, max_length=64)
+
+
+class UserAchievement(UserAchievementBase, table=True):
+    unlocked_at: datetime = Field(default_factory=datetime.utcnow)
+
+
+class AchievementRead(SQLModel):
+    code: str
+    name: str
+    description: str
+    unlocked: bool = False
+    unlocked_at: Optional[datetime] = None
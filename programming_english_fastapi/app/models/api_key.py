@@ -0,0 +1,38 @@
+from sqlmodel import SQLModel, Field
+from typing import List, Optional
+from datetime import datetime
+
+
+class ApiKeyBase(SQLModel):
+    name: str = Field(max_length=100)
+
+
+class ApiKey(ApiKeyBase, table=True):
+    """
+    服务间调用的长期API密钥
+
+    只保存密钥的SHA-256摘要，明文仅在创建时返回一次；prefix为密钥开头
+    的几个字符，用于在列表中辨认密钥。scopes为空格分隔的权限范围。
+    """
+    id: Optional[int] = Field(default=None, primary_key=True)
+    user_id: int = Field(foreign_key="user.id", index=True)
+    prefix: str = Field(max_length=16)
+    key_hash: str = Field(max_length=64, index=True, unique=True)
+    scopes: str = Field(default="")
+    expires_at: Optional[datetime] = None
+    revoked_at: Optional[datetime] = None
+    created_at: datetime = Field(default_factory=datetime.utcnow)
+
+
+class ApiKeyCreate(ApiKeyBase):
+    scopes: List[str] = []
+    expires_in_days: Optional[int] = Field(default=None, gt=0)
+
+
+class ApiKeyRead(ApiKeyBase):
+    id: int
+    prefix: str
+    scopes: List[str]
+    expires_at: Optional[datetime] = None
+    revoked_at: Optional[datetime] = None
+    created_at: datetime
@@ -0,0 +1,29 @@
+from sqlmodel import SQLModel, Field
+from typing import Optional
+
+
+class ClozeExerciseBase(SQLModel):
+    word_id: int = Field(foreign_key="word.id", index=True)
+    variant: int = Field(default=0)
+    text: str
+    answer: str
+    span_start: int
+    span_end: int
+
+
+class ClozeExercise(ClozeExerciseBase, table=True):
+    id: Optional[int] = Field(default=None, primary_key=True)
+
+
+class ClozeExerciseRead(ClozeExerciseBase):
+    id: int
+
+
+class ClozeCheckRequest(SQLModel):
+    answer: str
+    variant: int = 0
+
+
+class ClozeCheckResult(SQLModel):
+    correct: bool
+    expected: str
@@ -0,0 +1,15 @@
+from sqlmodel import SQLModel, Field
+from datetime import datetime
+
+
+class FavoriteBase(SQLModel):
+    user_id: int = Field(foreign_key="user.id", primary_key=True)
+    word_id: int = Field(foreign_key="word.id", primary_key=True)
+
+
+class Favorite(FavoriteBase, table=True):
+    created_at: datetime = Field(default_factory=datetime.utcnow)
+
+
+class FavoriteRead(FavoriteBase):
+    created_at: datetime
@@ -0,0 +1,17 @@
+from sqlmodel import SQLModel, Field
+from datetime import datetime
+
+
+class StudyPlan(SQLModel, table=True):
+    """
+    用户最近一次生成的学习计划
+
+    保存计划参数和模拟结果；学习进度变化时在写入路径上按参数重新模拟，
+    读取计划时直接返回保存的结果，所有进程看到的都是同一份计划。
+    """
+    user_id: int = Field(foreign_key="user.id", primary_key=True)
+    # PlanRequest的JSON
+    request: str
+    # LearningPlan的JSON
+    plan: str
+    created_at: datetime = Field(default_factory=datetime.utcnow)
@@ -0,0 +1,16 @@
+from sqlmodel import SQLModel, Field
+
+from .word import WordRead
+
+
+class RelatedWord(SQLModel, table=True):
+    """单词的近邻列表，主键(word_id, rank)使按相关度读取只需一次索引扫描"""
+    word_id: int = Field(foreign_key="word.id", primary_key=True)
+    rank: int = Field(primary_key=True)
+    related_word_id: int = Field(foreign_key="word.id", index=True)
+    score: float
+
+
+class RelatedWordRead(SQLModel):
+    word: WordRead
+    score: float
@@ -0,0 +1,40 @@
+from sqlmodel import SQLModel, Field
+from sqlalchemy import UniqueConstraint
+from typing import Optional
+from datetime import date, datetime
+from enum import Enum
+
+
+class ReminderStatus(str, Enum):
+    PENDING = "pending"
+    SENT = "sent"
+
+
+class ReminderOutbox(SQLModel, table=True):
+    """复习提醒发件箱：每个用户每天一条，由通知器消费"""
+    __table_args__ = (
+        UniqueConstraint("user_id", "due_date", name="uq_reminderoutbox_user_date"),
+    )
+
+    id: Optional[int] = Field(default=None, primary_key=True)
+    user_id: int = Field(foreign_key="user.id")
+    due_date: date
+    due_count: int = Field(default=0)
+    status: ReminderStatus = Field(default=ReminderStatus.PENDING, index=True)
+    created_at: datetime = Field(default_factory=datetime.utcnow)
+    sent_at: Optional[datetime] = None
+
+
+class ReminderJobRun(SQLModel, table=True):
+    """复习提醒批处理运行记录，保存扫描游标用于中断后续跑"""
+    run_date: date = Field(primary_key=True)
+    completed: bool = Field(default=False)
+    # 扫描游标：最后处理的(next_review_at, user_id, id)
+    cursor_next_review_at: Optional[datetime] = None
+    cursor_user_id: Optional[int] = None
+    cursor_record_id: Optional[int] = None
+    rows_scanned: int = Field(default=0)
+    users: int = Field(default=0)
+    elapsed_seconds: float = Field(default=0.0)
+    started_at: datetime = Field(default_factory=datetime.utcnow)
+    finished_at: Optional[datetime] = None
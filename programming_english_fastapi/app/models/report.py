@@ -0,0 +1,46 @@
+from sqlmodel import SQLModel, Field
+from typing import Optional
+from datetime import datetime
+from enum import Enum
+
+
+class JobStatus(str, Enum):
+    PENDING = "pending"
+    RUNNING = "running"
+    SUCCEEDED = "succeeded"
+    FAILED = "failed"
+
+
+class ReportJobBase(SQLModel):
+    # 报告月份，格式YYYY-MM
+    month: str = Field(max_length=7)
+
+
+class ReportJob(ReportJobBase, table=True):
+    id: Optional[int] = Field(default=None, primary_key=True)
+    user_id: int = Field(foreign_key="user.id", index=True)
+    status: JobStatus = Field(default=JobStatus.PENDING)
+    # 生成的HTML报告，下载或过期后删除并置空
+    file_path: Optional[str] = None
+    error: Optional[str] = None
+    created_at: datetime = Field(default_factory=datetime.utcnow)
+    # 提交任务的进程在渲染期间定期刷新，超时未刷新的任务视为已中断
+    heartbeat_at: Optional[datetime] = None
+    finished_at: Optional[datetime] = None
+
+
+class ReportJobCreate(ReportJobBase):
+    pass
+
+
+class ReportJobRead(ReportJobBase):
+    id: int
+    status: JobStatus
+    file_available: bool = False
+    error: Optional[str] = None
+    created_at: datetime
+    finished_at: Optional[datetime] = None
+
+    @classmethod
+    def from_job(cls, job: ReportJob) -> "ReportJobRead":
+        return cls.model_validate(job, update={"file_available": job.file_path is not None})
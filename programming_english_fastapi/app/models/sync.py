@@ -0,0 +1,16 @@
+from sqlmodel import SQLModel, Field
+from datetime import datetime
+
+
+class DeviceReviewCounter(SQLModel, table=True):
+    """
+    每台设备对每个单词的累计答题计数（只增不减的G-Counter）
+
+    合并时取各设备计数的最大值，同一批数据重复上传不会重复计数。
+    """
+    user_id: int = Field(foreign_key="user.id", primary_key=True)
+    device_id: str = Field(primary_key=True, max_length=64)
+    word_id: int = Field(foreign_key="word.id", primary_key=True)
+    correct_count: int = Field(default=0)
+    incorrect_count: int = Field(default=0)
+    last_reviewed: datetime = Field(default_factory=datetime.utcnow)
@@ -0,0 +1,20 @@
+from sqlmodel import SQLModel, Field
+from typing import Optional
+
+
+class TagBase(SQLModel):
+    name: str = Field(index=True, unique=True, max_length=50)
+
+
+class Tag(TagBase, table=True):
+    id: Optional[int] = Field(default=None, primary_key=True)
+
+
+class TagRead(TagBase):
+    word_count: int = 0
+
+
+class WordTag(SQLModel, table=True):
+    word_id: int = Field(foreign_key="word.id", primary_key=True)
+    # 按标签反查单词
+    tag_id: int = Field(foreign_key="tag.id", primary_key=True, index=True)
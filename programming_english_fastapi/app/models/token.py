@@ -0,0 +1,16 @@
+from sqlmodel import SQLModel, Field
+from typing import Optional
+from datetime import datetime
+
+
+class RevokedToken(SQLModel, table=True):
+    """
+    已撤销的令牌（按jti）
+
+    条目只需保留到令牌本身过期，过期后由purge清理。
+    """
+    jti: str = Field(primary_key=True, max_length=64)
+    user_id: Optional[int] = Field(default=None, foreign_key="user.id", index=True)
+    token_type: str = Field(default="access", max_length=16)
+    expires_at: datetime = Field(index=True)
+    revoked_at: datetime = Field(default_factory=datetime.utcnow)
@@ -1,5 +1,5 @@
 from sqlmodel import SQLModel, Field
-from typing import Optional
+from typing import FrozenSet, NamedTuple, Optional
 from datetime import datetime
 from pydantic import EmailStr
 
@@ -14,6 +14,9 @@ class UserBase(SQLModel):
 class User(UserBase, table=True):
     id: Optional[int] = Field(default=None, primary_key=True)
     hashed_password: str
+    # 小写的用户名和邮箱，用于不区分大小写的登录查找和唯一性约束
+    username_key: Optional[str] = Field(default=None, index=True, unique=True)
+    email_key: Optional[str] = Field(default=None, index=True, unique=True)
     created_at: datetime = Field(default_factory=datetime.utcnow)
     updated_at: datetime = Field(default_factory=datetime.utcnow)
 
@@ -33,4 +36,13 @@ class UserUpdate(SQLModel):
 class UserRead(UserBase):
     id: int
     created_at: datetime
-    updated_at: datetime
\ No newline at end of file
+    updated_at: datetime
+
+
+class Principal(NamedTuple):
+    """已认证用户的精简不可变视图，缓存在进程内供依赖注入使用"""
+    id: int
+    username: str
+    is_active: bool
+    # API密钥授予的权限范围；通过访问令牌登录的用户为None，不受范围限制
+    scopes: Optional[FrozenSet[str]] = None
@@ -0,0 +1,42 @@
+from sqlmodel import SQLModel, Field
+from typing import Optional
+from datetime import datetime
+
+from .report import JobStatus
+
+
+class UserImportJob(SQLModel, table=True):
+    """用户批量导入任务，上传的CSV在后台导入，结果文件下载后删除"""
+    id: Optional[int] = Field(default=None, primary_key=True)
+    user_id: int = Field(foreign_key="user.id", index=True)
+    status: JobStatus = Field(default=JobStatus.PENDING)
+    # 上传的CSV，导入结束后删除
+    source_path: str
+    # 逐行结果CSV，下载或过期后删除并置空
+    file_path: Optional[str] = None
+    total: int = Field(default=0)
+    created: int = Field(default=0)
+    duplicate: int = Field(default=0)
+    invalid: int = Field(default=0)
+    seconds: float = Field(default=0.0)
+    error: Optional[str] = None
+    created_at: datetime = Field(default_factory=datetime.utcnow)
+    finished_at: Optional[datetime] = None
+
+
+class UserImportJobRead(SQLModel):
+    id: int
+    status: JobStatus
+    total: int
+    created: int
+    duplicate: int
+    invalid: int
+    seconds: float
+    result_available: bool = False
+    error: Optional[str] = None
+    created_at: datetime
+    finished_at: Optional[datetime] = None
+
+    @classmethod
+    def from_job(cls, job: UserImportJob) -> "UserImportJobRead":
+        return cls.model_validate(job, update={"result_available": job.file_path is not None})
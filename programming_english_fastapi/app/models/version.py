@@ -0,0 +1,13 @@
+from sqlmodel import SQLModel, Field
+
+
+class DataVersion(SQLModel, table=True):
+    """
+    数据版本号
+
+    写入单词时在同一事务内递增，进程内由单词派生的结构（相关词模型、
+    检索索引）记录构建时的版本，与数据库不一致时说明其他进程写入过，需要重建。
+    每个用户的学习记录也有一个版本，作为离线同步按提交顺序递增的游标。
+    """
+    name: str = Field(primary_key=True, max_length=32)
+    version: int = Field(default=0)
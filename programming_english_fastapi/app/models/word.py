@@ -1,5 +1,6 @@
 from sqlmodel import SQLModel, Field
-from typing import Optional
+from sqlalchemy import Index, UniqueConstraint
+from typing import List, Optional
 from datetime import datetime
 from enum import Enum
 
@@ -31,12 +32,14 @@ class WordBase(SQLModel):
 
 class Word(WordBase, table=True):
     id: Optional[int] = Field(default=None, primary_key=True)
+    # 写入时由word计算的语音键，用于按发音查找
+    phonetic_key: Optional[str] = Field(default=None, index=True)
     created_at: datetime = Field(default_factory=datetime.utcnow)
     updated_at: datetime = Field(default_factory=datetime.utcnow)
 
 
 class WordCreate(WordBase):
-    pass
+    tags: List[str] = []
 
 
 class WordUpdate(SQLModel):
@@ -47,12 +50,14 @@ class WordUpdate(SQLModel):
     category: Optional[Category] = None
     difficulty: Optional[DifficultyLevel] = None
     pronunciation: Optional[str] = None
+    tags: Optional[List[str]] = None
 
 
 class WordRead(WordBase):
     id: int
     created_at: datetime
     updated_at: datetime
+    is_favorite: Optional[bool] = None
 
 
 class LearningRecordBase(SQLModel):
@@ -64,9 +69,27 @@ class LearningRecordBase(SQLModel):
 
 
 class LearningRecord(LearningRecordBase, table=True):
+    __table_args__ = (
+        # 单词本按掌握程度筛选并按word_id游标分页
+        Index("ix_learningrecord_user_mastery_word", "user_id", "mastery_level", "word_id"),
+        # 单词本按最近复习时间筛选
+        Index("ix_learningrecord_user_last_reviewed", "user_id", "last_reviewed"),
+        # 学习会话按到期时间取待复习卡片
+        Index("ix_learningrecord_user_next_review", "user_id", "next_review_at"),
+        # 复习提醒批处理按到期时间顺序扫描全部用户
+        Index("ix_learningrecord_next_review_user", "next_review_at", "user_id"),
+        # 离线同步按版本返回服务端增量
+        Index("ix_learningrecord_user_sync_version", "user_id", "sync_version"),
+        UniqueConstraint("user_id", "word_id", name="uq_learningrecord_user_word"),
+    )
+
     id: Optional[int] = Field(default=None, primary_key=True)
     last_reviewed: datetime = Field(default_factory=datetime.utcnow)
+    next_review_at: datetime = Field(default_factory=datetime.utcnow)
     created_at: datetime = Field(default_factory=datetime.utcnow)
+    updated_at: datetime = Field(default_factory=datetime.utcnow)
+    # 写入时用户学习记录版本（reviews:{user_id}），版本行锁使其按提交顺序递增
+    sync_version: int = Field(default=0)
 
 
 class LearningRecordCreate(LearningRecordBase):
@@ -76,4 +99,6 @@ class LearningRecordCreate(LearningRecordBase):
 class LearningRecordRead(LearningRecordBase):
     id: int
     last_reviewed: datetime
-    created_at: datetime
\ No newline at end of file
+    next_review_at: datetime
+    created_at: datetime
+    updated_at: datetime
\ No newline at end of file
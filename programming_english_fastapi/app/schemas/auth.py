@@ -23,6 +23,8 @@ class Token(BaseModel):
     """Token响应模型"""
     access_token: str
     token_type: str = "bearer"
+    refresh_token: Optional[str] = None
+    expires_in: Optional[int] = None
     
     model_config = ConfigDict(
         json_schema_extra={
@@ -34,6 +36,16 @@ class Token(BaseModel):
     )
 
 
+class RefreshRequest(BaseModel):
+    """刷新令牌请求模型"""
+    refresh_token: str
+
+
+class LogoutRequest(BaseModel):
+    """登出请求模型（可同时撤销刷新令牌）"""
+    refresh_token: Optional[str] = None
+
+
 class TokenData(BaseModel):
     """Token数据模型"""
     username: Optional[str] = None
@@ -0,0 +1,84 @@
+"""学习相关的Pydantic模型"""
+
+from datetime import date, datetime
+from typing import List, Optional
+from pydantic import BaseModel, ConfigDict
+
+from app.models.word import WordRead, LearningRecordRead, Category, DifficultyLevel
+
+
+class WordBookItem(BaseModel):
+    """单词本条目：单词及其学习进度"""
+    word: WordRead
+    record: LearningRecordRead
+
+
+class StudyCard(BaseModel):
+    """学习卡片：单词详情、预生成选项及当前进度"""
+    word: WordRead
+    options: List[str]
+    record: Optional[LearningRecordRead] = None
+    is_new: bool
+
+
+class StudyProgress(BaseModel):
+    """学习进度概览"""
+    learned: int
+    mastered: int
+    due: int
+
+
+class StudySessionBatch(BaseModel):
+    """学习会话预取批次"""
+    cards: List[StudyCard]
+    progress: StudyProgress
+
+
+class ReviewRequest(BaseModel):
+    """复习结果提交模型"""
+    word_id: int
+    correct: bool
+    
+    model_config = ConfigDict(
+        json_schema_extra={
+            "example": {
+                "word_id": 1,
+                "correct": True
+            }
+        }
+    )
+
+
+class PlanRequest(BaseModel):
+    """学习计划请求模型，不指定word_ids时计划全部未学单词"""
+    target_date: date
+    word_ids: Optional[List[int]] = None
+    category: Optional[Category] = None
+    difficulty: Optional[DifficultyLevel] = None
+    
+    model_config = ConfigDict(
+        json_schema_extra={
+            "example": {
+                "target_date": "2025-12-31",
+                "category": "basic"
+            }
+        }
+    )
+
+
+class PlanDay(BaseModel):
+    """学习计划中的一天"""
+    date: date
+    new_word_ids: List[int]
+    new_count: int
+    expected_reviews: float
+    expected_total: float
+
+
+class LearningPlan(BaseModel):
+    """逐日学习计划"""
+    target_date: date
+    total_words: int
+    peak_load: float
+    days: List[PlanDay]
+    created_at: datetime
@@ -0,0 +1,58 @@
+"""测验相关的Pydantic模型"""
+
+from datetime import datetime
+from typing import List, Optional
+from pydantic import BaseModel, ConfigDict, Field
+
+
+class QuizStartRequest(BaseModel):
+    """开始测验请求"""
+    n: int = Field(10, ge=1, le=50)
+
+
+class QuizQuestion(BaseModel):
+    """测验题目（不含答案）"""
+    index: int
+    word_id: int
+    word: str
+    options: List[str]
+
+
+class QuizSession(BaseModel):
+    """测验会话"""
+    quiz_id: str
+    questions: List[QuizQuestion]
+    started_at: datetime
+    expires_in: int
+
+
+class QuizAnswerRequest(BaseModel):
+    """提交答案请求"""
+    index: int = Field(ge=0)
+    answer: str
+    
+    model_config = ConfigDict(
+        json_schema_extra={
+            "example": {
+                "index": 0,
+                "answer": "函数"
+            }
+        }
+    )
+
+
+class QuizAnswerResult(BaseModel):
+    """答案校验结果"""
+    index: int
+    correct: bool
+    expected: str
+
+
+class QuizResult(BaseModel):
+    """测验最终结果"""
+    quiz_id: str
+    total: int
+    answered: int
+    correct: int
+    duration_seconds: float
+    unlocked_achievements: List[str] = []
@@ -0,0 +1,17 @@
+"""检索相关的Pydantic模型"""
+
+from pydantic import BaseModel
+
+from app.models.word import WordRead
+
+
+class WordMatch(BaseModel):
+    """模糊查找结果：单词及其与查询词的编辑距离"""
+    word: WordRead
+    distance: int
+
+
+class TranslationMatch(BaseModel):
+    """中文反查结果：单词及匹配得分"""
+    word: WordRead
+    score: float
@@ -0,0 +1,60 @@
+"""离线同步相关的Pydantic模型"""
+
+from datetime import datetime, timezone
+from typing import List, Optional
+from pydantic import BaseModel, ConfigDict, Field, field_validator
+
+from app.models.word import LearningRecordRead
+
+
+def to_naive_utc(value: Optional[datetime]) -> Optional[datetime]:
+    """带时区的时间转换为UTC并去掉时区，与数据库中的naive UTC时间可比较"""
+    if value is None or value.tzinfo is None:
+        return value
+    return value.astimezone(timezone.utc).replace(tzinfo=None)
+
+
+class SyncReviewEntry(BaseModel):
+    """设备上某个单词的累计复习状态"""
+    word_id: int
+    correct_count: int = Field(ge=0)
+    incorrect_count: int = Field(ge=0)
+    last_reviewed: datetime
+    mastery_level: int = Field(ge=0, le=5)
+    
+    _naive_last_reviewed = field_validator("last_reviewed")(to_naive_utc)
+
+
+class SyncReviewsRequest(BaseModel):
+    """离线复习上传请求"""
+    device_id: str = Field(min_length=1, max_length=64)
+    # 上次同步响应中的cursor（学习记录版本），为空时返回全部学习记录
+    since: Optional[int] = Field(default=None, ge=0)
+    entries: List[SyncReviewEntry] = Field(default_factory=list, max_length=2000)
+    
+    model_config = ConfigDict(
+        json_schema_extra={
+            "example": {
+                "device_id": "pixel-7-a1b2",
+                "since": 42,
+                "entries": [
+                    {
+                        "word_id": 1,
+                        "correct_count": 3,
+                        "incorrect_count": 1,
+                        "last_reviewed": "2025-01-02T08:30:00",
+                        "mastery_level": 2
+                    }
+                ]
+            }
+        }
+    )
+
+
+class SyncReviewsResponse(BaseModel):
+    """离线复习上传结果：服务端增量状态"""
+    # 下次同步时作为since上传
+    cursor: int
+    records: List[LearningRecordRead]
+    rejected_word_ids: List[int]
+    unlocked_achievements: List[str] = []
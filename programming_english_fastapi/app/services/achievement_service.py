@@ -0,0 +1,304 @@
+"""成就服务模块 - 由复习事件驱动的增量成就规则引擎"""
+
+from bisect import bisect_right
+from collections import defaultdict
+from datetime import datetime
+from typing import Callable, Dict, Iterable, List, Mapping, Optional, Sequence, Set, Tuple
+from sqlmodel import Session, select
+from loguru import logger
+
+from ..models.achievement import UserCounter, UserAchievement, AchievementRead
+from ..models.word import Category
+
+# 计数器名称
+REVIEWS = "reviews"
+CORRECT = "correct"
+LEARNED = "learned"
+MASTERED = "mastered"
+STREAK = "streak"
+LAST_REVIEW_DAY = "last_review_day"
+CATEGORY_PREFIX = "category:"
+
+
+def category_counter(category) -> str:
+    """分类覆盖计数器名称（该分类下已学单词数）"""
+    return f"{CATEGORY_PREFIX}{getattr(category, 'value', category)}"
+
+
+class AchievementRule:
+    """
+    成就规则
+
+    简单规则只声明一个计数器和阈值，计数器跨过阈值时解锁；复合规则
+    声明依赖的计数器并提供判定函数，只在依赖的计数器变化时执行。
+    """
+
+    def __init__(
+        self,
+        code: str,
+        name: str,
+        description: str,
+        counter: Optional[str] = None,
+        threshold: int = 0,
+        depends_on: Sequence[str] = (),
+        check: Optional[Callable[[Mapping[str, int]], bool]] = None
+    ):
+        if (counter is None) == (check is None):
+            raise ValueError("规则必须且只能指定counter阈值或check判定函数之一")
+        self.code = code
+        self.name = name
+        self.description = description
+        self.counter = counter
+        self.threshold = threshold
+        self.depends_on = tuple(depends_on) if check else (counter,)
+        self.check = check
+
+    def is_satisfied(self, counters: Mapping[str, int]) -> bool:
+        """按完整计数器判定是否满足（用于基准对比和补发）"""
+        if self.check is not None:
+            return self.check(counters)
+        return counters.get(self.counter, 0) >= self.threshold
+
+
+class AchievementEngine:
+    """
+    成就规则引擎
+
+    阈值规则按计数器分组并按阈值排序，计数器从old变为new时用二分查找
+    取出阈值落在(old, new]内的规则；复合规则按依赖的计数器建立索引。
+    单次事件的开销只与受影响的规则数有关，与规则总数和历史记录无关。
+    """
+
+    def __init__(self, rules: Iterable[AchievementRule]):
+        self.rules: Dict[str, AchievementRule] = {}
+        thresholds: Dict[str, List[Tuple[int, str]]] = defaultdict(list)
+        self._composite: Dict[str, List[AchievementRule]] = defaultdict(list)
+        for rule in rules:
+            if rule.code in self.rules:
+                raise ValueError(f"成就编码重复: {rule.code}")
+            self.rules[rule.code] = rule
+            if rule.check is None:
+                thresholds[rule.counter].append((rule.threshold, rule.code))
+            else:
+                for counter in rule.depends_on:
+                    self._composite[counter].append(rule)
+
+        self._thresholds: Dict[str, List[int]] = {}
+        self._threshold_codes: Dict[str, List[str]] = {}
+        for counter, entries in thresholds.items():
+            entries.sort()
+            self._thresholds[counter] = [threshold for threshold, _ in entries]
+            self._threshold_codes[counter] = [code for _, code in entries]
+
+    def evaluate(
+        self,
+        changes: Mapping[str, Tuple[int, int]],
+        counters: Mapping[str, int],
+        unlocked: Set[str] = frozenset()
+    ) -> List[str]:
+        """
+        根据计数器变化求新满足的成就
+
+        Args:
+            changes: 计数器名 -> (旧值, 新值)
+            counters: 变化后的完整计数器
+            unlocked: 已解锁的成就编码
+
+        Returns:
+            List[str]: 新满足的成就编码
+        """
+        satisfied: List[str] = []
+        seen: Set[str] = set()
+        for counter, (old, new) in changes.items():
+            if new > old and counter in self._thresholds:
+                thresholds = self._thresholds[counter]
+                codes = self._threshold_codes[counter]
+                for index in range(bisect_right(thresholds, old), bisect_right(thresholds, new)):
+                    code = codes[index]
+                    if code not in unlocked and code not in seen:
+                        seen.add(code)
+                        satisfied.append(code)
+            for rule in self._composite.get(counter, ()):
+                if rule.code not in unlocked and rule.code not in seen and rule.check(counters):
+                    seen.add(rule.code)
+                    satisfied.append(rule.code)
+        return satisfied
+
+
+def _default_rules() -> List[AchievementRule]:
+    """内置成就规则"""
+    rules = [
+        AchievementRule("first_review", "初次复习", "完成第一次复习", counter=REVIEWS, threshold=1),
+        AchievementRule("reviews_100", "勤学苦练", "累计复习100次", counter=REVIEWS, threshold=100),
+        AchievementRule("reviews_1000", "千锤百炼", "累计复习1000次", counter=REVIEWS, threshold=1000),
+        AchievementRule("correct_100", "百发百中", "累计答对100次", counter=CORRECT, threshold=100),
+        AchievementRule("learned_50", "词汇起步", "学习50个单词", counter=LEARNED, threshold=50),
+        AchievementRule("mastered_10", "小有所成", "掌握10个单词", counter=MASTERED, threshold=10),
+        AchievementRule("mastered_100", "词汇达人", "掌握100个单词", counter=MASTERED, threshold=100),
+        AchievementRule("streak_3", "三天打鱼", "连续学习3天", counter=STREAK, threshold=3),
+        AchievementRule("streak_7", "坚持一周", "连续学习7天", counter=STREAK, threshold=7),
+        AchievementRule("streak_30", "月度学霸", "连续学习30天", counter=STREAK, threshold=30),
+    ]
+    categories = [category_counter(category) for category in Category]
+    rules.extend(
+        AchievementRule(
+            f"{counter.replace(':', '_')}_10", f"{counter[len(CATEGORY_PREFIX):]}入门",
+            f"在{counter[len(CATEGORY_PREFIX):]}分类学习10个单词", counter=counter, threshold=10
+        )
+        for counter in categories
+    )
+    rules.append(AchievementRule(
+        "all_categories", "全面发展", "每个分类都学习过单词",
+        depends_on=categories,
+        check=lambda counters: all(counters.get(counter, 0) > 0 for counter in categories)
+    ))
+    return rules
+
+
+achievement_engine = AchievementEngine(_default_rules())
+
+
+class AchievementService:
+    """成就服务类"""
+
+    def __init__(self, session: Session, engine: AchievementEngine = achievement_engine):
+        self.session = session
+        self.engine = engine
+
+    def get_counters(self, user_id: int) -> Dict[str, int]:
+        """获取用户全部计数器"""
+        statement = select(UserCounter.name, UserCounter.value).where(UserCounter.user_id == user_id)
+        return dict(self.session.exec(statement).all())
+
+    def on_review(
+        self,
+        user_id: int,
+        reviewed_at: datetime,
+        correct: bool,
+        old_mastery: Optional[int],
+        new_mastery: int,
+        mastered_level: int,
+        category=None
+    ) -> List[str]:
+        """
+        处理一次复习事件：更新计数器并解锁受影响的成就（不提交事务）
+
+        Args:
+            user_id: 用户ID
+            reviewed_at: 复习时间
+            correct: 是否答对
+            old_mastery: 复习前掌握程度，新学单词为None
+            new_mastery: 复习后掌握程度
+            mastered_level: 视为已掌握的掌握程度
+            category: 单词分类
+
+        Returns:
+            List[str]: 本次新解锁的成就编码
+        """
+        return self.on_reviews(
+            user_id, reviewed_at, 1, int(correct), old_mastery, new_mastery, mastered_level, category
+        )
+
+    def on_reviews(
+        self,
+        user_id: int,
+        reviewed_at: datetime,
+        reviews: int,
+        correct: int,
+        old_mastery: Optional[int],
+        new_mastery: int,
+        mastered_level: int,
+        category=None
+    ) -> List[str]:
+        """
+        处理同一单词合并后的多次复习（离线同步），计数器一次累加（不提交事务）
+
+        早于最近复习日的复习只累加计数，不改变连续学习天数。
+
+        Args:
+            user_id: 用户ID
+            reviewed_at: 最后一次复习时间
+            reviews: 复习次数
+            correct: 其中答对次数
+            old_mastery: 复习前掌握程度，新学单词为None
+            new_mastery: 复习后掌握程度
+            mastered_level: 视为已掌握的掌握程度
+            category: 单词分类
+
+        Returns:
+            List[str]: 本次新解锁的成就编码
+        """
+        rows = {
+            row.name: row
+            for row in self.session.exec(select(UserCounter).where(UserCounter.user_id == user_id)).all()
+        }
+        counters = {name: row.value for name, row in rows.items()}
+        deltas: Dict[str, int] = {}
+        if reviews:
+            deltas[REVIEWS] = reviews
+        if correct:
+            deltas[CORRECT] = correct
+        if old_mastery is None:
+            deltas[LEARNED] = 1
+            if category is not None:
+                deltas[category_counter(category)] = 1
+        was_mastered = old_mastery is not None and old_mastery >= mastered_level
+        if new_mastery >= mastered_level and not was_mastered:
+            deltas[MASTERED] = 1
+        elif was_mastered and new_mastery < mastered_level:
+            deltas[MASTERED] = -1
+
+        changes = {
+            name: (counters.get(name, 0), counters.get(name, 0) + delta)
+            for name, delta in deltas.items()
+        }
+
+        day = reviewed_at.date().toordinal()
+        last_day = counters.get(LAST_REVIEW_DAY, 0)
+        # 离线设备晚到的旧复习不能把连续天数重置为1
+        if reviews and day > last_day:
+            streak = counters.get(STREAK, 0)
+            changes[STREAK] = (streak, streak + 1 if day == last_day + 1 else 1)
+            changes[LAST_REVIEW_DAY] = (last_day, day)
+
+        for name, (_, value) in changes.items():
+            counters[name] = value
+            row = rows.get(name) or UserCounter(user_id=user_id, name=name)
+            row.value = value
+            self.session.add(row)
+
+        candidates = self.engine.evaluate(changes, counters)
+        if not candidates:
+            return []
+        unlocked = self._unlocked_codes(user_id, candidates)
+        new_codes = [code for code in candidates if code not in unlocked]
+        self.session.add_all([
+            UserAchievement(user_id=user_id, code=code, unlocked_at=reviewed_at)
+            for code in new_codes
+        ])
+        if new_codes:
+            logger.info(f"用户 {user_id} 解锁成就: {', '.join(new_codes)}")
+        return new_codes
+
+    def list_achievements(self, user_id: int) -> List[AchievementRead]:
+        """获取全部成就及用户解锁状态"""
+        statement = select(UserAchievement).where(UserAchievement.user_id == user_id)
+        unlocked = {item.code: item.unlocked_at for item in self.session.exec(statement).all()}
+        return [
+            AchievementRead(
+                code=rule.code,
+                name=rule.name,
+                description=rule.description,
+                unlocked=rule.code in unlocked,
+                unlocked_at=unlocked.get(rule.code)
+            )
+            for rule in self.engine.rules.values()
+        ]
+
+    def _unlocked_codes(self, user_id: int, codes: List[str]) -> Set[str]:
+        """查询候选成就中已解锁的编码"""
+        statement = select(UserAchievement.code).where(
+            UserAchievement.user_id == user_id,
+            UserAchievement.code.in_(codes)
+        )
+        return set(self.session.exec(statement).all())
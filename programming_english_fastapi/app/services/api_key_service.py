@@ -0,0 +1,170 @@
+"""API密钥服务模块 - 服务间调用的长期密钥签发、验证与吊销"""
+
+import hashlib
+import secrets
+from datetime import datetime, timedelta
+from typing import List, Optional, Tuple
+
+from sqlmodel import Session, select
+from loguru import logger
+
+from ..core.config import config
+from ..core.metrics import metrics
+from ..models.api_key import ApiKey, ApiKeyCreate
+from ..models.user import Principal
+from ..utils.cache_utils import TTLCache
+from .user_service import UserService
+
+API_KEY_CACHE_HITS_METRIC = "api_key_cache.hits"
+API_KEY_CACHE_MISSES_METRIC = "api_key_cache.misses"
+
+# 可授予API密钥的权限范围
+API_KEY_SCOPES = {
+    "words:write": "创建、修改和删除单词",
+    "users:import": "批量导入用户（密钥所属用户须为超级用户）",
+    "metrics:read": "读取进程内指标（密钥所属用户须为超级用户）",
+}
+
+# 明文密钥的前缀，便于在日志和密钥扫描工具中识别
+API_KEY_PREFIX = config.get('security.api_keys.prefix', 'pek')
+# 列表中展示的密钥开头字符数
+DISPLAY_PREFIX_LENGTH = 12
+
+# 密钥摘要 -> (user_id, scopes)；吊销时显式失效，TTL兜底其他进程中的吊销。
+# 用户被禁用经principal缓存失效，不依赖本缓存
+api_key_cache = TTLCache(
+    maxsize=config.get('cache.api_keys.maxsize', 10000),
+    ttl=config.get('cache.api_keys.ttl_seconds', 300)
+)
+
+
+def hash_api_key(raw_key: str) -> str:
+    """
+    计算API密钥摘要
+
+    密钥本身是256位随机数，不需要加盐的慢哈希，一次SHA-256即可安全存储，
+    并能按摘要直接索引查找。
+
+    Args:
+        raw_key: 明文密钥
+
+    Returns:
+        str: 十六进制SHA-256摘要
+    """
+    return hashlib.sha256(raw_key.encode("utf-8")).hexdigest()
+
+
+class ApiKeyService:
+    """API密钥服务类"""
+
+    def __init__(self, session: Session):
+        self.session = session
+
+    def create_key(self, user_id: int, key_create: ApiKeyCreate) -> Tuple[ApiKey, str]:
+        """
+        为用户创建API密钥
+
+        Args:
+            user_id: 密钥所属用户ID
+            key_create: 密钥名称、权限范围和有效天数
+
+        Returns:
+            Tuple[ApiKey, str]: (密钥记录, 明文密钥)，明文只在此时返回一次
+
+        Raises:
+            ValueError: 权限范围未知
+        """
+        unknown = set(key_create.scopes) - set(API_KEY_SCOPES)
+        if unknown:
+            raise ValueError(f"未知的权限范围: {', '.join(sorted(unknown))}")
+
+        raw_key = f"{API_KEY_PREFIX}_{secrets.token_urlsafe(32)}"
+        expires_at = None
+        if key_create.expires_in_days:
+            expires_at = datetime.utcnow() + timedelta(days=key_create.expires_in_days)
+        api_key = ApiKey(
+            user_id=user_id,
+            name=key_create.name,
+            prefix=raw_key[:DISPLAY_PREFIX_LENGTH],
+            key_hash=hash_api_key(raw_key),
+            scopes=" ".join(sorted(set(key_create.scopes))),
+            expires_at=expires_at
+        )
+        self.session.add(api_key)
+        self.session.commit()
+        self.session.refresh(api_key)
+
+        logger.info(f"API密钥创建成功 - 用户ID: {user_id}, 名称: {api_key.name}")
+        return api_key, raw_key
+
+    def list_keys(self, user_id: int) -> List[ApiKey]:
+        """
+        获取用户的API密钥列表
+
+        Args:
+            user_id: 用户ID
+
+        Returns:
+            List[ApiKey]: 密钥记录（不含明文）
+        """
+        return self.session.exec(
+            select(ApiKey).where(ApiKey.user_id == user_id).order_by(ApiKey.id)
+        ).all()
+
+    def revoke_key(self, user_id: int, key_id: int) -> bool:
+        """
+        吊销用户的API密钥
+
+        Args:
+            user_id: 用户ID
+            key_id: 密钥ID
+
+        Returns:
+            bool: 是否吊销成功（密钥不存在或不属于该用户返回False）
+        """
+        api_key = self.session.get(ApiKey, key_id)
+        if api_key is None or api_key.user_id != user_id:
+            return False
+        if api_key.revoked_at is None:
+            api_key.revoked_at = datetime.utcnow()
+            self.session.add(api_key)
+            self.session.commit()
+        api_key_cache.delete(api_key.key_hash)
+        logger.info(f"API密钥已吊销 - 用户ID: {user_id}, 密钥ID: {key_id}")
+        return True
+
+    def authenticate(self, raw_key: str) -> Optional[Principal]:
+        """
+        验证API密钥并返回带权限范围的用户视图
+
+        先按摘要读取密钥缓存，再读取principal缓存，两者都命中时不访问
+        数据库，也不做密码哈希或JWT验签。
+
+        Args:
+            raw_key: 明文密钥
+
+        Returns:
+            Optional[Principal]: 用户视图，密钥无效、已吊销、已过期或用户不存在时返回None
+        """
+        digest = hash_api_key(raw_key)
+        entry = api_key_cache.get(digest)
+        metrics.inc(API_KEY_CACHE_HITS_METRIC if entry is not None else API_KEY_CACHE_MISSES_METRIC)
+        if entry is None:
+            api_key = self.session.exec(select(ApiKey).where(ApiKey.key_hash == digest)).first()
+            now = datetime.utcnow()
+            if api_key is None or api_key.revoked_at is not None:
+                return None
+            if api_key.expires_at is not None and api_key.expires_at <= now:
+                return None
+            entry = (api_key.user_id, frozenset(api_key.scopes.split()))
+            ttl = api_key_cache.ttl
+            if api_key.expires_at is not None:
+                # 缓存条目不晚于密钥过期
+                ttl = min(ttl, (api_key.expires_at - now).total_seconds())
+            api_key_cache.set(digest, entry, ttl=ttl)
+
+        user_id, scopes = entry
+        principal = UserService(self.session).get_principal(user_id)
+        if principal is None:
+            return None
+        return principal._replace(scopes=scopes)
@@ -0,0 +1,106 @@
+"""填空题服务模块"""
+
+from typing import List, Optional
+from sqlalchemy import delete
+from sqlmodel import Session, select
+from loguru import logger
+
+from ..models.exercise import ClozeExercise
+from ..models.word import Word
+from ..utils.text_utils import build_cloze_variants, answers_match
+
+
+class ClozeService:
+    """填空题服务类"""
+
+    def __init__(self, session: Session):
+        self.session = session
+
+    def sync_word(self, word: Word) -> List[ClozeExercise]:
+        """
+        重新生成单词的填空变体（不提交事务，由调用方统一提交）
+
+        Args:
+            word: 已分配ID的单词
+
+        Returns:
+            List[ClozeExercise]: 新生成的填空题
+        """
+        self.delete_for_word(word.id)
+        exercises = [
+            ClozeExercise(
+                word_id=word.id,
+                variant=variant,
+                text=text,
+                answer=answer,
+                span_start=start,
+                span_end=end
+            )
+            for variant, (text, answer, start, end) in enumerate(build_cloze_variants(word.word, word.example))
+        ]
+        self.session.add_all(exercises)
+        return exercises
+
+    def delete_for_word(self, word_id: int) -> None:
+        """删除单词的全部填空题（不提交事务）"""
+        self.session.exec(delete(ClozeExercise).where(ClozeExercise.word_id == word_id))
+
+    def get_for_word(self, word_id: int) -> List[ClozeExercise]:
+        """获取单词的全部填空题"""
+        statement = (
+            select(ClozeExercise)
+            .where(ClozeExercise.word_id == word_id)
+            .order_by(ClozeExercise.variant)
+        )
+        return list(self.session.exec(statement).all())
+
+    def get_variant(self, word_id: int, variant: int) -> Optional[ClozeExercise]:
+        """获取单词的某个填空变体"""
+        statement = select(ClozeExercise).where(
+            ClozeExercise.word_id == word_id,
+            ClozeExercise.variant == variant
+        )
+        return self.session.exec(statement).first()
+
+    def check_answer(self, exercise: ClozeExercise, answer: str) -> bool:
+        """检查填空答案（忽略大小写、空白和标点）"""
+        return answers_match(exercise.answer, answer)
+
+    def backfill(self, batch_size: int = 500, only_missing: bool = True) -> int:
+        """
+        为已有单词批量生成填空题
+
+        Args:
+            batch_size: 每批处理的单词数
+            only_missing: 是否只处理还没有填空题的单词
+
+        Returns:
+            int: 处理的单词数
+        """
+        processed = 0
+        last_id = 0
+        while True:
+            statement = select(Word).where(Word.id > last_id).order_by(Word.id).limit(batch_size)
+            words = list(self.session.exec(statement).all())
+            if not words:
+                break
+
+            if only_missing:
+                existing = set(self.session.exec(
+                    select(ClozeExercise.word_id)
+                    .where(ClozeExercise.word_id.in_([word.id for word in words]))
+                    .distinct()
+                ).all())
+                words_to_sync = [word for word in words if word.id not in existing]
+            else:
+                words_to_sync = words
+
+            for word in words_to_sync:
+                self.sync_word(word)
+            self.session.commit()
+
+            processed += len(words_to_sync)
+            last_id = words[-1].id
+            logger.info(f"填空题回填进度: 已处理 {processed} 个单词，当前ID {last_id}")
+
+        return processed
@@ -0,0 +1,111 @@
+"""收藏服务模块"""
+
+from typing import FrozenSet, List, Optional, Tuple
+from sqlmodel import Session, select
+from loguru import logger
+
+from ..models.favorite import Favorite
+from ..models.word import Word
+from ..core.config import config
+from ..utils.cache_utils import TTLCache
+
+# 每个用户的收藏单词ID集合缓存，列表页通过一次集合查找标注is_favorite
+favorite_ids_cache = TTLCache(
+    maxsize=config.get('cache.favorites.maxsize', 10000),
+    ttl=config.get('cache.favorites.ttl_seconds', 300)
+)
+
+
+class FavoriteService:
+    """收藏服务类"""
+
+    def __init__(self, session: Session):
+        self.session = session
+
+    def add_favorite(self, user_id: int, word_id: int) -> Favorite:
+        """添加收藏（重复添加时直接返回已有记录）"""
+        favorite = self.session.get(Favorite, (user_id, word_id))
+        if favorite:
+            return favorite
+
+        favorite = Favorite(user_id=user_id, word_id=word_id)
+        self.session.add(favorite)
+        self.session.commit()
+        self.session.refresh(favorite)
+        favorite_ids_cache.delete(user_id)
+
+        logger.info(f"用户 {user_id} 收藏单词 {word_id}")
+        return favorite
+
+    def remove_favorite(self, user_id: int, word_id: int) -> bool:
+        """取消收藏"""
+        favorite = self.session.get(Favorite, (user_id, word_id))
+        if not favorite:
+            return False
+
+        self.session.delete(favorite)
+        self.session.commit()
+        favorite_ids_cache.delete(user_id)
+
+        logger.info(f"用户 {user_id} 取消收藏单词 {word_id}")
+        return True
+
+    def list_favorites(
+        self,
+        user_id: int,
+        after: Optional[int] = None,
+        limit: int = 20
+    ) -> Tuple[List[Word], Optional[int]]:
+        """
+        按单词ID游标分页获取收藏的单词
+
+        Args:
+            user_id: 用户ID
+            after: 上一页最后一个单词ID，为None时从头开始
+            limit: 每页数量
+
+        Returns:
+            Tuple: (单词列表, 下一页游标)
+        """
+        statement = (
+            select(Word)
+            .join(Favorite, Favorite.word_id == Word.id)
+            .where(Favorite.user_id == user_id)
+        )
+        if after is not None:
+            statement = statement.where(Favorite.word_id > after)
+        # 多取一条用于判断是否还有下一页
+        statement = statement.order_by(Favorite.word_id).limit(limit + 1)
+
+        words = list(self.session.exec(statement).all())
+        next_cursor = None
+        if len(words) > limit:
+            words = words[:limit]
+            next_cursor = words[-1].id
+        return words, next_cursor
+
+    def get_favorite_ids(self, user_id: int) -> FrozenSet[int]:
+        """获取用户收藏的单词ID集合（带缓存）"""
+        return favorite_ids_cache.get_or_set(user_id, lambda: self._load_favorite_ids(user_id))
+
+    def _load_favorite_ids(self, user_id: int) -> FrozenSet[int]:
+        """从数据库加载用户收藏的单词ID集合"""
+        statement = select(Favorite.word_id).where(Favorite.user_id == user_id)
+        return frozenset(self.session.exec(statement).all())
+
+    def annotate_favorites(self, user_id: int, words: List[Word]) -> List[dict]:
+        """
+        为单词列表标注is_favorite
+
+        Args:
+            user_id: 用户ID
+            words: 单词列表
+
+        Returns:
+            List[dict]: 带is_favorite字段的单词数据
+        """
+        favorite_ids = self.get_favorite_ids(user_id)
+        return [
+            {**word.model_dump(), "is_favorite": word.id in favorite_ids}
+            for word in words
+        ]
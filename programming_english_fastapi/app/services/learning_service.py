@@ -0,0 +1,246 @@
+"""学习记录服务模块"""
+
+from datetime import datetime, timedelta
+from typing import List, Optional, Sequence, Tuple
+from sqlalchemy import update
+from sqlmodel import Session, select
+from loguru import logger
+
+from ..models.word import Word, LearningRecord
+from ..core.config import config
+from .achievement_service import AchievementService
+from .version_service import VersionService, reviews_version
+
+# 各掌握程度对应的复习间隔（天），下标为mastery_level
+REVIEW_INTERVALS_DAYS = config.get('learning.review_intervals_days', [0, 1, 2, 4, 7, 15])
+MASTERED_LEVEL = config.get('learning.mastered_level', 5)
+
+
+def next_review_time(mastery_level: int, reviewed_at: datetime) -> datetime:
+    """
+    根据掌握程度计算下次复习时间
+
+    Args:
+        mastery_level: 复习后的掌握程度
+        reviewed_at: 本次复习时间
+
+    Returns:
+        datetime: 下次复习时间
+    """
+    index = min(max(mastery_level, 0), len(REVIEW_INTERVALS_DAYS) - 1)
+    return reviewed_at + timedelta(days=REVIEW_INTERVALS_DAYS[index])
+
+
+class LearningService:
+    """学习记录服务类"""
+
+    def __init__(self, session: Session):
+        self.session = session
+        # 最近一次record_review解锁的成就编码
+        self.unlocked_achievements: List[str] = []
+
+    def get_word_book(
+        self,
+        user_id: int,
+        mastery_level: Optional[int] = None,
+        reviewed_after: Optional[datetime] = None,
+        reviewed_before: Optional[datetime] = None,
+        after: Optional[int] = None,
+        limit: int = 20
+    ) -> Tuple[List[Tuple[LearningRecord, Word]], Optional[int]]:
+        """
+        获取用户单词本（学习记录与单词一次联表查询，按word_id游标分页）
+
+        Args:
+            user_id: 用户ID
+            mastery_level: 掌握程度筛选
+            reviewed_after: 最近复习时间下限（含）
+            reviewed_before: 最近复习时间上限（不含）
+            after: 上一页最后一个单词ID
+            limit: 每页数量
+
+        Returns:
+            Tuple: ([(学习记录, 单词)], 下一页游标)
+        """
+        statement = (
+            select(LearningRecord, Word)
+            .join(Word, Word.id == LearningRecord.word_id)
+            .where(LearningRecord.user_id == user_id)
+        )
+        if mastery_level is not None:
+            statement = statement.where(LearningRecord.mastery_level == mastery_level)
+        if reviewed_after is not None:
+            statement = statement.where(LearningRecord.last_reviewed >= reviewed_after)
+        if reviewed_before is not None:
+            statement = statement.where(LearningRecord.last_reviewed < reviewed_before)
+        if after is not None:
+            statement = statement.where(LearningRecord.word_id > after)
+        statement = statement.order_by(LearningRecord.word_id).limit(limit + 1)
+
+        rows = list(self.session.exec(statement).all())
+        next_cursor = None
+        if len(rows) > limit:
+            rows = rows[:limit]
+            next_cursor = rows[-1][0].word_id
+        return rows, next_cursor
+
+    def get_record(self, user_id: int, word_id: int) -> Optional[LearningRecord]:
+        """获取用户某个单词的学习记录"""
+        statement = select(LearningRecord).where(
+            LearningRecord.user_id == user_id,
+            LearningRecord.word_id == word_id
+        )
+        return self.session.exec(statement).first()
+
+    def record_review(
+        self,
+        user_id: int,
+        word_id: int,
+        correct: bool,
+        reviewed_at: Optional[datetime] = None
+    ) -> LearningRecord:
+        """
+        记录一次复习结果并安排下次复习
+
+        Args:
+            user_id: 用户ID
+            word_id: 单词ID
+            correct: 是否回答正确
+            reviewed_at: 复习时间，默认当前时间
+
+        Returns:
+            LearningRecord: 更新后的学习记录
+        """
+        reviewed_at = reviewed_at or datetime.utcnow()
+        version = VersionService(self.session).bump(reviews_version(user_id))
+        record, self.unlocked_achievements = self._apply_review(
+            user_id, word_id, correct, reviewed_at, self.get_record(user_id, word_id), version
+        )
+        self.session.commit()
+        self.session.refresh(record)
+        self._after_progress_change(user_id)
+
+        logger.info(f"用户 {user_id} 复习单词 {word_id} - {'正确' if correct else '错误'}")
+        return record
+
+    def record_reviews(
+        self,
+        user_id: int,
+        results: Sequence[Tuple[int, bool]],
+        reviewed_at: Optional[datetime] = None
+    ) -> List[LearningRecord]:
+        """
+        在一个事务内批量记录复习结果（测验结束时一次写入）
+
+        Args:
+            user_id: 用户ID
+            results: [(单词ID, 是否正确)]，按作答顺序
+            reviewed_at: 复习时间，默认当前时间
+
+        Returns:
+            List[LearningRecord]: 更新后的学习记录
+        """
+        reviewed_at = reviewed_at or datetime.utcnow()
+        word_ids = list(dict.fromkeys(word_id for word_id, _ in results))
+        records = {
+            record.word_id: record
+            for record in self.session.exec(
+                select(LearningRecord).where(
+                    LearningRecord.user_id == user_id,
+                    LearningRecord.word_id.in_(word_ids)
+                )
+            ).all()
+        } if word_ids else {}
+
+        self.unlocked_achievements = []
+        version = VersionService(self.session).bump(reviews_version(user_id)) if results else 0
+        for word_id, correct in results:
+            records[word_id], unlocked = self._apply_review(
+                user_id, word_id, correct, reviewed_at, records.get(word_id), version
+            )
+            self.unlocked_achievements.extend(unlocked)
+        self.session.commit()
+        if results:
+            self._after_progress_change(user_id)
+            logger.info(f"用户 {user_id} 批量提交 {len(results)} 条复习结果")
+        return [records[word_id] for word_id in word_ids]
+
+    def _apply_review(
+        self,
+        user_id: int,
+        word_id: int,
+        correct: bool,
+        reviewed_at: datetime,
+        record: Optional[LearningRecord],
+        version: int
+    ) -> Tuple[LearningRecord, List[str]]:
+        """更新学习记录和成就计数器（不提交事务，version为本事务递增后的学习记录版本）"""
+        old_mastery = None if record is None else record.mastery_level
+        if record is None:
+            record = LearningRecord(user_id=user_id, word_id=word_id)
+
+        if correct:
+            record.correct_count += 1
+            record.mastery_level = min(record.mastery_level + 1, MASTERED_LEVEL)
+        else:
+            record.incorrect_count += 1
+            record.mastery_level = max(record.mastery_level - 1, 0)
+        record.last_reviewed = reviewed_at
+        record.next_review_at = next_review_time(record.mastery_level, reviewed_at)
+        record.updated_at = datetime.utcnow()
+        record.sync_version = version
+
+        self.session.add(record)
+        category = None
+        if old_mastery is None:
+            category = self.session.exec(select(Word.category).where(Word.id == word_id)).first()
+        unlocked = AchievementService(self.session).on_review(
+            user_id,
+            reviewed_at,
+            correct,
+            old_mastery,
+            record.mastery_level,
+            MASTERED_LEVEL,
+            category=category
+        )
+        return record, unlocked
+
+    def backfill_review_schedule(self, batch_size: int = 500, only_missing: bool = True) -> int:
+        """
+        按掌握程度和上次复习时间批量计算下次复习时间
+
+        Args:
+            batch_size: 每批处理的记录数
+            only_missing: 是否只处理还没有下次复习时间的记录
+
+        Returns:
+            int: 处理的记录数
+        """
+        processed = 0
+        last_id = 0
+        while True:
+            statement = select(
+                LearningRecord.id, LearningRecord.mastery_level, LearningRecord.last_reviewed
+            ).where(LearningRecord.id > last_id)
+            if only_missing:
+                statement = statement.where(LearningRecord.next_review_at.is_(None))
+            rows = self.session.exec(statement.order_by(LearningRecord.id).limit(batch_size)).all()
+            if not rows:
+                break
+
+            self.session.execute(update(LearningRecord), [
+                {"id": record_id, "next_review_at": next_review_time(mastery_level, last_reviewed)}
+                for record_id, mastery_level, last_reviewed in rows
+            ])
+            self.session.commit()
+
+            processed += len(rows)
+            last_id = rows[-1][0]
+            logger.info(f"复习计划回填进度: 已处理 {processed} 条学习记录，当前ID {last_id}")
+
+        return processed
+
+    def _after_progress_change(self, user_id: int) -> None:
+        """进度变化后旧的学习计划不再准确，在写入路径上重新生成"""
+        from .plan_service import PlanService
+        PlanService(self.session).refresh_plan(user_id)
@@ -0,0 +1,274 @@
+"""学习计划服务模块 - 按目标日期分配新词并模拟每日复习负荷"""
+
+import math
+from datetime import date, datetime, timedelta
+from functools import lru_cache
+from typing import List, Optional, Sequence
+
+import numpy as np
+from sqlalchemy import exists, func
+from sqlmodel import Session, select
+from loguru import logger
+
+from ..models.plan import StudyPlan
+from ..models.word import Word, LearningRecord
+from ..schemas.learning import LearningPlan, PlanDay, PlanRequest
+from ..core.config import config
+from .learning_service import REVIEW_INTERVALS_DAYS, MASTERED_LEVEL
+
+# 模拟时假设的单次复习答对概率
+RECALL_RATE = config.get('learning.plan.recall_rate', 0.85)
+# 计划最长天数
+MAX_PLAN_DAYS = config.get('learning.plan.max_days', 365)
+
+
+@lru_cache(maxsize=16)
+def review_kernels(horizon: int, recall_rate: float = RECALL_RATE) -> np.ndarray:
+    """
+    计算复习负荷核：kernels[level, k]为在第0天以掌握程度level到期的单词，
+    第k天的期望复习次数
+
+    按天推进各掌握程度上的概率质量：答对升级并按新等级间隔推迟，答错
+    降级（至少推迟1天）。整个计算对掌握程度维度向量化。
+
+    Args:
+        horizon: 模拟天数
+        recall_rate: 单次复习答对概率
+
+    Returns:
+        np.ndarray: 形状为(MASTERED_LEVEL+1, horizon)的负荷核
+    """
+    levels = MASTERED_LEVEL + 1
+    level_index = np.arange(levels)
+    intervals = np.array(
+        [REVIEW_INTERVALS_DAYS[min(level, len(REVIEW_INTERVALS_DAYS) - 1)] for level in range(levels)]
+    )
+    promoted = np.minimum(level_index + 1, MASTERED_LEVEL)
+    demoted = np.maximum(level_index - 1, 0)
+    promoted_delay = np.maximum(intervals[promoted], 1)
+    demoted_delay = np.maximum(intervals[demoted], 1)
+
+    kernels = np.zeros((levels, horizon))
+    for start in range(levels):
+        # due[level, day]：该天以该掌握程度到期的概率质量
+        due = np.zeros((levels, horizon))
+        due[start, 0] = 1.0
+        for day in range(horizon):
+            mass = due[:, day]
+            if not mass.any():
+                continue
+            kernels[start, day] = mass.sum()
+            success_day = day + promoted_delay
+            fail_day = day + demoted_delay
+            ok = success_day < horizon
+            np.add.at(due, (promoted[ok], success_day[ok]), mass[ok] * recall_rate)
+            ok = fail_day < horizon
+            np.add.at(due, (demoted[ok], fail_day[ok]), mass[ok] * (1 - recall_rate))
+    return kernels
+
+
+def spread_new_words(total: int, baseline: np.ndarray, kernel: np.ndarray) -> np.ndarray:
+    """
+    在计划期内分配新词，使每日总负荷（新词+复习）的峰值尽量低
+
+    对每日容量二分查找：给定容量时逐日贪心安排新词，每天能安排的数量
+    受之后所有天的剩余容量约束（剩余容量除以负荷核，一次向量运算），
+    新词带来的后续复习再整体叠加到之后的天数。
+
+    Args:
+        total: 新词总数
+        baseline: 已有学习记录带来的每日复习负荷
+        kernel: 新词从第0天开始的负荷核（含学习当天）
+
+    Returns:
+        np.ndarray: 每天安排的新词数
+    """
+    days = len(baseline)
+
+    def allocate(capacity: float) -> Optional[np.ndarray]:
+        load = baseline.copy()
+        new = np.zeros(days, dtype=int)
+        remaining = total
+        for day in range(days):
+            if not remaining:
+                break
+            window = kernel[:days - day]
+            mask = window > 0
+            headroom = (capacity - load[day:])[mask] / window[mask]
+            count = min(remaining, max(0, int(math.floor(headroom.min() + 1e-9))))
+            if count:
+                new[day] = count
+                load[day:] += count * kernel[:days - day]
+                remaining -= count
+        return new if remaining == 0 else None
+
+    low = max(math.ceil(total / days), 1)
+    high = math.ceil(total * kernel.max() + baseline.max(initial=0)) + 1
+    best = allocate(high)
+    while low < high:
+        middle = (low + high) // 2
+        plan = allocate(middle)
+        if plan is None:
+            low = middle + 1
+        else:
+            best, high = plan, middle
+    return best
+
+
+class PlanService:
+    """学习计划服务类"""
+
+    def __init__(self, session: Session):
+        self.session = session
+
+    def create_plan(self, user_id: int, request: PlanRequest, today: Optional[date] = None) -> LearningPlan:
+        """
+        生成学习计划，与计划参数一起保存
+
+        Args:
+            user_id: 用户ID
+            request: 计划参数
+            today: 计划起始日期，默认今天
+
+        Returns:
+            LearningPlan: 逐日学习计划
+
+        Raises:
+            ValueError: 目标日期早于今天或超出最长天数
+        """
+        plan = self._build_plan(user_id, request, today)
+        stored = self.session.get(StudyPlan, user_id) or StudyPlan(user_id=user_id, request="", plan="")
+        stored.request = request.model_dump_json()
+        self._store(stored, plan)
+        return plan
+
+    def get_plan(self, user_id: int, today: Optional[date] = None) -> Optional[LearningPlan]:
+        """
+        获取保存的学习计划（只读取，不重新模拟）
+
+        Args:
+            user_id: 用户ID
+            today: 当前日期，默认今天
+
+        Returns:
+            Optional[LearningPlan]: 学习计划，未生成过或目标日期已过时返回None
+        """
+        stored = self.session.get(StudyPlan, user_id)
+        if stored is None:
+            return None
+        plan = LearningPlan.model_validate_json(stored.plan)
+        if plan.target_date < (today or datetime.utcnow().date()):
+            return None
+        return plan
+
+    def refresh_plan(self, user_id: int, today: Optional[date] = None) -> Optional[LearningPlan]:
+        """
+        学习进度变化后按保存的参数从今天起重新生成计划
+
+        在复习写入提交后调用，没有生成过计划的用户不做任何模拟；目标
+        日期已过时保留旧计划，读取时返回None。
+
+        Args:
+            user_id: 用户ID
+            today: 重新生成时的起始日期，默认今天
+
+        Returns:
+            Optional[LearningPlan]: 重新生成的计划，未生成过或目标日期已过时返回None
+        """
+        stored = self.session.get(StudyPlan, user_id)
+        if stored is None:
+            return None
+        try:
+            plan = self._build_plan(user_id, PlanRequest.model_validate_json(stored.request), today)
+        except ValueError:
+            return None
+        self._store(stored, plan)
+        return plan
+
+    def _store(self, stored: StudyPlan, plan: LearningPlan) -> None:
+        """保存计划的模拟结果"""
+        stored.plan = plan.model_dump_json()
+        stored.created_at = plan.created_at
+        self.session.add(stored)
+        self.session.commit()
+
+    def _build_plan(self, user_id: int, request: PlanRequest, today: Optional[date] = None) -> LearningPlan:
+        """按参数模拟并生成逐日学习计划"""
+        today = today or datetime.utcnow().date()
+        days = (request.target_date - today).days + 1
+        if days < 1:
+            raise ValueError("目标日期不能早于今天")
+        if days > MAX_PLAN_DAYS:
+            raise ValueError(f"计划天数不能超过{MAX_PLAN_DAYS}天")
+
+        word_ids = self._pending_word_ids(user_id, request)
+        kernels = review_kernels(days)
+        baseline = self._baseline_load(user_id, today, kernels)
+        new_per_day = spread_new_words(len(word_ids), baseline, kernels[0]) if word_ids else np.zeros(days, dtype=int)
+        total_load = baseline + np.convolve(new_per_day, kernels[0])[:days]
+
+        plan_days: List[PlanDay] = []
+        offsets = np.concatenate(([0], np.cumsum(new_per_day)))
+        for day in range(days):
+            new_count = int(new_per_day[day])
+            plan_days.append(PlanDay(
+                date=today + timedelta(days=day),
+                new_word_ids=word_ids[offsets[day]:offsets[day + 1]],
+                new_count=new_count,
+                expected_reviews=round(float(total_load[day]) - new_count, 2),
+                expected_total=round(float(total_load[day]), 2)
+            ))
+
+        plan = LearningPlan(
+            target_date=request.target_date,
+            total_words=len(word_ids),
+            peak_load=round(float(total_load.max(initial=0)), 2),
+            days=plan_days,
+            created_at=datetime.utcnow()
+        )
+        logger.info(f"用户 {user_id} 生成学习计划: {len(word_ids)} 个单词，{days} 天")
+        return plan
+
+    def _pending_word_ids(self, user_id: int, request: PlanRequest) -> List[int]:
+        """获取计划内尚未学习的单词ID（按ID升序）"""
+        learned = exists().where(
+            LearningRecord.user_id == user_id,
+            LearningRecord.word_id == Word.id
+        )
+        statement = select(Word.id).where(~learned)
+        if request.word_ids is not None:
+            statement = statement.where(Word.id.in_(request.word_ids))
+        if request.category is not None:
+            statement = statement.where(Word.category == request.category)
+        if request.difficulty is not None:
+            statement = statement.where(Word.difficulty == request.difficulty)
+        return list(self.session.exec(statement.order_by(Word.id)).all())
+
+    def _baseline_load(self, user_id: int, today: date, kernels: np.ndarray) -> np.ndarray:
+        """
+        已有学习记录在计划期内的期望复习负荷
+
+        按(掌握程度, 到期日)聚合后，每个掌握程度的到期直方图与对应负荷核
+        卷积，无需逐条记录模拟。
+        """
+        levels, days = kernels.shape
+        statement = (
+            select(
+                LearningRecord.mastery_level,
+                func.date(LearningRecord.next_review_at),
+                func.count()
+            )
+            .where(LearningRecord.user_id == user_id)
+            .group_by(LearningRecord.mastery_level, func.date(LearningRecord.next_review_at))
+        )
+        due = np.zeros((levels, days))
+        for level, due_date, count in self.session.exec(statement).all():
+            offset = max(0, (date.fromisoformat(str(due_date)) - today).days)
+            if offset < days:
+                due[min(level, levels - 1), offset] += count
+
+        load = np.zeros(days)
+        for level in range(levels):
+            if due[level].any():
+                load += np.convolve(due[level], kernels[level])[:days]
+        return load
@@ -0,0 +1,125 @@
+"""测验服务模块 - 测验状态保存在服务端会话存储，结束时一次写库"""
+
+import secrets
+from datetime import datetime
+from typing import Optional
+from sqlmodel import Session
+from loguru import logger
+
+from ..core.config import config
+from ..core.exception_handlers import NotFoundException, ValidationException
+from ..schemas.quiz import QuizAnswerResult, QuizQuestion, QuizResult, QuizSession
+from ..utils.session_store import SessionStore, create_session_store
+from ..utils.text_utils import answers_match
+from .learning_service import LearningService
+from .study_session_service import StudySessionService
+
+QUIZ_TTL_SECONDS = config.get('quiz.ttl_seconds', 1800)
+
+# 测验会话存储，多worker部署时可在配置中换成共享后端
+quiz_store: SessionStore = create_session_store(
+    config.get('quiz.store.backend', 'memory'),
+    maxsize=config.get('quiz.store.maxsize', 10000),
+    ttl=QUIZ_TTL_SECONDS
+)
+
+
+class QuizService:
+    """测验服务类"""
+
+    def __init__(self, session: Session, store: SessionStore = quiz_store):
+        self.session = session
+        self.store = store
+
+    def start(self, user_id: int, n: int, now: Optional[datetime] = None) -> QuizSession:
+        """
+        开始测验：出题并把题目顺序和答案保存在服务端
+
+        Args:
+            user_id: 用户ID
+            n: 题目数量
+            now: 开始时间
+
+        Returns:
+            QuizSession: 不含答案的题目
+        """
+        now = now or datetime.utcnow()
+        batch = StudySessionService(self.session).next_batch(user_id, n, now)
+        quiz_id = secrets.token_urlsafe(16)
+        questions = [
+            {"word_id": card.word.id, "word": card.word.word, "options": card.options, "answer": card.word.translation}
+            for card in batch.cards
+        ]
+        self.store.set(quiz_id, {
+            "user_id": user_id,
+            "started_at": now.isoformat(),
+            "questions": questions,
+            "answers": {},
+        })
+        return QuizSession(
+            quiz_id=quiz_id,
+            questions=[
+                QuizQuestion(index=index, word_id=q["word_id"], word=q["word"], options=q["options"])
+                for index, q in enumerate(questions)
+            ],
+            started_at=now,
+            expires_in=QUIZ_TTL_SECONDS
+        )
+
+    def answer(self, user_id: int, quiz_id: str, index: int, answer: str) -> QuizAnswerResult:
+        """
+        校验一道题的答案（只更新会话存储，不写数据库）
+
+        Raises:
+            NotFoundException: 测验不存在、已过期或不属于该用户
+            ValidationException: 题号无效或重复作答
+        """
+        def mutate(state: dict) -> QuizAnswerResult:
+            if state["user_id"] != user_id:
+                raise NotFoundException("测验不存在或已过期")
+            if index >= len(state["questions"]):
+                raise ValidationException("题号无效")
+            # JSON序列化后dict键为字符串，这里统一用字符串
+            if str(index) in state["answers"]:
+                raise ValidationException("该题已作答")
+            expected = state["questions"][index]["answer"]
+            correct = answers_match(expected, answer)
+            state["answers"][str(index)] = correct
+            return QuizAnswerResult(index=index, correct=correct, expected=expected)
+
+        try:
+            return self.store.update(quiz_id, mutate)
+        except KeyError:
+            raise NotFoundException("测验不存在或已过期")
+
+    def finish(self, user_id: int, quiz_id: str, now: Optional[datetime] = None) -> QuizResult:
+        """
+        结束测验，把已作答题目的结果一次写入学习记录
+
+        Raises:
+            NotFoundException: 测验不存在、已过期或不属于该用户
+        """
+        now = now or datetime.utcnow()
+        state = self.store.get(quiz_id)
+        if state is None or state["user_id"] != user_id or not self.store.delete(quiz_id):
+            raise NotFoundException("测验不存在或已过期")
+
+        questions = state["questions"]
+        results = [
+            (questions[int(index)]["word_id"], correct)
+            for index, correct in sorted(state["answers"].items(), key=lambda item: int(item[0]))
+        ]
+        learning_service = LearningService(self.session)
+        learning_service.record_reviews(user_id, results, reviewed_at=now)
+
+        started_at = datetime.fromisoformat(state["started_at"])
+        result = QuizResult(
+            quiz_id=quiz_id,
+            total=len(questions),
+            answered=len(results),
+            correct=sum(1 for _, correct in results if correct),
+            duration_seconds=round((now - started_at).total_seconds(), 3),
+            unlocked_achievements=learning_service.unlocked_achievements
+        )
+        logger.info(f"用户 {user_id} 完成测验 {quiz_id}: {result.correct}/{result.total}")
+        return result
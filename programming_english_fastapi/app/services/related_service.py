@@ -0,0 +1,527 @@
+"""相关词服务模块 - 基于释义、示例和翻译的TF-IDF向量计算近邻"""
+
+import math
+import threading
+from array import array
+from collections import Counter
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+from sqlalchemy import delete, func, or_
+from sqlmodel import Session, select
+from loguru import logger
+
+from ..models.related import RelatedWord
+from ..models.word import Word
+from ..core.config import config
+from ..utils.text_utils import tokenize_terms
+from .version_service import VersionService, WORDS_VERSION
+
+TOP_K = config.get('related.top_k', 10)
+MAX_FEATURES = config.get('related.max_features', 4096)
+
+
+def word_document(word) -> str:
+    """拼接用于计算相关度的文本：释义、代码示例和中文翻译"""
+    return " ".join(filter(None, [word.definition, word.example, word.translation]))
+
+
+class TfidfModel:
+    """
+    单词TF-IDF向量模型（稀疏存储）
+
+    每行只保存非零项（列号和权重），并按列维护倒排表（行号和权重），
+    内存与非零项数成正比，而不是行数×词表大小。行向量已做L2归一化，
+    点积即余弦相似度；一行的相似度只需累加其检索词倒排表上的权重。
+    增量写入会扩充词表并更新文档频率，但不会重算已有行的IDF权重，
+    这部分漂移由定期的全量重建修正。
+    """
+
+    def __init__(self, word_ids: Sequence[int], documents: Sequence[str], max_features: int = MAX_FEATURES):
+        self.max_features = max_features
+        tokenized = [set(tokenize_terms(document)) for document in documents]
+
+        self.document_frequency = Counter()
+        for tokens in tokenized:
+            self.document_frequency.update(tokens)
+        self.total_documents = len(tokenized)
+        vocabulary = sorted(
+            self.document_frequency,
+            key=lambda token: (-self.document_frequency[token], token)
+        )[:max_features]
+        self.vocabulary: Dict[str, int] = {token: index for index, token in enumerate(vocabulary)}
+        self.idf: List[float] = [self._idf_of(token) for token in vocabulary]
+        # 每列的倒排表：包含该检索词的行号及其权重
+        self.postings: List[Tuple[array, array]] = [(array("i"), array("f")) for _ in vocabulary]
+
+        self.word_ids: List[Optional[int]] = list(word_ids)
+        self.row_of: Dict[int, int] = {word_id: row for row, word_id in enumerate(self.word_ids)}
+        self.row_tokens: List[frozenset] = [frozenset(tokens) for tokens in tokenized]
+        # 每行的非零项（列号, 权重）
+        self.rows: List[Tuple[np.ndarray, np.ndarray]] = []
+
+        # 每个单词当前近邻列表中的最低分及条目数，用于判断增量写入是否影响其列表；
+        # 按容量倍增预留，新增行时摊还O(1)次复制
+        self._kth_scores = np.zeros(len(self.word_ids), dtype=np.float32)
+        self._neighbour_counts = np.zeros(len(self.word_ids), dtype=np.int32)
+        for row, document in enumerate(documents):
+            self.rows.append(self.vectorize(document))
+            self._post(row)
+
+    @property
+    def kth_scores(self) -> np.ndarray:
+        return self._kth_scores[:len(self.word_ids)]
+
+    @property
+    def neighbour_counts(self) -> np.ndarray:
+        return self._neighbour_counts[:len(self.word_ids)]
+
+    @property
+    def nnz(self) -> int:
+        """非零项总数"""
+        return sum(columns.size for columns, _ in self.rows)
+
+    @staticmethod
+    def _smoothed_idf(total_documents: int, frequency: int) -> float:
+        """平滑IDF"""
+        return math.log((1 + total_documents) / (1 + frequency)) + 1
+
+    def _idf_of(self, token: str) -> float:
+        return self._smoothed_idf(self.total_documents, self.document_frequency[token])
+
+    def _reserve(self, rows: int) -> None:
+        """按需倍增近邻统计数组的容量"""
+        capacity = self._kth_scores.size
+        if rows <= capacity:
+            return
+        capacity = max(rows, capacity * 2)
+        used = len(self.word_ids)
+        kth_scores = np.zeros(capacity, dtype=np.float32)
+        kth_scores[:used] = self.kth_scores
+        neighbour_counts = np.zeros(capacity, dtype=np.int32)
+        neighbour_counts[:used] = self.neighbour_counts
+        self._kth_scores, self._neighbour_counts = kth_scores, neighbour_counts
+
+    def _post(self, row: int) -> None:
+        """把一行的非零项加入倒排表"""
+        columns, weights = self.rows[row]
+        for column, weight in zip(columns.tolist(), weights.tolist()):
+            rows, values = self.postings[column]
+            rows.append(row)
+            values.append(weight)
+
+    def _unpost(self, row: int) -> None:
+        """从倒排表中移除一行的非零项"""
+        columns, _ = self.rows[row]
+        for column in columns.tolist():
+            rows, values = self.postings[column]
+            index = rows.index(row)
+            del rows[index]
+            del values[index]
+
+    def _dot(self, columns: np.ndarray, weights: np.ndarray) -> np.ndarray:
+        """稀疏向量与全部行的点积（只访问向量非零列的倒排表）"""
+        scores = np.zeros(len(self.word_ids), dtype=np.float32)
+        for column, weight in zip(columns.tolist(), weights.tolist()):
+            rows, values = self.postings[column]
+            if rows:
+                scores[np.frombuffer(rows, dtype=np.intc)] += weight * np.frombuffer(values, dtype=np.float32)
+        return scores
+
+    def _new_tokens(self, tokens: frozenset) -> List[str]:
+        """写入时会加入词表的新检索词（不超过max_features）"""
+        return sorted(
+            token for token in tokens if token not in self.vocabulary
+        )[:max(self.max_features - len(self.vocabulary), 0)]
+
+    def _extend_vocabulary(self, tokens: frozenset) -> None:
+        """为新出现的检索词扩充词表"""
+        for token in self._new_tokens(tokens):
+            self.vocabulary[token] = len(self.idf)
+            self.idf.append(self._idf_of(token))
+            self.postings.append((array("i"), array("f")))
+
+    def _vectorize_tokens(self, tokens: List[str]) -> Tuple[np.ndarray, np.ndarray]:
+        """将检索词转换为归一化的稀疏TF-IDF向量（词频取对数）"""
+        columns, weights = [], []
+        for token, count in Counter(tokens).items():
+            column = self.vocabulary.get(token)
+            if column is not None:
+                columns.append(column)
+                weights.append((1 + math.log(count)) * self.idf[column])
+        columns = np.array(columns, dtype=np.int32)
+        weights = np.array(weights, dtype=np.float32)
+        norm = np.linalg.norm(weights)
+        return columns, (weights / norm if norm > 0 else weights)
+
+    def vectorize(self, document: str) -> Tuple[np.ndarray, np.ndarray]:
+        """将文本转换为归一化的稀疏TF-IDF向量（列号, 权重）"""
+        return self._vectorize_tokens(tokenize_terms(document))
+
+    def preview(self, word_id: int, document: str) -> np.ndarray:
+        """
+        计算单词按upsert写入后与各现有行的相似度，但不修改模型
+
+        新检索词只影响向量的模长（现有行在这些列上都为0），按写入后的
+        文档频率计算其IDF，结果与upsert后调用similarities一致。
+
+        Returns:
+            np.ndarray: 每个现有行的相似度（单词自身所在行置0）
+        """
+        tokens = tokenize_terms(document)
+        row = self.row_of.get(word_id)
+        previous = self.row_tokens[row] if row is not None else frozenset()
+        total_documents = self.total_documents + (1 if row is None else 0)
+        new_idf = {
+            token: self._smoothed_idf(total_documents, self.document_frequency[token] + (token not in previous))
+            for token in self._new_tokens(frozenset(tokens))
+        }
+
+        columns, weights = [], []
+        squared_norm = 0.0
+        for token, count in Counter(tokens).items():
+            column = self.vocabulary.get(token)
+            if column is not None:
+                columns.append(column)
+                weights.append((1 + math.log(count)) * self.idf[column])
+            elif token in new_idf:
+                squared_norm += ((1 + math.log(count)) * new_idf[token]) ** 2
+        weights = np.array(weights, dtype=np.float32)
+        norm = math.sqrt(float(weights @ weights) + squared_norm)
+        if norm == 0:
+            return np.zeros(len(self.word_ids), dtype=np.float32)
+
+        scores = self._dot(np.array(columns, dtype=np.int32), weights / norm)
+        if row is not None:
+            scores[row] = 0
+        return scores
+
+    def upsert(self, word_id: int, document: str) -> int:
+        """
+        写入或替换单词向量，同时更新文档频率并扩充词表
+
+        Returns:
+            int: 单词所在行
+        """
+        tokens = frozenset(tokenize_terms(document))
+        row = self.row_of.get(word_id)
+        if row is None:
+            self.total_documents += 1
+            self.document_frequency.update(tokens)
+        else:
+            self.document_frequency.subtract(self.row_tokens[row] - tokens)
+            self.document_frequency.update(tokens - self.row_tokens[row])
+        self._extend_vocabulary(tokens)
+
+        vector = self.vectorize(document)
+        if row is None:
+            row = len(self.word_ids)
+            self._reserve(row + 1)
+            self.word_ids.append(word_id)
+            self.row_of[word_id] = row
+            self.row_tokens.append(tokens)
+            self.rows.append(vector)
+            self.kth_scores[row] = 0
+            self.neighbour_counts[row] = 0
+        else:
+            self._unpost(row)
+            self.row_tokens[row] = tokens
+            self.rows[row] = vector
+        self._post(row)
+        return row
+
+    def remove(self, word_id: int) -> None:
+        """移除单词（清空向量，保留行位置避免整体移动）"""
+        row = self.row_of.pop(word_id, None)
+        if row is None:
+            return
+        self._unpost(row)
+        self.word_ids[row] = None
+        self.rows[row] = (np.zeros(0, dtype=np.int32), np.zeros(0, dtype=np.float32))
+        self.total_documents -= 1
+        self.document_frequency.subtract(self.row_tokens[row])
+        self.row_tokens[row] = frozenset()
+
+    def similarities(self, word_id: int) -> np.ndarray:
+        """计算单词与所有行的相似度（自身置0）"""
+        row = self.row_of[word_id]
+        scores = self._dot(*self.rows[row])
+        scores[row] = 0
+        return scores
+
+    def top_from_scores(self, scores: np.ndarray, k: int) -> List[Tuple[int, float]]:
+        """从一行相似度中选出得分最高且大于0的k个单词"""
+        if k <= 0 or scores.size == 0:
+            return []
+        if k < scores.size:
+            candidates = np.argpartition(-scores, k)[:k]
+        else:
+            candidates = np.arange(scores.size)
+        candidates = candidates[np.argsort(-scores[candidates], kind="stable")]
+        return [
+            (self.word_ids[row], float(scores[row]))
+            for row in candidates
+            if scores[row] > 0 and self.word_ids[row] is not None
+        ]
+
+    def all_top_k(self, k: int) -> Dict[int, List[Tuple[int, float]]]:
+        """逐行计算全部单词的近邻"""
+        return {
+            word_id: self.top_from_scores(self.similarities(word_id), k)
+            for word_id in self.word_ids
+            if word_id is not None
+        }
+
+    def set_neighbour_stats(self, word_id: int, neighbours: List[Tuple[int, float]]) -> None:
+        """记录单词近邻列表的最低分和条目数"""
+        row = self.row_of.get(word_id)
+        if row is None:
+            return
+        self.neighbour_counts[row] = len(neighbours)
+        self.kth_scores[row] = neighbours[-1][1] if neighbours else 0
+
+
+@dataclass
+class RelatedUpdate:
+    """事务内计算出的单词近邻变更，提交后再应用到进程内模型"""
+    word_id: int
+    document: str
+    neighbours: Dict[int, List[Tuple[int, float]]] = field(default_factory=dict)
+    # 进程内模型已过期时在事务内重新构建的模型及其版本，提交后替换进程内模型
+    model: Optional[TfidfModel] = None
+    model_version: Optional[int] = None
+
+
+class _ModelHolder:
+    """
+    进程内TF-IDF模型持有者
+
+    应用启动时构建，单词写入提交后增量维护。模型记录构建时的单词数据版本，
+    其他进程写入单词后版本不一致，下一次在本进程写入单词时重新构建。
+    """
+
+    def __init__(self):
+        self.model: Optional[TfidfModel] = None
+        self.version: Optional[int] = None
+        self.lock = threading.RLock()
+
+    def reset(self) -> None:
+        with self.lock:
+            self.model = None
+            self.version = None
+
+    def install(self, model: TfidfModel, version: Optional[int]) -> None:
+        """替换进程内模型"""
+        with self.lock:
+            self.model = model
+            self.version = version
+
+    def current(self, version: int) -> Optional[TfidfModel]:
+        """返回与给定数据版本一致的模型，过期或未构建时返回None"""
+        with self.lock:
+            return self.model if self.version == version else None
+
+    def on_word_saved(self, version: int, update: Optional[RelatedUpdate] = None) -> None:
+        """
+        单词写入提交后更新模型
+
+        Args:
+            version: 本次写入后的单词数据版本
+            update: 相关词变更，未修改相关字段时为None
+        """
+        with self.lock:
+            if update is not None and update.model is not None:
+                self.model, self.version = update.model, update.model_version
+            if self.model is None:
+                return
+            if update is not None:
+                self.model.upsert(update.word_id, update.document)
+                for word_id, neighbours in update.neighbours.items():
+                    self.model.set_neighbour_stats(word_id, neighbours)
+            self._advance(version)
+
+    def on_word_deleted(self, word_id: int, version: int) -> None:
+        """单词删除提交后从模型中移除"""
+        with self.lock:
+            if self.model is not None:
+                self.model.remove(word_id)
+                self._advance(version)
+
+    def _advance(self, version: int) -> None:
+        """只有中间没有其他进程的写入时，增量更新后的模型才与新版本一致"""
+        self.version = version if self.version == version - 1 else None
+
+
+related_model = _ModelHolder()
+
+
+class RelatedService:
+    """相关词服务类"""
+
+    def __init__(self, session: Session, top_k: int = TOP_K):
+        self.session = session
+        self.top_k = top_k
+
+    def get_related(self, word_id: int, n: int = TOP_K) -> List[Tuple[RelatedWord, Word]]:
+        """按相关度读取近邻单词（单次索引读取）"""
+        statement = (
+            select(RelatedWord, Word)
+            .join(Word, Word.id == RelatedWord.related_word_id)
+            .where(RelatedWord.word_id == word_id)
+            .order_by(RelatedWord.rank)
+            .limit(n)
+        )
+        return list(self.session.exec(statement).all())
+
+    def rebuild_all(self) -> int:
+        """
+        离线全量重建TF-IDF模型与近邻表
+
+        Returns:
+            int: 处理的单词数
+        """
+        version = VersionService(self.session).get(WORDS_VERSION)
+        model = self._build_model()
+        neighbours = model.all_top_k(self.top_k)
+
+        self.session.exec(delete(RelatedWord))
+        for word_id, items in neighbours.items():
+            self._add_rows(word_id, items)
+            model.set_neighbour_stats(word_id, items)
+        self.session.commit()
+
+        related_model.install(model, version)
+        logger.info(f"相关词全量重建完成，共 {len(neighbours)} 个单词")
+        return len(neighbours)
+
+    def sync_word(self, word: Word) -> RelatedUpdate:
+        """
+        增量更新单词及受其影响的近邻列表（不提交事务，也不修改进程内模型）
+
+        只计算该单词一行相似度，并仅改写新分数能进入前k名或原本包含
+        该单词的近邻列表。只有计算相似度时持有模型锁，数据库读写都在
+        锁外进行。进程内模型与数据库版本不一致（其他进程写入过单词）时，
+        在事务内重新构建一个模型使用。调用方提交后把返回值交给
+        related_model.on_word_saved，事务回滚时进程内模型保持不变。
+
+        Args:
+            word: 已分配ID的单词
+
+        Returns:
+            RelatedUpdate: 待提交后应用到模型的变更
+        """
+        document = word_document(word)
+        referrers = set(self.session.exec(
+            select(RelatedWord.word_id).where(RelatedWord.related_word_id == word.id)
+        ).all())
+        version = VersionService(self.session).get(WORDS_VERSION)
+        update = RelatedUpdate(word.id, document)
+        model = related_model.current(version)
+        if model is None:
+            model = update.model = self._load_model()
+            update.model_version = version
+
+        with related_model.lock:
+            scores = model.preview(word.id, document)
+            own = model.top_from_scores(scores, self.top_k)
+            enters = (scores > 0) & ((scores > model.kth_scores) | (model.neighbour_counts < self.top_k))
+            affected = {model.word_ids[row] for row in np.flatnonzero(enters)} | referrers
+            affected -= {None, word.id}
+            affected_scores = {
+                other: float(scores[model.row_of[other]]) if other in model.row_of else 0.0
+                for other in affected
+            }
+
+        self._replace_rows(word.id, own)
+        update.neighbours[word.id] = own
+        update.neighbours.update(self._update_reverse_neighbours(word.id, affected_scores))
+        return update
+
+    def delete_for_word(self, word_id: int) -> None:
+        """删除单词的近邻数据及其在其他列表中的条目（不提交事务，提交后调用related_model.on_word_deleted）"""
+        self.session.exec(delete(RelatedWord).where(
+            or_(RelatedWord.word_id == word_id, RelatedWord.related_word_id == word_id)
+        ))
+
+    def _update_reverse_neighbours(
+        self,
+        word_id: int,
+        affected_scores: Dict[int, float]
+    ) -> Dict[int, List[Tuple[int, float]]]:
+        """
+        将单词合并进受影响的其他单词的近邻列表，返回这些单词的新列表
+
+        Args:
+            word_id: 写入的单词ID
+            affected_scores: 受影响的单词及其与写入单词的新相似度
+        """
+        if not affected_scores:
+            return {}
+
+        current: Dict[int, List[Tuple[int, float]]] = {other: [] for other in affected_scores}
+        rows = self.session.exec(
+            select(RelatedWord.word_id, RelatedWord.related_word_id, RelatedWord.score)
+            .where(RelatedWord.word_id.in_(affected_scores))
+            .order_by(RelatedWord.word_id, RelatedWord.rank)
+        ).all()
+        for other, related_id, score in rows:
+            if related_id != word_id:
+                current[other].append((related_id, score))
+
+        self.session.exec(delete(RelatedWord).where(RelatedWord.word_id.in_(affected_scores)))
+        for other, items in current.items():
+            score = affected_scores[other]
+            if score > 0:
+                items.append((word_id, score))
+            items.sort(key=lambda item: -item[1])
+            current[other] = items[:self.top_k]
+            self._add_rows(other, current[other])
+        return current
+
+    def _replace_rows(self, word_id: int, items: List[Tuple[int, float]]) -> None:
+        """替换单词的近邻列表"""
+        self.session.exec(delete(RelatedWord).where(RelatedWord.word_id == word_id))
+        self._add_rows(word_id, items)
+
+    def _add_rows(self, word_id: int, items: List[Tuple[int, float]]) -> None:
+        """写入单词的近邻列表"""
+        self.session.add_all([
+            RelatedWord(word_id=word_id, rank=rank, related_word_id=related_id, score=score)
+            for rank, (related_id, score) in enumerate(items)
+        ])
+
+    def ensure_model(self) -> TfidfModel:
+        """
+        获取与数据库版本一致的进程内模型，未构建或已过期时重新加载
+
+        应用启动时已在线程中预先调用；加载在锁外读取数据库，完成后再替换模型。
+        """
+        version = VersionService(self.session).get(WORDS_VERSION)
+        model = related_model.current(version)
+        if model is None:
+            model = self._load_model()
+            related_model.install(model, version)
+        return model
+
+    def _load_model(self) -> TfidfModel:
+        """构建模型并从近邻表恢复每个单词近邻列表的最低分和条目数"""
+        model = self._build_model()
+        stats = self.session.exec(
+            select(RelatedWord.word_id, func.min(RelatedWord.score), func.count())
+            .group_by(RelatedWord.word_id)
+        ).all()
+        for word_id, kth_score, count in stats:
+            row = model.row_of.get(word_id)
+            if row is not None:
+                model.kth_scores[row] = kth_score
+                model.neighbour_counts[row] = count
+        logger.info(f"相关词模型加载完成，共 {len(model.row_of)} 个单词，{model.nnz} 个非零项")
+        return model
+
+    def _build_model(self) -> TfidfModel:
+        """从数据库加载全部单词并构建TF-IDF模型"""
+        rows = self.session.exec(
+            select(Word.id, Word.definition, Word.example, Word.translation).order_by(Word.id)
+        ).all()
+        return TfidfModel([row[0] for row in rows], [word_document(row) for row in rows])
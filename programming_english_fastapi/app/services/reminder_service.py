@@ -0,0 +1,168 @@
+"""复习提醒服务模块 - 按索引顺序扫描到期记录并写入提醒发件箱"""
+
+import time
+from collections import Counter
+from datetime import date, datetime, time as datetime_time, timedelta
+from typing import Callable, Dict, List, Optional
+from sqlalchemy import func, tuple_
+from sqlmodel import Session, select
+from loguru import logger
+
+from ..models.reminder import ReminderOutbox, ReminderJobRun, ReminderStatus
+from ..models.word import LearningRecord
+from ..core.config import config
+from ..core.metrics import metrics
+
+CHUNK_SIZE = config.get('reminders.chunk_size', 5000)
+THROUGHPUT_METRIC = "reminders.users_per_second"
+
+
+class ReminderJob:
+    """
+    复习提醒批处理
+
+    沿(next_review_at, user_id)索引做一次范围扫描，只读取索引列；每批
+    在内存中按用户聚合后累加到发件箱，并在同一事务内保存扫描游标，
+    中断后从游标继续，不会重复或遗漏计数。
+    """
+
+    def __init__(self, session: Session, chunk_size: int = CHUNK_SIZE):
+        self.session = session
+        self.chunk_size = chunk_size
+
+    def run(self, run_date: Optional[date] = None, max_chunks: Optional[int] = None) -> ReminderJobRun:
+        """
+        统计run_date当天（含逾期）有复习到期的用户并写入发件箱
+
+        Args:
+            run_date: 统计日期，默认今天
+            max_chunks: 最多处理的批数（用于分段执行），None表示处理到结束
+
+        Returns:
+            ReminderJobRun: 运行记录
+        """
+        run_date = run_date or datetime.utcnow().date()
+        due_before = datetime.combine(run_date + timedelta(days=1), datetime_time.min)
+        run = self.session.get(ReminderJobRun, run_date)
+        if run is None:
+            run = ReminderJobRun(run_date=run_date)
+            self.session.add(run)
+            self.session.commit()
+            self.session.refresh(run)
+        if run.completed:
+            return run
+        if run.cursor_record_id is not None:
+            logger.info(f"复习提醒任务 {run_date} 从游标继续，已扫描 {run.rows_scanned} 条")
+
+        chunks = 0
+        started = time.perf_counter()
+        while max_chunks is None or chunks < max_chunks:
+            statement = (
+                select(LearningRecord.next_review_at, LearningRecord.user_id, LearningRecord.id)
+                .where(LearningRecord.next_review_at < due_before)
+            )
+            if run.cursor_record_id is not None:
+                statement = statement.where(
+                    tuple_(LearningRecord.next_review_at, LearningRecord.user_id, LearningRecord.id)
+                    > tuple_(run.cursor_next_review_at, run.cursor_user_id, run.cursor_record_id)
+                )
+            statement = statement.order_by(
+                LearningRecord.next_review_at, LearningRecord.user_id, LearningRecord.id
+            ).limit(self.chunk_size)
+            rows = self.session.exec(statement).all()
+            if not rows:
+                run.completed = True
+                break
+
+            self._accumulate(run_date, Counter(user_id for _, user_id, _ in rows))
+            run.cursor_next_review_at, run.cursor_user_id, run.cursor_record_id = rows[-1]
+            run.rows_scanned += len(rows)
+            self._checkpoint(run, started)
+            started = time.perf_counter()
+            chunks += 1
+
+        run.users = self.session.exec(
+            select(func.count()).select_from(ReminderOutbox).where(ReminderOutbox.due_date == run_date)
+        ).one()
+        if run.completed:
+            run.finished_at = datetime.utcnow()
+        self._checkpoint(run, started)
+
+        if run.completed and run.elapsed_seconds > 0:
+            throughput = run.users / run.elapsed_seconds
+            metrics.observe(THROUGHPUT_METRIC, throughput)
+            logger.info(
+                f"复习提醒任务 {run_date} 完成: {run.users} 个用户，扫描 {run.rows_scanned} 条，"
+                f"{throughput:.0f} 用户/秒"
+            )
+        return run
+
+    def _accumulate(self, run_date: date, due_counts: Dict[int, int]) -> None:
+        """将一批的按用户计数累加到发件箱（不提交事务）"""
+        existing = {
+            item.user_id: item
+            for item in self.session.exec(
+                select(ReminderOutbox).where(
+                    ReminderOutbox.due_date == run_date,
+                    ReminderOutbox.user_id.in_(list(due_counts))
+                )
+            ).all()
+        }
+        for user_id, count in due_counts.items():
+            item = existing.get(user_id) or ReminderOutbox(user_id=user_id, due_date=run_date)
+            item.due_count += count
+            self.session.add(item)
+
+    def _checkpoint(self, run: ReminderJobRun, started: float) -> None:
+        """与本批发件箱写入一起提交游标"""
+        run.elapsed_seconds += time.perf_counter() - started
+        self.session.add(run)
+        self.session.commit()
+        self.session.refresh(run)
+
+
+def log_notifier(item: ReminderOutbox) -> None:
+    """本地通知器：只写日志，代替推送或邮件服务"""
+    logger.bind(type="reminder").info(f"提醒用户 {item.user_id}: 今天有 {item.due_count} 个单词待复习")
+
+
+class ReminderNotifier:
+    """
+    提醒发件箱消费者
+
+    只发送扫描已完成日期的提醒：扫描未完成时后续批次还会累加计数，
+    提前发送会让用户收到偏少的到期数，之后的累加也不会再发送。
+    """
+
+    def __init__(self, session: Session, send: Callable[[ReminderOutbox], None] = log_notifier):
+        self.session = session
+        self.send = send
+
+    def deliver(self, batch_size: int = 500) -> int:
+        """
+        发送扫描已完成日期的待发送提醒并标记为已发送
+
+        Args:
+            batch_size: 每批读取的提醒数
+
+        Returns:
+            int: 发送数量
+        """
+        sent = 0
+        while True:
+            items: List[ReminderOutbox] = list(self.session.exec(
+                select(ReminderOutbox)
+                .join(ReminderJobRun, ReminderJobRun.run_date == ReminderOutbox.due_date)
+                .where(ReminderOutbox.status == ReminderStatus.PENDING, ReminderJobRun.completed)
+                .order_by(ReminderOutbox.id)
+                .limit(batch_size)
+            ).all())
+            if not items:
+                return sent
+            for item in items:
+                self.send(item)
+                item.status = ReminderStatus.SENT
+                item.sent_at = datetime.utcnow()
+                self.session.add(item)
+            self.session.commit()
+            sent += len(items)
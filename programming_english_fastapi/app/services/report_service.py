@@ -0,0 +1,425 @@
+"""学习报告服务模块 - 报告渲染在进程池中执行，请求只负责提交和轮询"""
+
+import threading
+from concurrent.futures import CancelledError, Future, ProcessPoolExecutor
+from datetime import date, datetime, timedelta
+from pathlib import Path
+from typing import Any, Callable, Dict, Optional, Tuple
+from sqlalchemy import func, update
+from sqlmodel import Session, select
+from loguru import logger
+
+from ..models.achievement import UserAchievement
+from ..models.report import ReportJob, JobStatus
+from ..models.user import Principal
+from ..models.word import Word, LearningRecord
+from ..core.config import config
+from ..core.exception_handlers import BusinessException, NotFoundException
+from ..core.metrics import metrics
+from ..db.database import engine
+from ..utils.report_utils import render_report
+from .achievement_service import AchievementService, achievement_engine
+from .learning_service import MASTERED_LEVEL
+
+QUEUE_DEPTH_METRIC = "report_jobs.queue_depth"
+
+ACTIVE_STATUSES = (JobStatus.PENDING, JobStatus.RUNNING)
+
+
+def parse_month(month: str) -> date:
+    """
+    解析YYYY-MM格式的月份
+
+    Raises:
+        ValueError: 格式不正确
+    """
+    try:
+        return datetime.strptime(month, "%Y-%m").date()
+    except ValueError:
+        raise ValueError(f"月份格式应为YYYY-MM: {month}")
+
+
+class ReportJobManager:
+    """
+    报告任务进程池
+
+    进程池在第一次提交时创建；未完成任务数超过max_pending时拒绝提交。
+    渲染完成后由提交任务的进程在回调中把最终状态写入数据库，轮询请求
+    无论落在哪个worker上都只读数据库；渲染进程不接触数据库。
+    渲染期间由心跳线程每heartbeat_interval秒刷新本进程未完成任务的heartbeat_at，
+    其他worker据此判断任务是否随提交进程一起中断。
+    """
+
+    def __init__(
+        self,
+        max_workers: int,
+        max_pending: int,
+        output_dir: str,
+        session_factory: Optional[Callable[[], Session]] = None,
+        heartbeat_interval: float = 60
+    ):
+        self.max_workers = max_workers
+        self.max_pending = max_pending
+        self.output_dir = Path(output_dir)
+        self.session_factory = session_factory or (lambda: Session(engine))
+        self.heartbeat_interval = heartbeat_interval
+        self._executor: Optional[ProcessPoolExecutor] = None
+        self._futures: Dict[int, Future] = {}
+        self._heartbeat_stop: Optional[threading.Event] = None
+        self._lock = threading.Lock()
+
+    @property
+    def queue_depth(self) -> int:
+        """尚未完成的任务数"""
+        with self._lock:
+            return sum(1 for future in self._futures.values() if not future.done())
+
+    def submit(self, job_id: int, data: Dict[str, Any]) -> None:
+        """
+        提交渲染任务
+
+        Raises:
+            BusinessException: 队列已满
+        """
+        with self._lock:
+            pending = sum(1 for future in self._futures.values() if not future.done())
+            if pending >= self.max_pending:
+                raise BusinessException("报告任务队列已满，请稍后再试", 429)
+            if self._executor is None:
+                self._executor = ProcessPoolExecutor(max_workers=self.max_workers)
+            if self._heartbeat_stop is None:
+                self._heartbeat_stop = threading.Event()
+                threading.Thread(
+                    target=self._heartbeat_loop, args=(self._heartbeat_stop,),
+                    name="report-heartbeat", daemon=True
+                ).start()
+            output_path = self.output_dir / f"report_{job_id}.html"
+            future = self._executor.submit(render_report, data, str(output_path))
+            self._futures[job_id] = future
+        metrics.set_gauge(QUEUE_DEPTH_METRIC, self.queue_depth)
+        future.add_done_callback(lambda done: self._record(job_id, done))
+
+    def heartbeat(self) -> int:
+        """
+        刷新本进程未完成任务的心跳
+
+        Returns:
+            int: 刷新的任务数
+        """
+        with self._lock:
+            job_ids = [job_id for job_id, future in self._futures.items() if not future.done()]
+        if not job_ids:
+            return 0
+        with self.session_factory() as session:
+            result = session.exec(
+                update(ReportJob)
+                .where(ReportJob.id.in_(job_ids), ReportJob.status.in_(ACTIVE_STATUSES))
+                .values(heartbeat_at=datetime.utcnow())
+            )
+            session.commit()
+        return result.rowcount
+
+    def _heartbeat_loop(self, stop: threading.Event) -> None:
+        """心跳线程：直到进程池关闭"""
+        while not stop.wait(self.heartbeat_interval):
+            try:
+                self.heartbeat()
+            except Exception as e:
+                logger.error(f"刷新学习报告任务心跳失败: {e}")
+
+    def _record(self, job_id: int, future: Future) -> None:
+        """渲染结束后把最终状态写入数据库"""
+        status, file_path, error = JobStatus.SUCCEEDED, None, None
+        try:
+            file_path = future.result()
+        except CancelledError:
+            status, error = JobStatus.FAILED, "任务已取消，请重新提交"
+        except Exception as e:
+            logger.error(f"学习报告任务 {job_id} 失败: {e}")
+            status, error = JobStatus.FAILED, str(e)
+
+        try:
+            with self.session_factory() as session:
+                job = session.get(ReportJob, job_id)
+                if job is not None and job.status in ACTIVE_STATUSES:
+                    job.status = status
+                    job.file_path = file_path
+                    job.error = error
+                    job.finished_at = datetime.utcnow()
+                    session.add(job)
+                    session.commit()
+                elif file_path is not None:
+                    # 任务已被判定中断，没有人会再下载这份报告
+                    Path(file_path).unlink(missing_ok=True)
+        except Exception as e:
+            logger.error(f"回写学习报告任务 {job_id} 状态失败: {e}")
+        finally:
+            self.forget(job_id)
+            metrics.set_gauge(QUEUE_DEPTH_METRIC, self.queue_depth)
+
+    def get_future(self, job_id: int) -> Optional[Future]:
+        """获取任务的Future，进程重启后丢失的任务返回None"""
+        with self._lock:
+            return self._futures.get(job_id)
+
+    def forget(self, job_id: int) -> None:
+        """结果已回写数据库后释放Future"""
+        with self._lock:
+            self._futures.pop(job_id, None)
+
+    def shutdown(self, wait: bool = True) -> None:
+        """关闭进程池"""
+        with self._lock:
+            executor, self._executor = self._executor, None
+            stop, self._heartbeat_stop = self._heartbeat_stop, None
+            self._futures.clear()
+        if stop is not None:
+            stop.set()
+        if executor is not None:
+            executor.shutdown(wait=wait, cancel_futures=not wait)
+        metrics.set_gauge(QUEUE_DEPTH_METRIC, 0)
+
+
+report_jobs = ReportJobManager(
+    max_workers=config.get('reports.max_workers', 2),
+    max_pending=config.get('reports.max_pending', 32),
+    output_dir=config.get('reports.output_dir', 'reports'),
+    heartbeat_interval=config.get('reports.heartbeat_seconds', 60)
+)
+
+# 每个用户同时进行中的报告任务上限
+MAX_ACTIVE_PER_USER = config.get('reports.max_active_per_user', 1)
+# 超过该时间没有心跳（尚无心跳时按创建时间）的任务视为已中断（提交任务的进程崩溃或重启）
+STALE_AFTER = timedelta(seconds=config.get('reports.stale_after_seconds', 600))
+# 未下载的报告文件保留时间
+FILE_TTL = timedelta(seconds=config.get('reports.file_ttl_seconds', 86400))
+
+# 任务最近一次存活的时间
+LAST_SEEN = func.coalesce(ReportJob.heartbeat_at, ReportJob.created_at)
+
+
+class ReportService:
+    """学习报告服务类"""
+
+    def __init__(self, session: Session, manager: ReportJobManager = report_jobs):
+        self.session = session
+        self.manager = manager
+
+    def create_job(self, user: Principal, month: str) -> ReportJob:
+        """
+        创建报告任务：在请求内完成数据查询，渲染交给进程池
+        
+        数据查询成功后才创建任务记录，查询失败不会留下进行中的任务。
+
+        Args:
+            user: 当前用户
+            month: 报告月份，格式YYYY-MM
+
+        Returns:
+            ReportJob: 新建的任务
+
+        Raises:
+            ValueError: 月份格式不正确
+            BusinessException: 超过并发限制或队列已满
+        """
+        start = parse_month(month)
+        self.expire_stale_jobs(user.id)
+        self.purge_expired_files()
+        active = self.session.exec(
+            select(func.count()).select_from(ReportJob).where(
+                ReportJob.user_id == user.id,
+                ReportJob.status.in_(ACTIVE_STATUSES)
+            )
+        ).one()
+        if active >= MAX_ACTIVE_PER_USER:
+            raise BusinessException("已有进行中的报告任务，请等待完成后再提交", 429)
+
+        data = self.collect_report_data(user, start)
+        job = ReportJob(user_id=user.id, month=month)
+        self.session.add(job)
+        self.session.commit()
+        self.session.refresh(job)
+
+        try:
+            self.manager.submit(job.id, data)
+        except BusinessException as e:
+            self._finish(job, JobStatus.FAILED, error=e.message)
+            raise
+
+        logger.info(f"用户 {user.id} 提交 {month} 学习报告任务 {job.id}")
+        return job
+
+    def get_job(self, user_id: int, job_id: int) -> ReportJob:
+        """
+        获取任务状态（最终状态由提交任务的进程写入数据库）
+
+        超过STALE_AFTER没有心跳的进行中任务标记为已中断。
+
+        Raises:
+            NotFoundException: 任务不存在或不属于该用户
+        """
+        job = self.session.get(ReportJob, job_id, populate_existing=True)
+        if job is None or job.user_id != user_id:
+            raise NotFoundException("报告任务不存在")
+        last_seen = job.heartbeat_at or job.created_at
+        if job.status in ACTIVE_STATUSES and last_seen < datetime.utcnow() - STALE_AFTER:
+            self._finish(job, JobStatus.FAILED, error="任务已中断，请重新提交")
+        return job
+
+    def take_file(self, user_id: int, job_id: int) -> Tuple[Path, str]:
+        """
+        领取报告文件：清除任务上的文件路径，调用方发送文件后负责删除
+
+        Returns:
+            Tuple[Path, str]: HTML报告路径和报告月份
+
+        Raises:
+            NotFoundException: 任务不存在或不属于该用户
+            BusinessException: 任务未成功结束（409）或报告已下载、已过期（410）
+        """
+        job = self.get_job(user_id, job_id)
+        if job.status != JobStatus.SUCCEEDED:
+            raise BusinessException(f"报告尚未生成完成，当前状态: {job.status.value}", 409)
+        if job.file_path is None or not Path(job.file_path).exists():
+            raise BusinessException("报告已下载或已过期，请重新提交", 410)
+        path = Path(job.file_path)
+        job.file_path = None
+        self.session.add(job)
+        self.session.commit()
+        return path, job.month
+
+    def purge_expired_files(self) -> int:
+        """
+        删除超过FILE_TTL仍未下载的报告文件
+
+        Returns:
+            int: 删除的文件数
+        """
+        expired = self.session.exec(
+            select(ReportJob.id, ReportJob.file_path).where(
+                ReportJob.file_path.is_not(None),
+                ReportJob.finished_at < datetime.utcnow() - FILE_TTL
+            )
+        ).all()
+        if not expired:
+            return 0
+        for _, file_path in expired:
+            Path(file_path).unlink(missing_ok=True)
+        self.session.exec(
+            update(ReportJob)
+            .where(ReportJob.id.in_([job_id for job_id, _ in expired]))
+            .values(file_path=None)
+        )
+        self.session.commit()
+        return len(expired)
+
+    def expire_stale_jobs(self, user_id: int) -> int:
+        """
+        把用户超时没有心跳的进行中任务标记为已中断
+
+        Returns:
+            int: 标记的任务数
+        """
+        now = datetime.utcnow()
+        result = self.session.exec(
+            update(ReportJob)
+            .where(
+                ReportJob.user_id == user_id,
+                ReportJob.status.in_(ACTIVE_STATUSES),
+                LAST_SEEN < now - STALE_AFTER
+            )
+            .values(status=JobStatus.FAILED, error="任务已中断，请重新提交", finished_at=now)
+        )
+        self.session.commit()
+        return result.rowcount
+
+    def collect_report_data(self, user: Principal, start: date) -> Dict[str, Any]:
+        """
+        查询报告所需的统计数据（全部为聚合查询，结果只含基本类型以便跨进程传递）
+
+        Args:
+            user: 用户
+            start: 月份第一天
+
+        Returns:
+            Dict: 报告数据
+        """
+        end = date(start.year + start.month // 12, start.month % 12 + 1, 1)
+        month_start, month_end = datetime.combine(start, datetime.min.time()), datetime.combine(end, datetime.min.time())
+
+        new_words_by_day = [0] * (end - start).days
+        daily = self.session.exec(
+            select(func.date(LearningRecord.created_at), func.count())
+            .where(
+                LearningRecord.user_id == user.id,
+                LearningRecord.created_at >= month_start,
+                LearningRecord.created_at < month_end
+            )
+            .group_by(func.date(LearningRecord.created_at))
+        ).all()
+        for day, count in daily:
+            new_words_by_day[date.fromisoformat(str(day)).day - 1] = count
+
+        reviewed_words = self.session.exec(
+            select(func.count()).select_from(LearningRecord).where(
+                LearningRecord.user_id == user.id,
+                LearningRecord.last_reviewed >= month_start,
+                LearningRecord.last_reviewed < month_end
+            )
+        ).one()
+
+        mastery_distribution = [0] * (MASTERED_LEVEL + 1)
+        for level, count in self.session.exec(
+            select(LearningRecord.mastery_level, func.count())
+            .where(LearningRecord.user_id == user.id)
+            .group_by(LearningRecord.mastery_level)
+        ).all():
+            mastery_distribution[min(level, MASTERED_LEVEL)] = count
+
+        category_distribution = {
+            getattr(category, "value", category): count
+            for category, count in self.session.exec(
+                select(Word.category, func.count())
+                .join(LearningRecord, LearningRecord.word_id == Word.id)
+                .where(LearningRecord.user_id == user.id)
+                .group_by(Word.category)
+            ).all()
+        }
+
+        codes = self.session.exec(
+            select(UserAchievement.code).where(
+                UserAchievement.user_id == user.id,
+                UserAchievement.unlocked_at >= month_start,
+                UserAchievement.unlocked_at < month_end
+            )
+        ).all()
+
+        return {
+            "username": user.username,
+            "month": start.strftime("%Y-%m"),
+            "generated_at": datetime.utcnow().isoformat(timespec="seconds"),
+            "new_words_by_day": new_words_by_day,
+            "reviewed_words": reviewed_words,
+            "mastery_distribution": mastery_distribution,
+            "category_distribution": category_distribution,
+            "totals": AchievementService(self.session).get_counters(user.id),
+            "achievements": [
+                achievement_engine.rules[code].name for code in codes if code in achievement_engine.rules
+            ],
+        }
+
+    def _finish(
+        self,
+        job: ReportJob,
+        status: JobStatus,
+        file_path: Optional[str] = None,
+        error: Optional[str] = None
+    ) -> None:
+        """回写任务结果"""
+        job.status = status
+        job.file_path = file_path
+        job.error = error
+        job.finished_at = datetime.utcnow()
+        self.session.add(job)
+        self.session.commit()
+        self.session.refresh(job)
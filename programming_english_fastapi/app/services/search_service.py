@@ -0,0 +1,118 @@
+"""单词检索服务模块 - 基于进程内索引的模糊查找"""
+
+from typing import List, Optional, Tuple
+from sqlalchemy import func
+from sqlmodel import Session, select
+
+from ..models.word import Word, WordRead
+from ..core.config import config
+from ..utils.text_utils import phonetic_key, translation_query_tokens
+from .word_index import word_indexes
+from .word_service import WordService
+
+FUZZY_MAX_DISTANCE = config.get('search.fuzzy.max_distance', 2)
+LOOKUP_LIMIT = config.get('search.limit', 10)
+
+
+def default_max_distance(query: str) -> int:
+    """
+    按查询长度确定允许的编辑距离：短词要求更精确
+    
+    短词放宽到距离2时三元组过滤几乎失效（阈值降为1），候选会退化为全量扫描。
+    """
+    if len(query) <= 2:
+        return 0
+    if len(query) <= 7:
+        return min(1, FUZZY_MAX_DISTANCE)
+    return FUZZY_MAX_DISTANCE
+
+
+class SearchService:
+    """单词检索服务类"""
+
+    def __init__(self, session: Session):
+        self.session = session
+        self.word_service = WordService(session)
+
+    def lookup(
+        self,
+        query: str,
+        fuzzy: bool = False,
+        max_distance: Optional[int] = None,
+        limit: int = LOOKUP_LIMIT
+    ) -> List[Tuple[WordRead, int]]:
+        """
+        按单词文本查找，可容忍拼写错误
+
+        Args:
+            query: 查询词
+            fuzzy: 是否模糊查找
+            max_distance: 编辑距离上限，默认按查询长度确定
+            limit: 最多返回数量
+
+        Returns:
+            List[Tuple]: (单词, 编辑距离)，按距离排序
+        """
+        query = query.strip()
+        if not query:
+            return []
+        if not fuzzy:
+            word = self.word_service.get_word_by_word(query)
+            return [(WordRead.model_validate(word), 0)] if word else []
+
+        if max_distance is None:
+            max_distance = default_max_distance(query)
+        matches = word_indexes.ensure(self.session).term_index.search(query, max_distance, limit)
+        words = self.word_service.get_words_by_ids([word_id for word_id, _, _ in matches])
+        return [
+            (words[word_id], distance)
+            for word_id, _, distance in matches
+            if word_id in words
+        ]
+
+    def reverse_lookup(self, query: str, limit: int = LOOKUP_LIMIT) -> List[Tuple[WordRead, float]]:
+        """
+        按中文释义反查英文单词
+
+        Args:
+            query: 中文查询词，如“变量”
+            limit: 最多返回数量
+
+        Returns:
+            List[Tuple]: (单词, 得分)，按相关度排序
+        """
+        query = query.strip()
+        tokens = translation_query_tokens(query)
+        if not tokens:
+            return []
+
+        matches = word_indexes.ensure(self.session).translation_index.search(query, tokens, limit)
+        words = self.word_service.get_words_by_ids([word_id for word_id, _, _ in matches])
+        return [
+            (words[word_id], score)
+            for word_id, _, score in matches
+            if word_id in words
+        ]
+
+    def sounds_like(self, query: str, limit: int = LOOKUP_LIMIT) -> List[Word]:
+        """
+        查找发音相近的单词（语音键索引等值查询）
+
+        Args:
+            query: 听到的拼写，如funkshun
+            limit: 最多返回数量
+
+        Returns:
+            List[Word]: 语音键相同的单词，短词在前
+        """
+        key = phonetic_key(query)
+        if not key:
+            return []
+
+        statement = (
+            select(Word)
+            .where(Word.phonetic_key == key)
+            .order_by(func.length(Word.word), Word.word)
+            .limit(limit)
+        )
+        return list(self.session.exec(statement).all())
@@ -0,0 +1,120 @@
+"""学习会话服务模块"""
+
+import random
+from datetime import datetime
+from typing import List, Optional, Sequence
+from sqlalchemy import case, exists, func
+from sqlmodel import Session, select
+
+from ..models.word import Word, LearningRecord, LearningRecordRead
+from ..schemas.learning import StudyCard, StudyProgress, StudySessionBatch
+from ..services.word_service import WordService
+from ..services.learning_service import MASTERED_LEVEL
+from ..core.config import config
+
+OPTION_COUNT = config.get('learning.option_count', 4)
+
+
+def build_options(
+    correct: str,
+    pool: Sequence[str],
+    count: int = OPTION_COUNT,
+    rng: Optional[random.Random] = None
+) -> List[str]:
+    """
+    从释义池中抽取干扰项并与正确答案打乱组成选项
+
+    Args:
+        correct: 正确释义
+        pool: 释义池
+        count: 选项总数
+        rng: 随机数生成器
+
+    Returns:
+        List[str]: 打乱后的选项，池子不足时选项会少于count
+    """
+    rng = rng or random
+    candidates = [translation for translation in pool if translation != correct]
+    options = rng.sample(candidates, min(count - 1, len(candidates)))
+    options.append(correct)
+    rng.shuffle(options)
+    return options
+
+
+class StudySessionService:
+    """学习会话服务类"""
+
+    def __init__(self, session: Session):
+        self.session = session
+        self.word_service = WordService(session)
+
+    def next_batch(self, user_id: int, n: int, now: Optional[datetime] = None) -> StudySessionBatch:
+        """
+        一次性组装下一批学习卡片（到期复习优先，不足时补充新词）
+
+        单词详情与释义池来自进程内缓存，数据库只执行固定数量的批量查询，
+        与卡片数量无关。
+
+        Args:
+            user_id: 用户ID
+            n: 卡片数量
+            now: 当前时间，默认utcnow
+
+        Returns:
+            StudySessionBatch: 卡片列表及学习进度
+        """
+        now = now or datetime.utcnow()
+
+        due_records = self._get_due_records(user_id, n, now)
+        records_by_word = {record.word_id: record for record in due_records}
+        word_ids = list(records_by_word)
+        if len(word_ids) < n:
+            word_ids.extend(self._get_new_word_ids(user_id, n - len(word_ids)))
+
+        words = self.word_service.get_words_by_ids(word_ids)
+
+        cards = []
+        for word_id in word_ids:
+            word = words.get(word_id)
+            if word is None:
+                continue
+            record = records_by_word.get(word_id)
+            pool = self.word_service.get_translation_pool(word.category)
+            cards.append(StudyCard(
+                word=word,
+                options=build_options(word.translation, pool),
+                record=LearningRecordRead.model_validate(record) if record else None,
+                is_new=record is None
+            ))
+
+        return StudySessionBatch(cards=cards, progress=self.get_progress(user_id, now))
+
+    def get_progress(self, user_id: int, now: Optional[datetime] = None) -> StudyProgress:
+        """单次聚合查询统计已学、已掌握和到期数量"""
+        now = now or datetime.utcnow()
+        statement = select(
+            func.count(LearningRecord.id),
+            func.sum(case((LearningRecord.mastery_level >= MASTERED_LEVEL, 1), else_=0)),
+            func.sum(case((LearningRecord.next_review_at <= now, 1), else_=0))
+        ).where(LearningRecord.user_id == user_id)
+        learned, mastered, due = self.session.exec(statement).one()
+        return StudyProgress(learned=learned or 0, mastered=mastered or 0, due=due or 0)
+
+    def _get_due_records(self, user_id: int, limit: int, now: datetime) -> List[LearningRecord]:
+        """按到期时间获取待复习的学习记录"""
+        statement = (
+            select(LearningRecord)
+            .where(LearningRecord.user_id == user_id, LearningRecord.next_review_at <= now)
+            .order_by(LearningRecord.next_review_at)
+            .limit(limit)
+        )
+        return list(self.session.exec(statement).all())
+
+    def _get_new_word_ids(self, user_id: int, limit: int) -> List[int]:
+        """获取用户尚未学习过的单词ID"""
+        learned = exists().where(
+            LearningRecord.user_id == user_id,
+            LearningRecord.word_id == Word.id
+        )
+        statement = select(Word.id).where(~learned).order_by(Word.id).limit(limit)
+        return list(self.session.exec(statement).all())
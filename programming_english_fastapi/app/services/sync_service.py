@@ -0,0 +1,198 @@
+"""离线同步服务模块 - 多设备复习记录的无冲突合并"""
+
+from datetime import datetime
+from typing import Dict, List, Optional, Tuple
+from sqlmodel import Session, select
+from loguru import logger
+
+from ..models.sync import DeviceReviewCounter
+from ..models.word import Word, LearningRecord, LearningRecordRead
+from ..schemas.sync import SyncReviewEntry, SyncReviewsRequest, SyncReviewsResponse
+from .achievement_service import AchievementService
+from .learning_service import MASTERED_LEVEL, next_review_time
+from .plan_service import PlanService
+from .version_service import VersionService, reviews_version
+
+
+class SyncService:
+    """
+    离线同步服务类
+
+    合并规则与到达顺序无关：
+    - 答对/答错次数是按设备的G-Counter，服务端只累加每台设备新增的部分；
+    - last_reviewed取最大值；
+    - 掌握程度是以last_reviewed为时间戳的LWW寄存器，时间相同时取较大值。
+
+    新增的复习次数按last_reviewed顺序计入成就计数器。
+
+    增量游标是用户学习记录版本（reviews:{user_id}）：每个写入学习记录的事务
+    递增一次，版本行锁持有到提交，已提交的版本总是连续的前缀，读取时尚未
+    提交的写入只会得到更大的版本，不会被游标跳过。
+    """
+
+    def __init__(self, session: Session):
+        self.session = session
+
+    def sync_reviews(self, user_id: int, request: SyncReviewsRequest) -> SyncReviewsResponse:
+        """
+        在一个事务内合并一台设备上传的复习记录
+
+        Args:
+            user_id: 用户ID
+            request: 设备ID、上次同步游标和各单词的累计状态
+
+        Returns:
+            SyncReviewsResponse: 新游标（返回记录中的最大版本）、游标之后变化的学习记录和被拒绝的单词ID
+        """
+        now = datetime.utcnow()
+        entries = self._collapse(request.entries)
+        word_ids = list(entries)
+
+        existing_words = set()
+        counters: Dict[int, DeviceReviewCounter] = {}
+        records: Dict[int, LearningRecord] = {}
+        if word_ids:
+            existing_words = set(self.session.exec(select(Word.id).where(Word.id.in_(word_ids))).all())
+            counters = {
+                counter.word_id: counter
+                for counter in self.session.exec(
+                    select(DeviceReviewCounter).where(
+                        DeviceReviewCounter.user_id == user_id,
+                        DeviceReviewCounter.device_id == request.device_id,
+                        DeviceReviewCounter.word_id.in_(word_ids)
+                    )
+                ).all()
+            }
+            records = {
+                record.word_id: record
+                for record in self.session.exec(
+                    select(LearningRecord).where(
+                        LearningRecord.user_id == user_id,
+                        LearningRecord.word_id.in_(word_ids)
+                    )
+                ).all()
+            }
+
+        rejected = [word_id for word_id in word_ids if word_id not in existing_words]
+        changed: List[LearningRecord] = []
+        # (复习时间, 单词ID, 新增复习次数, 新增答对次数, 合并前掌握程度, 合并后掌握程度)
+        reviews: List[Tuple[datetime, int, int, int, Optional[int], int]] = []
+        for word_id, entry in entries.items():
+            if word_id not in existing_words:
+                continue
+            counter = counters.get(word_id) or DeviceReviewCounter(
+                user_id=user_id, device_id=request.device_id, word_id=word_id,
+                correct_count=0, incorrect_count=0, last_reviewed=entry.last_reviewed
+            )
+            record = records.get(word_id) or LearningRecord(
+                user_id=user_id, word_id=word_id, last_reviewed=entry.last_reviewed
+            )
+            is_new = word_id not in records
+            old_mastery = None if is_new else record.mastery_level
+            old_correct, old_incorrect = counter.correct_count, counter.incorrect_count
+            if self._merge(counter, record, entry, is_new=is_new):
+                record.updated_at = now
+                self.session.add(counter)
+                self.session.add(record)
+                changed.append(record)
+                correct = counter.correct_count - old_correct
+                total = correct + counter.incorrect_count - old_incorrect
+                if total or is_new or record.mastery_level != old_mastery:
+                    reviews.append((entry.last_reviewed, word_id, total, correct, old_mastery, record.mastery_level))
+
+        if changed:
+            version = VersionService(self.session).bump(reviews_version(user_id))
+            for record in changed:
+                record.sync_version = version
+        unlocked = self._record_achievements(user_id, reviews)
+        self.session.commit()
+        if changed:
+            PlanService(self.session).refresh_plan(user_id)
+            logger.info(f"用户 {user_id} 设备 {request.device_id} 同步 {len(changed)} 条复习记录")
+
+        records = self._changed_since(user_id, request.since)
+        return SyncReviewsResponse(
+            cursor=records[-1].sync_version if records else request.since or 0,
+            records=[LearningRecordRead.model_validate(record) for record in records],
+            rejected_word_ids=rejected,
+            unlocked_achievements=unlocked
+        )
+
+    def _record_achievements(
+        self,
+        user_id: int,
+        reviews: List[Tuple[datetime, int, int, int, Optional[int], int]]
+    ) -> List[str]:
+        """按复习时间顺序把合并后的新增复习计入成就计数器（不提交事务）"""
+        if not reviews:
+            return []
+        new_word_ids = [word_id for _, word_id, _, _, old_mastery, _ in reviews if old_mastery is None]
+        categories = dict(self.session.exec(
+            select(Word.id, Word.category).where(Word.id.in_(new_word_ids))
+        ).all()) if new_word_ids else {}
+
+        achievements = AchievementService(self.session)
+        unlocked: List[str] = []
+        for reviewed_at, word_id, total, correct, old_mastery, new_mastery in sorted(reviews):
+            unlocked.extend(achievements.on_reviews(
+                user_id, reviewed_at, total, correct, old_mastery, new_mastery, MASTERED_LEVEL,
+                category=categories.get(word_id)
+            ))
+        return unlocked
+
+    @staticmethod
+    def _collapse(entries: List[SyncReviewEntry]) -> Dict[int, SyncReviewEntry]:
+        """同一批次中重复的单词先按相同规则合并"""
+        collapsed: Dict[int, SyncReviewEntry] = {}
+        for entry in entries:
+            current = collapsed.get(entry.word_id)
+            if current is None:
+                collapsed[entry.word_id] = entry
+                continue
+            latest = max(current, entry, key=lambda item: (item.last_reviewed, item.mastery_level))
+            collapsed[entry.word_id] = SyncReviewEntry(
+                word_id=entry.word_id,
+                correct_count=max(current.correct_count, entry.correct_count),
+                incorrect_count=max(current.incorrect_count, entry.incorrect_count),
+                last_reviewed=latest.last_reviewed,
+                mastery_level=latest.mastery_level
+            )
+        return collapsed
+
+    @staticmethod
+    def _merge(
+        counter: DeviceReviewCounter,
+        record: LearningRecord,
+        entry: SyncReviewEntry,
+        is_new: bool
+    ) -> bool:
+        """
+        合并一个单词的设备状态
+
+        Returns:
+            bool: 学习记录或设备计数是否发生变化
+        """
+        correct_delta = max(0, entry.correct_count - counter.correct_count)
+        incorrect_delta = max(0, entry.incorrect_count - counter.incorrect_count)
+        counter.correct_count += correct_delta
+        counter.incorrect_count += incorrect_delta
+        record.correct_count = (record.correct_count or 0) + correct_delta
+        record.incorrect_count = (record.incorrect_count or 0) + incorrect_delta
+
+        newer = is_new or (entry.last_reviewed, entry.mastery_level) > (record.last_reviewed, record.mastery_level)
+        if newer:
+            record.last_reviewed = entry.last_reviewed
+            record.mastery_level = entry.mastery_level
+            record.next_review_at = next_review_time(entry.mastery_level, entry.last_reviewed)
+        counter_moved = entry.last_reviewed > counter.last_reviewed
+        if counter_moved:
+            counter.last_reviewed = entry.last_reviewed
+        return bool(correct_delta or incorrect_delta or newer or counter_moved)
+
+    def _changed_since(self, user_id: int, since: Optional[int]) -> List[LearningRecord]:
+        """获取游标版本之后变化的学习记录（按版本升序）"""
+        statement = select(LearningRecord).where(LearningRecord.user_id == user_id)
+        if since is not None:
+            statement = statement.where(LearningRecord.sync_version > since)
+        statement = statement.order_by(LearningRecord.sync_version, LearningRecord.word_id)
+        return list(self.session.exec(statement).all())
@@ -0,0 +1,102 @@
+"""标签服务模块"""
+
+from typing import Dict, Iterable, List
+from sqlalchemy import delete, func
+from sqlmodel import Session, select
+
+from ..models.tag import Tag, WordTag
+
+
+def normalize_tags(names: Iterable[str]) -> List[str]:
+    """
+    归一化标签名：去空白、转小写、去重并保持顺序
+
+    Args:
+        names: 原始标签名
+
+    Returns:
+        List[str]: 归一化后的标签名
+    """
+    return list(dict.fromkeys(
+        name.strip().lower() for name in names if name and name.strip()
+    ))
+
+
+class TagService:
+    """标签服务类"""
+
+    def __init__(self, session: Session):
+        self.session = session
+
+    def get_or_create_tags(self, names: Iterable[str]) -> List[Tag]:
+        """
+        按名称批量获取标签，不存在的自动创建（不提交事务）
+
+        Args:
+            names: 标签名
+
+        Returns:
+            List[Tag]: 标签列表
+        """
+        names = normalize_tags(names)
+        if not names:
+            return []
+
+        existing = {
+            tag.name: tag
+            for tag in self.session.exec(select(Tag).where(Tag.name.in_(names))).all()
+        }
+        missing = [Tag(name=name) for name in names if name not in existing]
+        if missing:
+            self.session.add_all(missing)
+            self.session.flush()
+            existing.update((tag.name, tag) for tag in missing)
+        return [existing[name] for name in names]
+
+    def set_word_tags(self, word_id: int, names: Iterable[str]) -> List[str]:
+        """
+        替换单词的全部标签（不提交事务，由调用方统一提交）
+
+        Args:
+            word_id: 单词ID
+            names: 标签名
+
+        Returns:
+            List[str]: 归一化后的标签名
+        """
+        tags = self.get_or_create_tags(names)
+        self.delete_for_word(word_id)
+        self.session.add_all([WordTag(word_id=word_id, tag_id=tag.id) for tag in tags])
+        return [tag.name for tag in tags]
+
+    def delete_for_word(self, word_id: int) -> None:
+        """删除单词的全部标签关联（不提交事务）"""
+        self.session.exec(delete(WordTag).where(WordTag.word_id == word_id))
+
+    def get_word_tags(self, word_id: int) -> List[str]:
+        """获取单词的标签名"""
+        statement = (
+            select(Tag.name)
+            .join(WordTag, WordTag.tag_id == Tag.id)
+            .where(WordTag.word_id == word_id)
+            .order_by(Tag.name)
+        )
+        return list(self.session.exec(statement).all())
+
+    def get_all_word_tags(self) -> Dict[int, List[str]]:
+        """获取全部单词的标签名（用于构建位图索引）"""
+        statement = select(WordTag.word_id, Tag.name).join(Tag, Tag.id == WordTag.tag_id)
+        word_tags: Dict[int, List[str]] = {}
+        for word_id, name in self.session.exec(statement).all():
+            word_tags.setdefault(word_id, []).append(name)
+        return word_tags
+
+    def list_tags(self) -> List[tuple]:
+        """获取全部标签及其单词数"""
+        statement = (
+            select(Tag.name, func.count(WordTag.word_id))
+            .join(WordTag, WordTag.tag_id == Tag.id, isouter=True)
+            .group_by(Tag.id)
+            .order_by(Tag.name)
+        )
+        return list(self.session.exec(statement).all())
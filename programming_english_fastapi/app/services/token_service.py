@@ -0,0 +1,214 @@
+"""令牌服务模块 - 刷新令牌轮换与按jti撤销"""
+
+import threading
+import time
+from datetime import datetime
+from typing import Any, Dict, Optional
+
+from sqlalchemy import delete
+from sqlmodel import Session, select
+from loguru import logger
+
+from ..core.config import ACCESS_TOKEN_EXPIRE_MINUTES, config
+from ..db.database import insert_ignore
+from ..core.exception_handlers import AuthenticationException
+from ..core.metrics import metrics
+from ..models.token import RevokedToken
+from ..utils.cache_utils import BloomFilter
+from ..utils.jwt_utils import create_refresh_token, create_user_token, get_refresh_claims
+from .user_service import UserService
+
+BLOOM_NEGATIVE_METRIC = "revocation.bloom_negative"
+BLOOM_POSITIVE_METRIC = "revocation.bloom_positive"
+REVOKED_SIZE_METRIC = "revocation.size"
+
+
+class RevocationList:
+    """
+    已撤销jti的进程内布隆过滤器，挡在撤销表之前
+
+    绝大多数令牌未被撤销，过滤器判定不存在时无需访问数据库；判定可能
+    存在时再查撤销表确认。本进程撤销的jti立即加入过滤器，其他进程的撤销
+    在下一次重建（启动时及每rebuild_interval秒）后生效。
+    """
+
+    def __init__(self, capacity: int = 100000, error_rate: float = 0.001, rebuild_interval: float = 60.0):
+        self.capacity = capacity
+        self.error_rate = error_rate
+        self.rebuild_interval = rebuild_interval
+        self._filter = BloomFilter(capacity, error_rate)
+        self._next_rebuild = 0.0
+        self._recent: set = set()
+        self._lock = threading.Lock()
+
+    def __contains__(self, jti: str) -> bool:
+        return jti in self._filter
+
+    def add(self, jti: str) -> None:
+        """加入本进程刚撤销的jti"""
+        with self._lock:
+            self._recent.add(jti)
+        self._filter.add(jti)
+
+    def rebuild(self, session: Session) -> int:
+        """
+        从撤销表重建过滤器（只包含未过期的条目）
+
+        Args:
+            session: 数据库会话
+
+        Returns:
+            int: 过滤器中的jti数量
+        """
+        with self._lock:
+            # 查询开始前撤销的jti已提交到表中；查询期间撤销的记录在_recent中，交换前补入
+            self._recent = set()
+        jtis = session.exec(
+            select(RevokedToken.jti).where(RevokedToken.expires_at > datetime.utcnow())
+        ).all()
+        bloom = BloomFilter(max(self.capacity, 2 * len(jtis)), self.error_rate)
+        for jti in jtis:
+            bloom.add(jti)
+        with self._lock:
+            for jti in self._recent:
+                bloom.add(jti)
+            self._filter = bloom
+            self._next_rebuild = time.monotonic() + self.rebuild_interval
+        metrics.set_gauge(REVOKED_SIZE_METRIC, len(jtis))
+        return len(jtis)
+
+    def maybe_rebuild(self, session: Session) -> None:
+        """到达重建间隔时重建过滤器"""
+        if time.monotonic() < self._next_rebuild:
+            return
+        with self._lock:
+            if time.monotonic() < self._next_rebuild:
+                return
+            # 先推迟下一次重建，避免并发请求同时重建
+            self._next_rebuild = time.monotonic() + self.rebuild_interval
+        self.rebuild(session)
+
+    def reset(self) -> None:
+        """清空过滤器，下一次检查时重建"""
+        with self._lock:
+            self._filter = BloomFilter(self.capacity, self.error_rate)
+            self._recent = set()
+            self._next_rebuild = 0.0
+
+
+revocation_list = RevocationList(
+    capacity=config.get('security.revocation.capacity', 100000),
+    error_rate=config.get('security.revocation.error_rate', 0.001),
+    rebuild_interval=config.get('security.revocation.rebuild_interval_seconds', 60)
+)
+
+
+class TokenService:
+    """令牌服务类"""
+
+    def __init__(self, session: Session, revocations: RevocationList = revocation_list):
+        self.session = session
+        self.revocations = revocations
+
+    def issue_tokens(self, user_id: int, username: str) -> Dict[str, Any]:
+        """
+        签发访问令牌和刷新令牌
+
+        Args:
+            user_id: 用户ID
+            username: 用户名
+
+        Returns:
+            Dict: access_token、refresh_token、token_type和expires_in（秒）
+        """
+        return {
+            "access_token": create_user_token(user_id, username),
+            "refresh_token": create_refresh_token(user_id, username),
+            "token_type": "bearer",
+            "expires_in": ACCESS_TOKEN_EXPIRE_MINUTES * 60
+        }
+
+    def is_revoked(self, jti: str) -> bool:
+        """
+        检查jti是否已撤销，布隆过滤器判定不存在时不访问数据库
+
+        Args:
+            jti: 令牌ID
+
+        Returns:
+            bool: 是否已撤销
+        """
+        self.revocations.maybe_rebuild(self.session)
+        if jti not in self.revocations:
+            metrics.inc(BLOOM_NEGATIVE_METRIC)
+            return False
+        metrics.inc(BLOOM_POSITIVE_METRIC)
+        return self.session.get(RevokedToken, jti) is not None
+
+    def revoke(self, claims: Dict[str, Any]) -> bool:
+        """
+        按jti撤销令牌
+
+        依赖撤销表的主键约束（按方言忽略冲突的INSERT），同一jti
+        只能成功撤销一次，并发轮换同一刷新令牌时只有一个请求成功。
+
+        Args:
+            claims: 已验证的令牌声明，需包含jti和exp
+
+        Returns:
+            bool: 本次是否新撤销（已撤销过返回False）
+        """
+        jti = claims.get("jti")
+        if not jti:
+            return False
+        # 主键冲突时不插入，rowcount为0说明已撤销过
+        result = self.session.exec(insert_ignore(self.session, RevokedToken).values(
+            jti=jti,
+            user_id=claims.get("user_id"),
+            token_type=claims.get("type", "access"),
+            expires_at=datetime.utcfromtimestamp(claims["exp"]),
+            revoked_at=datetime.utcnow()
+        ))
+        self.session.commit()
+        if result.rowcount == 0:
+            return False
+        self.revocations.add(jti)
+        return True
+
+    def refresh(self, refresh_token: str) -> Dict[str, Any]:
+        """
+        使用刷新令牌换取新的令牌对，旧刷新令牌随即撤销
+
+        Args:
+            refresh_token: 刷新令牌
+
+        Returns:
+            Dict: 新的令牌对
+
+        Raises:
+            AuthenticationException: 令牌无效、已使用或用户不可用
+        """
+        claims = get_refresh_claims(refresh_token)
+        if claims is None:
+            raise AuthenticationException("刷新令牌无效")
+        if not self.revoke(claims):
+            logger.warning(f"刷新令牌重复使用 - 用户ID: {claims.get('user_id')}")
+            raise AuthenticationException("刷新令牌已失效")
+
+        principal = UserService(self.session).get_principal(claims.get("user_id"))
+        if principal is None or not principal.is_active:
+            raise AuthenticationException("用户不存在或已被禁用")
+        return self.issue_tokens(principal.id, principal.username)
+
+    def purge_expired(self, now: Optional[datetime] = None) -> int:
+        """
+        删除已过期令牌的撤销记录
+
+        Returns:
+            int: 删除的记录数
+        """
+        result = self.session.exec(
+            delete(RevokedToken).where(RevokedToken.expires_at <= (now or datetime.utcnow()))
+        )
+        self.session.commit()
+        return result.rowcount
@@ -0,0 +1,505 @@
+"""用户批量导入服务模块 - 流式读取CSV，并行哈希密码，按块查重与批量插入；接口上传的CSV在后台任务中导入"""
+
+import csv
+import shutil
+import threading
+import time
+import uuid
+from concurrent.futures import Future, ThreadPoolExecutor
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta
+from itertools import islice
+from pathlib import Path
+from typing import BinaryIO, Callable, Dict, Iterable, Iterator, List, Optional, TextIO
+
+from pydantic import ValidationError
+from sqlalchemy import update
+from sqlmodel import Session, or_, select
+from loguru import logger
+
+from ..core.config import config
+from ..core.exception_handlers import BusinessException, NotFoundException
+from ..core.hashing import HashingExecutor, password_hashing
+from ..core.metrics import metrics
+from ..db.database import engine, insert_ignore
+from ..models.report import JobStatus
+from ..models.user import User, UserCreate
+from ..models.user_import import UserImportJob
+from .user_service import login_key, unknown_login_cache
+
+IMPORTED_METRIC = "user_import.created"
+IMPORT_RATE_METRIC = "user_import.users_per_second"
+QUEUE_DEPTH_METRIC = "user_import_jobs.queue_depth"
+
+ACTIVE_STATUSES = (JobStatus.PENDING, JobStatus.RUNNING)
+
+# CSV必需的列，full_name可选
+REQUIRED_COLUMNS = ("username", "email", "password")
+RESULT_COLUMNS = ("line", "username", "email", "status", "message")
+
+STATUS_CREATED = "created"
+STATUS_DUPLICATE = "duplicate"
+STATUS_INVALID = "invalid"
+
+
+@dataclass
+class ImportSummary:
+    """导入结果汇总"""
+    total: int = 0
+    created: int = 0
+    duplicate: int = 0
+    invalid: int = 0
+    seconds: float = 0.0
+
+    @property
+    def users_per_second(self) -> float:
+        """每秒创建的用户数"""
+        return self.created / self.seconds if self.seconds > 0 else 0.0
+
+    def to_dict(self) -> Dict[str, float]:
+        return {
+            "total": self.total,
+            "created": self.created,
+            "duplicate": self.duplicate,
+            "invalid": self.invalid,
+            "seconds": round(self.seconds, 3),
+            "users_per_second": round(self.users_per_second, 1)
+        }
+
+
+@dataclass
+class _Row:
+    line: int
+    username: str
+    email: str
+    status: Optional[str] = None
+    message: str = ""
+    user: Optional[UserCreate] = field(default=None, repr=False)
+
+
+def _chunks(rows: Iterable[dict], size: int) -> Iterator[List[dict]]:
+    iterator = iter(rows)
+    while True:
+        chunk = list(islice(iterator, size))
+        if not chunk:
+            return
+        yield chunk
+
+
+class UserImportService:
+    """
+    用户批量导入服务类
+
+    CSV按块流式处理，内存占用只与chunk_size有关。每块先校验字段，再用
+    一次集合查询找出已存在的用户名/邮箱，剩余行的密码在与登录共用的有界
+    哈希线程池中并行哈希（同时占用的名额不超过线程数），最后用一条忽略
+    冲突的INSERT批量插入并提交；与并发注册冲突而未插入的行记为重复。
+    """
+
+    def __init__(
+        self,
+        session: Session,
+        hashing: HashingExecutor = password_hashing,
+        chunk_size: Optional[int] = None
+    ):
+        """
+        初始化导入服务
+
+        Args:
+            session: 数据库会话
+            hashing: 密码哈希线程池，默认与登录、注册共用
+            chunk_size: 每块行数，默认读取配置
+        """
+        self.session = session
+        self.hashing = hashing
+        self.chunk_size = chunk_size or config.get('user_import.chunk_size', 500)
+
+    @staticmethod
+    def check_columns(fieldnames: Optional[Iterable[str]]) -> None:
+        """
+        检查CSV表头是否包含必需的列
+
+        Raises:
+            ValueError: CSV缺少必需的列
+        """
+        missing = [column for column in REQUIRED_COLUMNS if column not in (fieldnames or [])]
+        if missing:
+            raise ValueError(f"CSV缺少必需的列: {', '.join(missing)}")
+
+    def import_csv(self, source: TextIO, result: TextIO) -> ImportSummary:
+        """
+        从CSV导入用户，并逐行写出导入结果
+
+        Args:
+            source: 包含username、email、password列（full_name可选）的CSV文本流
+            result: 结果CSV文本流，列为line、username、email、status、message
+
+        Returns:
+            ImportSummary: 导入结果汇总
+
+        Raises:
+            ValueError: CSV缺少必需的列
+        """
+        reader = csv.DictReader(source)
+        self.check_columns(reader.fieldnames)
+
+        writer = csv.DictWriter(result, fieldnames=RESULT_COLUMNS)
+        writer.writeheader()
+        summary = ImportSummary()
+        seen_usernames, seen_emails = set(), set()
+        started = time.perf_counter()
+
+        # 第1行是表头，数据从第2行开始
+        numbered = ({**row, "_line": line} for line, row in enumerate(reader, start=2))
+        for chunk in _chunks(numbered, self.chunk_size):
+            rows = self._import_chunk(chunk, seen_usernames, seen_emails)
+            for row in rows:
+                setattr(summary, row.status, getattr(summary, row.status) + 1)
+                writer.writerow({
+                    "line": row.line, "username": row.username, "email": row.email,
+                    "status": row.status, "message": row.message
+                })
+            summary.total += len(rows)
+
+        summary.seconds = time.perf_counter() - started
+        metrics.inc(IMPORTED_METRIC, summary.created)
+        metrics.set_gauge(IMPORT_RATE_METRIC, summary.users_per_second)
+        logger.info(
+            f"用户批量导入完成 - 共 {summary.total} 行，创建 {summary.created}，重复 {summary.duplicate}，"
+            f"无效 {summary.invalid}，{summary.users_per_second:.1f} 用户/秒"
+        )
+        return summary
+
+    def _import_chunk(
+        self,
+        chunk: List[dict],
+        seen_usernames: set,
+        seen_emails: set
+    ) -> List[_Row]:
+        """校验、查重、哈希并插入一块数据"""
+        rows = []
+        for raw in chunk:
+            row = _Row(raw["_line"], (raw.get("username") or "").strip(), (raw.get("email") or "").strip())
+            rows.append(row)
+            try:
+                row.user = UserCreate(
+                    username=row.username,
+                    email=row.email,
+                    password=raw.get("password") or "",
+                    full_name=(raw.get("full_name") or "").strip() or None
+                )
+            except ValidationError as exc:
+                row.status, row.message = STATUS_INVALID, exc.errors()[0]["msg"]
+                continue
+            if not row.username or not row.user.password:
+                row.status, row.message = STATUS_INVALID, "用户名和密码不能为空"
+                continue
+
+            # 文件内重复
+            username_key, email_key = login_key(row.username), login_key(row.user.email)
+            if username_key in seen_usernames:
+                row.status, row.message = STATUS_DUPLICATE, f"用户名 {row.username} 在文件中重复"
+            elif email_key in seen_emails:
+                row.status, row.message = STATUS_DUPLICATE, f"邮箱 {row.email} 在文件中重复"
+            seen_usernames.add(username_key)
+            seen_emails.add(email_key)
+
+        pending = [row for row in rows if row.status is None]
+        if pending:
+            self._mark_existing(pending)
+            pending = [row for row in pending if row.status is None]
+        if pending:
+            self._insert(pending)
+        return rows
+
+    def _mark_existing(self, rows: List[_Row]) -> None:
+        """一次集合查询标记数据库中已存在的用户名或邮箱"""
+        username_keys = {login_key(row.username) for row in rows}
+        email_keys = {login_key(row.user.email) for row in rows}
+        existing = self.session.exec(
+            select(User.username_key, User.email_key).where(
+                or_(User.username_key.in_(username_keys), User.email_key.in_(email_keys))
+            )
+        ).all()
+        existing_usernames = {username for username, _ in existing}
+        existing_emails = {email for _, email in existing}
+        for row in rows:
+            if login_key(row.username) in existing_usernames:
+                row.status, row.message = STATUS_DUPLICATE, f"用户名 {row.username} 已存在"
+            elif login_key(row.user.email) in existing_emails:
+                row.status, row.message = STATUS_DUPLICATE, f"邮箱 {row.email} 已存在"
+
+    def _insert(self, rows: List[_Row]) -> None:
+        """并行哈希密码后批量插入"""
+        hashed = self.hashing.hash_many(row.user.password for row in rows)
+
+        values = [
+            {
+                "username": row.user.username,
+                "email": row.user.email,
+                "full_name": row.user.full_name,
+                "hashed_password": hashed_password,
+                "is_active": True,
+                "username_key": login_key(row.user.username),
+                "email_key": login_key(row.user.email)
+            }
+            for row, hashed_password in zip(rows, hashed)
+        ]
+        statement = insert_ignore(self.session, User).values(values)
+        if self.session.get_bind().dialect.insert_returning:
+            inserted = set(self.session.scalars(statement.returning(User.username_key)).all())
+        else:
+            # MySQL不支持RETURNING：哈希带随机盐，按(登录键, 哈希)找回本次插入的行
+            self.session.exec(statement)
+            inserted = set(self.session.exec(
+                select(User.username_key).where(
+                    User.username_key.in_([value["username_key"] for value in values]),
+                    User.hashed_password.in_(hashed)
+                )
+            ).all())
+        self.session.commit()
+
+        for row, value in zip(rows, values):
+            if value["username_key"] in inserted:
+                row.status = STATUS_CREATED
+                unknown_login_cache.delete(value["username_key"])
+                unknown_login_cache.delete(value["email_key"])
+            else:
+                row.status, row.message = STATUS_DUPLICATE, "用户名或邮箱已被并发注册"
+
+
+class ImportJobManager:
+    """
+    用户导入后台任务
+
+    导入在单个后台线程中依次执行，密码在与登录共用的有界哈希线程池中
+    并行哈希。导入结束后由后台线程把结果写入数据库，轮询请求无论落在
+    哪个worker上都只读数据库。
+    """
+
+    def __init__(
+        self,
+        max_pending: int,
+        output_dir: str,
+        session_factory: Optional[Callable[[], Session]] = None,
+        hashing: HashingExecutor = password_hashing
+    ):
+        self.max_pending = max_pending
+        self.hashing = hashing
+        self.output_dir = Path(output_dir)
+        self.session_factory = session_factory or (lambda: Session(engine))
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._futures: Dict[int, Future] = {}
+        self._lock = threading.Lock()
+
+    @property
+    def queue_depth(self) -> int:
+        """尚未完成的任务数"""
+        with self._lock:
+            return sum(1 for future in self._futures.values() if not future.done())
+
+    def submit(self, job_id: int) -> None:
+        """
+        提交导入任务
+
+        Raises:
+            BusinessException: 队列已满
+        """
+        with self._lock:
+            pending = sum(1 for future in self._futures.values() if not future.done())
+            if pending >= self.max_pending:
+                raise BusinessException("导入任务队列已满，请稍后再试", 429)
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="user-import")
+            future = self._executor.submit(self.run, job_id)
+            self._futures[job_id] = future
+        metrics.set_gauge(QUEUE_DEPTH_METRIC, self.queue_depth)
+        future.add_done_callback(lambda _: self.forget(job_id))
+
+    def run(self, job_id: int) -> None:
+        """执行导入并把结果写入数据库，结束后删除上传的CSV"""
+        with self.session_factory() as session:
+            job = session.get(UserImportJob, job_id)
+            if job is None or job.status not in ACTIVE_STATUSES:
+                return
+            job.status = JobStatus.RUNNING
+            session.add(job)
+            session.commit()
+
+            source_path = Path(job.source_path)
+            result_path = self.output_dir / f"import_{job_id}.csv"
+            try:
+                with open(source_path, newline="", encoding="utf-8-sig") as source, \
+                        open(result_path, "w", newline="", encoding="utf-8") as result:
+                    summary = UserImportService(session, self.hashing).import_csv(source, result)
+            except Exception as e:
+                logger.error(f"用户导入任务 {job_id} 失败: {e}")
+                if session.in_transaction():
+                    session.rollback()
+                result_path.unlink(missing_ok=True)
+                job = session.get(UserImportJob, job_id)
+                job.status, job.error = JobStatus.FAILED, str(e)
+            else:
+                job.status, job.file_path = JobStatus.SUCCEEDED, str(result_path)
+                job.total, job.created = summary.total, summary.created
+                job.duplicate, job.invalid, job.seconds = summary.duplicate, summary.invalid, summary.seconds
+            finally:
+                source_path.unlink(missing_ok=True)
+
+            job.finished_at = datetime.utcnow()
+            session.add(job)
+            session.commit()
+
+    def get_future(self, job_id: int) -> Optional[Future]:
+        """获取任务的Future，任务已结束或进程重启后返回None"""
+        with self._lock:
+            return self._futures.get(job_id)
+
+    def forget(self, job_id: int) -> None:
+        """任务结束后释放Future"""
+        with self._lock:
+            self._futures.pop(job_id, None)
+        metrics.set_gauge(QUEUE_DEPTH_METRIC, self.queue_depth)
+
+    def shutdown(self, wait: bool = True) -> None:
+        """关闭后台线程（未开始的任务取消，超时后按已中断处理）"""
+        with self._lock:
+            executor, self._executor = self._executor, None
+            self._futures.clear()
+        if executor is not None:
+            executor.shutdown(wait=wait, cancel_futures=not wait)
+        metrics.set_gauge(QUEUE_DEPTH_METRIC, 0)
+
+
+import_jobs = ImportJobManager(
+    max_pending=config.get('user_import.max_pending', 8),
+    output_dir=config.get('user_import.output_dir', 'imports')
+)
+
+# 超过该时间仍未结束的任务视为已中断（执行任务的进程崩溃或重启）
+STALE_AFTER = timedelta(seconds=config.get('user_import.stale_after_seconds', 3600))
+# 未下载的结果文件保留时间
+RESULT_TTL = timedelta(seconds=config.get('user_import.result_ttl_seconds', 86400))
+
+
+class UserImportJobService:
+    """用户导入任务服务类"""
+
+    def __init__(self, session: Session, manager: ImportJobManager = import_jobs):
+        self.session = session
+        self.manager = manager
+
+    def create_job(self, user_id: int, upload: BinaryIO) -> UserImportJob:
+        """
+        保存上传的CSV并提交后台导入
+
+        Args:
+            user_id: 提交任务的用户ID
+            upload: 上传的CSV二进制流
+
+        Returns:
+            UserImportJob: 新建的任务
+
+        Raises:
+            ValueError: CSV缺少必需的列
+            BusinessException: 队列已满
+        """
+        self.purge_expired_results()
+        self.manager.output_dir.mkdir(parents=True, exist_ok=True)
+        source_path = self.manager.output_dir / f"upload_{uuid.uuid4().hex}.csv"
+        with open(source_path, "wb") as target:
+            shutil.copyfileobj(upload, target)
+        try:
+            with open(source_path, newline="", encoding="utf-8-sig") as source:
+                UserImportService.check_columns(next(csv.reader(source), None))
+        except (ValueError, UnicodeDecodeError):
+            source_path.unlink(missing_ok=True)
+            raise
+
+        job = UserImportJob(user_id=user_id, source_path=str(source_path))
+        self.session.add(job)
+        self.session.commit()
+        self.session.refresh(job)
+
+        try:
+            self.manager.submit(job.id)
+        except BusinessException as e:
+            source_path.unlink(missing_ok=True)
+            self._finish(job, JobStatus.FAILED, error=e.message)
+            raise
+
+        logger.info(f"用户 {user_id} 提交用户导入任务 {job.id}")
+        return job
+
+    def get_job(self, user_id: int, job_id: int) -> UserImportJob:
+        """
+        获取任务状态（最终状态由后台线程写入数据库）
+
+        超过STALE_AFTER仍未结束的任务标记为已中断。
+
+        Raises:
+            NotFoundException: 任务不存在或不属于该用户
+        """
+        job = self.session.get(UserImportJob, job_id, populate_existing=True)
+        if job is None or job.user_id != user_id:
+            raise NotFoundException("导入任务不存在")
+        if job.status in ACTIVE_STATUSES and job.created_at < datetime.utcnow() - STALE_AFTER:
+            Path(job.source_path).unlink(missing_ok=True)
+            self._finish(job, JobStatus.FAILED, error="任务已中断，请重新提交")
+        return job
+
+    def take_result(self, user_id: int, job_id: int) -> Path:
+        """
+        领取结果文件：清除任务上的文件路径，调用方发送文件后负责删除
+
+        Returns:
+            Path: 结果CSV路径
+
+        Raises:
+            NotFoundException: 任务不存在或不属于该用户
+            BusinessException: 任务未成功结束（409）或结果已下载、已过期（410）
+        """
+        job = self.get_job(user_id, job_id)
+        if job.status != JobStatus.SUCCEEDED:
+            raise BusinessException(f"导入尚未完成，当前状态: {job.status.value}", 409)
+        if job.file_path is None or not Path(job.file_path).exists():
+            raise BusinessException("导入结果已下载或已过期", 410)
+        path = Path(job.file_path)
+        job.file_path = None
+        self.session.add(job)
+        self.session.commit()
+        return path
+
+    def purge_expired_results(self) -> int:
+        """
+        删除超过RESULT_TTL仍未下载的结果文件
+
+        Returns:
+            int: 删除的文件数
+        """
+        expired = self.session.exec(
+            select(UserImportJob.id, UserImportJob.file_path).where(
+                UserImportJob.file_path.is_not(None),
+                UserImportJob.finished_at < datetime.utcnow() - RESULT_TTL
+            )
+        ).all()
+        if not expired:
+            return 0
+        for _, file_path in expired:
+            Path(file_path).unlink(missing_ok=True)
+        self.session.exec(
+            update(UserImportJob)
+            .where(UserImportJob.id.in_([job_id for job_id, _ in expired]))
+            .values(file_path=None)
+        )
+        self.session.commit()
+        return len(expired)
+
+    def _finish(self, job: UserImportJob, status: JobStatus, error: Optional[str] = None) -> None:
+        """回写任务结果"""
+        job.status = status
+        job.error = error
+        job.finished_at = datetime.utcnow()
+        self.session.add(job)
+        self.session.commit()
+        self.session.refresh(job)
@@ -1,13 +1,44 @@
 """用户服务模块"""
 
-from typing import Optional
-from sqlmodel import Session, select
+from datetime import datetime
+from typing import List, Optional, Tuple
+from fastapi.concurrency import run_in_threadpool
+from sqlmodel import Session, or_, select
 from sqlalchemy.exc import IntegrityError
 from loguru import logger
 
-from ..models.user import User, UserCreate
+from ..db.database import insert_ignore
+from ..models.user import Principal, User, UserCreate, UserUpdate
 from ..core.config import config
-from ..utils.password_utils import hash_password, verify_password
+from ..core.hashing import password_hashing
+from ..utils.cache_utils import TTLCache
+
+# 已认证用户的精简视图缓存（按user_id），认证依赖命中时无需查询用户表；
+# 用户被修改或禁用时显式失效，TTL兜底其他进程中的修改
+principal_cache = TTLCache(
+    maxsize=config.get('cache.principals.maxsize', 10000),
+    ttl=config.get('cache.principals.ttl_seconds', 60)
+)
+
+# 不存在的登录标识缓存，重复的失败登录（撞库）无需再查询数据库；
+# 注册或修改用户名/邮箱时显式失效，TTL兜底其他进程中的注册
+unknown_login_cache = TTLCache(
+    maxsize=config.get('cache.unknown_logins.maxsize', 100000),
+    ttl=config.get('cache.unknown_logins.ttl_seconds', 60)
+)
+
+
+def login_key(identifier: str) -> str:
+    """
+    规范化登录标识（用户名或邮箱）
+    
+    Args:
+        identifier: 用户名或邮箱
+        
+    Returns:
+        str: 去除首尾空白并转为小写的标识
+    """
+    return identifier.strip().lower()
 
 
 class UserService:
@@ -17,56 +48,338 @@ class UserService:
         self.session = session
     
     def create_user(self, user_create: UserCreate) -> User:
-        """创建用户"""
-        # 检查用户名是否已存在
-        existing_user = self.get_user_by_username(user_create.username)
-        if existing_user:
-            raise ValueError(f"用户名 {user_create.username} 已存在")
+        """
+        创建用户（同步路径，供初始化和脚本使用）
+        
+        Args:
+            user_create: 用户创建数据
+            
+        Returns:
+            User: 新用户
+            
+        Raises:
+            ValueError: 用户名或邮箱已存在（不区分大小写）
+        """
+        return self._insert_user(user_create, password_hashing.hash(user_create.password))
+    
+    async def create_user_async(self, user_create: UserCreate) -> User:
+        """
+        创建用户（注册接口使用）
+        
+        密码在哈希线程池中计算并异步等待，不占用anyio线程；只有数据库写入
+        在anyio线程池中执行。
         
-        # 检查邮箱是否已存在
-        existing_email = self.get_user_by_email(user_create.email)
-        if existing_email:
-            raise ValueError(f"邮箱 {user_create.email} 已存在")
+        Args:
+            user_create: 用户创建数据
+            
+        Returns:
+            User: 新用户
+            
+        Raises:
+            ValueError: 用户名或邮箱已存在（不区分大小写）
+        """
+        hashed_password = await password_hashing.hash_async(user_create.password)
+        return await run_in_threadpool(self._insert_user, user_create, hashed_password)
+    
+    def _insert_user(self, user_create: UserCreate, hashed_password: str) -> User:
+        """
+        写入新用户
         
-        # 创建用户，使用SHA256哈希密码
-        hashed_password = hash_password(user_create.password)
+        不预先查询用户名和邮箱，由唯一约束在一条忽略冲突的INSERT语句中完成
+        （支持时带RETURNING）；只有冲突时才再查询一次确定冲突字段。
         
-        user = User(
+        Args:
+            user_create: 用户创建数据
+            hashed_password: 已哈希的密码
+            
+        Returns:
+            User: 新用户
+            
+        Raises:
+            ValueError: 用户名或邮箱已存在（不区分大小写）
+        """
+        username_key, email_key = login_key(user_create.username), login_key(user_create.email)
+        statement = insert_ignore(self.session, User).values(
             username=user_create.username,
             email=user_create.email,
             full_name=user_create.full_name,
             hashed_password=hashed_password,
-            is_active=True
+            is_active=True,
+            username_key=username_key,
+            email_key=email_key
         )
-        
-        self.session.add(user)
+        if self.session.get_bind().dialect.insert_returning:
+            user = self.session.scalars(statement.returning(User)).first()
+        else:
+            # MySQL不支持INSERT ... RETURNING，按受影响行数判断是否插入，再按主键读取
+            result = self.session.exec(statement)
+            user = self.session.get(User, result.inserted_primary_key[0]) if result.rowcount else None
+        if user is None:
+            self._raise_conflict(user_create.username, user_create.email)
         self.session.commit()
-        self.session.refresh(user)
+        unknown_login_cache.delete(username_key)
+        unknown_login_cache.delete(email_key)
         
         logger.info(f"用户创建成功: {user.username}")
         return user
     
+    def _raise_conflict(self, username: str, email: str, exclude_id: Optional[int] = None) -> None:
+        """
+        检查用户名和邮箱是否已被其他用户占用（不区分大小写）
+        
+        Raises:
+            ValueError: 用户名或邮箱已存在
+        """
+        username_key, email_key = login_key(username), login_key(email)
+        statement = select(User.username_key, User.email_key).where(
+            or_(User.username_key == username_key, User.email_key == email_key)
+        )
+        if exclude_id is not None:
+            statement = statement.where(User.id != exclude_id)
+        conflicts = self.session.exec(statement).all()
+        if any(row[0] == username_key for row in conflicts):
+            raise ValueError(f"用户名 {username} 已存在")
+        if conflicts:
+            raise ValueError(f"邮箱 {email} 已存在")
+    
+    def get_user_by_login(self, identifier: str) -> Optional[User]:
+        """
+        根据用户名或邮箱获取用户（不区分大小写，一次查询）
+        
+        不存在的标识写入负缓存，短时间内重复查询不再访问数据库。
+        
+        Args:
+            identifier: 用户名或邮箱
+            
+        Returns:
+            Optional[User]: 用户，不存在返回None
+        """
+        key = login_key(identifier)
+        if key in unknown_login_cache:
+            return None
+        
+        user = self.session.exec(
+            select(User).where(or_(User.username_key == key, User.email_key == key))
+        ).first()
+        if user is None:
+            unknown_login_cache.set(key, True)
+        return user
+    
     def get_user_by_username(self, username: str) -> Optional[User]:
-        """根据用户名获取用户"""
-        statement = select(User).where(User.username == username)
+        """根据用户名获取用户（不区分大小写）"""
+        statement = select(User).where(User.username_key == login_key(username))
         result = self.session.exec(statement)
         return result.first()
     
     def get_user_by_email(self, email: str) -> Optional[User]:
-        """根据邮箱获取用户"""
-        statement = select(User).where(User.email == email)
+        """根据邮箱获取用户（不区分大小写）"""
+        statement = select(User).where(User.email_key == login_key(email))
         result = self.session.exec(statement)
         return result.first()
     
+    def backfill_login_keys(self, batch_size: int = 500) -> Tuple[int, List[int]]:
+        """
+        为登录键为空的已有用户回填登录键
+        
+        用户名和邮箱分别检查唯一性（用户名与自己的邮箱相同不算冲突）；与
+        已有登录键仅大小写不同的用户跳过，留待人工合并。
+        
+        Args:
+            batch_size: 每批处理的用户数
+            
+        Returns:
+            Tuple[int, List[int]]: 回填的用户数，以及因冲突跳过的用户ID
+        """
+        processed, conflicts = 0, []
+        last_id = 0
+        while True:
+            users = list(self.session.exec(
+                select(User)
+                .where(User.id > last_id, User.username_key.is_(None))
+                .order_by(User.id)
+                .limit(batch_size)
+            ).all())
+            if not users:
+                break
+            
+            keys = {user.id: (login_key(user.username), login_key(user.email)) for user in users}
+            taken_usernames = set(self.session.exec(
+                select(User.username_key).where(User.username_key.in_([key for key, _ in keys.values()]))
+            ).all())
+            taken_emails = set(self.session.exec(
+                select(User.email_key).where(User.email_key.in_([key for _, key in keys.values()]))
+            ).all())
+            for user in users:
+                username_key, email_key = keys[user.id]
+                if username_key in taken_usernames or email_key in taken_emails:
+                    conflicts.append(user.id)
+                    continue
+                taken_usernames.add(username_key)
+                taken_emails.add(email_key)
+                user.username_key, user.email_key = username_key, email_key
+                self.session.add(user)
+                processed += 1
+            self.session.commit()
+            last_id = users[-1].id
+            logger.info(f"登录键回填进度: 已处理 {processed} 个用户，当前ID {last_id}")
+        
+        return processed, conflicts
+    
     def get_user_by_id(self, user_id: int) -> Optional[User]:
         """根据ID获取用户"""
         statement = select(User).where(User.id == user_id)
         result = self.session.exec(statement)
         return result.first()
     
+    def get_principal(self, user_id: int) -> Optional[Principal]:
+        """
+        获取用户的精简视图，优先读取缓存
+        
+        Args:
+            user_id: 用户ID
+            
+        Returns:
+            Optional[Principal]: 用户视图，用户不存在时返回None（不缓存）
+        """
+        principal = principal_cache.get(user_id)
+        if principal is not None:
+            return principal
+        
+        row = self.session.exec(
+            select(User.id, User.username, User.is_active).where(User.id == user_id)
+        ).first()
+        if row is None:
+            return None
+        principal = Principal(*row)
+        principal_cache.set(user_id, principal)
+        return principal
+    
+    def update_user(self, user_id: int, user_update: UserUpdate) -> User:
+        """
+        更新用户信息并使认证缓存失效（同步路径）
+        
+        Args:
+            user_id: 用户ID
+            user_update: 更新数据，password字段会重新哈希
+            
+        Returns:
+            User: 更新后的用户
+            
+        Raises:
+            ValueError: 用户不存在，或用户名/邮箱已被占用
+        """
+        password = user_update.password
+        hashed_password = password_hashing.hash(password) if password else None
+        return self._apply_update(user_id, user_update, hashed_password)
+    
+    async def update_user_async(self, user_id: int, user_update: UserUpdate) -> User:
+        """
+        更新用户信息（接口使用），新密码在哈希线程池中异步计算
+        
+        Args:
+            user_id: 用户ID
+            user_update: 更新数据，password字段会重新哈希
+            
+        Returns:
+            User: 更新后的用户
+            
+        Raises:
+            ValueError: 用户不存在，或用户名/邮箱已被占用
+        """
+        password = user_update.password
+        hashed_password = await password_hashing.hash_async(password) if password else None
+        return await run_in_threadpool(self._apply_update, user_id, user_update, hashed_password)
+    
+    def _apply_update(self, user_id: int, user_update: UserUpdate, hashed_password: Optional[str]) -> User:
+        """
+        写入用户更新并使认证缓存失效
+        
+        Args:
+            user_id: 用户ID
+            user_update: 更新数据（忽略其中的明文password）
+            hashed_password: 新密码的哈希，不修改密码时为None
+            
+        Returns:
+            User: 更新后的用户
+            
+        Raises:
+            ValueError: 用户不存在，或用户名/邮箱已被占用
+        """
+        user = self.get_user_by_id(user_id)
+        if not user:
+            raise ValueError(f"用户 {user_id} 不存在")
+        
+        update_data = user_update.model_dump(exclude_unset=True)
+        if "username" in update_data or "email" in update_data:
+            username = update_data.get("username", user.username)
+            email = update_data.get("email", user.email)
+            self._raise_conflict(username, email, exclude_id=user_id)
+            update_data["username_key"] = login_key(username)
+            update_data["email_key"] = login_key(email)
+        
+        update_data.pop("password", None)
+        if hashed_password:
+            update_data["hashed_password"] = hashed_password
+        for field, value in update_data.items():
+            setattr(user, field, value)
+        user.updated_at = datetime.utcnow()
+        
+        self.session.add(user)
+        self.session.commit()
+        self.session.refresh(user)
+        unknown_login_cache.delete(user.username_key)
+        unknown_login_cache.delete(user.email_key)
+        principal_cache.delete(user_id)
+        
+        logger.info(f"用户更新成功: {user.username}")
+        return user
+    
+    def deactivate_user(self, user_id: int) -> User:
+        """
+        禁用用户，已签发的令牌在下一次请求时即失效
+        
+        Args:
+            user_id: 用户ID
+            
+        Returns:
+            User: 更新后的用户
+            
+        Raises:
+            ValueError: 用户不存在
+        """
+        return self.update_user(user_id, UserUpdate(is_active=False))
+    
     def verify_password(self, plain_password: str, hashed_password: str) -> bool:
-        """验证密码"""
-        return verify_password(plain_password, hashed_password)
+        """验证密码（兼容旧版SHA-256哈希）"""
+        return password_hashing.verify(plain_password, hashed_password)
+    
+    async def authenticate(self, plain_password: str, user: User) -> bool:
+        """
+        验证用户密码，成功时将旧格式或旧参数的哈希升级为当前配置
+        
+        哈希计算在专用线程池中执行并异步等待，不占用事件循环和anyio线程；
+        升级后的哈希在anyio线程池中写回数据库。
+        
+        Args:
+            plain_password: 明文密码
+            user: 用户
+            
+        Returns:
+            bool: 密码是否正确
+        """
+        if not await password_hashing.verify_async(plain_password, user.hashed_password):
+            return False
+        if password_hashing.needs_rehash(user.hashed_password):
+            hashed_password = await password_hashing.hash_async(plain_password)
+            await run_in_threadpool(self._save_password_hash, user, hashed_password)
+        return True
+    
+    def _save_password_hash(self, user: User, hashed_password: str) -> None:
+        """写回升级后的密码哈希"""
+        user.hashed_password = hashed_password
+        self.session.add(user)
+        self.session.commit()
+        logger.info(f"用户密码哈希已升级: {user.username}")
     
     def initialize_superuser(self) -> bool:
         """初始化超级用户"""
@@ -86,7 +399,7 @@ class UserService:
                 logger.warning("超级用户配置不完整")
                 return False
             
-            # 检查超级用户是否已存在
+            # 检查超级用户是否已存在（与登录一致，按登录键不区分大小写）
             existing_user = self.get_user_by_username(username)
             if existing_user:
                 logger.info(f"超级用户 {username} 已存在，跳过创建")
@@ -0,0 +1,53 @@
+"""数据版本服务模块 - 多进程间判断进程内派生结构是否过期"""
+
+from sqlalchemy import update
+from sqlmodel import Session, select
+
+from ..db.database import insert_ignore
+from ..models.version import DataVersion
+
+# 单词及其标签的版本
+WORDS_VERSION = "words"
+
+
+def reviews_version(user_id: int) -> str:
+    """用户学习记录的版本名，写入学习记录时递增，作为离线同步的游标"""
+    return f"reviews:{user_id}"
+
+
+class VersionService:
+    """数据版本服务类"""
+
+    def __init__(self, session: Session):
+        self.session = session
+
+    def get(self, name: str) -> int:
+        """
+        读取当前版本（一次主键查询）
+
+        Args:
+            name: 版本名
+
+        Returns:
+            int: 版本号，从未写入过时为0
+        """
+        version = self.session.exec(select(DataVersion.version).where(DataVersion.name == name)).first()
+        return version or 0
+
+    def bump(self, name: str) -> int:
+        """
+        在当前事务内递增版本（不提交事务）
+
+        版本行在事务提交前保持行锁，并发写入按提交顺序得到连续的版本号。
+
+        Args:
+            name: 版本名
+
+        Returns:
+            int: 递增后的版本号
+        """
+        self.session.exec(insert_ignore(self.session, DataVersion).values(name=name, version=0))
+        self.session.exec(
+            update(DataVersion).where(DataVersion.name == name).values(version=DataVersion.version + 1)
+        )
+        return self.get(name)
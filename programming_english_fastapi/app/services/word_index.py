@@ -0,0 +1,130 @@
+"""进程内单词索引模块 - 应用启动时从数据库构建，单词写入后增量维护，其他进程写入后重建"""
+
+import threading
+from typing import Iterable, Optional, Set
+from sqlmodel import Session, select
+from loguru import logger
+
+from ..models.word import Word
+from ..utils.search_utils import BitmapIndex, TrigramIndex, TokenIndex
+from ..utils.text_utils import translation_tokens
+from .tag_service import TagService
+from .version_service import VersionService, WORDS_VERSION
+
+TAG_PREFIX = "tag:"
+
+
+def filter_keys(difficulty=None, category=None, tags: Iterable[str] = ()) -> Set[str]:
+    """
+    生成位图索引的过滤键
+
+    Args:
+        difficulty: 难度
+        category: 分类
+        tags: 已归一化的标签名
+
+    Returns:
+        Set[str]: 过滤键集合
+    """
+    keys = {f"{TAG_PREFIX}{tag}" for tag in tags}
+    if difficulty is not None:
+        keys.add(f"difficulty:{getattr(difficulty, 'value', difficulty)}")
+    if category is not None:
+        keys.add(f"category:{getattr(category, 'value', category)}")
+    return keys
+
+
+class _IndexHolder:
+    """
+    进程内单词索引持有者
+
+    应用启动时在线程中构建，本进程写入单词后增量维护。索引记录构建时的
+    单词数据版本，每次使用前用一次主键查询与数据库比对，其他进程写入过
+    单词时重新构建，避免返回过期的检索结果。
+    """
+
+    def __init__(self):
+        self.term_index: Optional[TrigramIndex] = None
+        self.translation_index: Optional[TokenIndex] = None
+        self.filter_index: Optional[BitmapIndex] = None
+        self.version: Optional[int] = None
+        self.lock = threading.RLock()
+        # 同一时间只允许一个线程重建，其他线程等待后直接使用重建结果
+        self._build_lock = threading.Lock()
+
+    @property
+    def built(self) -> bool:
+        return self.term_index is not None
+
+    def reset(self) -> None:
+        with self.lock:
+            self.term_index = None
+            self.translation_index = None
+            self.filter_index = None
+            self.version = None
+
+    def ensure(self, session: Session) -> "_IndexHolder":
+        """确保索引已构建且与数据库版本一致（一次查询同时构建全部索引）"""
+        version = VersionService(session).get(WORDS_VERSION)
+        if self._current(version):
+            return self
+        with self._build_lock:
+            if self._current(version):
+                return self
+            term_index = TrigramIndex()
+            translation_index = TokenIndex()
+            filter_index = BitmapIndex()
+            word_tags = TagService(session).get_all_word_tags()
+            rows = session.exec(
+                select(Word.id, Word.word, Word.translation, Word.difficulty, Word.category)
+            ).all()
+            for word_id, term, translation, difficulty, category in rows:
+                term_index.add(word_id, term)
+                translation_index.add(word_id, translation, translation_tokens(translation))
+                filter_index.set(word_id, filter_keys(difficulty, category, word_tags.get(word_id, ())))
+            with self.lock:
+                self.term_index = term_index
+                self.translation_index = translation_index
+                self.filter_index = filter_index
+                self.version = version
+            logger.info(f"单词检索索引构建完成，共 {len(term_index)} 个词条，版本 {version}")
+        return self
+
+    def _current(self, version: int) -> bool:
+        with self.lock:
+            return self.built and self.version == version
+
+    def on_word_saved(self, word: Word, version: int, tags: Optional[Iterable[str]] = None) -> None:
+        """
+        单词写入后增量更新已构建的索引
+
+        Args:
+            word: 已提交的单词
+            version: 本次写入后的单词数据版本
+            tags: 新的标签名，为None时保留原有标签
+        """
+        with self.lock:
+            if self.built:
+                self.term_index.add(word.id, word.word)
+                self.translation_index.add(word.id, word.translation, translation_tokens(word.translation))
+                keys = filter_keys(word.difficulty, word.category, tags or ())
+                if tags is None:
+                    keys |= {key for key in self.filter_index.keys_of(word.id) if key.startswith(TAG_PREFIX)}
+                self.filter_index.set(word.id, keys)
+                self._advance(version)
+
+    def on_word_deleted(self, word_id: int, version: int) -> None:
+        """单词删除后从已构建的索引中移除"""
+        with self.lock:
+            if self.built:
+                self.term_index.remove(word_id)
+                self.translation_index.remove(word_id)
+                self.filter_index.remove(word_id)
+                self._advance(version)
+
+    def _advance(self, version: int) -> None:
+        """只有中间没有其他进程的写入时，增量更新后的索引才与新版本一致"""
+        self.version = version if self.version == version - 1 else None
+
+
+word_indexes = _IndexHolder()
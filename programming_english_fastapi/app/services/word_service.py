@@ -1,6 +1,34 @@
-from typing import List, Optional
+from typing import Dict, Iterable, List, Optional, Tuple
 from sqlmodel import Session, select
-from ..models.word import Word, WordCreate, WordUpdate
+from loguru import logger
+from ..models.word import Word, WordCreate, WordUpdate, WordRead
+from ..core.config import config
+from ..utils.cache_utils import TTLCache
+from ..utils.text_utils import phonetic_key
+from ..utils.search_utils import BitmapIndex
+from .cloze_service import ClozeService
+from .related_service import RelatedService, RelatedUpdate, related_model
+from .tag_service import TagService, normalize_tags
+from .version_service import VersionService, WORDS_VERSION
+from .word_index import word_indexes, filter_keys
+
+# 单词详情缓存（word_id -> WordRead），学习会话等批量场景优先命中缓存
+word_cache = TTLCache(
+    maxsize=config.get('cache.words.maxsize', 5000),
+    ttl=config.get('cache.words.ttl_seconds', 600)
+)
+
+# 各分类的释义池缓存（category -> 释义元组），用于生成选择题干扰项
+translation_pool_cache = TTLCache(maxsize=64, ttl=config.get('cache.words.ttl_seconds', 600))
+
+# 每个分类最多加载的释义数量
+TRANSLATION_POOL_SIZE = 500
+
+# 影响填空题的字段
+CLOZE_FIELDS = {"word", "example"}
+
+# 影响相关词的字段
+RELATED_FIELDS = {"definition", "example", "translation"}
 
 
 class WordService:
@@ -12,9 +40,15 @@ class WordService:
     def create_word(self, word_create: WordCreate) -> Word:
         """创建新单词"""
         word = Word.model_validate(word_create)
+        word.phonetic_key = phonetic_key(word.word)
         self.session.add(word)
+        self.session.flush()
+        tags, related = self._sync_derived(word, set(word_create.model_dump()), word_create.tags)
+        version = VersionService(self.session).bump(WORDS_VERSION)
         self.session.commit()
         self.session.refresh(word)
+        self._invalidate(word.id)
+        self._update_indexes(word, version, tags, related)
         return word
 
     def get_word_by_id(self, word_id: int) -> Optional[Word]:
@@ -23,6 +57,72 @@ class WordService:
         result = self.session.exec(statement)
         return result.first()
 
+    def get_words_by_ids(self, word_ids: Iterable[int]) -> Dict[int, WordRead]:
+        """
+        批量获取单词详情（优先读缓存，未命中的一次查询补齐）
+
+        Args:
+            word_ids: 单词ID列表
+
+        Returns:
+            Dict[int, WordRead]: word_id到单词详情的映射，不存在的ID不会出现
+        """
+        found: Dict[int, WordRead] = {}
+        missing = []
+        for word_id in dict.fromkeys(word_ids):
+            cached = word_cache.get(word_id)
+            if cached is None:
+                missing.append(word_id)
+            else:
+                found[word_id] = cached
+
+        if missing:
+            statement = select(Word).where(Word.id.in_(missing))
+            for word in self.session.exec(statement).all():
+                word_read = WordRead.model_validate(word)
+                word_cache.set(word.id, word_read)
+                found[word.id] = word_read
+        return found
+
+    def get_translation_pool(self, category: str) -> tuple:
+        """获取某分类的释义池（带缓存）"""
+        def load():
+            statement = (
+                select(Word.translation)
+                .where(Word.category == category)
+                .distinct()
+                .limit(TRANSLATION_POOL_SIZE)
+            )
+            return tuple(self.session.exec(statement).all())
+        return translation_pool_cache.get_or_set(category, load)
+
+    def filter_words(
+        self,
+        tags: Iterable[str] = (),
+        difficulty: Optional[str] = None,
+        category: Optional[str] = None,
+        skip: int = 0,
+        limit: int = 100
+    ) -> List[WordRead]:
+        """
+        按标签、难度、分类组合过滤单词（位图求交后批量取详情）
+
+        Args:
+            tags: 标签名，需同时具有全部标签
+            difficulty: 难度
+            category: 分类
+            skip: 跳过数量
+            limit: 返回数量
+
+        Returns:
+            List[WordRead]: 按ID升序的单词列表
+        """
+        keys = filter_keys(difficulty, category, normalize_tags(tags))
+        index = word_indexes.ensure(self.session).filter_index
+        word_ids = BitmapIndex.to_ids(index.intersect(keys), skip=skip, limit=limit)
+        words = self.get_words_by_ids(word_ids)
+        return [words[word_id] for word_id in word_ids if word_id in words]
+
     def get_word_by_word(self, word_text: str) -> Optional[Word]:
         """根据单词文本获取单词"""
         statement = select(Word).where(Word.word == word_text)
@@ -54,12 +154,19 @@ class WordService:
             return None
         
         word_data = word_update.model_dump(exclude_unset=True)
+        tags = word_data.pop("tags", None)
         for key, value in word_data.items():
             setattr(word, key, value)
+        if "word" in word_data:
+            word.phonetic_key = phonetic_key(word.word)
         
         self.session.add(word)
+        tags, related = self._sync_derived(word, set(word_data), tags)
+        version = VersionService(self.session).bump(WORDS_VERSION)
         self.session.commit()
         self.session.refresh(word)
+        self._invalidate(word_id)
+        self._update_indexes(word, version, tags, related)
         return word
 
     def delete_word(self, word_id: int) -> bool:
@@ -68,8 +175,12 @@ class WordService:
         if not word:
             return False
         
+        self._delete_derived(word_id)
         self.session.delete(word)
+        version = VersionService(self.session).bump(WORDS_VERSION)
         self.session.commit()
+        self._invalidate(word_id)
+        self._remove_from_indexes(word_id, version)
         return True
 
     def get_random_word(self) -> Optional[Word]:
@@ -78,4 +189,85 @@ class WordService:
         words = self.get_words()
         if not words:
             return None
-        return random.choice(words)
\ No newline at end of file
+        return random.choice(words)
+
+    def backfill_phonetic_keys(self, batch_size: int = 500, only_missing: bool = True) -> int:
+        """
+        为已有单词批量计算语音键
+
+        Args:
+            batch_size: 每批处理的单词数
+            only_missing: 是否只处理还没有语音键的单词
+
+        Returns:
+            int: 处理的单词数
+        """
+        processed = 0
+        last_id = 0
+        while True:
+            statement = select(Word).where(Word.id > last_id)
+            if only_missing:
+                statement = statement.where(Word.phonetic_key.is_(None))
+            words = list(self.session.exec(statement.order_by(Word.id).limit(batch_size)).all())
+            if not words:
+                break
+
+            for word in words:
+                word.phonetic_key = phonetic_key(word.word)
+            self.session.add_all(words)
+            self.session.commit()
+
+            processed += len(words)
+            last_id = words[-1].id
+            logger.info(f"语音键回填进度: 已处理 {processed} 个单词，当前ID {last_id}")
+
+        return processed
+
+    def _sync_derived(
+        self,
+        word: Word,
+        changed_fields: set,
+        tags: Optional[List[str]] = None
+    ) -> Tuple[Optional[List[str]], Optional[RelatedUpdate]]:
+        """
+        在同一事务内更新由单词派生的数据（填空题、相关词、标签）
+
+        Returns:
+            Tuple[Optional[List[str]], Optional[RelatedUpdate]]: 归一化后的标签名（未修改标签时为None），
+                以及提交后应用到相关词模型的变更（未修改相关字段时为None）
+        """
+        related = None
+        if changed_fields & CLOZE_FIELDS:
+            ClozeService(self.session).sync_word(word)
+        if changed_fields & RELATED_FIELDS:
+            related = RelatedService(self.session).sync_word(word)
+        if tags is not None:
+            tags = TagService(self.session).set_word_tags(word.id, tags)
+        return tags, related
+
+    def _delete_derived(self, word_id: int) -> None:
+        """在同一事务内删除由单词派生的数据"""
+        ClozeService(self.session).delete_for_word(word_id)
+        RelatedService(self.session).delete_for_word(word_id)
+        TagService(self.session).delete_for_word(word_id)
+
+    def _invalidate(self, word_id: int) -> None:
+        """提交后失效单词相关缓存"""
+        word_cache.delete(word_id)
+        translation_pool_cache.clear()
+
+    def _update_indexes(
+        self,
+        word: Word,
+        version: int,
+        tags: Optional[List[str]] = None,
+        related: Optional[RelatedUpdate] = None
+    ) -> None:
+        """提交后增量更新进程内检索索引和相关词模型（version为本次写入后的单词数据版本）"""
+        word_indexes.on_word_saved(word, version, tags)
+        related_model.on_word_saved(version, related)
+
+    def _remove_from_indexes(self, word_id: int, version: int) -> None:
+        """提交后从进程内检索索引和相关词模型中移除"""
+        word_indexes.on_word_deleted(word_id, version)
+        related_model.on_word_deleted(word_id, version)
@@ -0,0 +1,118 @@
+"""令牌桶存储模块 - 限流状态的可插拔存储后端"""
+
+import threading
+import time
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from typing import Callable, Tuple
+
+
+class BucketStore(ABC):
+    """
+    令牌桶存储接口
+
+    take在后端内原子地完成补充与扣减，多节点部署时可替换为共享存储
+    （如Redis脚本），使所有节点共用同一组令牌桶。
+    """
+
+    @abstractmethod
+    def take(self, key: str, rate: float, burst: float, cost: float = 1.0) -> Tuple[bool, float]:
+        """
+        从令牌桶中取出令牌
+
+        Args:
+            key: 桶键
+            rate: 每秒补充的令牌数
+            burst: 桶容量
+            cost: 本次消耗的令牌数
+
+        Returns:
+            Tuple[bool, float]: (是否允许, 需要等待的秒数)
+        """
+
+    @abstractmethod
+    def clear(self) -> None:
+        """清空全部令牌桶"""
+
+
+class _Shard:
+    __slots__ = ("lock", "buckets")
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.buckets: "OrderedDict[str, Tuple[float, float]]" = OrderedDict()
+
+
+class MemoryBucketStore(BucketStore):
+    """
+    进程内令牌桶存储
+
+    按键哈希分片，每个分片独立加锁，并发请求很少争用同一把锁；每个分片
+    按LRU淘汰，总条目数不超过max_keys。被淘汰的桶视为满桶重新开始。
+    """
+
+    def __init__(self, shards: int = 16, max_keys: int = 100000):
+        if shards <= 0 or max_keys <= 0:
+            raise ValueError("shards和max_keys必须大于0")
+        self._shards = [_Shard() for _ in range(shards)]
+        self._max_per_shard = max(1, max_keys // shards)
+
+    def take(self, key: str, rate: float, burst: float, cost: float = 1.0) -> Tuple[bool, float]:
+        shard = self._shards[hash(key) % len(self._shards)]
+        now = time.monotonic()
+        with shard.lock:
+            state = shard.buckets.get(key)
+            if state is None:
+                tokens = burst
+            else:
+                tokens = min(burst, state[0] + (now - state[1]) * rate)
+                shard.buckets.move_to_end(key)
+
+            if tokens >= cost:
+                tokens -= cost
+                allowed, retry_after = True, 0.0
+            else:
+                allowed = False
+                retry_after = (cost - tokens) / rate if rate > 0 else float("inf")
+
+            shard.buckets[key] = (tokens, now)
+            while len(shard.buckets) > self._max_per_shard:
+                shard.buckets.popitem(last=False)
+        return allowed, retry_after
+
+    def clear(self) -> None:
+        for shard in self._shards:
+            with shard.lock:
+                shard.buckets.clear()
+
+    def __len__(self) -> int:
+        return sum(len(shard.buckets) for shard in self._shards)
+
+
+_BACKENDS = {
+    "memory": MemoryBucketStore,
+}
+
+
+def create_bucket_store(backend: str = "memory", **options) -> BucketStore:
+    """
+    按名称创建令牌桶存储
+
+    Args:
+        backend: 后端名称
+        **options: 后端参数
+
+    Returns:
+        BucketStore: 令牌桶存储
+
+    Raises:
+        ValueError: 未知的后端
+    """
+    if backend not in _BACKENDS:
+        raise ValueError(f"不支持的限流存储后端: {backend}")
+    return _BACKENDS[backend](**options)
+
+
+def register_bucket_store(name: str, factory: Callable[..., BucketStore]) -> None:
+    """注册令牌桶存储后端（如基于Redis的共享存储）"""
+    _BACKENDS[name] = factory
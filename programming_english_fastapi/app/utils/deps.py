@@ -1,44 +1,137 @@
 from fastapi import Depends, HTTPException, status
-from fastapi.security import OAuth2PasswordBearer
-from sqlmodel import Session
+from fastapi.security import APIKeyHeader, OAuth2PasswordBearer
+from typing import Optional
+from sqlmodel import Session, select
+from ..core.config import config
 from ..db.database import get_session
-from ..core.security import verify_token
-from ..models.user import User
+from ..models.user import Principal, User
+from ..services.api_key_service import ApiKeyService
+from ..services.token_service import TokenService
+from ..services.user_service import UserService, login_key
+from .jwt_utils import get_current_user_from_token
 
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="auth/token")
+optional_oauth2_scheme = OAuth2PasswordBearer(tokenUrl="auth/token", auto_error=False)
+api_key_scheme = APIKeyHeader(name="X-API-Key", auto_error=False)
+
+
+def _resolve_principal(token: str, session: Session) -> Optional[Principal]:
+    """
+    根据令牌解析当前用户视图
+    
+    按令牌中的user_id读取principal缓存，缓存命中时不查询数据库；
+    缺少user_id的旧令牌退回按用户名查询。已撤销的jti先经布隆过滤器
+    判断，未撤销的令牌同样不查询数据库。
+    """
+    claims = get_current_user_from_token(token)
+    if claims is None:
+        return None
+    if claims.get("jti") and TokenService(session).is_revoked(claims["jti"]):
+        return None
+    
+    user_id = claims.get("user_id")
+    if user_id is None:
+        if not claims.get("username"):
+            return None
+        user_id = session.exec(select(User.id).where(User.username == claims["username"])).first()
+        if user_id is None:
+            return None
+    return UserService(session).get_principal(user_id)
+
+
+def _authenticate(token: Optional[str], api_key: Optional[str], session: Session) -> Optional[Principal]:
+    """按请求携带的凭据解析当前用户，X-API-Key优先于Bearer令牌"""
+    if api_key:
+        return ApiKeyService(session).authenticate(api_key)
+    if token:
+        return _resolve_principal(token, session)
+    return None
 
 
 async def get_current_user(
-    token: str = Depends(oauth2_scheme),
+    token: Optional[str] = Depends(optional_oauth2_scheme),
+    api_key: Optional[str] = Depends(api_key_scheme),
     session: Session = Depends(get_session)
-) -> User:
-    """获取当前用户"""
-    username = verify_token(token)
-    if username is None:
+) -> Principal:
+    """获取当前用户（Bearer令牌或X-API-Key）"""
+    principal = _authenticate(token, api_key, session)
+    if principal is None:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Could not validate credentials",
             headers={"WWW-Authenticate": "Bearer"},
         )
-    
-    # 从数据库获取用户信息
-    statement = select(User).where(User.username == username)
-    user = session.exec(statement).first()
-    if user is None:
-        raise HTTPException(
-            status_code=status.HTTP_401_UNAUTHORIZED,
-            detail="User not found"
-        )
-    return user
+    return principal
 
 
-async def get_current_active_user(
-    current_user: User = Depends(get_current_user)
-) -> User:
-    """获取当前活跃用户"""
+def _ensure_active(current_user: Principal) -> Principal:
     if not current_user.is_active:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="Inactive user"
         )
-    return current_user
\ No newline at end of file
+    return current_user
+
+
+def _ensure_superuser(current_user: Principal) -> Principal:
+    superuser = config.get('superuser.username')
+    if not superuser or login_key(current_user.username) != login_key(superuser):
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Superuser required"
+        )
+    return current_user
+
+
+async def get_current_active_user(
+    current_user: Principal = Depends(get_current_user)
+) -> Principal:
+    """
+    获取当前活跃用户（仅限访问令牌）
+    
+    API密钥默认拒绝，只有通过require_scope声明了权限范围的路由接受密钥。
+    """
+    if current_user.scopes is not None:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="API keys are not accepted for this operation"
+        )
+    return _ensure_active(current_user)
+
+
+async def get_current_user_optional(
+    token: Optional[str] = Depends(optional_oauth2_scheme),
+    session: Session = Depends(get_session)
+) -> Optional[Principal]:
+    """获取当前用户（未登录或令牌无效时返回None；API密钥视为未登录）"""
+    if not token:
+        return None
+    principal = _resolve_principal(token, session)
+    if principal is None or not principal.is_active:
+        return None
+    return principal
+
+
+def require_scope(scope: str, superuser: bool = False):
+    """
+    创建接受API密钥的依赖
+    
+    通过访问令牌登录的用户不受范围限制；API密钥必须被授予该范围。
+    
+    Args:
+        scope: 所需的权限范围
+        superuser: 是否还要求（密钥所属）用户为超级用户
+        
+    Returns:
+        Callable: 返回当前活跃用户的依赖
+    """
+    async def dependency(current_user: Principal = Depends(get_current_user)) -> Principal:
+        if current_user.scopes is not None and scope not in current_user.scopes:
+            raise HTTPException(
+                status_code=status.HTTP_403_FORBIDDEN,
+                detail=f"API key lacks scope: {scope}"
+            )
+        _ensure_active(current_user)
+        return _ensure_superuser(current_user) if superuser else current_user
+    return dependency
+
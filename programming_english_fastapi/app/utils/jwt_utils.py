@@ -1,9 +1,28 @@
 """JWT工具模块"""
 
+import hashlib
+import time
+import uuid
 import jwt
 from datetime import datetime, timedelta
 from typing import Optional
-from ..core.config import SECRET_KEY, ALGORITHM, ACCESS_TOKEN_EXPIRE_MINUTES
+from ..core.config import ACCESS_TOKEN_EXPIRE_MINUTES, config
+from ..core.metrics import metrics
+from ..core.tokens import token_codec
+from .cache_utils import TTLCache
+
+TOKEN_CACHE_HITS_METRIC = "token_cache.hits"
+TOKEN_CACHE_MISSES_METRIC = "token_cache.misses"
+TOKEN_CACHE_HIT_RATE_METRIC = "token_cache.hit_rate"
+
+REFRESH_TOKEN_EXPIRE_DAYS = config.get('security.refresh_token_expire_days', 30)
+
+# 已验证令牌缓存：令牌摘要 -> 解码后的claims，条目在令牌exp时过期；
+# 只缓存验证通过的令牌，伪造或过期令牌每次都完整验证
+token_cache = TTLCache(
+    maxsize=config.get('cache.tokens.maxsize', 10000),
+    ttl=ACCESS_TOKEN_EXPIRE_MINUTES * 60
+)
 
 
 def create_access_token(data: dict, expires_delta: Optional[timedelta] = None) -> str:
@@ -25,7 +44,7 @@ def create_access_token(data: dict, expires_delta: Optional[timedelta] = None) -
         expire = datetime.utcnow() + timedelta(minutes=ACCESS_TOKEN_EXPIRE_MINUTES)
     
     to_encode.update({"exp": expire})
-    encoded_jwt = jwt.encode(to_encode, SECRET_KEY, algorithm=ALGORITHM)
+    encoded_jwt = token_codec.encode(to_encode)
     return encoded_jwt
 
 
@@ -33,19 +52,43 @@ def verify_token(token: str) -> Optional[dict]:
     """
     验证并解码JWT令牌
     
+    验证通过的令牌按SHA-256摘要缓存至其exp，重复使用同一令牌时跳过签名验证。
+    
     Args:
         token: JWT令牌字符串
         
     Returns:
         Optional[dict]: 解码后的payload，验证失败返回None
     """
+    if not token:
+        return None
+    
+    digest = hashlib.sha256(token.encode("utf-8")).digest()
+    payload = token_cache.get(digest)
+    if payload is not None:
+        _record_token_cache(hit=True)
+        return dict(payload)
+    _record_token_cache(hit=False)
+    
     try:
-        payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
-        return payload
+        payload = token_codec.decode(token)
     except jwt.ExpiredSignatureError:
         return None
-    except jwt.JWTError:
+    except jwt.PyJWTError:
         return None
+    
+    exp = payload.get("exp")
+    if exp is not None:
+        remaining = exp - time.time()
+        if remaining > 0:
+            token_cache.set(digest, dict(payload), ttl=remaining)
+    return payload
+
+
+def _record_token_cache(hit: bool) -> None:
+    """记录令牌缓存命中情况"""
+    metrics.inc(TOKEN_CACHE_HITS_METRIC if hit else TOKEN_CACHE_MISSES_METRIC)
+    metrics.set_gauge(TOKEN_CACHE_HIT_RATE_METRIC, token_cache.hit_rate)
 
 
 def extract_token_from_authorization(authorization: str) -> Optional[str]:
@@ -84,11 +127,48 @@ def create_user_token(user_id: int, username: str) -> str:
     data = {
         "sub": username,
         "user_id": user_id,
-        "type": "access"
+        "type": "access",
+        "jti": uuid.uuid4().hex
     }
     return create_access_token(data)
 
 
+def create_refresh_token(user_id: int, username: str) -> str:
+    """
+    为用户创建刷新令牌
+    
+    Args:
+        user_id: 用户ID
+        username: 用户名
+        
+    Returns:
+        str: JWT刷新令牌，每个令牌带唯一jti，只能使用一次
+    """
+    data = {
+        "sub": username,
+        "user_id": user_id,
+        "type": "refresh",
+        "jti": uuid.uuid4().hex
+    }
+    return create_access_token(data, expires_delta=timedelta(days=REFRESH_TOKEN_EXPIRE_DAYS))
+
+
+def get_refresh_claims(token: str) -> Optional[dict]:
+    """
+    验证刷新令牌
+    
+    Args:
+        token: JWT刷新令牌
+        
+    Returns:
+        Optional[dict]: 令牌声明，无效或不是刷新令牌返回None
+    """
+    payload = verify_token(token)
+    if payload is None or payload.get("type") != "refresh" or not payload.get("jti"):
+        return None
+    return payload
+
+
 def get_current_user_from_token(token: str) -> Optional[dict]:
     """
     从JWT令牌获取当前用户信息
@@ -109,7 +189,8 @@ def get_current_user_from_token(token: str) -> Optional[dict]:
     
     return {
         "user_id": payload.get("user_id"),
-        "username": payload.get("sub")
+        "username": payload.get("sub"),
+        "jti": payload.get("jti")
     }
 
 
@@ -124,7 +205,7 @@ def is_token_expired(token: str) -> bool:
         bool: 是否过期
     """
     try:
-        payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
+        payload = token_codec.decode(token)
         exp = payload.get("exp")
         if exp is None:
             return True
@@ -132,5 +213,5 @@ def is_token_expired(token: str) -> bool:
         return datetime.utcnow().timestamp() > exp
     except jwt.ExpiredSignatureError:
         return True
-    except jwt.JWTError:
+    except jwt.PyJWTError:
         return True
\ No newline at end of file
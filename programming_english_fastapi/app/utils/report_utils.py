@@ -0,0 +1,121 @@
+"""学习报告渲染工具模块 - 在工作进程中生成带SVG图表的HTML报告"""
+
+import html
+from pathlib import Path
+from typing import Any, Dict, List, Sequence
+
+_BAR_COLOR = "#4f7cff"
+
+
+def svg_bar_chart(labels: Sequence[str], values: Sequence[float], width: int = 640, height: int = 220) -> str:
+    """
+    生成SVG柱状图
+
+    Args:
+        labels: 横轴标签
+        values: 柱高数值
+        width: 图宽
+        height: 图高
+
+    Returns:
+        str: SVG片段
+    """
+    if not values:
+        return '<p class="empty">暂无数据</p>'
+
+    padding = 24
+    chart_height = height - 2 * padding
+    peak = max(max(values), 1)
+    slot = (width - 2 * padding) / len(values)
+    bar_width = max(slot * 0.7, 1)
+    parts = [f'<svg xmlns="http://www.w3.org/2000/svg" width="{width}" height="{height}" role="img">']
+    for index, (label, value) in enumerate(zip(labels, values)):
+        bar_height = chart_height * value / peak
+        x = padding + index * slot + (slot - bar_width) / 2
+        y = padding + chart_height - bar_height
+        parts.append(
+            f'<rect x="{x:.1f}" y="{y:.1f}" width="{bar_width:.1f}" height="{bar_height:.1f}" fill="{_BAR_COLOR}">'
+            f'<title>{html.escape(str(label))}: {value:g}</title></rect>'
+        )
+        if len(values) <= 12 or index % 5 == 0:
+            parts.append(
+                f'<text x="{x + bar_width / 2:.1f}" y="{height - 6}" font-size="10" text-anchor="middle">'
+                f'{html.escape(str(label))}</text>'
+            )
+    parts.append("</svg>")
+    return "".join(parts)
+
+
+def _table(rows: List[Sequence[Any]]) -> str:
+    body = "".join(
+        "<tr>" + "".join(f"<td>{html.escape(str(cell))}</td>" for cell in row) + "</tr>"
+        for row in rows
+    )
+    return f"<table>{body}</table>"
+
+
+def render_report_html(data: Dict[str, Any]) -> str:
+    """
+    渲染月度学习报告HTML
+
+    Args:
+        data: 报告数据（只包含可序列化的基本类型，由主进程查询后传入）
+
+    Returns:
+        str: 完整HTML文档
+    """
+    daily = data.get("new_words_by_day", [])
+    mastery = data.get("mastery_distribution", [])
+    categories = data.get("category_distribution", {})
+    totals = data.get("totals", {})
+    achievements = data.get("achievements", [])
+    title = f"{data.get('username', '')} 的 {data['month']} 学习报告"
+
+    sections = [
+        f"<h1>{html.escape(title)}</h1>",
+        f"<p>生成时间：{html.escape(data.get('generated_at', ''))}</p>",
+        "<h2>概览</h2>",
+        _table([
+            ("本月新学单词", sum(daily)),
+            ("本月复习过的单词", data.get("reviewed_words", 0)),
+            ("累计复习次数", totals.get("reviews", 0)),
+            ("已掌握单词", totals.get("mastered", 0)),
+            ("当前连续学习天数", totals.get("streak", 0)),
+        ]),
+        "<h2>每日新学单词</h2>",
+        svg_bar_chart([str(day + 1) for day in range(len(daily))], daily),
+        "<h2>掌握程度分布</h2>",
+        svg_bar_chart([f"L{level}" for level in range(len(mastery))], mastery),
+        "<h2>分类分布</h2>",
+        svg_bar_chart(list(categories), list(categories.values())),
+        "<h2>本月解锁成就</h2>",
+        _table([(name,) for name in achievements]) if achievements else '<p class="empty">本月暂无新成就</p>',
+    ]
+    return (
+        "<!DOCTYPE html><html lang=\"zh-CN\"><head><meta charset=\"utf-8\">"
+        f"<title>{html.escape(title)}</title>"
+        "<style>body{font-family:sans-serif;max-width:720px;margin:auto}"
+        "table{border-collapse:collapse}td{border:1px solid #ddd;padding:4px 12px}"
+        ".empty{color:#888}</style></head><body>"
+        + "".join(sections)
+        + "</body></html>"
+    )
+
+
+def render_report(data: Dict[str, Any], output_path: str) -> str:
+    """
+    渲染报告并写入文件（在进程池中执行，必须是模块级函数）
+
+    Args:
+        data: 报告数据
+        output_path: 输出文件路径
+
+    Returns:
+        str: 输出文件路径
+    """
+    path = Path(output_path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    temporary = path.with_suffix(".tmp")
+    temporary.write_text(render_report_html(data), encoding="utf-8")
+    temporary.replace(path)
+    return str(path)
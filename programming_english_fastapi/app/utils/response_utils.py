@@ -44,6 +44,25 @@ class PaginationData(BaseModel):
     )
 
 
+class CursorPaginationData(BaseModel):
+    """游标分页数据模型"""
+    items: List[Any]
+    size: int
+    next_cursor: Optional[Any] = None
+    has_next: bool
+    
+    model_config = ConfigDict(
+        json_schema_extra={
+            "example": {
+                "items": [{"id": 1}, {"id": 2}],
+                "size": 2,
+                "next_cursor": 2,
+                "has_next": True
+            }
+        }
+    )
+
+
 class StandardResponse(BaseModel):
     """标准响应模型"""
     success: bool
@@ -202,6 +221,36 @@ def pagination_response(
     return create_response(True, code, message, pagination_data)
 
 
+def cursor_pagination_response(
+    items: List[Any],
+    next_cursor: Optional[Any],
+    size: int,
+    message: str = "获取数据成功",
+    code: int = 200
+) -> Dict[str, Any]:
+    """
+    创建游标分页响应
+    
+    Args:
+        items: 数据项列表
+        next_cursor: 下一页游标，没有下一页时为None
+        size: 每页大小
+        message: 成功消息
+        code: 成功状态码
+        
+    Returns:
+        Dict: 游标分页响应格式
+    """
+    pagination_data = {
+        "items": items,
+        "size": size,
+        "next_cursor": next_cursor,
+        "has_next": next_cursor is not None
+    }
+    
+    return create_response(True, code, message, pagination_data)
+
+
 def created_response(data: Optional[Any] = None, message: str = ResponseStatus.CREATED) -> Dict[str, Any]:
     """
     创建成功响应 (201)
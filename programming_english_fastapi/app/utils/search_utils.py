@@ -0,0 +1,323 @@
+"""检索工具模块 - 进程内倒排索引与编辑距离"""
+
+import math
+import threading
+from collections import defaultdict
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+
+def bounded_levenshtein(source: str, target: str, max_distance: int) -> Optional[int]:
+    """
+    计算编辑距离，超过上限时提前返回None
+
+    只计算对角线附近宽度为2*max_distance+1的条带，复杂度O(len*max_distance)。
+
+    Args:
+        source: 原字符串
+        target: 目标字符串
+        max_distance: 距离上限
+
+    Returns:
+        Optional[int]: 编辑距离，超过上限返回None
+    """
+    if abs(len(source) - len(target)) > max_distance:
+        return None
+    if source == target:
+        return 0
+
+    infinity = max_distance + 1
+    previous = [j if j <= max_distance else infinity for j in range(len(target) + 1)]
+    for i in range(1, len(source) + 1):
+        low = max(1, i - max_distance)
+        high = min(len(target), i + max_distance)
+        current = [infinity] * (len(target) + 1)
+        if i <= max_distance:
+            current[0] = i
+        row_min = current[0]
+        for j in range(low, high + 1):
+            cost = 0 if source[i - 1] == target[j - 1] else 1
+            value = min(previous[j] + 1, current[j - 1] + 1, previous[j - 1] + cost)
+            current[j] = value if value <= max_distance else infinity
+            row_min = min(row_min, current[j])
+        if row_min > max_distance:
+            return None
+        previous = current
+
+    distance = previous[len(target)]
+    return distance if distance <= max_distance else None
+
+
+def trigrams(term: str) -> Set[str]:
+    """
+    生成带边界填充的三元组集合
+
+    Args:
+        term: 小写词条
+
+    Returns:
+        Set[str]: 三元组集合
+    """
+    padded = f"$${term}$"
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+
+class TrigramIndex:
+    """
+    词条三元组倒排索引，支持编辑距离有界的模糊查找
+
+    先按三元组计数过滤候选（每次编辑最多破坏3个三元组），再用条带
+    编辑距离校验，避免对全部词条逐一计算距离。候选只从最稀有的倒排表
+    中产生，高频三元组不会被遍历。线程安全。
+    """
+
+    def __init__(self):
+        self._postings: Dict[str, Set[int]] = defaultdict(set)
+        self._terms: Dict[int, str] = {}
+        self._lock = threading.RLock()
+
+    def __len__(self) -> int:
+        return len(self._terms)
+
+    def add(self, item_id: int, term: str) -> None:
+        """写入或替换词条"""
+        term = term.lower()
+        with self._lock:
+            self.remove(item_id)
+            self._terms[item_id] = term
+            for gram in trigrams(term):
+                self._postings[gram].add(item_id)
+
+    def remove(self, item_id: int) -> None:
+        """删除词条"""
+        with self._lock:
+            term = self._terms.pop(item_id, None)
+            if term is None:
+                return
+            for gram in trigrams(term):
+                postings = self._postings.get(gram)
+                if postings is not None:
+                    postings.discard(item_id)
+                    if not postings:
+                        del self._postings[gram]
+
+    def search(self, query: str, max_distance: int, limit: int = 10) -> List[Tuple[int, str, int]]:
+        """
+        查找编辑距离不超过max_distance的词条
+
+        Args:
+            query: 查询词
+            max_distance: 编辑距离上限
+            limit: 最多返回数量
+
+        Returns:
+            List[Tuple]: (ID, 词条, 距离)，按距离、词条排序
+        """
+        query = query.lower()
+        query_grams = trigrams(query)
+        threshold = max(1, len(query_grams) - 3 * max_distance)
+
+        with self._lock:
+            # 前缀过滤：共享threshold个三元组的词条必然出现在最稀有的
+            # len-threshold+1个倒排表之一，其余倒排表只做集合成员判断
+            postings = sorted(
+                (self._postings.get(gram, set()) for gram in query_grams),
+                key=len
+            )
+            prefix_length = len(postings) - threshold + 1
+            counts: Dict[int, int] = defaultdict(int)
+            for posting in postings[:prefix_length]:
+                for item_id in posting:
+                    counts[item_id] += 1
+            candidates = []
+            for item_id, count in counts.items():
+                for posting in postings[prefix_length:]:
+                    if count >= threshold:
+                        break
+                    if item_id in posting:
+                        count += 1
+                if count >= threshold:
+                    candidates.append((item_id, self._terms[item_id]))
+
+        matches = []
+        for item_id, term in candidates:
+            distance = bounded_levenshtein(query, term, max_distance)
+            if distance is not None:
+                matches.append((item_id, term, distance))
+        matches.sort(key=lambda match: (match[2], match[1]))
+        return matches[:limit]
+
+
+class TokenIndex:
+    """
+    通用检索词倒排索引，按查询词覆盖率（IDF加权）排序
+
+    用于中文翻译反查：文档预先切分为单字和二元组，查询只需合并少量
+    倒排表，避免LIKE '%…%'全表扫描。线程安全。
+    """
+
+    def __init__(self):
+        self._postings: Dict[str, Set[int]] = defaultdict(set)
+        self._documents: Dict[int, Tuple[str, frozenset]] = {}
+        self._lock = threading.RLock()
+
+    def __len__(self) -> int:
+        return len(self._documents)
+
+    def add(self, item_id: int, text: str, tokens: Iterable[str]) -> None:
+        """写入或替换文档"""
+        tokens = frozenset(tokens)
+        with self._lock:
+            self.remove(item_id)
+            self._documents[item_id] = (text, tokens)
+            for token in tokens:
+                self._postings[token].add(item_id)
+
+    def remove(self, item_id: int) -> None:
+        """删除文档"""
+        with self._lock:
+            document = self._documents.pop(item_id, None)
+            if document is None:
+                return
+            for token in document[1]:
+                postings = self._postings.get(token)
+                if postings is not None:
+                    postings.discard(item_id)
+                    if not postings:
+                        del self._postings[token]
+
+    def _idf(self, token: str) -> float:
+        return math.log((1 + len(self._documents)) / (1 + len(self._postings.get(token, ())))) + 1
+
+    def search(self, query: str, tokens: Iterable[str], limit: int = 10) -> List[Tuple[int, str, float]]:
+        """
+        按检索词查找文档
+
+        排序依据：原文完全匹配优先，其次为IDF加权的查询词覆盖率，
+        覆盖率相同时原文越短越靠前。
+
+        Args:
+            query: 原始查询词
+            tokens: 查询检索词
+            limit: 最多返回数量
+
+        Returns:
+            List[Tuple]: (ID, 原文, 得分)，得分范围(0, 1]
+        """
+        tokens = set(tokens)
+        if not tokens:
+            return []
+
+        with self._lock:
+            weights = {token: self._idf(token) for token in tokens}
+            total_weight = sum(weights.values())
+            scores: Dict[int, float] = defaultdict(float)
+            for token, weight in weights.items():
+                for item_id in self._postings.get(token, ()):
+                    scores[item_id] += weight
+            results = [
+                (item_id, self._documents[item_id][0], score / total_weight)
+                for item_id, score in scores.items()
+            ]
+
+        results.sort(key=lambda result: (result[1] != query, -result[2], len(result[1]), result[0]))
+        return results[:limit]
+
+
+class BitmapIndex:
+    """
+    位图倒排索引：每个键对应一个以ID为位号的整数位图
+
+    多条件过滤直接做位图按位与，避免多表JOIN。Python整数按位运算在
+    C层逐字完成，十万级ID的交集只需微秒级。线程安全。
+    """
+
+    def __init__(self):
+        self._bitmaps: Dict[str, int] = {}
+        self._keys: Dict[int, frozenset] = {}
+        self._lock = threading.RLock()
+
+    def __len__(self) -> int:
+        return len(self._keys)
+
+    def set(self, item_id: int, keys: Iterable[str]) -> None:
+        """写入或替换ID的全部键"""
+        keys = frozenset(keys)
+        bit = 1 << item_id
+        with self._lock:
+            self.remove(item_id)
+            self._keys[item_id] = keys
+            for key in keys:
+                self._bitmaps[key] = self._bitmaps.get(key, 0) | bit
+
+    def remove(self, item_id: int) -> None:
+        """删除ID"""
+        with self._lock:
+            keys = self._keys.pop(item_id, None)
+            if keys is None:
+                return
+            mask = ~(1 << item_id)
+            for key in keys:
+                bitmap = self._bitmaps[key] & mask
+                if bitmap:
+                    self._bitmaps[key] = bitmap
+                else:
+                    del self._bitmaps[key]
+
+    def keys_of(self, item_id: int) -> frozenset:
+        """获取ID当前的键"""
+        with self._lock:
+            return self._keys.get(item_id, frozenset())
+
+    def count(self, key: str) -> int:
+        """键下的ID数量"""
+        with self._lock:
+            return bin(self._bitmaps.get(key, 0)).count("1")
+
+    def intersect(self, keys: Iterable[str]) -> int:
+        """
+        求多个键的位图交集
+
+        Args:
+            keys: 键列表，任一键不存在时交集为空
+
+        Returns:
+            int: 交集位图
+        """
+        with self._lock:
+            bitmaps = [self._bitmaps.get(key, 0) for key in set(keys)]
+        if not bitmaps:
+            return 0
+        # 从最稀疏的位图开始，尽早归零
+        bitmaps.sort(key=int.bit_length)
+        result = bitmaps[0]
+        for bitmap in bitmaps[1:]:
+            if not result:
+                break
+            result &= bitmap
+        return result
+
+    @staticmethod
+    def to_ids(bitmap: int, skip: int = 0, limit: Optional[int] = None) -> List[int]:
+        """
+        按升序取出位图中的ID
+
+        Args:
+            bitmap: 位图
+            skip: 跳过数量
+            limit: 最多返回数量
+
+        Returns:
+            List[int]: ID列表
+        """
+        bits = bin(bitmap)[:1:-1]
+        ids = []
+        position = bits.find("1")
+        while position != -1:
+            if skip:
+                skip -= 1
+            else:
+                ids.append(position)
+                if limit is not None and len(ids) >= limit:
+                    break
+            position = bits.find("1", position + 1)
+        return ids
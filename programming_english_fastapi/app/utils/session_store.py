@@ -0,0 +1,102 @@
+"""服务端会话存储模块 - 测验等短期状态的可插拔存储后端"""
+
+import threading
+from abc import ABC, abstractmethod
+from typing import Any, Callable, Optional
+
+from .cache_utils import TTLCache
+
+
+class SessionStore(ABC):
+    """
+    会话存储接口
+
+    值应为可JSON序列化的dict，便于替换为多worker共享的外部存储。
+    update在后端内原子地完成读-改-写，避免并发提交答案时互相覆盖。
+    """
+
+    @abstractmethod
+    def get(self, key: str) -> Optional[dict]:
+        """读取会话，不存在或已过期返回None"""
+
+    @abstractmethod
+    def set(self, key: str, value: dict, ttl: Optional[float] = None) -> None:
+        """写入会话"""
+
+    @abstractmethod
+    def update(self, key: str, mutate: Callable[[dict], Any]) -> Any:
+        """
+        原子地修改会话
+
+        Args:
+            key: 会话键
+            mutate: 就地修改会话并返回结果的函数
+
+        Returns:
+            Any: mutate的返回值
+
+        Raises:
+            KeyError: 会话不存在或已过期
+        """
+
+    @abstractmethod
+    def delete(self, key: str) -> bool:
+        """删除会话"""
+
+
+class MemorySessionStore(SessionStore):
+    """进程内会话存储（单worker或测试使用），按TTL淘汰，容量满时按LRU淘汰"""
+
+    def __init__(self, maxsize: int = 10000, ttl: float = 1800):
+        self._cache = TTLCache(maxsize=maxsize, ttl=ttl)
+        # TTLCache的锁只保护单次操作，update需要单独的锁保证读-改-写原子
+        self._update_lock = threading.Lock()
+
+    def get(self, key: str) -> Optional[dict]:
+        return self._cache.get(key)
+
+    def set(self, key: str, value: dict, ttl: Optional[float] = None) -> None:
+        self._cache.set(key, value, ttl)
+
+    def update(self, key: str, mutate: Callable[[dict], Any]) -> Any:
+        with self._update_lock:
+            value = self._cache.get(key)
+            if value is None:
+                raise KeyError(key)
+            return mutate(value)
+
+    def delete(self, key: str) -> bool:
+        return self._cache.delete(key)
+
+    def clear(self) -> None:
+        """清空全部会话"""
+        self._cache.clear()
+
+
+_BACKENDS = {
+    "memory": MemorySessionStore,
+}
+
+
+def create_session_store(backend: str = "memory", **options) -> SessionStore:
+    """
+    按名称创建会话存储
+
+    Args:
+        backend: 后端名称
+        **options: 后端参数
+
+    Returns:
+        SessionStore: 会话存储
+
+    Raises:
+        ValueError: 未知的后端
+    """
+    if backend not in _BACKENDS:
+        raise ValueError(f"不支持的会话存储后端: {backend}")
+    return _BACKENDS[backend](**options)
+
+
+def register_session_store(name: str, factory: Callable[..., SessionStore]) -> None:
+    """注册会话存储后端（如基于Redis的共享存储）"""
+    _BACKENDS[name] = factory
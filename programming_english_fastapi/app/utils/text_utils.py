@@ -0,0 +1,304 @@
+"""文本处理工具模块 - 填空题生成与答案归一化"""
+
+import re
+from typing import List, Tuple
+
+# 填空占位符
+BLANK = "____"
+
+# 预编译的答案归一化正则：去除标点、合并空白
+_PUNCTUATION_RE = re.compile(r"[^\w\s]", re.UNICODE)
+_WHITESPACE_RE = re.compile(r"\s+", re.UNICODE)
+
+
+def normalize_answer(text: str) -> str:
+    """
+    归一化答案文本，忽略大小写、标点和多余空白
+    
+    Args:
+        text: 原始答案
+        
+    Returns:
+        str: 归一化后的答案
+    """
+    if text is None:
+        return ""
+    text = _PUNCTUATION_RE.sub("", text.casefold())
+    return _WHITESPACE_RE.sub(" ", text).strip()
+
+
+def answers_match(expected: str, actual: str) -> bool:
+    """
+    比较两个答案是否一致（归一化后比较）
+    
+    Args:
+        expected: 标准答案
+        actual: 用户答案
+        
+    Returns:
+        bool: 是否一致
+    """
+    return normalize_answer(expected) == normalize_answer(actual)
+
+
+def find_term_spans(term: str, text: str) -> List[Tuple[int, int]]:
+    """
+    查找术语在代码示例中出现的位置
+    
+    优先匹配独立标识符片段（如my_function中的function），
+    找不到时退化为不区分大小写的子串匹配。
+    
+    Args:
+        term: 目标术语
+        text: 代码示例
+        
+    Returns:
+        List[Tuple[int, int]]: 每次出现的(起始, 结束)位置
+    """
+    if not term or not text:
+        return []
+    escaped = re.escape(term)
+    bounded = re.compile(rf"(?<![A-Za-z0-9]){escaped}(?![A-Za-z0-9])", re.IGNORECASE)
+    spans = [match.span() for match in bounded.finditer(text)]
+    if not spans:
+        spans = [match.span() for match in re.finditer(escaped, text, re.IGNORECASE)]
+    return spans
+
+
+def build_cloze_variants(term: str, text: str) -> List[Tuple[str, str, int, int]]:
+    """
+    为每次出现的术语生成一个填空变体
+    
+    Args:
+        term: 目标术语
+        text: 代码示例
+        
+    Returns:
+        List[Tuple]: (挖空后的文本, 原文答案, 起始位置, 结束位置)
+    """
+    return [
+        (text[:start] + BLANK + text[end:], text[start:end], start, end)
+        for start, end in find_term_spans(term, text)
+    ]
+
+
+# 英文单词片段与连续中文字符
+_TERM_RE = re.compile(r"[A-Za-z]+|[\u4e00-\u9fff]+")
+# 拆分驼峰命名，如getHTTPResponse -> get, HTTP, Response
+_CAMEL_RE = re.compile(r"[A-Z]+(?![a-z])|[A-Z]?[a-z]+")
+_CJK_RE = re.compile(r"[\u4e00-\u9fff]")
+
+# 对语义区分度很低的英文停用词
+STOP_WORDS = frozenset({
+    "a", "an", "and", "are", "as", "at", "be", "by", "for", "from", "in", "is",
+    "it", "of", "on", "or", "that", "the", "this", "to", "with", "which", "used"
+})
+
+
+def cjk_bigrams(text: str) -> List[str]:
+    """
+    将连续中文字符切分为二元组（单字时返回单字）
+    
+    Args:
+        text: 中文文本
+        
+    Returns:
+        List[str]: 二元组列表
+    """
+    if len(text) < 2:
+        return [text] if text else []
+    return [text[i:i + 2] for i in range(len(text) - 1)]
+
+
+def tokenize_terms(text: str) -> List[str]:
+    """
+    将释义、代码示例或中文翻译切分为检索词
+    
+    英文按驼峰和下划线拆分后转小写并去除停用词，中文切分为二元组，
+    不依赖外部分词服务。
+    
+    Args:
+        text: 原始文本
+        
+    Returns:
+        List[str]: 检索词列表
+    """
+    if not text:
+        return []
+    tokens = []
+    for chunk in _TERM_RE.findall(text):
+        if _CJK_RE.match(chunk):
+            tokens.extend(cjk_bigrams(chunk))
+            continue
+        for part in _CAMEL_RE.findall(chunk):
+            part = part.lower()
+            if len(part) > 1 and part not in STOP_WORDS:
+                tokens.append(part)
+    return tokens
+
+
+def translation_tokens(text: str) -> List[str]:
+    """
+    将中文翻译切分为反查检索词
+    
+    中文输出单字和二元组（单字查询也能命中），夹杂的英文输出小写单词。
+    
+    Args:
+        text: 中文翻译
+        
+    Returns:
+        List[str]: 检索词列表
+    """
+    if not text:
+        return []
+    tokens = []
+    for chunk in _TERM_RE.findall(text):
+        if _CJK_RE.match(chunk):
+            tokens.extend(chunk)
+            if len(chunk) > 1:
+                tokens.extend(cjk_bigrams(chunk))
+        else:
+            tokens.append(chunk.lower())
+    return tokens
+
+
+def translation_query_tokens(text: str) -> List[str]:
+    """
+    将反查查询词切分为检索词（多字中文只用二元组，保证匹配精度）
+    
+    Args:
+        text: 查询词
+        
+    Returns:
+        List[str]: 检索词列表
+    """
+    if not text:
+        return []
+    tokens = []
+    for chunk in _TERM_RE.findall(text):
+        if _CJK_RE.match(chunk):
+            tokens.extend(cjk_bigrams(chunk))
+        else:
+            tokens.append(chunk.lower())
+    return tokens
+
+
+_NON_LETTER_RE = re.compile(r"[^a-z]")
+_VOWELS = frozenset("aeiou")
+_FRONT_VOWELS = frozenset("eiy")
+# 词首不发音的字母组合，只保留第二个字母
+_SILENT_PREFIXES = ("kn", "gn", "pn", "ae", "wr")
+# 直接映射的辅音
+_SIMPLE_CONSONANTS = {"f": "F", "j": "J", "l": "L", "m": "M", "n": "N", "r": "R", "q": "K", "v": "F", "z": "S"}
+
+
+def phonetic_key(term: str) -> str:
+    """
+    计算单词的语音键（简化的Metaphone规则）
+    
+    发音相近的拼写得到相同的键，如function与funkshun、synchronize与
+    sinkronize。键在单词写入时计算一次并存入索引列。
+    
+    Args:
+        term: 单词文本
+        
+    Returns:
+        str: 大写语音键，没有字母时返回空字符串
+    """
+    word = _NON_LETTER_RE.sub("", (term or "").lower())
+    if not word:
+        return ""
+    if word.startswith(_SILENT_PREFIXES):
+        word = word[1:]
+    elif word.startswith("x"):
+        word = "s" + word[1:]
+    elif word.startswith("wh"):
+        word = "w" + word[2:]
+
+    key = []
+    length = len(word)
+    i = 0
+    while i < length:
+        char = word[i]
+        prev = word[i - 1] if i > 0 else ""
+        next_char = word[i + 1] if i + 1 < length else ""
+        after_next = word[i + 2] if i + 2 < length else ""
+        step = 1
+
+        if char == prev and char != "c":
+            pass
+        elif char in _VOWELS:
+            if i == 0:
+                key.append("A")
+        elif char == "b":
+            if not (prev == "m" and i == length - 1):
+                key.append("B")
+        elif char == "c":
+            if next_char == "i" and after_next == "a":
+                key.append("X")
+            elif next_char == "h":
+                # chr多为希腊词源（synchronize），sch读作SK
+                key.append("K" if after_next == "r" or prev == "s" else "X")
+                step = 2
+            elif next_char in _FRONT_VOWELS:
+                if prev != "s":
+                    key.append("S")
+            else:
+                key.append("K")
+        elif char == "d":
+            if next_char == "g" and after_next in _FRONT_VOWELS:
+                key.append("J")
+                step = 2
+            else:
+                key.append("T")
+        elif char == "g":
+            if next_char == "h" and after_next and after_next not in _VOWELS:
+                step = 2
+            elif next_char == "n" and (i + 2 == length or word[i + 2:] == "ed"):
+                pass
+            elif next_char in _FRONT_VOWELS:
+                key.append("J")
+            else:
+                key.append("K")
+        elif char == "h":
+            if next_char in _VOWELS and (not prev or prev not in "csptg"):
+                key.append("H")
+        elif char == "k":
+            if prev != "c":
+                key.append("K")
+        elif char == "p":
+            if next_char == "h":
+                key.append("F")
+                step = 2
+            else:
+                key.append("P")
+        elif char == "s":
+            if next_char == "h":
+                key.append("X")
+                step = 2
+            elif next_char == "i" and after_next in ("o", "a"):
+                key.append("X")
+            else:
+                key.append("S")
+        elif char == "t":
+            if next_char == "i" and after_next in ("o", "a"):
+                key.append("X")
+            elif next_char == "h":
+                key.append("0")
+                step = 2
+            elif not (next_char == "c" and after_next == "h"):
+                key.append("T")
+        elif char in ("w", "y"):
+            if next_char in _VOWELS:
+                key.append(char.upper())
+        elif char == "x":
+            key.append("KS")
+        else:
+            key.append(_SIMPLE_CONSONANTS.get(char, ""))
+        i += step
+    # 合并相邻重复的音，如exception中x与c的S
+    encoded = "".join(key)
+    return "".join(
+        code for index, code in enumerate(encoded)
+        if index == 0 or code != encoded[index - 1]
+    )
@@ -0,0 +1,34 @@
+#!/usr/bin/env python
+"""填空题回填脚本 - 为已有单词生成填空题"""
+
+import argparse
+import sys
+from pathlib import Path
+
+# 添加项目根目录到Python路径
+sys.path.append(str(Path(__file__).parent))
+
+from sqlmodel import Session
+from app.db.database import engine, create_db_and_tables
+from app.services.cloze_service import ClozeService
+from loguru import logger
+
+
+def backfill_cloze(batch_size: int, rebuild: bool):
+    """为已有单词回填填空题"""
+    logger.info("🔄 开始回填填空题...")
+    
+    create_db_and_tables()
+    with Session(engine) as session:
+        processed = ClozeService(session).backfill(batch_size=batch_size, only_missing=not rebuild)
+    
+    logger.info(f"🎉 填空题回填完成，共处理 {processed} 个单词")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="为已有单词回填填空题")
+    parser.add_argument("--batch-size", type=int, default=500, help="每批处理的单词数")
+    parser.add_argument("--rebuild", action="store_true", help="重新生成所有单词的填空题")
+    args = parser.parse_args()
+    
+    backfill_cloze(args.batch_size, args.rebuild)
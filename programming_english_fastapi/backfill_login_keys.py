@@ -0,0 +1,33 @@
+#!/usr/bin/env python
+"""登录键回填脚本 - 为已有用户生成小写的用户名/邮箱登录键（应用启动时也会自动执行）"""
+
+import sys
+from pathlib import Path
+
+# 添加项目根目录到Python路径
+sys.path.append(str(Path(__file__).parent))
+
+from sqlmodel import Session
+from app.core.initialization import ensure_login_key_columns
+from app.db.database import engine, create_db_and_tables
+from app.services.user_service import UserService
+from loguru import logger
+
+
+def backfill_login_keys():
+    """回填登录键并创建唯一索引，存在仅大小写不同的重复时报告并以非零状态退出"""
+    logger.info("🔄 开始回填登录键...")
+    
+    create_db_and_tables()
+    ensure_login_key_columns()
+    with Session(engine) as session:
+        processed, conflicts = UserService(session).backfill_login_keys()
+    
+    logger.info(f"🎉 登录键回填完成，共处理 {processed} 个用户")
+    if conflicts:
+        logger.error(f"❌ 以下用户的用户名或邮箱与其他用户仅大小写不同，请先人工合并: {conflicts}")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    backfill_login_keys()
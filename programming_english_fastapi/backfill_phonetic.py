@@ -0,0 +1,47 @@
+#!/usr/bin/env python
+"""语音键回填脚本 - 为已有单词计算语音键"""
+
+import argparse
+import sys
+from pathlib import Path
+
+# 添加项目根目录到Python路径
+sys.path.append(str(Path(__file__).parent))
+
+from sqlalchemy import inspect, text
+from sqlmodel import Session
+from app.db.database import engine, create_db_and_tables
+from app.services.word_service import WordService
+from loguru import logger
+
+
+def ensure_phonetic_column():
+    """旧数据库的word表没有phonetic_key列时补建列和索引"""
+    columns = {column["name"] for column in inspect(engine).get_columns("word")}
+    if "phonetic_key" in columns:
+        return
+    with engine.begin() as connection:
+        connection.execute(text("ALTER TABLE word ADD COLUMN phonetic_key VARCHAR"))
+        connection.execute(text("CREATE INDEX IF NOT EXISTS ix_word_phonetic_key ON word (phonetic_key)"))
+    logger.info("✅ 已为word表添加phonetic_key列")
+
+
+def backfill_phonetic(batch_size: int, rebuild: bool):
+    """为已有单词回填语音键"""
+    logger.info("🔄 开始回填语音键...")
+    
+    create_db_and_tables()
+    ensure_phonetic_column()
+    with Session(engine) as session:
+        processed = WordService(session).backfill_phonetic_keys(batch_size=batch_size, only_missing=not rebuild)
+    
+    logger.info(f"🎉 语音键回填完成，共处理 {processed} 个单词")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="为已有单词回填语音键")
+    parser.add_argument("--batch-size", type=int, default=500, help="每批处理的单词数")
+    parser.add_argument("--rebuild", action="store_true", help="重新计算所有单词的语音键")
+    args = parser.parse_args()
+    
+    backfill_phonetic(args.batch_size, args.rebuild)
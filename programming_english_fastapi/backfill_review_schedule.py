@@ -0,0 +1,67 @@
+#!/usr/bin/env python
+"""复习计划回填脚本 - 为已有学习记录补建并计算下次复习时间和更新时间"""
+
+import argparse
+import sys
+from pathlib import Path
+
+# 添加项目根目录到Python路径
+sys.path.append(str(Path(__file__).parent))
+
+from sqlalchemy import inspect, text
+from sqlmodel import Session
+from app.db.database import engine, create_db_and_tables
+from app.services.learning_service import LearningService
+from loguru import logger
+
+# 列名 -> 补建后用于创建索引的语句
+REVIEW_SCHEDULE_INDEXES = {
+    "next_review_at": [
+        "CREATE INDEX IF NOT EXISTS ix_learningrecord_user_next_review ON learningrecord (user_id, next_review_at)",
+        "CREATE INDEX IF NOT EXISTS ix_learningrecord_next_review_user ON learningrecord (next_review_at, user_id)",
+    ],
+    "updated_at": [
+        "CREATE INDEX IF NOT EXISTS ix_learningrecord_user_updated ON learningrecord (user_id, updated_at)",
+    ],
+}
+
+
+def ensure_review_schedule_columns():
+    """旧数据库的learningrecord表没有next_review_at/updated_at列时补建列和索引"""
+    columns = {column["name"] for column in inspect(engine).get_columns("learningrecord")}
+    with engine.begin() as connection:
+        for column, indexes in REVIEW_SCHEDULE_INDEXES.items():
+            if column not in columns:
+                connection.execute(text(f"ALTER TABLE learningrecord ADD COLUMN {column} DATETIME"))
+                logger.info(f"✅ 已为learningrecord表添加{column}列")
+            for statement in indexes:
+                connection.execute(text(statement))
+        # 没有更新时间的旧记录以上次复习时间为准，增量同步会把它们视为已同步过的数据
+        updated = connection.execute(text(
+            "UPDATE learningrecord SET updated_at = COALESCE(last_reviewed, created_at) WHERE updated_at IS NULL"
+        )).rowcount
+    if updated:
+        logger.info(f"✅ 已为 {updated} 条学习记录回填updated_at")
+
+
+def backfill_review_schedule(batch_size: int, rebuild: bool):
+    """为已有学习记录回填下次复习时间"""
+    logger.info("🔄 开始回填复习计划...")
+    
+    create_db_and_tables()
+    ensure_review_schedule_columns()
+    with Session(engine) as session:
+        processed = LearningService(session).backfill_review_schedule(
+            batch_size=batch_size, only_missing=not rebuild
+        )
+    
+    logger.info(f"🎉 复习计划回填完成，共处理 {processed} 条学习记录")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="为已有学习记录回填下次复习时间")
+    parser.add_argument("--batch-size", type=int, default=500, help="每批处理的记录数")
+    parser.add_argument("--rebuild", action="store_true", help="按当前复习间隔重新计算所有记录的下次复习时间")
+    args = parser.parse_args()
+    
+    backfill_review_schedule(args.batch_size, args.rebuild)
@@ -0,0 +1,94 @@
+#!/usr/bin/env python
+"""成就引擎基准测试 - 100条规则、大量复习事件下的增量评估与全量检查对比"""
+
+import argparse
+import random
+import sys
+import time
+from pathlib import Path
+
+# 添加项目根目录到Python路径
+sys.path.append(str(Path(__file__).parent.parent))
+
+from app.services.achievement_service import (
+    AchievementEngine, AchievementRule, REVIEWS, CORRECT, LEARNED, MASTERED, STREAK, category_counter
+)
+from app.models.word import Category
+
+COUNTERS = [REVIEWS, CORRECT, LEARNED, MASTERED, STREAK] + [category_counter(category) for category in Category]
+
+
+def build_rules(count: int):
+    """生成count条规则：大部分为阈值规则，每10条中有1条复合规则"""
+    rules = []
+    for index in range(count):
+        if index % 10 == 9:
+            first, second = COUNTERS[index % len(COUNTERS)], COUNTERS[(index + 3) % len(COUNTERS)]
+            limit = index
+            rules.append(AchievementRule(
+                f"combo_{index}", f"combo_{index}", "", depends_on=(first, second),
+                check=lambda counters, a=first, b=second, n=limit: counters.get(a, 0) + counters.get(b, 0) >= n
+            ))
+        else:
+            counter = COUNTERS[index % len(COUNTERS)]
+            rules.append(AchievementRule(
+                f"rule_{index}", f"rule_{index}", "", counter=counter, threshold=(index + 1) * 7
+            ))
+    return rules
+
+
+def simulate(engine, events, users, incremental: bool):
+    """回放复习事件，返回(耗时秒, 解锁数)"""
+    counters = [dict() for _ in range(users)]
+    unlocked = [set() for _ in range(users)]
+    rules = list(engine.rules.values())
+    total = 0
+    start = time.perf_counter()
+    for user, correct, learned, category in events:
+        state = counters[user]
+        deltas = {REVIEWS: 1}
+        if correct:
+            deltas[CORRECT] = 1
+        if learned:
+            deltas[LEARNED] = 1
+            deltas[category] = 1
+        changes = {name: (state.get(name, 0), state.get(name, 0) + delta) for name, delta in deltas.items()}
+        for name, (_, value) in changes.items():
+            state[name] = value
+
+        if incremental:
+            codes = engine.evaluate(changes, state, unlocked[user])
+        else:
+            codes = [rule.code for rule in rules if rule.code not in unlocked[user] and rule.is_satisfied(state)]
+        unlocked[user].update(codes)
+        total += len(codes)
+    return time.perf_counter() - start, total
+
+
+def main():
+    parser = argparse.ArgumentParser(description="成就引擎基准测试")
+    parser.add_argument("--rules", type=int, default=100, help="规则数量")
+    parser.add_argument("--events", type=int, default=200000, help="复习事件数量")
+    parser.add_argument("--users", type=int, default=1000, help="用户数量")
+    args = parser.parse_args()
+
+    rng = random.Random(42)
+    categories = [category_counter(category) for category in Category]
+    events = [
+        (rng.randrange(args.users), rng.random() < 0.8, rng.random() < 0.3, rng.choice(categories))
+        for _ in range(args.events)
+    ]
+    engine = AchievementEngine(build_rules(args.rules))
+
+    incremental_time, incremental_unlocks = simulate(engine, events, args.users, incremental=True)
+    full_time, full_unlocks = simulate(engine, events, args.users, incremental=False)
+    assert incremental_unlocks == full_unlocks, "增量评估与全量检查的解锁结果不一致"
+
+    print(f"规则数: {args.rules}  事件数: {args.events}  用户数: {args.users}  解锁数: {incremental_unlocks}")
+    print(f"增量评估: {incremental_time:.3f}s  ({args.events / incremental_time:,.0f} 事件/秒)")
+    print(f"全量检查: {full_time:.3f}s  ({args.events / full_time:,.0f} 事件/秒)")
+    print(f"加速比: {full_time / incremental_time:.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,90 @@
+#!/usr/bin/env python
+"""密码哈希基准测试 - 在并发登录压力下扫描哈希成本，找出满足p99延迟预算的最大成本"""
+
+import argparse
+import asyncio
+import sys
+import time
+from pathlib import Path
+
+# 添加项目根目录到Python路径
+sys.path.append(str(Path(__file__).parent.parent))
+
+from app.core.config import config
+from app.core.hashing import HashingExecutor, PasswordHasher
+
+
+def percentile(samples, fraction: float) -> float:
+    """返回样本的分位数（最近秩法）"""
+    ordered = sorted(samples)
+    index = min(len(ordered) - 1, max(0, int(round(fraction * len(ordered))) - 1))
+    return ordered[index]
+
+
+async def login_storm(executor: HashingExecutor, hashed: str, logins: int, concurrency: int):
+    """以固定并发量回放登录验证，返回每次登录的耗时（毫秒，含排队时间）"""
+    semaphore = asyncio.Semaphore(concurrency)
+    latencies = []
+
+    async def one_login():
+        async with semaphore:
+            start = time.perf_counter()
+            assert await executor.verify_async("correct horse battery staple", hashed)
+            latencies.append((time.perf_counter() - start) * 1000)
+
+    await asyncio.gather(*(one_login() for _ in range(logins)))
+    return latencies
+
+
+def measure(hasher: PasswordHasher, workers: int, logins: int, concurrency: int):
+    """测量单个成本设置下的p50/p99登录延迟"""
+    executor = HashingExecutor(hasher, max_workers=workers, max_pending=concurrency)
+    hashed = hasher.hash("correct horse battery staple")
+    try:
+        latencies = asyncio.run(login_storm(executor, hashed, logins, concurrency))
+    finally:
+        executor.shutdown()
+    return percentile(latencies, 0.5), percentile(latencies, 0.99)
+
+
+def candidates(algorithm: str):
+    """按成本递增生成候选哈希器及其描述"""
+    if algorithm == "scrypt":
+        for exponent in range(12, 18):
+            yield f"n=2^{exponent}", PasswordHasher("scrypt", scrypt_n=2 ** exponent)
+    else:
+        for iterations in (100000, 200000, 400000, 600000, 1000000, 2000000):
+            yield f"i={iterations}", PasswordHasher("pbkdf2_sha256", pbkdf2_iterations=iterations)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="密码哈希成本基准测试")
+    parser.add_argument("--algorithm", default=config.get('password_hashing.algorithm', 'scrypt'),
+                        choices=["scrypt", "pbkdf2_sha256"], help="哈希算法")
+    parser.add_argument("--budget-ms", type=float, default=config.get('password_hashing.p99_budget_ms', 250),
+                        help="登录p99延迟预算（毫秒）")
+    parser.add_argument("--workers", type=int, default=config.get('password_hashing.max_workers', 4),
+                        help="哈希线程池大小")
+    parser.add_argument("--concurrency", type=int, default=8, help="并发登录数")
+    parser.add_argument("--logins", type=int, default=80, help="每个成本设置的登录次数")
+    args = parser.parse_args()
+
+    print(f"算法: {args.algorithm}  线程数: {args.workers}  并发: {args.concurrency}  预算: p99 <= {args.budget_ms:.0f}ms")
+    best = None
+    for label, hasher in candidates(args.algorithm):
+        p50, p99 = measure(hasher, args.workers, args.logins, args.concurrency)
+        within = p99 <= args.budget_ms
+        print(f"  {label:<12} p50={p50:8.1f}ms  p99={p99:8.1f}ms  {'✅' if within else '❌'}")
+        if not within:
+            # 成本单调递增，超出预算后无需继续
+            break
+        best = label
+
+    if best:
+        print(f"🎯 满足预算的最大成本: {best}")
+    else:
+        print("⚠️ 没有成本设置满足预算，请增加线程数或放宽预算")
+
+
+if __name__ == "__main__":
+    main()
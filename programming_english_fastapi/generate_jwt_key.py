@@ -0,0 +1,68 @@
+#!/usr/bin/env python
+"""JWT密钥生成脚本 - 为密钥轮换生成新的签名密钥对"""
+
+import argparse
+import os
+import sys
+from datetime import datetime
+from pathlib import Path
+
+# 添加项目根目录到Python路径
+sys.path.append(str(Path(__file__).parent))
+
+from app.core.config import config
+from app.core.tokens import PRIVATE_KEY_SUFFIX, PUBLIC_KEY_SUFFIX
+from loguru import logger
+
+
+def generate_key_pair(algorithm: str):
+    """生成私钥和公钥的PEM内容"""
+    from cryptography.hazmat.primitives import serialization
+    from cryptography.hazmat.primitives.asymmetric import ed25519, rsa
+
+    if algorithm == "EdDSA":
+        private_key = ed25519.Ed25519PrivateKey.generate()
+    elif algorithm == "RS256":
+        private_key = rsa.generate_private_key(public_exponent=65537, key_size=2048)
+    else:
+        raise ValueError(f"不支持的密钥算法: {algorithm}")
+
+    private_pem = private_key.private_bytes(
+        serialization.Encoding.PEM, serialization.PrivateFormat.PKCS8, serialization.NoEncryption()
+    )
+    public_pem = private_key.public_key().public_bytes(
+        serialization.Encoding.PEM, serialization.PublicFormat.SubjectPublicKeyInfo
+    )
+    return private_pem, public_pem
+
+
+def generate_jwt_key(directory: str, algorithm: str, kid: str):
+    """在密钥目录中写入 <kid>.pem 与 <kid>.pub"""
+    key_dir = Path(directory)
+    key_dir.mkdir(parents=True, exist_ok=True)
+    private_path = key_dir / f"{kid}{PRIVATE_KEY_SUFFIX}"
+    public_path = key_dir / f"{kid}{PUBLIC_KEY_SUFFIX}"
+    if private_path.exists() or public_path.exists():
+        logger.error(f"❌ 密钥 {kid} 已存在")
+        sys.exit(1)
+
+    private_pem, public_pem = generate_key_pair(algorithm)
+    private_path.write_bytes(private_pem)
+    os.chmod(private_path, 0o600)
+    public_path.write_bytes(public_pem)
+
+    logger.info(f"🔑 已生成 {algorithm} 密钥 {kid}")
+    logger.info(f"   私钥（仅签发节点）: {private_path}")
+    logger.info(f"   公钥（分发到所有节点）: {public_path}")
+    logger.info("👉 公钥分发完成后，将签发节点的 security.keys.active_kid 设置为新kid")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="生成JWT签名密钥对")
+    parser.add_argument("--directory", default=config.get('security.keys.directory') or "keys", help="密钥目录")
+    parser.add_argument("--algorithm", default=config.get('security.keys.algorithm', 'EdDSA'),
+                        choices=["EdDSA", "RS256"], help="签名算法")
+    parser.add_argument("--kid", default=datetime.utcnow().strftime("%Y%m%d%H%M"), help="密钥ID")
+    args = parser.parse_args()
+
+    generate_jwt_key(args.directory, args.algorithm, args.kid)
@@ -0,0 +1,41 @@
+#!/usr/bin/env python
+"""用户批量导入脚本 - 从CSV创建用户并输出逐行结果"""
+
+import argparse
+import sys
+from pathlib import Path
+
+# 添加项目根目录到Python路径
+sys.path.append(str(Path(__file__).parent))
+
+from sqlmodel import Session
+from app.db.database import engine, create_db_and_tables
+from app.services.user_import_service import UserImportService
+from loguru import logger
+
+
+def import_users(source: Path, output: Path, chunk_size: int):
+    """从CSV批量导入用户"""
+    logger.info(f"🔄 开始导入用户: {source}")
+    
+    create_db_and_tables()
+    with open(source, newline="", encoding="utf-8-sig") as source_file, \
+            open(output, "w", newline="", encoding="utf-8") as result_file, \
+            Session(engine) as session:
+        summary = UserImportService(session, chunk_size=chunk_size).import_csv(source_file, result_file)
+    
+    logger.info(
+        f"🎉 导入完成: 共 {summary.total} 行，创建 {summary.created}，重复 {summary.duplicate}，"
+        f"无效 {summary.invalid}，耗时 {summary.seconds:.1f} 秒，{summary.users_per_second:.1f} 用户/秒"
+    )
+    logger.info(f"📄 逐行结果: {output}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="从CSV批量导入用户")
+    parser.add_argument("csv", type=Path, help="CSV文件，列为username、email、password、full_name（可选）")
+    parser.add_argument("--output", type=Path, help="结果文件路径，默认为<csv>.result.csv")
+    parser.add_argument("--chunk-size", type=int, default=None, help="每块的行数")
+    args = parser.parse_args()
+    
+    import_users(args.csv, args.output or args.csv.with_suffix(".result.csv"), args.chunk_size)
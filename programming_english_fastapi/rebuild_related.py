@@ -0,0 +1,30 @@
+#!/usr/bin/env python
+"""相关词全量重建脚本 - 离线计算全部单词的TF-IDF近邻"""
+
+import sys
+import time
+from pathlib import Path
+
+# 添加项目根目录到Python路径
+sys.path.append(str(Path(__file__).parent))
+
+from sqlmodel import Session
+from app.db.database import engine, create_db_and_tables
+from app.services.related_service import RelatedService
+from loguru import logger
+
+
+def rebuild_related():
+    """全量重建相关词近邻表"""
+    logger.info("🔄 开始重建相关词...")
+    
+    create_db_and_tables()
+    start_time = time.time()
+    with Session(engine) as session:
+        count = RelatedService(session).rebuild_all()
+    
+    logger.info(f"🎉 相关词重建完成，共 {count} 个单词，耗时 {time.time() - start_time:.2f}s")
+
+
+if __name__ == "__main__":
+    rebuild_related()
@@ -0,0 +1,40 @@
+#!/usr/bin/env python
+"""复习提醒脚本 - 统计当天到期复习并发送提醒，适合由cron每日调度"""
+
+import argparse
+import sys
+from datetime import date
+from pathlib import Path
+from typing import Optional
+
+# 添加项目根目录到Python路径
+sys.path.append(str(Path(__file__).parent))
+
+from sqlmodel import Session
+from app.db.database import engine, create_db_and_tables
+from app.services.reminder_service import ReminderJob, ReminderNotifier, CHUNK_SIZE
+from loguru import logger
+
+
+def send_reminders(run_date: Optional[date], chunk_size: int, notify: bool):
+    """生成当天的复习提醒，按需发送"""
+    logger.info("🔄 开始生成复习提醒...")
+    
+    create_db_and_tables()
+    with Session(engine) as session:
+        run = ReminderJob(session, chunk_size=chunk_size).run(run_date)
+        logger.info(f"✅ {run.run_date} 提醒生成完成: {run.users} 个用户，耗时 {run.elapsed_seconds:.2f}s")
+        
+        if notify:
+            sent = ReminderNotifier(session).deliver()
+            logger.info(f"🎉 已发送 {sent} 条提醒")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="统计到期复习并发送提醒（中断后重新执行会从游标继续）")
+    parser.add_argument("--date", type=date.fromisoformat, default=None, help="统计日期，格式YYYY-MM-DD，默认今天(UTC)")
+    parser.add_argument("--chunk-size", type=int, default=CHUNK_SIZE, help="每批扫描的记录数")
+    parser.add_argument("--no-notify", action="store_true", help="只写发件箱，不发送")
+    args = parser.parse_args()
+    
+    send_reminders(args.date, args.chunk_size, not args.no_notify)
@@ -41,6 +41,37 @@ def db_session() -> Generator[Session, None, None]:
         connection.close()
 
 
+@pytest.fixture(scope="function", autouse=True)
+def reset_caches():
+    """清空进程内缓存，避免事务回滚后ID复用读到上个测试的数据"""
+    from app.services.favorite_service import favorite_ids_cache
+    from app.services.word_service import word_cache, translation_pool_cache
+    from app.services.related_service import related_model
+    from app.services.word_index import word_indexes
+    from app.services.quiz_service import quiz_store
+    from app.services.user_service import principal_cache, unknown_login_cache
+    from app.utils.jwt_utils import token_cache
+    from app.services.token_service import revocation_list
+    from app.services.api_key_service import api_key_cache
+    from app.core.rate_limit import rate_limiter, login_guard
+    
+    caches = [favorite_ids_cache, word_cache, translation_pool_cache, principal_cache, token_cache,
+              unknown_login_cache, api_key_cache]
+    for cache in caches:
+        cache.clear()
+    related_model.reset()
+    word_indexes.reset()
+    quiz_store.clear()
+    revocation_list.reset()
+    rate_limiter.store.clear()
+    login_guard.clear()
+    yield
+    for cache in caches:
+        cache.clear()
+    related_model.reset()
+    word_indexes.reset()
+
+
 @pytest.fixture(scope="function")
 def client(db_session: Session) -> Generator[TestClient, None, None]:
     """创建测试客户端"""
@@ -89,4 +120,42 @@ def test_word_data():
         "example": "def my_function(): print('Hello')",
         "category": "basic",
         "difficulty": "beginner"
-    }
\ No newline at end of file
+    }
+
+@pytest.fixture(scope="function")
+def user(user_service, test_user_data: dict):
+    """创建测试用户"""
+    from app.models.user import UserCreate
+    return user_service.create_user(UserCreate(**test_user_data))
+
+
+@pytest.fixture(scope="function")
+def make_words(db_session: Session):
+    """
+    创建按序号命名的测试单词（term0、term1……）
+
+    返回的函数接受单词数量和可选的逐个分类列表。
+    """
+    from app.models.word import WordCreate
+    from app.services.word_service import WordService
+
+    def make(count: int, categories=None):
+        word_service = WordService(db_session)
+        return [
+            word_service.create_word(WordCreate(
+                word=f"term{i}",
+                translation=f"术语{i}",
+                definition=f"definition {i}",
+                example=f"term{i}()",
+                **({"category": categories[i]} if categories is not None else {})
+            ))
+            for i in range(count)
+        ]
+
+    return make
+
+
+@pytest.fixture(scope="function")
+def words(make_words):
+    """创建5个测试单词"""
+    return make_words(5)
@@ -0,0 +1,145 @@
+"""成就服务测试模块"""
+
+import pytest
+from datetime import datetime, timedelta
+from fastapi.testclient import TestClient
+from sqlmodel import Session
+
+from app.models.word import Category
+from app.services.achievement_service import (
+    AchievementEngine, AchievementRule, AchievementService, REVIEWS, STREAK, MASTERED
+)
+from app.services.learning_service import LearningService
+
+START = datetime(2025, 1, 1, 9)
+
+
+@pytest.fixture
+def words(make_words):
+    """每个分类各创建一个测试单词"""
+    return make_words(len(Category), list(Category))
+
+
+class TestAchievementEngine:
+    """成就规则引擎测试类"""
+    
+    def test_threshold_crossing(self):
+        """测试只返回阈值落在(旧值, 新值]内的规则"""
+        engine = AchievementEngine([
+            AchievementRule("r1", "r1", "", counter=REVIEWS, threshold=1),
+            AchievementRule("r5", "r5", "", counter=REVIEWS, threshold=5),
+            AchievementRule("r10", "r10", "", counter=REVIEWS, threshold=10),
+        ])
+        
+        assert engine.evaluate({REVIEWS: (0, 1)}, {REVIEWS: 1}) == ["r1"]
+        assert engine.evaluate({REVIEWS: (1, 2)}, {REVIEWS: 2}) == []
+        assert engine.evaluate({REVIEWS: (4, 10)}, {REVIEWS: 10}) == ["r5", "r10"]
+        assert engine.evaluate({REVIEWS: (4, 5)}, {REVIEWS: 5}, unlocked={"r5"}) == []
+    
+    def test_composite_rule_only_on_dependency_change(self):
+        """测试复合规则只在依赖的计数器变化时判定"""
+        calls = []
+        
+        def check(counters):
+            calls.append(dict(counters))
+            return counters.get(STREAK, 0) >= 2 and counters.get(MASTERED, 0) >= 1
+        
+        engine = AchievementEngine([
+            AchievementRule("combo", "combo", "", depends_on=(STREAK, MASTERED), check=check)
+        ])
+        
+        assert engine.evaluate({REVIEWS: (0, 1)}, {REVIEWS: 1, STREAK: 2, MASTERED: 1}) == []
+        assert calls == []
+        assert engine.evaluate({STREAK: (1, 2)}, {STREAK: 2, MASTERED: 1}) == ["combo"]
+    
+    def test_invalid_rules(self):
+        """测试非法规则定义"""
+        with pytest.raises(ValueError):
+            AchievementRule("bad", "bad", "")
+        with pytest.raises(ValueError):
+            AchievementEngine([
+                AchievementRule("dup", "dup", "", counter=REVIEWS, threshold=1),
+                AchievementRule("dup", "dup", "", counter=REVIEWS, threshold=2),
+            ])
+
+
+class TestAchievementService:
+    """成就服务测试类"""
+    
+    def test_unlock_on_review_once(self, db_session: Session, user, words):
+        """测试复习事件解锁成就且只解锁一次"""
+        learning_service = LearningService(db_session)
+        
+        learning_service.record_review(user.id, words[0].id, True, reviewed_at=START)
+        assert learning_service.unlocked_achievements == ["first_review"]
+        
+        learning_service.record_review(user.id, words[0].id, True, reviewed_at=START)
+        assert learning_service.unlocked_achievements == []
+        
+        counters = AchievementService(db_session).get_counters(user.id)
+        assert counters["reviews"] == 2
+        assert counters["learned"] == 1
+        assert counters["streak"] == 1
+    
+    def test_streak_and_category_coverage(self, db_session: Session, user, words):
+        """测试连续天数与分类覆盖"""
+        learning_service = LearningService(db_session)
+        unlocked = []
+        
+        # When: 连续3天，每天学习不同分类的单词
+        for day, word in enumerate(words):
+            learning_service.record_review(user.id, word.id, True, reviewed_at=START + timedelta(days=day % 3))
+            unlocked.extend(learning_service.unlocked_achievements)
+        
+        # Then: 解锁连续3天和全分类覆盖
+        assert "streak_3" in unlocked
+        assert "all_categories" in unlocked
+        
+        # When: 中断一天后再复习
+        learning_service.record_review(user.id, words[0].id, True, reviewed_at=START + timedelta(days=5))
+        assert AchievementService(db_session).get_counters(user.id)["streak"] == 1
+    
+    def test_out_of_order_review_keeps_streak(self, db_session: Session, user, words):
+        """测试晚到的旧复习不重置连续天数"""
+        learning_service = LearningService(db_session)
+        learning_service.record_review(user.id, words[0].id, True, reviewed_at=START)
+        learning_service.record_review(user.id, words[1].id, True, reviewed_at=START + timedelta(days=1))
+        
+        # When: 离线设备上传前一天的复习
+        learning_service.record_review(user.id, words[2].id, True, reviewed_at=START)
+        
+        # Then: 复习数累加，连续天数和最近复习日不变
+        counters = AchievementService(db_session).get_counters(user.id)
+        assert counters["reviews"] == 3
+        assert counters["streak"] == 2
+        assert counters["last_review_day"] == (START + timedelta(days=1)).date().toordinal()
+    
+    def test_mastered_counter_follows_demotion(self, db_session: Session, user, words):
+        """测试掌握数随降级减少"""
+        learning_service = LearningService(db_session)
+        for _ in range(5):
+            learning_service.record_review(user.id, words[0].id, True, reviewed_at=START)
+        assert AchievementService(db_session).get_counters(user.id)["mastered"] == 1
+        
+        learning_service.record_review(user.id, words[0].id, False, reviewed_at=START)
+        
+        assert AchievementService(db_session).get_counters(user.id)["mastered"] == 0
+
+
+class TestAchievementAPI:
+    """成就API测试类"""
+    
+    def test_list_achievements(self, client: TestClient, db_session: Session, user, words, test_user_data: dict):
+        """测试获取成就列表"""
+        LearningService(db_session).record_review(user.id, words[0].id, True)
+        token = client.post("/api/v1/auth/login", json={
+            "username": test_user_data["username"],
+            "password": test_user_data["password"]
+        }).json()["access_token"]
+        
+        response = client.get("/api/v1/me/achievements", headers={"Authorization": f"Bearer {token}"})
+        
+        assert response.status_code == 200
+        achievements = {item["code"]: item for item in response.json()["data"]}
+        assert achievements["first_review"]["unlocked"] is True
+        assert achievements["streak_7"]["unlocked"] is False
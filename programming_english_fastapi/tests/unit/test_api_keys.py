@@ -0,0 +1,159 @@
+"""API密钥测试模块"""
+
+import pytest
+from datetime import datetime, timedelta
+from fastapi.testclient import TestClient
+from sqlalchemy import event
+from sqlmodel import Session
+
+from app.models.api_key import ApiKey, ApiKeyCreate
+from app.models.user import UserCreate
+from app.services.api_key_service import ApiKeyService, api_key_cache, hash_api_key
+from app.services.user_service import UserService
+
+
+@pytest.fixture
+def api_key_service(db_session: Session):
+    """创建API密钥服务实例"""
+    return ApiKeyService(db_session)
+
+
+@pytest.fixture
+def auth_headers(client: TestClient, user, test_user_data: dict):
+    """访问令牌请求头"""
+    token = client.post("/api/v1/auth/login", json={
+        "username": test_user_data["username"],
+        "password": test_user_data["password"]
+    }).json()["access_token"]
+    return {"Authorization": f"Bearer {token}"}
+
+
+class TestApiKeyService:
+    """API密钥服务测试类"""
+    
+    def test_create_stores_only_hash(self, api_key_service: ApiKeyService, user):
+        """测试只保存密钥摘要"""
+        api_key, raw_key = api_key_service.create_key(user.id, ApiKeyCreate(name="importer", scopes=["words:write"]))
+        
+        assert raw_key.startswith("pek_")
+        assert api_key.key_hash == hash_api_key(raw_key)
+        assert raw_key not in (api_key.key_hash, api_key.prefix)
+        assert raw_key.startswith(api_key.prefix)
+    
+    def test_unknown_scope_rejected(self, api_key_service: ApiKeyService, user):
+        """测试拒绝未知的权限范围"""
+        with pytest.raises(ValueError, match="未知的权限范围"):
+            api_key_service.create_key(user.id, ApiKeyCreate(name="bad", scopes=["root"]))
+    
+    def test_authenticate_cached(self, db_session: Session, api_key_service: ApiKeyService, user):
+        """测试验证结果缓存后不再访问数据库"""
+        # Given: 已验证过一次的密钥
+        _, raw_key = api_key_service.create_key(user.id, ApiKeyCreate(name="job", scopes=["words:write"]))
+        first = api_key_service.authenticate(raw_key)
+        statements = []
+        connection = db_session.connection()
+        listener = lambda *args: statements.append(args[2])
+        event.listen(connection, "before_cursor_execute", listener)
+        
+        # When: 再次验证
+        try:
+            second = api_key_service.authenticate(raw_key)
+        finally:
+            event.remove(connection, "before_cursor_execute", listener)
+        
+        # Then: 不执行SQL，返回带权限范围的用户视图
+        assert statements == []
+        assert second == first
+        assert second.id == user.id
+        assert second.scopes == frozenset({"words:write"})
+    
+    def test_revoked_and_expired_keys(self, db_session: Session, api_key_service: ApiKeyService, user):
+        """测试吊销或过期的密钥无法使用"""
+        revoked, revoked_raw = api_key_service.create_key(user.id, ApiKeyCreate(name="old"))
+        assert api_key_service.authenticate(revoked_raw) is not None
+        
+        assert api_key_service.revoke_key(user.id, revoked.id)
+        expired = ApiKey(user_id=user.id, name="expired", prefix="pek_x", key_hash=hash_api_key("pek_x"),
+                         expires_at=datetime.utcnow() - timedelta(seconds=1))
+        db_session.add(expired)
+        db_session.commit()
+        
+        assert hash_api_key(revoked_raw) not in api_key_cache
+        assert api_key_service.authenticate(revoked_raw) is None
+        assert api_key_service.authenticate("pek_x") is None
+        assert api_key_service.authenticate("pek_unknown") is None
+    
+    def test_revoke_other_users_key(self, api_key_service: ApiKeyService, user, user_service: UserService):
+        """测试不能吊销其他用户的密钥"""
+        other = user_service.create_user(UserCreate(username="other", email="o@example.com", password="secret123"))
+        api_key, _ = api_key_service.create_key(user.id, ApiKeyCreate(name="mine"))
+        
+        assert not api_key_service.revoke_key(other.id, api_key.id)
+    
+    def test_deactivated_owner(self, api_key_service: ApiKeyService, user, user_service: UserService):
+        """测试密钥所属用户被禁用后立即失效"""
+        _, raw_key = api_key_service.create_key(user.id, ApiKeyCreate(name="job"))
+        assert api_key_service.authenticate(raw_key).is_active
+        
+        user_service.deactivate_user(user.id)
+        
+        assert not api_key_service.authenticate(raw_key).is_active
+
+
+class TestApiKeyAPI:
+    """API密钥接口测试类"""
+    
+    def test_key_lifecycle(self, client: TestClient, auth_headers: dict, test_word_data: dict):
+        """测试创建密钥、用密钥写入单词、吊销密钥"""
+        # Given: 创建具有words:write范围的密钥
+        response = client.post("/api/v1/me/api-keys", json={"name": "importer", "scopes": ["words:write"]},
+                               headers=auth_headers)
+        assert response.status_code == 201
+        data = response.json()["data"]
+        key_headers = {"X-API-Key": data["key"]}
+        
+        # When: 使用密钥创建单词
+        created = client.post("/api/v1/words/", json=test_word_data, headers=key_headers)
+        
+        # Then: 创建成功，列表中不返回明文
+        assert created.status_code == 200
+        listed = client.get("/api/v1/me/api-keys", headers=auth_headers).json()["data"]
+        assert [item["name"] for item in listed] == ["importer"]
+        assert "key" not in listed[0] and "key_hash" not in listed[0]
+        
+        # When: 吊销后再次使用
+        assert client.delete(f"/api/v1/me/api-keys/{data['id']}", headers=auth_headers).status_code == 200
+        
+        # Then: 返回401
+        assert client.delete(f"/api/v1/words/{created.json()['id']}", headers=key_headers).status_code == 401
+    
+    def test_scope_enforced(self, client: TestClient, auth_headers: dict, test_word_data: dict):
+        """测试缺少权限范围的密钥被拒绝，且不能管理密钥"""
+        raw_key = client.post("/api/v1/me/api-keys", json={"name": "reader"},
+                              headers=auth_headers).json()["data"]["key"]
+        key_headers = {"X-API-Key": raw_key}
+        
+        assert client.post("/api/v1/words/", json=test_word_data, headers=key_headers).status_code == 403
+        assert client.get("/api/v1/me/api-keys", headers=key_headers).status_code == 403
+        assert client.get("/api/v1/me/favorites/", headers=key_headers).status_code == 403
+    
+    def test_scopeless_key_denied_by_default(self, client: TestClient, auth_headers: dict):
+        """测试未声明权限范围的路由默认拒绝API密钥"""
+        # Given: 不带任何权限范围的密钥
+        raw_key = client.post("/api/v1/me/api-keys", json={"name": "analytics"},
+                              headers=auth_headers).json()["data"]["key"]
+        key_headers = {"X-API-Key": raw_key}
+        
+        # When: 访问学习记录接口
+        response = client.get("/api/v1/me/words", headers=key_headers)
+        
+        # Then: 返回403，而访问令牌仍可访问
+        assert response.status_code == 403
+        assert client.get("/api/v1/me/words", headers=auth_headers).status_code == 200
+        assert client.post("/api/v1/sync/reviews", json={"device_id": "job"}, headers=key_headers).status_code == 403
+    
+    def test_invalid_key(self, client: TestClient):
+        """测试无效密钥返回401"""
+        response = client.get("/api/v1/me/favorites/", headers={"X-API-Key": "pek_invalid"})
+        
+        assert response.status_code == 401
@@ -1,5 +1,6 @@
 """用户认证API测试模块"""
 
+import asyncio
 import pytest
 from fastapi.testclient import TestClient
 from sqlmodel import Session
@@ -33,6 +34,34 @@ class TestAuthAPI:
         assert data["token_type"] == "bearer"
         assert len(data["access_token"]) > 0  # JWT token不为空
     
+    def test_login_db_work_off_event_loop(self, client: TestClient, user_service: UserService,
+                                          test_user_data: dict, monkeypatch):
+        """测试登录的数据库查询不在事件循环线程中执行"""
+        # Given: 记录查询用户时是否处于事件循环中
+        user_service.create_user(UserCreate(**test_user_data))
+        lookup = UserService.get_user_by_login
+        on_event_loop = []
+        
+        def recording_lookup(self, identifier):
+            try:
+                asyncio.get_running_loop()
+                on_event_loop.append(True)
+            except RuntimeError:
+                on_event_loop.append(False)
+            return lookup(self, identifier)
+        
+        monkeypatch.setattr(UserService, "get_user_by_login", recording_lookup)
+        
+        # When: 登录
+        response = client.post("/api/v1/auth/login", json={
+            "username": test_user_data["username"],
+            "password": test_user_data["password"]
+        })
+        
+        # Then: 查询在线程池中执行
+        assert response.status_code == 200
+        assert on_event_loop == [False]
+    
     def test_login_with_username_success(self, client: TestClient, user_service: UserService, test_user_data: dict):
         """测试使用用户名登录成功"""
         # Given: 创建测试用户
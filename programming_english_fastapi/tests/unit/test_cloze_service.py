@@ -0,0 +1,83 @@
+"""填空题服务测试模块"""
+
+import pytest
+from fastapi.testclient import TestClient
+from sqlmodel import Session
+
+from app.models.exercise import ClozeExercise
+from app.models.word import WordCreate, WordUpdate
+from app.services.cloze_service import ClozeService
+from app.services.word_service import WordService
+
+
+@pytest.fixture
+def word(db_session: Session, test_word_data: dict):
+    """创建测试单词"""
+    return WordService(db_session).create_word(WordCreate(**test_word_data))
+
+
+class TestClozeService:
+    """填空题服务测试类"""
+    
+    def test_cloze_generated_on_create(self, db_session: Session, word):
+        """测试创建单词时生成填空题"""
+        exercises = ClozeService(db_session).get_for_word(word.id)
+        
+        assert len(exercises) == 1
+        assert exercises[0].answer == "function"
+        assert exercises[0].text == "def my_____(): print('Hello')"
+    
+    def test_cloze_regenerated_on_update(self, db_session: Session, word):
+        """测试修改示例时重新生成填空题"""
+        WordService(db_session).update_word(
+            word.id, WordUpdate(example="function a() {}; function b() {}")
+        )
+        
+        exercises = ClozeService(db_session).get_for_word(word.id)
+        
+        assert [exercise.span_start for exercise in exercises] == [0, 17]
+    
+    def test_cloze_deleted_with_word(self, db_session: Session, word):
+        """测试删除单词时删除填空题"""
+        word_id = word.id
+        WordService(db_session).delete_word(word_id)
+        
+        assert ClozeService(db_session).get_for_word(word_id) == []
+    
+    def test_backfill_only_missing(self, db_session: Session, word):
+        """测试回填只处理缺少填空题的单词"""
+        # Given: 删除已有填空题，模拟历史数据
+        cloze_service = ClozeService(db_session)
+        cloze_service.delete_for_word(word.id)
+        db_session.commit()
+        
+        # When: 回填两次
+        first = cloze_service.backfill(batch_size=1)
+        second = cloze_service.backfill(batch_size=1)
+        
+        # Then: 只在第一次生成
+        assert first >= 1
+        assert second == 0
+        assert len(cloze_service.get_for_word(word.id)) == 1
+
+
+class TestClozeAPI:
+    """填空题API测试类"""
+    
+    def test_get_and_check_cloze(self, client: TestClient, word):
+        """测试获取与检查填空题"""
+        response = client.get(f"/api/v1/words/{word.id}/cloze")
+        assert response.status_code == 200
+        assert len(response.json()) == 1
+        
+        response = client.post(f"/api/v1/words/{word.id}/cloze/check", json={"answer": " Function! "})
+        assert response.status_code == 200
+        assert response.json()["correct"] is True
+        
+        response = client.post(f"/api/v1/words/{word.id}/cloze/check", json={"answer": "method"})
+        assert response.json()["correct"] is False
+    
+    def test_check_missing_variant(self, client: TestClient, word):
+        """测试检查不存在的填空变体"""
+        response = client.post(f"/api/v1/words/{word.id}/cloze/check", json={"answer": "x", "variant": 5})
+        assert response.status_code == 404
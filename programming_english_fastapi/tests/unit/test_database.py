@@ -0,0 +1,33 @@
+"""数据库工具测试模块"""
+
+import pytest
+from sqlalchemy import create_mock_engine
+from sqlmodel import Session
+
+from app.db.database import insert_ignore
+from app.models.token import RevokedToken
+
+
+def compile_for(url: str) -> str:
+    """按数据库URL的方言编译忽略冲突的INSERT（不需要安装驱动）"""
+    engine = create_mock_engine(url, lambda *args, **kwargs: None)
+    statement = insert_ignore(Session(bind=engine), RevokedToken).values(jti="abc")
+    return str(statement.compile(dialect=engine.dialect))
+
+
+class TestInsertIgnore:
+    """忽略冲突的INSERT测试类"""
+    
+    @pytest.mark.parametrize("url", ["sqlite://", "postgresql://"])
+    def test_on_conflict_do_nothing(self, url: str):
+        """测试SQLite和PostgreSQL使用ON CONFLICT DO NOTHING"""
+        assert compile_for(url).endswith("ON CONFLICT DO NOTHING")
+    
+    def test_mysql_insert_ignore(self):
+        """测试MySQL使用INSERT IGNORE"""
+        assert compile_for("mysql://").startswith("INSERT IGNORE INTO revokedtoken")
+    
+    def test_unsupported_dialect(self):
+        """测试不支持的方言直接报错"""
+        with pytest.raises(NotImplementedError):
+            compile_for("oracle://")
@@ -0,0 +1,139 @@
+"""收藏服务测试模块"""
+
+import pytest
+from fastapi.testclient import TestClient
+from sqlmodel import Session
+
+from app.services.favorite_service import FavoriteService, favorite_ids_cache
+
+
+class TestFavoriteService:
+    """收藏服务测试类"""
+    
+    def test_add_favorite_idempotent(self, db_session: Session, user, words):
+        """测试重复收藏不会报错"""
+        # Given: 收藏服务
+        favorite_service = FavoriteService(db_session)
+        
+        # When: 同一单词收藏两次
+        favorite_service.add_favorite(user.id, words[0].id)
+        favorite_service.add_favorite(user.id, words[0].id)
+        
+        # Then: 只存在一条收藏
+        assert favorite_service.get_favorite_ids(user.id) == {words[0].id}
+    
+    def test_remove_favorite(self, db_session: Session, user, words):
+        """测试取消收藏"""
+        # Given: 已收藏的单词
+        favorite_service = FavoriteService(db_session)
+        favorite_service.add_favorite(user.id, words[0].id)
+        
+        # When: 取消收藏
+        removed = favorite_service.remove_favorite(user.id, words[0].id)
+        
+        # Then: 收藏集合为空，再次取消返回False
+        assert removed is True
+        assert favorite_service.get_favorite_ids(user.id) == frozenset()
+        assert favorite_service.remove_favorite(user.id, words[0].id) is False
+    
+    def test_list_favorites_keyset_pagination(self, db_session: Session, user, words):
+        """测试游标分页"""
+        # Given: 收藏全部5个单词
+        favorite_service = FavoriteService(db_session)
+        for word in words:
+            favorite_service.add_favorite(user.id, word.id)
+        
+        # When: 每页2条依次翻页
+        page1, cursor1 = favorite_service.list_favorites(user.id, limit=2)
+        page2, cursor2 = favorite_service.list_favorites(user.id, after=cursor1, limit=2)
+        page3, cursor3 = favorite_service.list_favorites(user.id, after=cursor2, limit=2)
+        
+        # Then: 覆盖全部单词且无重复
+        ids = [w.id for w in page1 + page2 + page3]
+        assert ids == sorted(w.id for w in words)
+        assert cursor1 == page1[-1].id
+        assert cursor3 is None
+    
+    def test_favorite_ids_cached_and_invalidated(self, db_session: Session, user, words):
+        """测试收藏ID集合缓存与失效"""
+        # Given: 已加载过的收藏集合
+        favorite_service = FavoriteService(db_session)
+        assert favorite_service.get_favorite_ids(user.id) == frozenset()
+        assert user.id in favorite_ids_cache
+        
+        # When: 添加收藏
+        favorite_service.add_favorite(user.id, words[1].id)
+        
+        # Then: 缓存失效后重新加载到最新数据
+        assert user.id not in favorite_ids_cache
+        assert favorite_service.get_favorite_ids(user.id) == {words[1].id}
+    
+    def test_annotate_favorites(self, db_session: Session, user, words):
+        """测试列表标注is_favorite"""
+        # Given: 收藏第一个单词
+        favorite_service = FavoriteService(db_session)
+        favorite_service.add_favorite(user.id, words[0].id)
+        
+        # When: 标注单词列表
+        annotated = favorite_service.annotate_favorites(user.id, words)
+        
+        # Then: 只有第一个单词被标注为收藏
+        assert [item["is_favorite"] for item in annotated] == [True, False, False, False, False]
+
+
+class TestFavoriteAPI:
+    """收藏API测试类"""
+    
+    def _login(self, client: TestClient, test_user_data: dict) -> dict:
+        response = client.post("/api/v1/auth/login", json={
+            "username": test_user_data["username"],
+            "password": test_user_data["password"]
+        })
+        return {"Authorization": f"Bearer {response.json()['access_token']}"}
+    
+    def test_add_list_remove_favorite(self, client: TestClient, user, words, test_user_data: dict):
+        """测试收藏的添加、列表与删除"""
+        # Given: 已登录用户
+        headers = self._login(client, test_user_data)
+        
+        # When: 收藏单词并获取列表
+        response = client.put(f"/api/v1/me/favorites/{words[2].id}", headers=headers)
+        assert response.status_code == 200
+        response = client.get("/api/v1/me/favorites/", headers=headers)
+        
+        # Then: 列表包含该单词
+        data = response.json()["data"]
+        assert [item["id"] for item in data["items"]] == [words[2].id]
+        assert data["items"][0]["is_favorite"] is True
+        assert data["has_next"] is False
+        
+        # When: 取消收藏
+        response = client.delete(f"/api/v1/me/favorites/{words[2].id}", headers=headers)
+        
+        # Then: 删除成功
+        assert response.status_code == 200
+    
+    def test_add_favorite_word_not_found(self, client: TestClient, user, test_user_data: dict):
+        """测试收藏不存在的单词"""
+        headers = self._login(client, test_user_data)
+        response = client.put("/api/v1/me/favorites/999999", headers=headers)
+        assert response.status_code == 404
+    
+    def test_word_list_with_favorite_flag(self, client: TestClient, user, words, test_user_data: dict):
+        """测试单词列表可选标注is_favorite"""
+        # Given: 收藏一个单词
+        headers = self._login(client, test_user_data)
+        client.put(f"/api/v1/me/favorites/{words[0].id}", headers=headers)
+        
+        # When: 带with_favorite请求单词列表
+        response = client.get("/api/v1/words/?with_favorite=true", headers=headers)
+        
+        # Then: 被收藏的单词标注为True
+        flags = {item["id"]: item["is_favorite"] for item in response.json()}
+        assert flags[words[0].id] is True
+        assert flags[words[1].id] is False
+    
+    def test_favorites_require_auth(self, client: TestClient):
+        """测试未登录访问收藏"""
+        response = client.get("/api/v1/me/favorites/")
+        assert response.status_code == 401
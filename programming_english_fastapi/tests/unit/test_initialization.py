@@ -4,7 +4,7 @@ import pytest
 from sqlmodel import Session
 from unittest.mock import patch, MagicMock
 
-from app.core.initialization import initialize_application
+from app.core.initialization import initialize_application, initialize_once, is_initialized
 from app.services.user_service import UserService
 
 
@@ -69,4 +69,123 @@ class TestInitialization:
             
             # Then: 应记录相关日志
             mock_logger.info.assert_called_with("开始初始化应用...")
-            mock_logger.success.assert_called_with("数据库表创建成功")
\ No newline at end of file
+            mock_logger.success.assert_called_with("数据库表创建成功")
+
+
+def _initialize_in_worker(lock_file: str, calls: str, results) -> None:
+    """在子进程中执行一次性初始化，初始化过程记录到calls文件"""
+    import os
+    import time
+    from app.core import initialization
+    
+    def slow_initialize():
+        with open(calls, "a") as f:
+            f.write("x")
+        time.sleep(0.3)
+        return True
+    
+    initialization.initialize_application = slow_initialize
+    initialization.is_initialized = lambda: os.path.exists(calls)
+    results.put(initialization.initialize_once(lock_file, wait_timeout=10, poll_interval=0.02))
+
+
+@pytest.fixture
+def scratch_engine(tmp_path, monkeypatch):
+    """指向临时SQLite文件的引擎，替换初始化模块使用的引擎"""
+    from sqlalchemy import create_engine
+    engine = create_engine(f"sqlite:///{tmp_path / 'scratch.db'}")
+    monkeypatch.setattr("app.core.initialization.engine", engine)
+    yield engine
+    engine.dispose()
+
+
+class TestInitializeOnce:
+    """多worker一次性初始化测试类"""
+    
+    def test_skips_when_database_initialized(self, scratch_engine, tmp_path):
+        """测试数据库已初始化时不再初始化"""
+        # When: 同一个数据库初始化两次
+        first = initialize_once(str(tmp_path / "init.lock"))
+        second = initialize_once(str(tmp_path / "init.lock"))
+        
+        # Then: 只有第一次执行初始化
+        assert (first, second) == (True, False)
+        assert is_initialized()
+    
+    def test_reinitializes_after_database_deleted(self, scratch_engine, tmp_path):
+        """测试数据库被删除后重新启动会重新初始化"""
+        from sqlalchemy import inspect
+        
+        # Given: 已初始化后删除数据库文件
+        assert initialize_once(str(tmp_path / "init.lock")) is True
+        scratch_engine.dispose()
+        (tmp_path / "scratch.db").unlink()
+        
+        # When: 再次启动
+        result = initialize_once(str(tmp_path / "init.lock"))
+        
+        # Then: 重新建表并创建超级用户
+        assert result is True
+        assert inspect(scratch_engine).has_table("user")
+        assert is_initialized()
+    
+    def test_backfills_login_keys_of_old_database(self, scratch_engine, tmp_path):
+        """测试旧版本数据库（user表没有登录键列）启动时补建列并回填"""
+        from sqlalchemy import text
+        
+        # Given: 旧版本建的user表和其中的用户
+        with scratch_engine.begin() as connection:
+            connection.execute(text(
+                "CREATE TABLE user (id INTEGER PRIMARY KEY, username VARCHAR NOT NULL, email VARCHAR NOT NULL, "
+                "full_name VARCHAR, is_active BOOLEAN NOT NULL, hashed_password VARCHAR NOT NULL, "
+                "created_at DATETIME NOT NULL, updated_at DATETIME NOT NULL)"
+            ))
+            connection.execute(text(
+                "INSERT INTO user VALUES (1, 'OldUser', 'Old@Example.com', NULL, 1, 'x', "
+                "'2024-01-01 00:00:00', '2024-01-01 00:00:00')"
+            ))
+        assert not is_initialized()
+        
+        # When: 启动
+        assert initialize_once(str(tmp_path / "init.lock")) is True
+        
+        # Then: 旧用户可以按登录键查找，数据库视为已初始化
+        with Session(scratch_engine) as session:
+            assert UserService(session).get_user_by_login("olduser").id == 1
+            assert UserService(session).get_user_by_login("old@example.com").id == 1
+        assert is_initialized()
+    
+    @patch('app.core.initialization.initialize_application')
+    def test_wait_timeout(self, mock_initialize, tmp_path):
+        """测试其他worker持锁且未完成时等待超时"""
+        import fcntl
+        lock_file = tmp_path / "init.lock"
+        with open(lock_file, "a") as held:
+            fcntl.flock(held.fileno(), fcntl.LOCK_EX)
+            with pytest.raises(RuntimeError, match="超时"):
+                initialize_once(str(lock_file), wait_timeout=0.2, poll_interval=0.05)
+        mock_initialize.assert_not_called()
+    
+    def test_concurrent_workers_initialize_once(self, tmp_path):
+        """测试多个worker进程并发启动时只有一个执行初始化"""
+        import multiprocessing
+        
+        # Given: 4个同时启动的worker进程
+        context = multiprocessing.get_context("fork")
+        results = context.Queue()
+        calls = tmp_path / "calls"
+        workers = [
+            context.Process(target=_initialize_in_worker, args=(str(tmp_path / "init.lock"), str(calls), results))
+            for _ in range(4)
+        ]
+        
+        # When: 并发初始化
+        for worker in workers:
+            worker.start()
+        outcomes = [results.get(timeout=20) for _ in workers]
+        for worker in workers:
+            worker.join(timeout=20)
+        
+        # Then: 只有一个worker执行了初始化，其余等锁释放后确认已初始化
+        assert calls.read_text() == "x"
+        assert sorted(outcomes) == [False, False, False, True]
@@ -0,0 +1,124 @@
+"""学习记录服务测试模块"""
+
+import pytest
+from datetime import datetime, timedelta
+from fastapi.testclient import TestClient
+from sqlalchemy import event, update
+from sqlmodel import Session
+
+from app.models.word import WordCreate, LearningRecord
+from app.services.learning_service import LearningService, next_review_time
+from app.services.word_service import WordService
+
+
+@pytest.fixture
+def records(db_session: Session, user):
+    """创建单词及对应学习记录，掌握程度依次为0..4"""
+    word_service = WordService(db_session)
+    now = datetime.utcnow()
+    records = []
+    for i in range(5):
+        word = word_service.create_word(WordCreate(
+            word=f"term{i}",
+            translation=f"术语{i}",
+            definition=f"definition {i}",
+            example=f"term{i}()"
+        ))
+        record = LearningRecord(
+            user_id=user.id,
+            word_id=word.id,
+            mastery_level=i,
+            last_reviewed=now - timedelta(days=i)
+        )
+        db_session.add(record)
+        records.append(record)
+    db_session.commit()
+    return records
+
+
+class TestLearningService:
+    """学习记录服务测试类"""
+    
+    def test_word_book_single_query(self, db_session: Session, user, records):
+        """测试单词本只执行一次查询"""
+        # Given: 统计SQL执行次数
+        user_id = user.id
+        statements = []
+        connection = db_session.connection()
+        listener = lambda *args: statements.append(args[2])
+        event.listen(connection, "before_cursor_execute", listener)
+        
+        # When: 获取单词本
+        try:
+            rows, _ = LearningService(db_session).get_word_book(user_id, limit=10)
+        finally:
+            event.remove(connection, "before_cursor_execute", listener)
+        
+        # Then: 一次联表查询返回单词与进度
+        assert len(statements) == 1
+        assert len(rows) == 5
+        assert all(record.word_id == word.id for record, word in rows)
+    
+    def test_word_book_keyset_pagination(self, db_session: Session, user, records):
+        """测试单词本游标分页"""
+        learning_service = LearningService(db_session)
+        
+        page1, cursor = learning_service.get_word_book(user.id, limit=3)
+        page2, last_cursor = learning_service.get_word_book(user.id, after=cursor, limit=3)
+        
+        word_ids = [record.word_id for record, _ in page1 + page2]
+        assert word_ids == sorted(r.word_id for r in records)
+        assert last_cursor is None
+    
+    def test_word_book_filters(self, db_session: Session, user, records):
+        """测试按掌握程度和复习时间筛选"""
+        learning_service = LearningService(db_session)
+        
+        mastered, _ = learning_service.get_word_book(user.id, mastery_level=3)
+        recent, _ = learning_service.get_word_book(
+            user.id, reviewed_after=datetime.utcnow() - timedelta(days=1, hours=12)
+        )
+        
+        assert [record.mastery_level for record, _ in mastered] == [3]
+        assert sorted(record.mastery_level for record, _ in recent) == [0, 1]
+    
+    def test_backfill_review_schedule(self, db_session: Session, user, records):
+        """测试按掌握程度和上次复习时间重算下次复习时间"""
+        # Given: 旧数据的下次复习时间不正确
+        db_session.exec(update(LearningRecord).values(next_review_at=datetime(2000, 1, 1)))
+        db_session.commit()
+        
+        # When: 重算全部记录
+        processed = LearningService(db_session).backfill_review_schedule(batch_size=2, only_missing=False)
+        
+        # Then: 全部记录按复习间隔补齐
+        assert processed == len(records)
+        for record in records:
+            db_session.refresh(record)
+            assert record.next_review_at == next_review_time(record.mastery_level, record.last_reviewed)
+        assert LearningService(db_session).backfill_review_schedule() == 0
+
+
+class TestWordBookAPI:
+    """单词本API测试类"""
+    
+    def test_get_word_book(self, client: TestClient, records, test_user_data: dict):
+        """测试获取我的单词本"""
+        # Given: 已登录用户
+        token = client.post("/api/v1/auth/login", json={
+            "username": test_user_data["username"],
+            "password": test_user_data["password"]
+        }).json()["access_token"]
+        
+        # When: 请求掌握程度为2的单词
+        response = client.get(
+            "/api/v1/me/words?mastery_level=2",
+            headers={"Authorization": f"Bearer {token}"}
+        )
+        
+        # Then: 返回单词及进度
+        assert response.status_code == 200
+        items = response.json()["data"]["items"]
+        assert len(items) == 1
+        assert items[0]["word"]["word"] == "term2"
+        assert items[0]["record"]["mastery_level"] == 2
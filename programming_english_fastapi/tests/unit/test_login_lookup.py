@@ -0,0 +1,142 @@
+"""登录查找与用户注册测试模块"""
+
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy import event
+from sqlmodel import Session
+
+from app.models.user import UserCreate, UserUpdate
+from app.services.user_service import UserService, unknown_login_cache
+
+
+@pytest.fixture
+def statements(db_session: Session):
+    """记录执行的SQL语句"""
+    executed = []
+    connection = db_session.connection()
+    listener = lambda *args: executed.append(args[2])
+    event.listen(connection, "before_cursor_execute", listener)
+    yield executed
+    event.remove(connection, "before_cursor_execute", listener)
+
+
+class TestLoginLookup:
+    """登录查找测试类"""
+    
+    def test_lookup_by_username_or_email_ignoring_case(self, user_service: UserService, user):
+        """测试按用户名或邮箱查找且不区分大小写"""
+        assert user_service.get_user_by_login(" TestUser ").id == user.id
+        assert user_service.get_user_by_login("TEST@example.com").id == user.id
+    
+    def test_single_query_and_negative_cache(self, user_service: UserService, user, statements: list):
+        """测试查找只执行一次查询，不存在的标识再次查找不访问数据库"""
+        # When: 查找存在和不存在的标识
+        assert user_service.get_user_by_login("test@example.com") is not None
+        assert user_service.get_user_by_login("ghost") is None
+        queries = len(statements)
+        assert user_service.get_user_by_login("GHOST") is None
+        
+        # Then: 每次查找一条SQL，负缓存命中时没有SQL
+        assert queries == 2
+        assert len(statements) == 2
+    
+    def test_registration_clears_negative_cache(self, user_service: UserService):
+        """测试注册后负缓存失效"""
+        assert user_service.get_user_by_login("newbie") is None
+        
+        user_service.create_user(UserCreate(username="Newbie", email="newbie@example.com", password="secret123"))
+        
+        assert "newbie" not in unknown_login_cache
+        assert user_service.get_user_by_login("newbie").username == "Newbie"
+    
+    def test_failed_login_does_not_query_twice(self, client: TestClient, user, statements: list):
+        """测试未知标识登录失败只查询一次用户表"""
+        response = client.post("/api/v1/auth/login", json={"username": "nobody", "password": "x"})
+        
+        assert response.status_code == 401
+        assert len([sql for sql in statements if 'FROM user' in sql or 'FROM "user"' in sql]) <= 1
+
+
+class TestLoginKeyBackfill:
+    """登录键回填测试类"""
+    
+    def test_backfill_login_keys(self, user_service: UserService, db_session: Session):
+        """测试回填旧用户的登录键，只跳过与他人仅大小写不同的用户"""
+        # Given: 没有登录键的旧用户，其中一个用户名就是自己的邮箱，另两个用户名仅大小写不同
+        users = [
+            user_service.create_user(UserCreate(username=name, email=email, password="secret123"))
+            for name, email in [("Alice", "alice@example.com"), ("bob@example.com", "bob@example.com"),
+                                ("carol", "carol@example.com"), ("Carol2", "carol2@example.com")]
+        ]
+        users[3].username = "CAROL"
+        for user in users:
+            user.username_key = user.email_key = None
+        db_session.add_all(users)
+        db_session.commit()
+        
+        # When: 回填登录键
+        processed, conflicts = user_service.backfill_login_keys(batch_size=2)
+        
+        # Then: 只有大小写冲突的用户被跳过，其余用户可以不区分大小写登录
+        assert (processed, conflicts) == (3, [users[3].id])
+        assert user_service.get_user_by_login("ALICE").id == users[0].id
+        assert user_service.get_user_by_login("Bob@Example.com").id == users[1].id
+        assert user_service.get_user_by_username("Carol").id == users[2].id
+
+
+class TestRegistration:
+    """用户注册测试类"""
+    
+    def test_create_user_single_statement(self, user_service: UserService, statements: list):
+        """测试创建用户不做预查询，第一条语句即为INSERT"""
+        user_service.create_user(UserCreate(username="solo", email="solo@example.com", password="secret123"))
+        
+        assert statements[0].startswith("INSERT")
+        assert len([sql for sql in statements if sql.startswith("INSERT")]) == 1
+    
+    def test_duplicate_ignores_case(self, user_service: UserService, user):
+        """测试用户名和邮箱唯一性不区分大小写"""
+        with pytest.raises(ValueError, match="用户名 .* 已存在"):
+            user_service.create_user(UserCreate(username="TESTUSER", email="x@example.com", password="secret123"))
+        with pytest.raises(ValueError, match="邮箱 .* 已存在"):
+            user_service.create_user(UserCreate(username="other", email="Test@Example.com", password="secret123"))
+    
+    def test_create_user_without_returning(self, user_service: UserService, user, monkeypatch):
+        """测试数据库不支持RETURNING（MySQL）时按受影响行数判断冲突"""
+        monkeypatch.setattr(user_service.session.get_bind().dialect, "insert_returning", False)
+        
+        created = user_service.create_user(UserCreate(username="Solo", email="solo@example.com", password="secret123"))
+        
+        assert created.id is not None and created.username_key == "solo"
+        with pytest.raises(ValueError, match="用户名 .* 已存在"):
+            user_service.create_user(UserCreate(username="TESTUSER", email="x@example.com", password="secret123"))
+    
+    def test_update_keeps_keys_in_sync(self, user_service: UserService, user):
+        """测试修改用户名后登录键同步，不能改成他人的标识"""
+        other = user_service.create_user(UserCreate(username="other", email="o@example.com", password="secret123"))
+        
+        user_service.update_user(user.id, UserUpdate(username="Renamed"))
+        
+        assert user_service.get_user_by_login("renamed").id == user.id
+        with pytest.raises(ValueError, match="用户名 .* 已存在"):
+            user_service.update_user(other.id, UserUpdate(username="RENAMED"))
+    
+    def test_register_endpoint(self, client: TestClient, test_user_data: dict):
+        """测试注册接口"""
+        # When: 注册新用户
+        response = client.post("/api/v1/users", json=test_user_data)
+        
+        # Then: 返回201且可以用邮箱登录
+        assert response.status_code == 201
+        assert response.json()["data"]["username"] == test_user_data["username"]
+        assert "hashed_password" not in response.json()["data"]
+        login = client.post("/api/v1/auth/login", json={
+            "username": test_user_data["email"].upper(), "password": test_user_data["password"]
+        })
+        assert login.status_code == 200
+        
+        # When: 重复注册
+        duplicate = client.post("/api/v1/users", json=test_user_data)
+        
+        # Then: 返回400
+        assert duplicate.status_code == 400
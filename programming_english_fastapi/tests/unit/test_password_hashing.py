@@ -0,0 +1,204 @@
+"""密码哈希测试模块"""
+
+import asyncio
+import hashlib
+import threading
+import pytest
+from fastapi.testclient import TestClient
+
+from app.core.exception_handlers import BusinessException
+from app.core.hashing import HashingExecutor, PasswordHasher, QUEUE_DEPTH_METRIC, is_legacy_hash
+from app.core.metrics import metrics
+from app.models.user import UserCreate, UserUpdate
+from app.services.user_service import UserService
+
+
+@pytest.fixture
+def hasher():
+    """低成本的scrypt哈希器，加快测试"""
+    return PasswordHasher("scrypt", scrypt_n=2 ** 10)
+
+
+class TestPasswordHasher:
+    """密码哈希器测试类"""
+    
+    def test_hash_is_salted(self, hasher: PasswordHasher):
+        """测试同一密码每次哈希结果不同且都能验证"""
+        first = hasher.hash("secret123")
+        second = hasher.hash("secret123")
+        
+        assert first != second
+        assert first.startswith("scrypt$n=1024,r=8,p=1$")
+        assert hasher.verify("secret123", first)
+        assert hasher.verify("secret123", second)
+        assert not hasher.verify("wrong", first)
+    
+    def test_pbkdf2_algorithm(self):
+        """测试pbkdf2_sha256算法"""
+        hasher = PasswordHasher("pbkdf2_sha256", pbkdf2_iterations=1000)
+        
+        hashed = hasher.hash("secret123")
+        
+        assert hashed.startswith("pbkdf2_sha256$i=1000$")
+        assert hasher.verify("secret123", hashed)
+    
+    def test_verify_legacy_sha256(self, hasher: PasswordHasher):
+        """测试兼容旧版无盐SHA-256哈希"""
+        legacy = hashlib.sha256("secret123".encode("utf-8")).hexdigest()
+        
+        assert is_legacy_hash(legacy)
+        assert hasher.verify("secret123", legacy)
+        assert not hasher.verify("wrong", legacy)
+        assert hasher.needs_rehash(legacy)
+    
+    def test_needs_rehash_on_cost_change(self, hasher: PasswordHasher):
+        """测试成本或算法变化后需要重新哈希，旧哈希仍可验证"""
+        hashed = hasher.hash("secret123")
+        stronger = PasswordHasher("scrypt", scrypt_n=2 ** 11)
+        
+        assert not hasher.needs_rehash(hashed)
+        assert stronger.needs_rehash(hashed)
+        assert stronger.verify("secret123", hashed)
+        assert PasswordHasher("pbkdf2_sha256").needs_rehash(hashed)
+    
+    def test_malformed_hash(self, hasher: PasswordHasher):
+        """测试格式错误的哈希验证失败而不抛出异常"""
+        assert not hasher.verify("secret123", "not-a-hash")
+        assert not hasher.verify("secret123", "")
+        assert hasher.needs_rehash("not-a-hash")
+    
+    def test_invalid_config(self):
+        """测试不支持的算法和非法成本参数"""
+        with pytest.raises(ValueError):
+            PasswordHasher("md5")
+        with pytest.raises(ValueError):
+            PasswordHasher("scrypt", scrypt_n=1000)
+
+
+class TestHashingExecutor:
+    """哈希线程池测试类"""
+    
+    def test_sync_and_async(self, hasher: PasswordHasher):
+        """测试同步与异步接口结果一致"""
+        executor = HashingExecutor(hasher, max_workers=2, max_pending=4)
+        try:
+            hashed = executor.hash("secret123")
+            assert executor.verify("secret123", hashed)
+            assert asyncio.run(executor.verify_async("secret123", hashed))
+            assert hasher.verify("secret123", asyncio.run(executor.hash_async("secret123")))
+        finally:
+            executor.shutdown()
+    
+    def test_rejects_when_queue_full(self, hasher: PasswordHasher):
+        """测试排队任务超过上限时拒绝新任务，并发布队列深度"""
+        # Given: 单线程、最多2个排队任务，且第一个任务被阻塞
+        executor = HashingExecutor(hasher, max_workers=1, max_pending=2)
+        release = threading.Event()
+        try:
+            blocked = executor._submit(release.wait)
+            queued = executor._submit(hasher.hash, "secret123")
+            
+            # When: 提交第三个任务
+            # Then: 返回503业务异常，队列深度为2
+            with pytest.raises(BusinessException) as exc_info:
+                executor.hash("secret123")
+            assert exc_info.value.status_code == 503
+            assert executor.queue_depth == 2
+            assert metrics.get(QUEUE_DEPTH_METRIC) == 2
+        finally:
+            release.set()
+            blocked.result()
+            queued.result()
+            executor.shutdown()
+        
+        assert executor.queue_depth == 0
+
+
+class TestRehashOnLogin:
+    """登录时升级哈希测试类"""
+    
+    def test_new_user_uses_configured_hash(self, user_service: UserService, test_user_data: dict):
+        """测试新用户使用配置的哈希算法"""
+        user = user_service.create_user(UserCreate(**test_user_data))
+        
+        assert user.hashed_password.startswith("scrypt$")
+        assert user_service.verify_password(test_user_data["password"], user.hashed_password)
+    
+    def test_legacy_hash_upgraded_on_login(self, client: TestClient, user_service: UserService,
+                                           test_user_data: dict):
+        """测试旧版SHA-256哈希在登录成功后升级"""
+        # Given: 密码为旧版SHA-256哈希的用户
+        user = user_service.create_user(UserCreate(**test_user_data))
+        user.hashed_password = hashlib.sha256(test_user_data["password"].encode("utf-8")).hexdigest()
+        user_service.session.add(user)
+        user_service.session.commit()
+        
+        # When: 用户登录
+        response = client.post("/api/v1/auth/login", json={
+            "username": test_user_data["username"],
+            "password": test_user_data["password"]
+        })
+        
+        # Then: 登录成功，哈希升级为scrypt且仍可验证
+        assert response.status_code == 200
+        user_service.session.refresh(user)
+        assert user.hashed_password.startswith("scrypt$")
+        assert user_service.verify_password(test_user_data["password"], user.hashed_password)
+    
+    def test_failed_login_keeps_legacy_hash(self, client: TestClient, user_service: UserService,
+                                            test_user_data: dict):
+        """测试登录失败不升级哈希"""
+        user = user_service.create_user(UserCreate(**test_user_data))
+        legacy = hashlib.sha256(test_user_data["password"].encode("utf-8")).hexdigest()
+        user.hashed_password = legacy
+        user_service.session.add(user)
+        user_service.session.commit()
+        
+        response = client.post("/api/v1/auth/login", json={
+            "username": test_user_data["username"],
+            "password": "wrong-password"
+        })
+        
+        assert response.status_code == 401
+        user_service.session.refresh(user)
+        assert user.hashed_password == legacy
+    
+    def test_api_awaits_hashing_pool(self, client: TestClient, user_service: UserService,
+                                     test_user_data: dict, monkeypatch):
+        """测试注册和登录异步等待哈希线程池，不阻塞等待结果"""
+        # Given: 旧版哈希的用户，且同步哈希入口不可用
+        user = user_service.create_user(UserCreate(**test_user_data))
+        user.hashed_password = hashlib.sha256(test_user_data["password"].encode("utf-8")).hexdigest()
+        user_service.session.add(user)
+        user_service.session.commit()
+        
+        def blocking(*args):
+            raise AssertionError("请求路径不应同步等待哈希结果")
+        
+        monkeypatch.setattr(HashingExecutor, "hash", blocking)
+        monkeypatch.setattr(HashingExecutor, "verify", blocking)
+        
+        # When: 注册新用户并以旧哈希用户登录
+        register = client.post("/api/v1/users", json={
+            "username": "newcomer", "email": "newcomer@example.com", "password": "secret123"
+        })
+        login = client.post("/api/v1/auth/login", json={
+            "username": test_user_data["username"],
+            "password": test_user_data["password"]
+        })
+        
+        # Then: 两者都成功，旧哈希已升级
+        assert register.status_code == 201
+        assert login.status_code == 200
+        user_service.session.refresh(user)
+        assert user.hashed_password.startswith("scrypt$")
+    
+    def test_update_password_async(self, user_service: UserService, test_user_data: dict):
+        """测试异步修改密码后新密码可验证"""
+        user = user_service.create_user(UserCreate(**test_user_data))
+        
+        updated = asyncio.run(user_service.update_user_async(user.id, UserUpdate(password="changed456")))
+        
+        assert updated.hashed_password.startswith("scrypt$")
+        assert user_service.verify_password("changed456", updated.hashed_password)
+        assert not user_service.verify_password(test_user_data["password"], updated.hashed_password)
@@ -0,0 +1,108 @@
+"""按发音查找测试模块"""
+
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy import update
+from sqlmodel import Session
+
+from app.models.word import Word, WordCreate, WordUpdate
+from app.services.search_service import SearchService
+from app.services.word_service import WordService
+from app.utils.text_utils import phonetic_key
+
+TERMS = ["function", "synchronize", "cache", "thread", "iterator"]
+
+
+@pytest.fixture
+def words(db_session: Session):
+    """创建测试单词"""
+    word_service = WordService(db_session)
+    return {
+        term: word_service.create_word(WordCreate(
+            word=term, translation="术语", definition=f"{term} definition", example=f"{term}()"
+        ))
+        for term in TERMS
+    }
+
+
+class TestPhoneticKey:
+    """语音键测试类"""
+    
+    @pytest.mark.parametrize("term,heard", [
+        ("function", "funkshun"),
+        ("synchronize", "sinkronize"),
+        ("cache", "cash"),
+        ("exception", "eksepshun"),
+        ("phone", "fone"),
+        ("knowledge", "nowledge"),
+        ("thread", "thred"),
+    ])
+    def test_similar_spellings_share_key(self, term, heard):
+        """测试发音相近的拼写得到相同的键"""
+        assert phonetic_key(term) == phonetic_key(heard)
+    
+    def test_different_sounds_differ(self):
+        """测试发音不同的单词键不同"""
+        assert phonetic_key("thread") != phonetic_key("tread")
+        assert phonetic_key("cache") != phonetic_key("class")
+    
+    @pytest.mark.parametrize("term,key", [
+        ("heap", "HP"),
+        ("hash", "HX"),
+        ("hook", "HK"),
+        ("header", "HTR"),
+    ])
+    def test_leading_h_kept(self, term, key):
+        """测试词首的H保留"""
+        assert phonetic_key(term) == key
+        assert phonetic_key("heap") != phonetic_key("pop")
+    
+    def test_ignores_case_and_non_letters(self):
+        """测试忽略大小写和非字母字符"""
+        assert phonetic_key("Exception!") == phonetic_key("exception")
+        assert phonetic_key("123") == ""
+
+
+class TestSoundsLike:
+    """按发音查找服务测试类"""
+    
+    def test_key_stored_on_write(self, db_session: Session, words):
+        """测试写入时计算语音键"""
+        word_service = WordService(db_session)
+        assert words["function"].phonetic_key == "FNKXN"
+        
+        word = word_service.update_word(words["cache"].id, WordUpdate(word="catch"))
+        
+        assert word.phonetic_key == phonetic_key("catch")
+    
+    def test_sounds_like(self, db_session: Session, words):
+        """测试按发音查找"""
+        service = SearchService(db_session)
+        
+        assert [word.word for word in service.sounds_like("funkshun")] == ["function"]
+        assert [word.word for word in service.sounds_like("sinkronize")] == ["synchronize"]
+        assert service.sounds_like("!!!") == []
+    
+    def test_backfill(self, db_session: Session, words):
+        """测试回填缺失的语音键"""
+        # Given: 旧数据没有语音键
+        db_session.exec(update(Word).values(phonetic_key=None))
+        db_session.commit()
+        
+        # When: 执行回填
+        processed = WordService(db_session).backfill_phonetic_keys(batch_size=2)
+        
+        # Then: 全部单词补齐语音键
+        assert processed == len(TERMS)
+        assert [word.word for word in SearchService(db_session).sounds_like("thred")] == ["thread"]
+
+
+class TestSoundsLikeAPI:
+    """按发音查找API测试类"""
+    
+    def test_sounds_like_endpoint(self, client: TestClient, words):
+        """测试按发音查找接口"""
+        response = client.get("/api/v1/words/sounds-like", params={"q": "cash"})
+        
+        assert response.status_code == 200
+        assert [item["word"] for item in response.json()] == ["cache"]
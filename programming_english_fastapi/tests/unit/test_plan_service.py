@@ -0,0 +1,156 @@
+"""学习计划服务测试模块"""
+
+import numpy as np
+import pytest
+from datetime import date, datetime, timedelta
+from fastapi.testclient import TestClient
+from sqlmodel import Session
+
+from app.models.word import Category
+from app.schemas.learning import PlanRequest
+from app.services.learning_service import LearningService
+from app.services.plan_service import PlanService, review_kernels, spread_new_words
+
+TODAY = date(2025, 1, 1)
+
+
+@pytest.fixture
+def words(make_words):
+    """创建8个测试单词，前2个为控制流分类"""
+    return make_words(8, [Category.CONTROL_FLOW] * 2 + [Category.BASIC] * 6)
+
+
+class TestSimulation:
+    """复习负荷模拟测试类"""
+    
+    def test_kernel_with_perfect_recall(self):
+        """测试全部答对时负荷核与复习间隔一致"""
+        kernel = review_kernels(10, recall_rate=1.0)[0]
+        
+        # 间隔[0,1,2,4,7]：学习当天、第1、3、7天复习
+        assert np.flatnonzero(kernel).tolist() == [0, 1, 3, 7]
+    
+    def test_kernel_failures_add_load(self):
+        """测试答错会带来额外复习"""
+        assert review_kernels(30, 0.7)[0].sum() > review_kernels(30, 1.0)[0].sum()
+    
+    def test_spread_keeps_peak_low(self):
+        """测试新词分配的总负荷峰值不高于全部集中在首日"""
+        kernel = review_kernels(30)[0]
+        
+        new = spread_new_words(300, np.zeros(30), kernel)
+        
+        assert new.sum() == 300
+        assert np.convolve(new, kernel)[:30].max() < 300
+
+
+class TestPlanService:
+    """学习计划服务测试类"""
+    
+    def test_create_plan(self, db_session: Session, user, words):
+        """测试生成计划覆盖全部未学单词"""
+        # Given: 已学过一个单词
+        LearningService(db_session).record_review(user.id, words[0].id, True, reviewed_at=datetime(2025, 1, 1))
+        
+        # When: 生成7天计划
+        plan = PlanService(db_session).create_plan(
+            user.id, PlanRequest(target_date=TODAY + timedelta(days=6)), today=TODAY
+        )
+        
+        # Then: 未学单词全部分配，已学单词的复习计入负荷
+        assert len(plan.days) == 7
+        planned = [word_id for day in plan.days for word_id in day.new_word_ids]
+        assert planned == [word.id for word in words[1:]]
+        assert plan.days[1].expected_reviews > 0
+        assert plan.peak_load == max(day.expected_total for day in plan.days)
+    
+    def test_plan_filters(self, db_session: Session, user, words):
+        """测试按分类筛选计划单词"""
+        plan = PlanService(db_session).create_plan(
+            user.id, PlanRequest(target_date=TODAY, category=Category.CONTROL_FLOW), today=TODAY
+        )
+        
+        assert plan.total_words == 2
+        assert plan.days[0].new_count == 2
+    
+    def test_invalid_target_date(self, db_session: Session, user):
+        """测试目标日期早于今天"""
+        with pytest.raises(ValueError):
+            PlanService(db_session).create_plan(
+                user.id, PlanRequest(target_date=TODAY - timedelta(days=1)), today=TODAY
+            )
+    
+    def test_plan_recomputed_after_review(self, db_session: Session, user, words):
+        """测试复习写入后按保存的参数重新生成计划"""
+        today = datetime.utcnow().date()
+        service = PlanService(db_session)
+        plan = service.create_plan(user.id, PlanRequest(target_date=today + timedelta(days=3)), today=today)
+        assert service.get_plan(user.id, today=today) == plan
+        
+        LearningService(db_session).record_review(user.id, words[0].id, True)
+        
+        recomputed = service.get_plan(user.id, today=today)
+        assert recomputed.total_words == plan.total_words - 1
+        assert words[0].id not in [word_id for day in recomputed.days for word_id in day.new_word_ids]
+    
+    def test_get_plan_does_not_simulate(self, db_session: Session, user, words, monkeypatch):
+        """测试读取计划只读取保存的结果，不重新模拟"""
+        # Given: 已生成计划
+        service = PlanService(db_session)
+        request = PlanRequest(target_date=TODAY + timedelta(days=3), category=Category.CONTROL_FLOW)
+        plan = service.create_plan(user.id, request, today=TODAY)
+        
+        def simulate(*args, **kwargs):
+            raise AssertionError("读取计划时不应重新模拟")
+        
+        monkeypatch.setattr(PlanService, "_build_plan", simulate)
+        
+        # When: 另一个会话（其他进程）读取计划
+        stored = PlanService(Session(bind=db_session.connection())).get_plan(user.id, today=TODAY)
+        
+        # Then: 返回保存的计划；目标日期已过或未生成过时返回None
+        assert stored == plan
+        assert service.get_plan(user.id, today=TODAY + timedelta(days=4)) is None
+        assert PlanService(db_session).get_plan(user.id + 1) is None
+    
+    def test_refresh_without_plan(self, db_session: Session, user, words):
+        """测试未生成过计划的用户复习时不生成计划"""
+        LearningService(db_session).record_review(user.id, words[0].id, True)
+        
+        assert PlanService(db_session).get_plan(user.id) is None
+
+
+class TestPlanAPI:
+    """学习计划API测试类"""
+    
+    def test_create_and_get_plan(self, client: TestClient, user, words, test_user_data: dict):
+        """测试生成并读取学习计划"""
+        token = client.post("/api/v1/auth/login", json={
+            "username": test_user_data["username"],
+            "password": test_user_data["password"]
+        }).json()["access_token"]
+        headers = {"Authorization": f"Bearer {token}"}
+        target = (datetime.utcnow().date() + timedelta(days=3)).isoformat()
+        
+        assert client.get("/api/v1/me/plan", headers=headers).status_code == 404
+        response = client.post("/api/v1/me/plan", json={"target_date": target}, headers=headers)
+        
+        assert response.status_code == 200
+        data = response.json()["data"]
+        assert data["total_words"] == 8
+        assert client.get("/api/v1/me/plan", headers=headers).json()["data"] == data
+    
+    def test_past_target_date(self, client: TestClient, user, test_user_data: dict):
+        """测试目标日期无效返回400"""
+        token = client.post("/api/v1/auth/login", json={
+            "username": test_user_data["username"],
+            "password": test_user_data["password"]
+        }).json()["access_token"]
+        
+        response = client.post(
+            "/api/v1/me/plan",
+            json={"target_date": "2000-01-01"},
+            headers={"Authorization": f"Bearer {token}"}
+        )
+        
+        assert response.status_code == 400
@@ -0,0 +1,98 @@
+"""认证用户缓存测试模块"""
+
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy import event
+from sqlmodel import Session
+
+from app.models.user import Principal, UserCreate, UserUpdate
+from app.models.word import WordCreate
+from app.services.user_service import UserService, principal_cache
+from app.services.word_service import WordService
+from app.utils.jwt_utils import create_user_token
+
+
+@pytest.fixture
+def headers(user):
+    """测试用户的认证头"""
+    return {"Authorization": f"Bearer {create_user_token(user.id, user.username)}"}
+
+
+@pytest.fixture
+def word(db_session: Session):
+    """创建测试单词"""
+    return WordService(db_session).create_word(WordCreate(
+        word="variable", translation="变量", definition="a named value", example="x = 1"
+    ))
+
+
+class TestPrincipalCache:
+    """认证用户缓存测试类"""
+    
+    def test_get_principal_cached(self, user_service: UserService, user):
+        """测试首次查询后写入缓存，不存在的用户不缓存"""
+        principal = user_service.get_principal(user.id)
+        
+        assert principal == Principal(user.id, user.username, True)
+        assert principal_cache.get(user.id) is principal
+        assert user_service.get_principal(user.id + 1000) is None
+        assert (user.id + 1000) not in principal_cache
+    
+    def test_warm_cache_write_skips_user_query(self, client: TestClient, db_session: Session,
+                                               headers: dict, word):
+        """测试缓存预热后认证写请求不查询用户表"""
+        # Given: 一次请求预热缓存
+        assert client.get("/api/v1/me/favorites/", headers=headers).status_code == 200
+        statements = []
+        connection = db_session.connection()
+        listener = lambda *args: statements.append(args[2])
+        event.listen(connection, "before_cursor_execute", listener)
+        
+        # When: 收藏单词
+        try:
+            response = client.put(f"/api/v1/me/favorites/{word.id}", headers=headers)
+        finally:
+            event.remove(connection, "before_cursor_execute", listener)
+        
+        # Then: 写入成功且没有任何用户查询
+        assert response.status_code == 200
+        assert statements
+        assert not [sql for sql in statements if 'FROM "user"' in sql or "FROM user" in sql]
+    
+    def test_deactivate_invalidates(self, client: TestClient, user_service: UserService, user, headers: dict):
+        """测试禁用用户后已缓存的令牌立即失效"""
+        # Given: 缓存中为活跃用户
+        assert client.get("/api/v1/me/favorites/", headers=headers).status_code == 200
+        
+        # When: 禁用用户
+        user_service.deactivate_user(user.id)
+        
+        # Then: 同一令牌被拒绝
+        assert user.id not in principal_cache
+        assert client.get("/api/v1/me/favorites/", headers=headers).status_code == 400
+    
+    def test_update_invalidates(self, user_service: UserService, user):
+        """测试修改用户后缓存刷新"""
+        user_service.get_principal(user.id)
+        
+        user_service.update_user(user.id, UserUpdate(username="renamed"))
+        
+        assert user_service.get_principal(user.id).username == "renamed"
+    
+    def test_update_rejects_duplicate_username(self, user_service: UserService, user):
+        """测试修改为已存在的用户名时报错"""
+        other = user_service.create_user(UserCreate(
+            username="other", email="other@example.com", password="secret123"
+        ))
+        
+        with pytest.raises(ValueError):
+            user_service.update_user(other.id, UserUpdate(username=user.username))
+    
+    def test_invalid_token(self, client: TestClient, user):
+        """测试无效令牌和不存在用户的令牌返回401"""
+        unknown = create_user_token(user.id + 1000, "ghost")
+        
+        assert client.get("/api/v1/me/favorites/", headers={"Authorization": "Bearer bad"}).status_code == 401
+        assert client.get(
+            "/api/v1/me/favorites/", headers={"Authorization": f"Bearer {unknown}"}
+        ).status_code == 401
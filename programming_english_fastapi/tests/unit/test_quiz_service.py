@@ -0,0 +1,135 @@
+"""测验服务测试模块"""
+
+import pytest
+from datetime import datetime, timedelta
+from fastapi.testclient import TestClient
+from sqlalchemy import event
+from sqlmodel import Session
+
+from app.core.exception_handlers import NotFoundException, ValidationException
+from app.services.learning_service import LearningService
+from app.services.quiz_service import QuizService
+from app.utils.session_store import MemorySessionStore, create_session_store
+
+START = datetime(2025, 1, 1, 8)
+
+
+@pytest.fixture
+def words(make_words):
+    """创建4个测试单词"""
+    return make_words(4)
+
+
+@pytest.fixture
+def store():
+    """独立的进程内会话存储"""
+    return MemorySessionStore(maxsize=10, ttl=60)
+
+
+class TestSessionStore:
+    """会话存储测试类"""
+    
+    def test_update_and_expire(self):
+        """测试原子修改与TTL过期"""
+        store = MemorySessionStore(ttl=60)
+        store.set("a", {"count": 0})
+        
+        assert store.update("a", lambda state: state.update(count=1) or state["count"]) == 1
+        assert store.get("a") == {"count": 1}
+        
+        store.set("b", {}, ttl=-1)
+        assert store.get("b") is None
+        with pytest.raises(KeyError):
+            store.update("b", lambda state: None)
+    
+    def test_unknown_backend(self):
+        """测试未知后端"""
+        with pytest.raises(ValueError):
+            create_session_store("unknown")
+
+
+class TestQuizService:
+    """测验服务测试类"""
+    
+    def test_answers_validated_without_db_writes(self, db_session: Session, user, words, store):
+        """测试作答只校验会话存储，不写数据库"""
+        service = QuizService(db_session, store)
+        quiz = service.start(user.id, 3, now=START)
+        assert len(quiz.questions) == 3
+        
+        statements = []
+        connection = db_session.connection()
+        listener = lambda *args: statements.append(args[2])
+        event.listen(connection, "before_cursor_execute", listener)
+        try:
+            first = service.answer(user.id, quiz.quiz_id, 0, quiz.questions[0].word.replace("term", "术语"))
+            second = service.answer(user.id, quiz.quiz_id, 1, "错误答案")
+        finally:
+            event.remove(connection, "before_cursor_execute", listener)
+        
+        assert first.correct is True
+        assert second.correct is False
+        assert statements == []
+    
+    def test_invalid_answers(self, db_session: Session, user, words, store):
+        """测试重复作答、无效题号和他人测验"""
+        service = QuizService(db_session, store)
+        quiz = service.start(user.id, 2, now=START)
+        service.answer(user.id, quiz.quiz_id, 0, "x")
+        
+        with pytest.raises(ValidationException):
+            service.answer(user.id, quiz.quiz_id, 0, "x")
+        with pytest.raises(ValidationException):
+            service.answer(user.id, quiz.quiz_id, 5, "x")
+        with pytest.raises(NotFoundException):
+            service.answer(user.id + 1, quiz.quiz_id, 1, "x")
+        with pytest.raises(NotFoundException):
+            service.answer(user.id, "missing", 1, "x")
+    
+    def test_finish_writes_outcome_once(self, db_session: Session, user, words, store):
+        """测试结束时一次写入结果，会话随即失效"""
+        service = QuizService(db_session, store)
+        quiz = service.start(user.id, 3, now=START)
+        service.answer(user.id, quiz.quiz_id, 0, words[0].translation)
+        service.answer(user.id, quiz.quiz_id, 2, "错误答案")
+        
+        result = service.finish(user.id, quiz.quiz_id, now=START + timedelta(seconds=42))
+        
+        assert (result.total, result.answered, result.correct) == (3, 2, 1)
+        assert result.duration_seconds == 42
+        assert "first_review" in result.unlocked_achievements
+        learning_service = LearningService(db_session)
+        assert learning_service.get_record(user.id, words[0].id).correct_count == 1
+        assert learning_service.get_record(user.id, words[2].id).incorrect_count == 1
+        assert learning_service.get_record(user.id, words[1].id) is None
+        with pytest.raises(NotFoundException):
+            service.finish(user.id, quiz.quiz_id)
+
+
+class TestQuizAPI:
+    """测验API测试类"""
+    
+    def test_quiz_flow(self, client: TestClient, user, words, test_user_data: dict):
+        """测试开始、作答和结束测验"""
+        token = client.post("/api/v1/auth/login", json={
+            "username": test_user_data["username"],
+            "password": test_user_data["password"]
+        }).json()["access_token"]
+        headers = {"Authorization": f"Bearer {token}"}
+        
+        quiz = client.post("/api/v1/quiz/", json={"n": 2}, headers=headers).json()["data"]
+        assert "answer" not in quiz["questions"][0]
+        
+        answer = client.post(
+            f"/api/v1/quiz/{quiz['quiz_id']}/answers", json={"index": 0, "answer": "术语0"}, headers=headers
+        )
+        assert answer.json()["data"]["correct"] is True
+        
+        duplicate = client.post(
+            f"/api/v1/quiz/{quiz['quiz_id']}/answers", json={"index": 0, "answer": "术语0"}, headers=headers
+        )
+        assert duplicate.status_code == 400
+        
+        result = client.post(f"/api/v1/quiz/{quiz['quiz_id']}/finish", headers=headers).json()["data"]
+        assert result["correct"] == 1
+        assert client.post(f"/api/v1/quiz/{quiz['quiz_id']}/finish", headers=headers).status_code == 404
@@ -0,0 +1,183 @@
+"""限流与登录锁定测试模块"""
+
+import pytest
+from fastapi.testclient import TestClient
+
+from app.core.metrics import metrics
+from app.core.rate_limit import (
+    LIMITED_METRIC, LoginGuard, RateLimiter, RateLimitRule, parse_rules
+)
+from app.models.user import UserCreate
+from app.services.api_key_service import api_key_cache, hash_api_key
+from app.services.user_service import UserService
+from app.utils.bucket_store import MemoryBucketStore, create_bucket_store, register_bucket_store
+from app.utils.jwt_utils import create_user_token
+
+
+def _scope(path: str = "/api/v1/words/", method: str = "GET", ip: str = "10.0.0.1", token: str = None,
+           api_key: str = None) -> dict:
+    headers = [(b"authorization", f"Bearer {token}".encode())] if token else []
+    if api_key:
+        headers.append((b"x-api-key", api_key.encode()))
+    return {"type": "http", "method": method, "path": path, "client": (ip, 1234), "headers": headers}
+
+
+class TestBucketStore:
+    """令牌桶存储测试类"""
+    
+    def test_burst_then_limited(self):
+        """测试桶满时允许突发，耗尽后返回等待时间"""
+        store = MemoryBucketStore(shards=4, max_keys=100)
+        
+        results = [store.take("k", rate=1, burst=3) for _ in range(4)]
+        
+        assert [allowed for allowed, _ in results] == [True, True, True, False]
+        assert 0 < results[-1][1] <= 1
+    
+    def test_bounded_keys(self):
+        """测试条目数不超过上限"""
+        store = MemoryBucketStore(shards=4, max_keys=40)
+        for i in range(1000):
+            store.take(f"k{i}", rate=1, burst=1)
+        
+        assert len(store) <= 40
+    
+    def test_pluggable_backend(self):
+        """测试注册自定义后端"""
+        register_bucket_store("test-memory", lambda **options: MemoryBucketStore(**options))
+        
+        assert isinstance(create_bucket_store("test-memory", shards=2), MemoryBucketStore)
+        with pytest.raises(ValueError):
+            create_bucket_store("unknown")
+
+
+class TestRateLimiter:
+    """限流器测试类"""
+    
+    def test_ip_rule_isolated_per_client(self):
+        """测试不同IP使用各自的令牌桶"""
+        limiter = RateLimiter([RateLimitRule("ip", rate=1, burst=2)], MemoryBucketStore())
+        
+        assert limiter.check(_scope(ip="10.0.0.1")) is None
+        assert limiter.check(_scope(ip="10.0.0.1")) is None
+        limited = limiter.check(_scope(ip="10.0.0.1"))
+        
+        assert limited is not None and limited[0].name == "ip"
+        assert limiter.check(_scope(ip="10.0.0.2")) is None
+    
+    def test_user_rule_follows_token_across_ips(self):
+        """测试用户规则按令牌中的user_id计数，未认证请求不受约束"""
+        limiter = RateLimiter([RateLimitRule("user", rate=1, burst=1, scope="user")], MemoryBucketStore())
+        token = create_user_token(42, "alice")
+        
+        assert limiter.check(_scope(ip="10.0.0.1", token=token)) is None
+        assert limiter.check(_scope(ip="10.0.0.2", token=token)) is not None
+        assert limiter.check(_scope(ip="10.0.0.3")) is None
+    
+    def test_api_key_bucketed_by_principal(self):
+        """测试API密钥请求按密钥所属用户计数，与该用户的令牌共用令牌桶"""
+        # Given: 认证依赖已验证并缓存了用户42的密钥
+        limiter = RateLimiter([RateLimitRule("user", rate=1, burst=2, scope="user")], MemoryBucketStore())
+        api_key_cache.set(hash_api_key("pek_known"), (42, frozenset({"words:write"})))
+        
+        # When/Then: 换IP使用密钥和令牌都计入同一个用户桶
+        assert limiter.check(_scope(ip="10.0.0.1", api_key="pek_known")) is None
+        assert limiter.check(_scope(ip="10.0.0.2", token=create_user_token(42, "alice"))) is None
+        assert limiter.check(_scope(ip="10.0.0.3", api_key="pek_known")) is not None
+        # 未缓存（无效）的密钥按未认证请求处理
+        assert limiter.check(_scope(ip="10.0.0.4", api_key="pek_unknown")) is None
+    
+    def test_route_rule_shared_and_path_matched(self):
+        """测试路由规则只匹配指定路径和方法，所有客户端共用"""
+        limiter = RateLimiter(parse_rules([{
+            "name": "reports", "scope": "route", "path": "/api/v1/me/reports", "methods": ["post"],
+            "rate": 1, "burst": 1
+        }]), MemoryBucketStore())
+        
+        assert limiter.check(_scope("/api/v1/me/reports/", "POST", ip="10.0.0.1")) is None
+        assert limiter.check(_scope("/api/v1/me/reports/", "POST", ip="10.0.0.2")) is not None
+        assert limiter.check(_scope("/api/v1/me/reports/", "GET")) is None
+        assert limiter.check(_scope("/api/v1/words/", "POST")) is None
+    
+    def test_invalid_rules(self):
+        """测试非法规则配置"""
+        with pytest.raises(ValueError):
+            parse_rules([{"name": "x", "scope": "planet", "rate": 1, "burst": 1}])
+        with pytest.raises(ValueError):
+            parse_rules([{"name": "x", "rate": 0, "burst": 1}])
+
+
+class TestRateLimitMiddleware:
+    """限流中间件测试类"""
+    
+    def test_login_route_limited_with_retry_after(self, client: TestClient):
+        """测试登录路由超出突发量后返回429和Retry-After"""
+        # Given: 登录规则突发量为10
+        limited_before = metrics.get(LIMITED_METRIC)
+        for _ in range(10):
+            assert client.post("/api/v1/auth/login", json={}).status_code == 422
+        
+        # When: 第11次请求
+        response = client.post("/api/v1/auth/login", json={})
+        
+        # Then: 被限流
+        assert response.status_code == 429
+        assert int(response.headers["Retry-After"]) >= 1
+        assert metrics.get(LIMITED_METRIC) == limited_before + 1
+        assert client.get("/api/v1/words/").status_code == 200
+
+
+class TestLoginLockout:
+    """登录失败锁定测试类"""
+    
+    def test_progressive_lockout(self):
+        """测试达到阈值后锁定时间逐次翻倍并有上限"""
+        guard = LoginGuard(threshold=3, base_seconds=2, max_seconds=5, account_threshold=100)
+        
+        locks = [guard.record_failure("alice", "10.0.0.1") for _ in range(5)]
+        
+        assert locks == [0, 0, 2, 4, 5]
+        assert 0 < guard.retry_after("alice", "10.0.0.1") <= 5
+        guard.record_success("alice", "10.0.0.1")
+        assert guard.retry_after("alice", "10.0.0.1") == 0
+    
+    def test_attacker_cannot_lock_out_victim(self):
+        """测试其他IP的失败只锁定攻击来源，账户级锁定是有上限的软锁定"""
+        guard = LoginGuard(threshold=3, base_seconds=2, max_seconds=900, account_threshold=6, account_max_seconds=4)
+        
+        # When: 攻击者在一个IP上连续失败
+        for _ in range(5):
+            guard.record_failure("alice", "6.6.6.6")
+        
+        # Then: 攻击来源被锁定，本人从其他IP不受影响
+        assert guard.retry_after("alice", "6.6.6.6") > 0
+        assert guard.retry_after("alice", "10.0.0.1") == 0
+        
+        # When: 分散到多个IP继续猜测，累计达到账户阈值
+        locks = [guard.record_failure("alice", f"7.7.7.{i}") for i in range(3)]
+        
+        # Then: 账户软锁定，时间不超过account_max_seconds
+        assert locks == [2, 4, 4]
+        assert 0 < guard.retry_after("alice", "10.0.0.1") <= 4
+        assert guard.retry_after("alice", "6.6.6.6") > 4
+    
+    def test_locked_login_returns_429(self, client: TestClient, user_service: UserService,
+                                      test_user_data: dict):
+        """测试连续失败后即使密码正确也被锁定"""
+        # Given: 连续5次密码错误
+        user_service.create_user(UserCreate(**test_user_data))
+        for _ in range(5):
+            response = client.post("/api/v1/auth/login", json={
+                "username": test_user_data["username"], "password": "wrong"
+            })
+            assert response.status_code == 401
+        
+        # When: 使用正确密码登录（用户名大小写不同）
+        response = client.post("/api/v1/auth/login", json={
+            "username": test_user_data["username"].upper(),
+            "password": test_user_data["password"]
+        })
+        
+        # Then: 处于锁定期
+        assert response.status_code == 429
+        assert "Retry-After" in response.headers
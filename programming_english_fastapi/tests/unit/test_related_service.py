@@ -0,0 +1,178 @@
+"""相关词服务测试模块"""
+
+import numpy as np
+import pytest
+from fastapi.testclient import TestClient
+from sqlmodel import Session, select
+
+from app.models.related import RelatedWord
+from app.models.word import Word, WordCreate, WordUpdate
+from app.services.related_service import RelatedService, TfidfModel, related_model, word_document
+from app.services.version_service import VersionService, WORDS_VERSION
+from app.services.word_service import WordService
+
+WORDS = [
+    ("list", "列表", "An ordered collection of items in Python", "items = [1, 2, 3]"),
+    ("tuple", "元组", "An immutable ordered collection of items", "point = (1, 2)"),
+    ("dictionary", "字典", "A collection of key value pairs", "ages = {'tom': 3}"),
+    ("exception", "异常", "An error raised while the program runs", "raise ValueError()"),
+    ("thread", "线程", "A unit of concurrent execution in a process", "Thread(target=run).start()"),
+]
+
+
+@pytest.fixture
+def words(db_session: Session):
+    """创建测试单词"""
+    word_service = WordService(db_session)
+    return [
+        word_service.create_word(WordCreate(word=w, translation=t, definition=d, example=e))
+        for w, t, d, e in WORDS
+    ]
+
+
+class TestTfidfModel:
+    """TF-IDF模型测试类"""
+    
+    def test_similar_documents_rank_higher(self):
+        """测试相似文本排名更高"""
+        model = TfidfModel(
+            [1, 2, 3],
+            ["ordered collection of items", "immutable ordered collection", "concurrent thread execution"]
+        )
+        
+        neighbours = model.top_from_scores(model.similarities(1), 2)
+        
+        assert neighbours[0][0] == 2
+        assert all(word_id != 3 for word_id, _ in neighbours)
+    
+    def test_upsert_and_remove(self):
+        """测试增量写入与删除"""
+        model = TfidfModel([1, 2], ["ordered collection", "thread execution"])
+        
+        model.upsert(3, "ordered collection of values")
+        assert model.top_from_scores(model.similarities(3), 1)[0][0] == 1
+        
+        model.remove(1)
+        assert model.top_from_scores(model.similarities(3), 2) == []
+    
+    def test_preview_matches_upsert(self):
+        """测试预览相似度与实际写入后的相似度一致，且不修改模型"""
+        model = TfidfModel([1, 2], ["ordered collection", "thread execution"])
+        
+        preview = model.preview(3, "ordered collection of unique values")
+        assert 3 not in model.row_of
+        assert model.total_documents == 2
+        
+        model.upsert(3, "ordered collection of unique values")
+        np.testing.assert_allclose(preview, model.similarities(3)[:2], rtol=1e-5)
+    
+    def test_sparse_storage(self):
+        """测试只保存非零项，替换和删除后倒排表与行向量保持一致"""
+        model = TfidfModel([1, 2], ["ordered collection", "thread execution"])
+        assert model.nnz == 4
+        
+        model.upsert(1, "thread pool")
+        model.remove(2)
+        
+        postings = {
+            token: list(model.postings[column][0])
+            for token, column in model.vocabulary.items()
+        }
+        assert postings["ordered"] == [] and postings["execution"] == []
+        assert postings["thread"] == [0] and postings["pool"] == [0]
+        assert model.nnz == 2
+
+
+class TestRelatedService:
+    """相关词服务测试类"""
+    
+    def test_neighbours_maintained_on_create(self, db_session: Session, words):
+        """测试创建单词时增量维护近邻"""
+        related = RelatedService(db_session).get_related(words[0].id)
+        
+        related_ids = [word.id for _, word in related]
+        assert related_ids[0] == words[1].id
+        assert words[4].id not in related_ids
+        # 反向：tuple的近邻中也包含list
+        assert words[0].id in [word.id for _, word in RelatedService(db_session).get_related(words[1].id)]
+    
+    def test_incremental_matches_full_rebuild(self, db_session: Session, words):
+        """测试增量结果与全量重建一致（排名第一的近邻）"""
+        service = RelatedService(db_session)
+        incremental = {w.id: [x.id for _, x in service.get_related(w.id, 1)] for w in words}
+        
+        service.rebuild_all()
+        rebuilt = {w.id: [x.id for _, x in service.get_related(w.id, 1)] for w in words}
+        
+        assert incremental == rebuilt
+    
+    def test_update_and_delete(self, db_session: Session, words):
+        """测试更新释义后近邻变化、删除后清理"""
+        word_service = WordService(db_session)
+        word_service.update_word(words[3].id, WordUpdate(
+            definition="A unit of concurrent execution", example="Thread().start()", translation="线程"
+        ))
+        service = RelatedService(db_session)
+        assert service.get_related(words[3].id, 1)[0][1].id == words[4].id
+        
+        deleted_id = words[4].id
+        word_service.delete_word(deleted_id)
+        remaining = db_session.exec(
+            select(RelatedWord).where(RelatedWord.related_word_id == deleted_id)
+        ).all()
+        assert remaining == []
+    
+    def test_model_updated_after_commit(self, db_session: Session, words):
+        """测试事务内同步近邻不修改进程内模型，提交后才应用"""
+        # Given: 已构建的模型和一个尚未提交的新单词
+        word = Word(word="set", translation="集合", definition="An unordered collection of unique items", example="s = {1, 2}")
+        db_session.add(word)
+        db_session.flush()
+        model = RelatedService(db_session).ensure_model()
+        
+        # When: 在事务内同步近邻
+        update = RelatedService(db_session).sync_word(word)
+        
+        # Then: 模型不变，应用变更后才写入
+        assert word.id not in model.row_of
+        assert update.document == word_document(word)
+        related_model.on_word_saved(related_model.version + 1, update)
+        assert word.id in model.row_of
+        assert model.top_from_scores(model.similarities(word.id), 1)[0][0] == update.neighbours[word.id][0][0]
+
+
+    def test_model_rebuilt_after_write_in_other_process(self, db_session: Session, words):
+        """测试其他进程写入单词后，本进程下一次写入时按新版本重建模型"""
+        # Given: 本进程已构建模型，另一个进程随后写入了单词（本进程的模型未收到变更）
+        RelatedService(db_session).ensure_model()
+        other = Session(bind=db_session.connection())
+        other.add(Word(word="set", translation="集合", definition="An unordered collection of unique items",
+                       example="s = {1, 2}"))
+        VersionService(other).bump(WORDS_VERSION)
+        other.commit()
+        assert related_model.current(VersionService(db_session).get(WORDS_VERSION)) is None
+        
+        # When: 本进程写入一个相似的单词
+        frozenset_word = WordService(db_session).create_word(WordCreate(
+            word="frozenset", translation="不可变集合", definition="An immutable unordered collection of unique items",
+            example="frozenset({1, 2})"
+        ))
+        
+        # Then: 近邻包含另一个进程写入的单词，模型与当前版本一致
+        related = RelatedService(db_session).get_related(frozenset_word.id, 1)
+        assert related[0][1].word == "set"
+        assert related_model.current(VersionService(db_session).get(WORDS_VERSION)) is not None
+
+
+class TestRelatedAPI:
+    """相关词API测试类"""
+    
+    def test_get_related(self, client: TestClient, words):
+        """测试获取相关单词"""
+        response = client.get(f"/api/v1/words/{words[0].id}/related?n=1")
+        
+        assert response.status_code == 200
+        data = response.json()
+        assert len(data) == 1
+        assert data[0]["word"]["word"] == "tuple"
+        assert data[0]["score"] > 0
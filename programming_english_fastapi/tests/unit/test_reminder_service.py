@@ -0,0 +1,114 @@
+"""复习提醒服务测试模块"""
+
+import pytest
+from datetime import date, datetime, timedelta
+from sqlmodel import Session, select
+
+from app.core.metrics import metrics
+from app.models.reminder import ReminderOutbox, ReminderStatus
+from app.models.user import UserCreate
+from app.models.word import WordCreate, LearningRecord
+from app.services.reminder_service import ReminderJob, ReminderNotifier, THROUGHPUT_METRIC
+from app.services.user_service import UserService
+from app.services.word_service import WordService
+
+RUN_DATE = date(2025, 1, 10)
+
+
+@pytest.fixture
+def due_records(db_session: Session, user_service: UserService):
+    """3个用户：u0有3个到期，u1有1个到期1个未到期，u2没有到期"""
+    words = [
+        WordService(db_session).create_word(WordCreate(
+            word=f"term{i}", translation=f"术语{i}", definition=f"definition {i}", example=f"term{i}()"
+        ))
+        for i in range(3)
+    ]
+    users = [
+        user_service.create_user(UserCreate(username=f"user{i}", email=f"user{i}@example.com", password="password123"))
+        for i in range(3)
+    ]
+    schedule = {
+        0: [datetime(2025, 1, 1), datetime(2025, 1, 10, 8), datetime(2025, 1, 10, 23)],
+        1: [datetime(2025, 1, 9), datetime(2025, 1, 11)],
+        2: [datetime(2025, 1, 12)],
+    }
+    for index, times in schedule.items():
+        for word, next_review_at in zip(words, times):
+            db_session.add(LearningRecord(user_id=users[index].id, word_id=word.id, next_review_at=next_review_at))
+    db_session.commit()
+    return users
+
+
+def outbox_counts(db_session: Session):
+    """发件箱中的{用户ID: 到期数}"""
+    items = db_session.exec(select(ReminderOutbox).where(ReminderOutbox.due_date == RUN_DATE)).all()
+    return {item.user_id: item.due_count for item in items}
+
+
+class TestReminderJob:
+    """复习提醒批处理测试类"""
+    
+    def test_aggregates_due_counts(self, db_session: Session, due_records):
+        """测试按用户聚合当天（含逾期）到期数"""
+        users = due_records
+        
+        run = ReminderJob(db_session, chunk_size=2).run(RUN_DATE)
+        
+        assert run.completed
+        assert run.rows_scanned == 4
+        assert run.users == 2
+        assert outbox_counts(db_session) == {users[0].id: 3, users[1].id: 1}
+        assert metrics.snapshot()["observations"][THROUGHPUT_METRIC]["count"] >= 1
+    
+    def test_resume_after_interruption(self, db_session: Session, due_records):
+        """测试中断后从游标继续，计数不重复"""
+        users = due_records
+        
+        # Given: 只处理了第一批就中断
+        partial = ReminderJob(db_session, chunk_size=1).run(RUN_DATE, max_chunks=1)
+        assert not partial.completed
+        assert partial.rows_scanned == 1
+        
+        # When: 重新运行
+        run = ReminderJob(db_session, chunk_size=1).run(RUN_DATE)
+        
+        # Then: 结果与一次跑完相同，已完成的任务再次运行不变
+        assert run.completed
+        assert outbox_counts(db_session) == {users[0].id: 3, users[1].id: 1}
+        assert ReminderJob(db_session).run(RUN_DATE).rows_scanned == 4
+        assert outbox_counts(db_session) == {users[0].id: 3, users[1].id: 1}
+
+
+class TestReminderNotifier:
+    """提醒通知器测试类"""
+    
+    def test_deliver_marks_sent(self, db_session: Session, due_records):
+        """测试发送后标记为已发送且不会重复发送"""
+        ReminderJob(db_session).run(RUN_DATE)
+        delivered = []
+        notifier = ReminderNotifier(db_session, send=delivered.append)
+        
+        assert notifier.deliver(batch_size=1) == 2
+        assert notifier.deliver() == 0
+        assert {item.due_count for item in delivered} == {3, 1}
+        assert all(item.status == ReminderStatus.SENT for item in db_session.exec(select(ReminderOutbox)).all())
+    
+    def test_deliver_waits_for_completed_run(self, db_session: Session, due_records):
+        """测试扫描未完成时不发送提醒，完成后按最终计数发送"""
+        users = due_records
+        delivered = []
+        notifier = ReminderNotifier(db_session, send=delivered.append)
+        
+        # Given: 扫描中断，发件箱中只有部分计数
+        ReminderJob(db_session, chunk_size=1).run(RUN_DATE, max_chunks=1)
+        
+        # When/Then: 未完成的扫描不发送
+        assert notifier.deliver() == 0
+        
+        # When: 扫描完成后发送
+        ReminderJob(db_session, chunk_size=1).run(RUN_DATE)
+        
+        # Then: 发送的是完整计数
+        assert notifier.deliver() == 2
+        assert {item.user_id: item.due_count for item in delivered} == {users[0].id: 3, users[1].id: 1}
@@ -0,0 +1,306 @@
+"""学习报告服务测试模块"""
+
+import time
+import pytest
+from datetime import datetime, timedelta
+from fastapi.testclient import TestClient
+from sqlmodel import Session
+
+from app.core.exception_handlers import BusinessException, NotFoundException
+from app.core.metrics import metrics
+from app.models.report import JobStatus, ReportJobRead
+from app.models.word import WordCreate
+from app.services.learning_service import LearningService
+from app.models.user import UserCreate
+from app.services.report_service import (
+    ReportJobManager, ReportService, QUEUE_DEPTH_METRIC, STALE_AFTER, FILE_TTL, report_jobs
+)
+from app.services.user_service import UserService
+from app.services.word_service import WordService
+from app.utils.report_utils import render_report_html, svg_bar_chart
+
+
+@pytest.fixture
+def records(db_session: Session, user):
+    """创建学习记录"""
+    word_service = WordService(db_session)
+    learning_service = LearningService(db_session)
+    for i in range(3):
+        word = word_service.create_word(WordCreate(
+            word=f"term{i}", translation=f"术语{i}", definition=f"definition {i}", example=f"term{i}()"
+        ))
+        learning_service.record_review(user.id, word.id, True, reviewed_at=datetime(2025, 3, 5))
+
+
+def bound_session_factory(db_session: Session):
+    """回写状态的会话与测试会话共用连接，使写入在测试事务内可见"""
+    return lambda: Session(bind=db_session.connection())
+
+
+@pytest.fixture
+def manager(tmp_path, db_session: Session):
+    """使用临时目录的报告进程池"""
+    manager = ReportJobManager(max_workers=1, max_pending=4, output_dir=str(tmp_path),
+                               session_factory=bound_session_factory(db_session))
+    yield manager
+    manager.shutdown()
+
+
+@pytest.fixture
+def idle_manager(tmp_path, db_session: Session):
+    """不执行渲染的进程池，任务停留在PENDING（模拟渲染中或提交进程崩溃）"""
+    manager = ReportJobManager(max_workers=1, max_pending=4, output_dir=str(tmp_path),
+                               session_factory=bound_session_factory(db_session))
+    manager.submit = lambda job_id, data: None
+    return manager
+
+
+def wait_for_status(service: ReportService, user_id: int, job_id: int, timeout: float = 30):
+    """轮询直到任务结束"""
+    deadline = time.monotonic() + timeout
+    while True:
+        job = service.get_job(user_id, job_id)
+        if job.status in (JobStatus.SUCCEEDED, JobStatus.FAILED) or time.monotonic() > deadline:
+            return job
+        time.sleep(0.05)
+
+
+class TestReportRendering:
+    """报告渲染测试类"""
+    
+    def test_svg_bar_chart(self):
+        """测试柱状图包含每个数据点"""
+        svg = svg_bar_chart(["a", "b"], [1, 3])
+        
+        assert svg.count("<rect") == 2
+        assert svg_bar_chart([], []) == '<p class="empty">暂无数据</p>'
+    
+    def test_render_escapes_html(self):
+        """测试报告内容转义"""
+        html = render_report_html({"username": "<script>", "month": "2025-03"})
+        
+        assert "<script>" not in html
+        assert "&lt;script&gt;" in html
+
+
+class TestReportService:
+    """学习报告服务测试类"""
+    
+    def test_collect_report_data(self, db_session: Session, user, records, manager):
+        """测试报告数据只含聚合结果"""
+        data = ReportService(db_session, manager).collect_report_data(user, datetime(2025, 3, 1).date())
+        
+        assert data["month"] == "2025-03"
+        assert data["mastery_distribution"][1] == 3
+        assert data["category_distribution"] == {"basic": 3}
+        assert "初次复习" in data["achievements"]
+    
+    def test_job_runs_in_process_pool(self, db_session: Session, user, records, manager):
+        """测试任务在进程池中渲染并通过轮询回写状态"""
+        service = ReportService(db_session, manager)
+        
+        # When: 提交任务并等待进程池完成
+        job = service.create_job(user, "2025-03")
+        assert job.status == JobStatus.PENDING
+        
+        # Then: 提交进程在回调中回写结果
+        job = wait_for_status(service, user.id, job.id)
+        assert job.status == JobStatus.SUCCEEDED
+        with open(job.file_path, encoding="utf-8") as report:
+            assert "2025-03 学习报告" in report.read()
+        assert metrics.get(QUEUE_DEPTH_METRIC) == 0
+    
+    def test_limits(self, db_session: Session, user, idle_manager):
+        """测试月份校验与每用户并发限制"""
+        service = ReportService(db_session, idle_manager)
+        with pytest.raises(ValueError):
+            service.create_job(user, "2025-13")
+        
+        service.create_job(user, "2025-03")
+        with pytest.raises(BusinessException):
+            service.create_job(user, "2025-04")
+    
+    def test_poll_on_other_worker(self, db_session: Session, user, records, idle_manager, tmp_path):
+        """测试轮询落在没有该任务Future的worker上时读取数据库中的状态"""
+        from concurrent.futures import Future
+        job = ReportService(db_session, idle_manager).create_job(user, "2025-03")
+        other_worker = ReportJobManager(max_workers=1, max_pending=4, output_dir=str(tmp_path))
+        
+        # When: 渲染中时其他worker轮询，不会把进行中的任务标记为失败
+        assert ReportService(db_session, other_worker).get_job(user.id, job.id).status == JobStatus.PENDING
+        
+        # Then: 提交进程回写完成状态后，其他worker看到成功状态
+        done = Future()
+        done.set_result(str(tmp_path / "report.html"))
+        idle_manager._record(job.id, done)
+        assert ReportService(db_session, other_worker).get_job(user.id, job.id).status == JobStatus.SUCCEEDED
+    
+    def test_stale_job_expires_by_age(self, db_session: Session, user, records, idle_manager):
+        """测试崩溃遗留的进行中任务按时间过期，不再占用并发名额"""
+        # Given: 提交任务的进程崩溃，任务停留在PENDING
+        service = ReportService(db_session, idle_manager)
+        job = service.create_job(user, "2025-03")
+        with pytest.raises(BusinessException):
+            service.create_job(user, "2025-04")
+        
+        # When: 超过过期时间
+        job.created_at = datetime.utcnow() - STALE_AFTER - timedelta(seconds=1)
+        db_session.add(job)
+        db_session.commit()
+        
+        # Then: 任务标记为中断，可以提交新任务
+        assert service.get_job(user.id, job.id).status == JobStatus.FAILED
+        assert service.create_job(user, "2025-04").status == JobStatus.PENDING
+    
+    def test_heartbeat_keeps_long_job_alive(self, db_session: Session, user, idle_manager):
+        """测试排队或渲染超过STALE_AFTER的任务只要提交进程仍有心跳就不会过期"""
+        from concurrent.futures import Future
+        # Given: 创建时间早已超过过期时间，但提交进程仍持有未完成的Future
+        service = ReportService(db_session, idle_manager)
+        job = service.create_job(user, "2025-03")
+        job.created_at = datetime.utcnow() - STALE_AFTER - timedelta(seconds=1)
+        db_session.add(job)
+        db_session.commit()
+        idle_manager._futures[job.id] = Future()
+        
+        # When: 心跳刷新
+        assert idle_manager.heartbeat() == 1
+        
+        # Then: 任务仍在进行中，也不会被提交新任务时的过期检查标记为中断
+        assert service.get_job(user.id, job.id).status == JobStatus.PENDING
+        assert service.expire_stale_jobs(user.id) == 0
+        
+        # When: 心跳停止超过过期时间
+        job.heartbeat_at = datetime.utcnow() - STALE_AFTER - timedelta(seconds=1)
+        db_session.add(job)
+        db_session.commit()
+        
+        # Then: 任务标记为中断
+        assert service.get_job(user.id, job.id).status == JobStatus.FAILED
+    
+    def test_late_result_of_expired_job_is_deleted(self, db_session: Session, user, idle_manager, tmp_path):
+        """测试已判定中断的任务之后渲染完成时删除报告文件"""
+        from concurrent.futures import Future
+        service = ReportService(db_session, idle_manager)
+        job = service.create_job(user, "2025-03")
+        service._finish(job, JobStatus.FAILED, error="任务已中断，请重新提交")
+        report = tmp_path / "late.html"
+        report.write_text("late", encoding="utf-8")
+        
+        done = Future()
+        done.set_result(str(report))
+        idle_manager._record(job.id, done)
+        
+        assert not report.exists()
+        assert service.get_job(user.id, job.id).file_path is None
+    
+    def test_take_file_once_and_purge_expired(self, db_session: Session, user, idle_manager, tmp_path):
+        """测试报告只能领取一次，未下载的报告超过保留时间后删除"""
+        from concurrent.futures import Future
+        service = ReportService(db_session, idle_manager)
+        reports = []
+        for month in ("2025-03", "2025-04"):
+            job = service.create_job(user, month)
+            report = tmp_path / f"{month}.html"
+            report.write_text(month, encoding="utf-8")
+            done = Future()
+            done.set_result(str(report))
+            idle_manager._record(job.id, done)
+            reports.append((job, report))
+        
+        # When: 领取第一份报告
+        path, month = service.take_file(user.id, reports[0][0].id)
+        
+        # Then: 任务不再引用文件，再次领取返回410
+        assert (path, month) == (reports[0][1], "2025-03")
+        with pytest.raises(BusinessException) as exc_info:
+            service.take_file(user.id, reports[0][0].id)
+        assert exc_info.value.status_code == 410
+        
+        # When: 第二份报告超过保留时间仍未下载
+        job = service.get_job(user.id, reports[1][0].id)
+        job.finished_at = datetime.utcnow() - FILE_TTL - timedelta(seconds=1)
+        db_session.add(job)
+        db_session.commit()
+        
+        # Then: 文件被删除
+        assert service.purge_expired_files() == 1
+        assert not reports[1][1].exists()
+        assert not ReportJobRead.from_job(service.get_job(user.id, job.id)).file_available
+    
+    def test_failed_data_collection_leaves_no_job(self, db_session: Session, user, idle_manager, monkeypatch):
+        """测试数据查询失败时不创建任务"""
+        service = ReportService(db_session, idle_manager)
+        monkeypatch.setattr(service, "collect_report_data", lambda *args: 1 / 0)
+        
+        with pytest.raises(ZeroDivisionError):
+            service.create_job(user, "2025-03")
+        
+        monkeypatch.undo()
+        assert service.create_job(user, "2025-03").status == JobStatus.PENDING
+    
+    def test_other_users_job_not_found(self, db_session: Session, user, idle_manager):
+        """测试不能查看他人的任务"""
+        job = ReportService(db_session, idle_manager).create_job(user, "2025-03")
+        
+        with pytest.raises(NotFoundException):
+            ReportService(db_session, idle_manager).get_job(user.id + 1, job.id)
+
+
+class TestReportAPI:
+    """学习报告API测试类"""
+    
+    def test_submit_poll_and_download(self, client: TestClient, db_session: Session, user, records,
+                                      test_user_data: dict, tmp_path, monkeypatch):
+        """测试提交、轮询和下载报告"""
+        monkeypatch.setattr(report_jobs, "output_dir", tmp_path)
+        monkeypatch.setattr(report_jobs, "session_factory", bound_session_factory(db_session))
+        token = client.post("/api/v1/auth/login", json={
+            "username": test_user_data["username"],
+            "password": test_user_data["password"]
+        }).json()["access_token"]
+        headers = {"Authorization": f"Bearer {token}"}
+        
+        try:
+            response = client.post("/api/v1/me/reports/", json={"month": "2025-03"}, headers=headers)
+            assert response.status_code == 202
+            job_id = response.json()["data"]["id"]
+            
+            deadline = time.monotonic() + 30
+            while True:
+                status = client.get(f"/api/v1/me/reports/{job_id}", headers=headers).json()["data"]["status"]
+                if status != "pending" or time.monotonic() > deadline:
+                    break
+                time.sleep(0.05)
+            assert status == "succeeded"
+            
+            file_response = client.get(f"/api/v1/me/reports/{job_id}/file", headers=headers)
+            assert file_response.status_code == 200
+            assert file_response.headers["content-type"].startswith("text/html")
+            
+            # Then: 报告发送后删除，不能再次下载
+            assert not list(tmp_path.glob("*.html"))
+            assert client.get(f"/api/v1/me/reports/{job_id}/file", headers=headers).status_code == 410
+        finally:
+            report_jobs.shutdown()
+    
+    def test_metrics_requires_superuser(self, client: TestClient, user_service: UserService, user,
+                                        test_user_data: dict, superuser_config: dict):
+        """测试指标接口只对超级用户开放"""
+        def login(username: str, password: str) -> dict:
+            token = client.post("/api/v1/auth/login", json={
+                "username": username, "password": password
+            }).json()["access_token"]
+            return {"Authorization": f"Bearer {token}"}
+        user_service.create_user(UserCreate(
+            username=superuser_config["username"], email=superuser_config["email"],
+            password=superuser_config["password"]
+        ))
+        
+        assert client.get("/api/v1/metrics").status_code == 401
+        assert client.get("/api/v1/metrics", headers=login(
+            test_user_data["username"], test_user_data["password"])).status_code == 403
+        response = client.get("/api/v1/metrics", headers=login(
+            superuser_config["username"], superuser_config["password"]))
+        assert response.status_code == 200
+        assert "gauges" in response.json()
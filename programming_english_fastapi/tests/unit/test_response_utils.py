@@ -5,7 +5,7 @@ from datetime import datetime
 from app.utils.response_utils import (
     success_response, error_response, 
     pagination_response, create_response,
-    ResponseStatus
+    cursor_pagination_response, ResponseStatus
 )
 
 
@@ -202,4 +202,20 @@ class TestResponseUtils:
         # Then: 验证响应
         assert response["success"] is True
         assert response["data"] == data
-        assert len(response["data"]) == 2
\ No newline at end of file
+        assert len(response["data"]) == 2
+    
+    def test_cursor_pagination_response(self):
+        """测试游标分页响应"""
+        # Given: 分页数据和下一页游标
+        items = [{"id": 1}, {"id": 2}]
+        
+        # When: 创建游标分页响应
+        response = cursor_pagination_response(items, next_cursor=2, size=2)
+        last_page = cursor_pagination_response(items, next_cursor=None, size=2)
+        
+        # Then: 验证游标与has_next
+        assert response["success"] is True
+        assert response["data"]["items"] == items
+        assert response["data"]["next_cursor"] == 2
+        assert response["data"]["has_next"] is True
+        assert last_page["data"]["has_next"] is False
@@ -0,0 +1,115 @@
+"""中文反查测试模块"""
+
+import pytest
+from fastapi.testclient import TestClient
+from sqlmodel import Session
+
+from app.models.word import WordCreate, WordUpdate
+from app.services.search_service import SearchService
+from app.services.word_service import WordService
+from app.utils.search_utils import TokenIndex
+from app.utils.text_utils import translation_query_tokens, translation_tokens
+
+TRANSLATIONS = {
+    "variable": "变量",
+    "global": "全局变量",
+    "constant": "常量",
+    "parameter": "参数",
+    "argument": "实际参数",
+}
+
+
+@pytest.fixture
+def words(db_session: Session):
+    """创建测试单词"""
+    word_service = WordService(db_session)
+    return {
+        term: word_service.create_word(WordCreate(
+            word=term, translation=translation, definition=f"{term} definition", example=f"{term}()"
+        ))
+        for term, translation in TRANSLATIONS.items()
+    }
+
+
+class TestTranslationTokens:
+    """翻译切分测试类"""
+    
+    def test_document_tokens(self):
+        """测试文档切分包含单字、二元组和英文单词"""
+        tokens = translation_tokens("API接口")
+        
+        assert set(tokens) == {"api", "接", "口", "接口"}
+    
+    def test_query_tokens(self):
+        """测试多字查询只使用二元组"""
+        assert translation_query_tokens("全局变量") == ["全局", "局变", "变量"]
+        assert translation_query_tokens("值") == ["值"]
+
+
+class TestTokenIndex:
+    """检索词倒排索引测试类"""
+    
+    def test_exact_match_ranked_first(self):
+        """测试完全匹配优先，其余按覆盖率和长度排序"""
+        # Given: 多个包含“变量”的文档
+        index = TokenIndex()
+        for item_id, text in enumerate(["全局变量", "变量", "局部变量名", "常量"]):
+            index.add(item_id, text, translation_tokens(text))
+        
+        # When: 查询“变量”
+        results = index.search("变量", translation_query_tokens("变量"))
+        
+        # Then: 完全匹配在前，不相关文档不出现
+        assert [text for _, text, _ in results] == ["变量", "全局变量", "局部变量名"]
+        assert results[0][2] == pytest.approx(1.0)
+    
+    def test_replace_and_remove(self):
+        """测试替换与删除文档"""
+        index = TokenIndex()
+        index.add(1, "变量", translation_tokens("变量"))
+        index.add(1, "常量", translation_tokens("常量"))
+        assert index.search("变量", ["变量"]) == []
+        
+        index.remove(1)
+        assert len(index) == 0
+        assert index.search("常量", ["常量"]) == []
+
+
+class TestReverseLookup:
+    """中文反查服务测试类"""
+    
+    def test_reverse_lookup(self, db_session: Session, words):
+        """测试按中文释义反查单词"""
+        matches = SearchService(db_session).reverse_lookup("参数")
+        
+        assert [word.word for word, _ in matches] == ["parameter", "argument"]
+    
+    def test_index_updated_on_write(self, db_session: Session, words):
+        """测试单词写入与删除后增量更新索引"""
+        service = SearchService(db_session)
+        assert service.reverse_lookup("常量")[0][0].word == "constant"
+        
+        word_service = WordService(db_session)
+        word_service.update_word(words["constant"].id, WordUpdate(translation="不可变值"))
+        word_service.delete_word(words["variable"].id)
+        
+        assert service.reverse_lookup("常量") == []
+        assert service.reverse_lookup("不可变")[0][0].word == "constant"
+        assert [word.word for word, _ in service.reverse_lookup("变量")] == ["global"]
+
+
+class TestReverseAPI:
+    """中文反查API测试类"""
+    
+    def test_reverse_endpoint(self, client: TestClient, words):
+        """测试反查接口"""
+        response = client.get("/api/v1/words/reverse", params={"q": "变量"})
+        
+        assert response.status_code == 200
+        data = response.json()
+        assert [item["word"]["word"] for item in data] == ["variable", "global"]
+        assert data[0]["score"] == pytest.approx(1.0)
+    
+    def test_reverse_requires_query(self, client: TestClient):
+        """测试缺少查询词返回422"""
+        assert client.get("/api/v1/words/reverse").status_code == 422
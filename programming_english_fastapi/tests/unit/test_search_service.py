@@ -0,0 +1,132 @@
+"""单词检索服务测试模块"""
+
+import pytest
+from fastapi.testclient import TestClient
+from sqlmodel import Session
+
+from app.models.word import Word, WordCreate, WordUpdate
+from app.services.search_service import SearchService, default_max_distance
+from app.services.version_service import VersionService, WORDS_VERSION
+from app.services.word_service import WordService
+from app.utils.search_utils import TrigramIndex, bounded_levenshtein
+
+TERMS = ["exception", "polymorphism", "expression", "exceptional", "function", "iterator"]
+
+
+@pytest.fixture
+def words(db_session: Session):
+    """创建测试单词"""
+    word_service = WordService(db_session)
+    return {
+        term: word_service.create_word(WordCreate(
+            word=term, translation="术语", definition=f"{term} definition", example=f"{term}()"
+        ))
+        for term in TERMS
+    }
+
+
+class TestSearchUtils:
+    """检索工具测试类"""
+    
+    @pytest.mark.parametrize("source,target,expected", [
+        ("excption", "exception", 1),
+        ("polymorphsim", "polymorphism", 2),
+        ("kitten", "sitting", 3),
+        ("same", "same", 0),
+    ])
+    def test_bounded_levenshtein(self, source, target, expected):
+        """测试编辑距离计算"""
+        assert bounded_levenshtein(source, target, 3) == expected
+    
+    def test_bounded_levenshtein_exceeds_limit(self):
+        """测试超过上限返回None"""
+        assert bounded_levenshtein("kitten", "sitting", 2) is None
+        assert bounded_levenshtein("a", "abcd", 2) is None
+    
+    def test_trigram_index_search_ranked(self):
+        """测试按距离排序的模糊查找"""
+        index = TrigramIndex()
+        for item_id, term in enumerate(TERMS):
+            index.add(item_id, term)
+        
+        matches = index.search("excption", max_distance=2)
+        
+        assert [term for _, term, _ in matches] == ["exception"]
+        assert matches[0][2] == 1
+    
+    def test_trigram_index_replace_and_remove(self):
+        """测试替换与删除词条"""
+        index = TrigramIndex()
+        index.add(1, "iterator")
+        index.add(1, "generator")
+        assert index.search("iterator", 0) == []
+        assert index.search("generator", 0)[0][0] == 1
+        
+        index.remove(1)
+        assert len(index) == 0
+        assert index.search("generator", 1) == []
+
+
+class TestSearchService:
+    """单词检索服务测试类"""
+    
+    def test_exact_lookup(self, db_session: Session, words):
+        """测试精确查找"""
+        service = SearchService(db_session)
+        
+        assert service.lookup("excption") == []
+        assert service.lookup("exception")[0][0].id == words["exception"].id
+    
+    def test_fuzzy_lookup(self, db_session: Session, words):
+        """测试容错查找"""
+        matches = SearchService(db_session).lookup("polymorphsim", fuzzy=True)
+        
+        assert [(word.word, distance) for word, distance in matches] == [("polymorphism", 2)]
+    
+    def test_index_updated_on_write(self, db_session: Session, words):
+        """测试单词写入后增量更新索引"""
+        service = SearchService(db_session)
+        assert service.lookup("iteratr", fuzzy=True)[0][0].word == "iterator"
+        
+        word_service = WordService(db_session)
+        word_service.update_word(words["iterator"].id, WordUpdate(word="generator"))
+        word_service.create_word(WordCreate(
+            word="closure", translation="闭包", definition="closure definition", example="closure()"
+        ))
+        
+        assert service.lookup("iteratr", fuzzy=True) == []
+        assert service.lookup("generatr", fuzzy=True)[0][0].word == "generator"
+        assert service.lookup("clsure", fuzzy=True)[0][0].word == "closure"
+    
+    def test_index_rebuilt_after_write_in_other_process(self, db_session: Session, words):
+        """测试其他进程写入单词后，下一次查找按新版本重建索引"""
+        # Given: 本进程已构建索引，另一个进程随后写入了单词
+        service = SearchService(db_session)
+        assert service.lookup("clsure", fuzzy=True) == []
+        other = Session(bind=db_session.connection())
+        other.add(Word(word="closure", translation="闭包", definition="closure definition", example="closure()"))
+        VersionService(other).bump(WORDS_VERSION)
+        other.commit()
+        
+        # When/Then: 查找能找到另一个进程写入的单词
+        assert service.lookup("clsure", fuzzy=True)[0][0].word == "closure"
+        assert service.reverse_lookup("闭包")[0][0].word == "closure"
+    
+    def test_default_max_distance(self):
+        """测试按长度确定编辑距离"""
+        assert default_max_distance("if") == 0
+        assert default_max_distance("loop") == 1
+        assert default_max_distance("iterator") == 2
+
+
+class TestLookupAPI:
+    """单词查找API测试类"""
+    
+    def test_lookup_fuzzy(self, client: TestClient, words):
+        """测试模糊查找接口"""
+        response = client.get("/api/v1/words/lookup?q=excption&fuzzy=true")
+        
+        assert response.status_code == 200
+        data = response.json()
+        assert data[0]["word"]["word"] == "exception"
+        assert data[0]["distance"] == 1
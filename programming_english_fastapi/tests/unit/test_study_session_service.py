@@ -0,0 +1,121 @@
+"""学习会话服务测试模块"""
+
+import random
+import pytest
+from datetime import datetime, timedelta
+from fastapi.testclient import TestClient
+from sqlalchemy import event
+from sqlmodel import Session
+
+from app.models.word import LearningRecord
+from app.services.learning_service import LearningService, next_review_time
+from app.services.study_session_service import StudySessionService, build_options
+
+
+@pytest.fixture
+def words(make_words):
+    """创建6个测试单词"""
+    return make_words(6)
+
+
+class TestBuildOptions:
+    """选项生成测试类"""
+    
+    def test_options_contain_answer_once(self):
+        """测试选项包含且仅包含一次正确答案"""
+        pool = ["变量", "函数", "数组", "对象", "类"]
+        
+        options = build_options("函数", pool, count=4, rng=random.Random(1))
+        
+        assert len(options) == 4
+        assert options.count("函数") == 1
+        assert set(options) <= set(pool)
+    
+    def test_small_pool(self):
+        """测试释义池不足时返回较少选项"""
+        options = build_options("变量", ["变量", "函数"], count=4)
+        
+        assert sorted(options) == ["函数", "变量"]
+
+
+class TestStudySessionService:
+    """学习会话服务测试类"""
+    
+    def test_due_cards_first_then_new(self, db_session: Session, user, words):
+        """测试到期卡片优先，不足时补充新词"""
+        # Given: 一个到期、一个未到期的学习记录
+        now = datetime.utcnow()
+        db_session.add(LearningRecord(user_id=user.id, word_id=words[3].id, next_review_at=now - timedelta(hours=1)))
+        db_session.add(LearningRecord(user_id=user.id, word_id=words[4].id, next_review_at=now + timedelta(days=1)))
+        db_session.commit()
+        
+        # When: 预取3张卡片
+        batch = StudySessionService(db_session).next_batch(user.id, 3, now=now)
+        
+        # Then: 第一张为到期卡片，其余为未学习的新词
+        assert [card.word.id for card in batch.cards] == [words[3].id, words[0].id, words[1].id]
+        assert [card.is_new for card in batch.cards] == [False, True, True]
+        assert batch.progress.learned == 2
+        assert batch.progress.due == 1
+        assert all(card.word.translation in card.options for card in batch.cards)
+    
+    def test_query_count_independent_of_batch_size(self, db_session: Session, user, words):
+        """测试查询次数与卡片数量无关"""
+        user_id = user.id
+        service = StudySessionService(db_session)
+        
+        def count_queries(n):
+            statements = []
+            connection = db_session.connection()
+            listener = lambda *args: statements.append(args[2])
+            event.listen(connection, "before_cursor_execute", listener)
+            try:
+                service.next_batch(user_id, n)
+            finally:
+                event.remove(connection, "before_cursor_execute", listener)
+            return len(statements)
+        
+        # 第一次调用预热单词与释义池缓存
+        assert count_queries(6) <= 5
+        assert count_queries(2) == count_queries(6) == 3
+    
+    def test_record_review_schedules_next_review(self, db_session: Session, user, words):
+        """测试复习后安排下次复习时间"""
+        reviewed_at = datetime(2025, 1, 1)
+        learning_service = LearningService(db_session)
+        
+        record = learning_service.record_review(user.id, words[0].id, True, reviewed_at)
+        record = learning_service.record_review(user.id, words[0].id, True, reviewed_at)
+        
+        assert record.correct_count == 2
+        assert record.mastery_level == 2
+        assert record.next_review_at == next_review_time(2, reviewed_at)
+        
+        record = learning_service.record_review(user.id, words[0].id, False, reviewed_at)
+        assert record.incorrect_count == 1
+        assert record.mastery_level == 1
+
+
+class TestStudySessionAPI:
+    """学习会话API测试类"""
+    
+    def test_next_and_review(self, client: TestClient, user, words, test_user_data: dict):
+        """测试预取卡片与提交复习"""
+        token = client.post("/api/v1/auth/login", json={
+            "username": test_user_data["username"],
+            "password": test_user_data["password"]
+        }).json()["access_token"]
+        headers = {"Authorization": f"Bearer {token}"}
+        
+        response = client.get("/api/v1/session/next?n=2", headers=headers)
+        assert response.status_code == 200
+        cards = response.json()["data"]["cards"]
+        assert len(cards) == 2
+        
+        response = client.post(
+            "/api/v1/session/review",
+            json={"word_id": cards[0]["word"]["id"], "correct": True},
+            headers=headers
+        )
+        assert response.status_code == 200
+        assert response.json()["data"]["mastery_level"] == 1
@@ -0,0 +1,193 @@
+"""离线同步服务测试模块"""
+
+import pytest
+from datetime import datetime, timedelta
+from fastapi.testclient import TestClient
+from sqlmodel import Session
+
+from app.schemas.sync import SyncReviewEntry, SyncReviewsRequest
+from app.services.achievement_service import AchievementService
+from app.services.learning_service import LearningService
+from app.services.sync_service import SyncService
+
+T0 = datetime(2025, 1, 1, 8)
+
+
+@pytest.fixture
+def words(make_words):
+    """创建测试单词"""
+    return make_words(2)
+
+
+def entry(word_id, correct, incorrect, minutes, mastery):
+    """构造一条设备累计状态"""
+    return SyncReviewEntry(
+        word_id=word_id,
+        correct_count=correct,
+        incorrect_count=incorrect,
+        last_reviewed=T0 + timedelta(minutes=minutes),
+        mastery_level=mastery
+    )
+
+
+def record_state(db_session: Session, user_id: int, word_id: int):
+    """读取学习记录的(答对, 答错, 最近复习, 掌握程度)"""
+    record = LearningService(db_session).get_record(user_id, word_id)
+    return record.correct_count, record.incorrect_count, record.last_reviewed, record.mastery_level
+
+
+class TestSyncService:
+    """离线同步服务测试类"""
+    
+    def test_replay_is_idempotent(self, db_session: Session, user, words):
+        """测试同一批数据重复上传不会重复计数"""
+        service = SyncService(db_session)
+        request = SyncReviewsRequest(device_id="phone", entries=[entry(words[0].id, 3, 1, 10, 2)])
+        
+        service.sync_reviews(user.id, request)
+        service.sync_reviews(user.id, request)
+        
+        assert record_state(db_session, user.id, words[0].id) == (3, 1, T0 + timedelta(minutes=10), 2)
+    
+    def test_two_devices_commute(self, db_session: Session, user, words):
+        """测试两台设备以任意顺序同步结果一致"""
+        service = SyncService(db_session)
+        phone = SyncReviewsRequest(device_id="phone", entries=[entry(words[0].id, 3, 1, 30, 3)])
+        tablet = SyncReviewsRequest(device_id="tablet", entries=[entry(words[0].id, 2, 2, 20, 1)])
+        
+        # When: 平板先同步，手机后同步（手机的复习时间更晚）
+        service.sync_reviews(user.id, tablet)
+        service.sync_reviews(user.id, phone)
+        
+        # Then: 计数累加，掌握程度取最近一次复习
+        assert record_state(db_session, user.id, words[0].id) == (5, 3, T0 + timedelta(minutes=30), 3)
+        
+        # When: 平板再次上传旧数据
+        service.sync_reviews(user.id, tablet)
+        
+        # Then: 状态不变
+        assert record_state(db_session, user.id, words[0].id) == (5, 3, T0 + timedelta(minutes=30), 3)
+    
+    def test_incremental_device_upload(self, db_session: Session, user, words):
+        """测试设备累计计数增长时只累加新增部分"""
+        service = SyncService(db_session)
+        LearningService(db_session).record_review(user.id, words[0].id, True, reviewed_at=T0)
+        
+        service.sync_reviews(user.id, SyncReviewsRequest(device_id="phone", entries=[entry(words[0].id, 2, 0, 5, 2)]))
+        service.sync_reviews(user.id, SyncReviewsRequest(device_id="phone", entries=[entry(words[0].id, 4, 1, 9, 2)]))
+        
+        # 在线复习1次 + 设备累计4次答对
+        assert record_state(db_session, user.id, words[0].id)[:2] == (5, 1)
+    
+    def test_delta_and_rejected(self, db_session: Session, user, words):
+        """测试响应携带游标之后的增量和被拒绝的单词"""
+        service = SyncService(db_session)
+        first = service.sync_reviews(user.id, SyncReviewsRequest(
+            device_id="phone", entries=[entry(words[0].id, 1, 0, 1, 1), entry(99999, 1, 0, 1, 1)]
+        ))
+        assert [record.word_id for record in first.records] == [words[0].id]
+        assert first.rejected_word_ids == [99999]
+        
+        # When: 另一台设备更新了另一个单词
+        service.sync_reviews(user.id, SyncReviewsRequest(device_id="tablet", entries=[entry(words[1].id, 1, 0, 2, 1)]))
+        
+        # Then: 手机以上次游标同步时只收到变化的记录
+        second = service.sync_reviews(user.id, SyncReviewsRequest(device_id="phone", since=first.cursor))
+        assert [record.word_id for record in second.records] == [words[1].id]
+    
+    def test_cursor_follows_commit_order(self, db_session: Session, user, words):
+        """测试更新时间早于上次同步、但之后才提交的在线复习不会被游标跳过"""
+        # Given: 手机完成一次同步
+        service = SyncService(db_session)
+        first = service.sync_reviews(user.id, SyncReviewsRequest(device_id="phone", entries=[entry(words[0].id, 1, 0, 1, 1)]))
+        
+        # When: 一次在线复习在同步之前打上更新时间，在同步读取之后才提交
+        record = LearningService(db_session).record_review(user.id, words[1].id, True)
+        record.updated_at = datetime.utcnow() - timedelta(hours=1)
+        db_session.add(record)
+        db_session.commit()
+        
+        # Then: 下次同步仍会收到这条记录，游标随之前进
+        second = service.sync_reviews(user.id, SyncReviewsRequest(device_id="phone", since=first.cursor))
+        assert [record.word_id for record in second.records] == [words[1].id]
+        assert second.cursor > first.cursor
+        third = service.sync_reviews(user.id, SyncReviewsRequest(device_id="phone", since=second.cursor))
+        assert third.records == [] and third.cursor == second.cursor
+
+    
+    def test_sync_updates_achievement_counters(self, db_session: Session, user, words):
+        """测试同步新增的复习计入成就计数器，重复上传不重复计数"""
+        service = SyncService(db_session)
+        request = SyncReviewsRequest(device_id="phone", entries=[
+            entry(words[0].id, 3, 1, 10, 2),
+            entry(words[1].id, 1, 0, 5 + 2 * 24 * 60, 1)
+        ])
+        
+        # When: 上传两天的离线复习并重放一次
+        response = service.sync_reviews(user.id, request)
+        service.sync_reviews(user.id, request)
+        
+        # Then: 复习、答对、已学单词只计一次，第二个复习日不连续
+        counters = AchievementService(db_session).get_counters(user.id)
+        assert (counters["reviews"], counters["correct"], counters["learned"]) == (5, 4, 2)
+        assert counters["streak"] == 1
+        assert "first_review" in response.unlocked_achievements
+
+
+class TestSyncAPI:
+    """离线同步API测试类"""
+    
+    def test_sync_reviews_endpoint(self, client: TestClient, user, words, test_user_data: dict):
+        """测试上传离线复习记录接口"""
+        token = client.post("/api/v1/auth/login", json={
+            "username": test_user_data["username"],
+            "password": test_user_data["password"]
+        }).json()["access_token"]
+        
+        response = client.post("/api/v1/sync/reviews", json={
+            "device_id": "phone",
+            "entries": [{
+                "word_id": words[0].id,
+                "correct_count": 2,
+                "incorrect_count": 0,
+                "last_reviewed": "2025-01-01T08:00:00",
+                "mastery_level": 2
+            }]
+        }, headers={"Authorization": f"Bearer {token}"})
+        
+        assert response.status_code == 200
+        data = response.json()["data"]
+        assert data["records"][0]["correct_count"] == 2
+        assert data["cursor"]
+    
+    def test_sync_with_timezone_aware_timestamps(self, client: TestClient, user, words, test_user_data: dict):
+        """测试带时区的时间戳（Z或偏移）重复同步时按UTC比较"""
+        # Given: 已登录用户
+        token = client.post("/api/v1/auth/login", json={
+            "username": test_user_data["username"],
+            "password": test_user_data["password"]
+        }).json()["access_token"]
+        headers = {"Authorization": f"Bearer {token}"}
+        
+        def sync(last_reviewed: str, since=None):
+            return client.post("/api/v1/sync/reviews", json={
+                "device_id": "phone",
+                "since": since,
+                "entries": [{
+                    "word_id": words[0].id,
+                    "correct_count": 1,
+                    "incorrect_count": 0,
+                    "last_reviewed": last_reviewed,
+                    "mastery_level": 1
+                }]
+            }, headers=headers)
+        
+        # When: 同一单词以带时区的时间戳同步两次
+        first = sync("2025-01-01T08:00:00Z")
+        second = sync("2025-01-01T17:00:00+08:00", since=first.json()["data"]["cursor"])
+        
+        # Then: 两次都成功，+08:00的17点换算为UTC 09:00，晚于第一次
+        assert first.status_code == 200
+        assert second.status_code == 200
+        records = second.json()["data"]["records"]
+        assert records[0]["last_reviewed"] == "2025-01-01T09:00:00"
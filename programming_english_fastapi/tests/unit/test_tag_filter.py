@@ -0,0 +1,144 @@
+"""标签与位图过滤测试模块"""
+
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy import event
+from sqlmodel import Session
+
+from app.models.word import WordCreate, WordUpdate, DifficultyLevel
+from app.services.tag_service import TagService, normalize_tags
+from app.services.word_service import WordService
+from app.utils.search_utils import BitmapIndex
+
+WORDS = [
+    ("thread", ["Python", "concurrency"], DifficultyLevel.ADVANCED),
+    ("asyncio", ["python", "concurrency"], DifficultyLevel.INTERMEDIATE),
+    ("promise", ["javascript", "concurrency"], DifficultyLevel.ADVANCED),
+    ("decorator", ["python"], DifficultyLevel.ADVANCED),
+]
+
+
+@pytest.fixture
+def words(db_session: Session):
+    """创建带标签的测试单词"""
+    word_service = WordService(db_session)
+    return {
+        term: word_service.create_word(WordCreate(
+            word=term, translation="术语", definition=f"{term} definition", example=f"{term}()",
+            difficulty=difficulty, tags=tags
+        ))
+        for term, tags, difficulty in WORDS
+    }
+
+
+class TestBitmapIndex:
+    """位图索引测试类"""
+    
+    def test_intersect_and_to_ids(self):
+        """测试位图求交并按升序取ID"""
+        index = BitmapIndex()
+        index.set(1, {"a", "b"})
+        index.set(5, {"a"})
+        index.set(70, {"a", "b"})
+        
+        bitmap = index.intersect(["a", "b"])
+        
+        assert BitmapIndex.to_ids(bitmap) == [1, 70]
+        assert BitmapIndex.to_ids(index.intersect(["a"]), skip=1, limit=1) == [5]
+        assert index.intersect(["a", "missing"]) == 0
+        assert index.count("a") == 3
+    
+    def test_replace_and_remove(self):
+        """测试替换与删除"""
+        index = BitmapIndex()
+        index.set(3, {"a"})
+        index.set(3, {"b"})
+        assert index.intersect(["a"]) == 0
+        
+        index.remove(3)
+        assert len(index) == 0
+        assert index.intersect(["b"]) == 0
+
+
+class TestTagService:
+    """标签服务测试类"""
+    
+    def test_normalize_tags(self):
+        """测试标签归一化"""
+        assert normalize_tags([" Python", "python", "", "Go "]) == ["python", "go"]
+    
+    def test_tags_stored_on_create(self, db_session: Session, words):
+        """测试创建单词时写入标签"""
+        service = TagService(db_session)
+        
+        assert service.get_word_tags(words["thread"].id) == ["concurrency", "python"]
+        assert dict(service.list_tags()) == {"concurrency": 3, "javascript": 1, "python": 3}
+
+
+class TestFilterWords:
+    """位图过滤测试类"""
+    
+    def test_filter_by_tags_and_difficulty(self, db_session: Session, words):
+        """测试标签与难度组合过滤"""
+        service = WordService(db_session)
+        
+        assert [w.word for w in service.filter_words(tags=["python", "concurrency"])] == ["thread", "asyncio"]
+        assert [w.word for w in service.filter_words(
+            tags=["concurrency"], difficulty=DifficultyLevel.ADVANCED
+        )] == ["thread", "promise"]
+        assert service.filter_words(tags=["rust"]) == []
+    
+    def test_index_updated_on_write(self, db_session: Session, words):
+        """测试单词写入与删除后增量更新位图"""
+        service = WordService(db_session)
+        assert len(service.filter_words(tags=["python"])) == 3
+        
+        # When: 修改标签、只修改难度、删除单词
+        service.update_word(words["decorator"].id, WordUpdate(tags=["javascript"]))
+        service.update_word(words["asyncio"].id, WordUpdate(difficulty=DifficultyLevel.ADVANCED))
+        service.delete_word(words["thread"].id)
+        
+        # Then: 未修改标签的单词保留原标签
+        assert [w.word for w in service.filter_words(tags=["python"])] == ["asyncio"]
+        assert [w.word for w in service.filter_words(
+            tags=["concurrency"], difficulty="advanced"
+        )] == ["asyncio", "promise"]
+        assert [w.word for w in service.filter_words(tags=["javascript"])] == ["promise", "decorator"]
+    
+    def test_warm_filter_is_single_query(self, db_session: Session, words):
+        """测试索引构建后过滤只需一次版本检查和一次批量取详情查询"""
+        service = WordService(db_session)
+        service.filter_words(tags=["python"])
+        from app.services.word_service import word_cache
+        word_cache.clear()
+        
+        statements = []
+        connection = db_session.connection()
+        listener = lambda *args: statements.append(args[2])
+        event.listen(connection, "before_cursor_execute", listener)
+        try:
+            result = service.filter_words(tags=["python", "concurrency"], difficulty="advanced")
+        finally:
+            event.remove(connection, "before_cursor_execute", listener)
+        
+        assert [w.word for w in result] == ["thread"]
+        assert len(statements) == 2
+
+
+class TestTagAPI:
+    """标签API测试类"""
+    
+    def test_filter_endpoint(self, client: TestClient, words):
+        """测试按标签和难度过滤接口"""
+        response = client.get("/api/v1/words/", params={"tags": "python,concurrency", "difficulty": "advanced"})
+        
+        assert response.status_code == 200
+        assert [item["word"] for item in response.json()] == ["thread"]
+    
+    def test_tag_endpoints(self, client: TestClient, words):
+        """测试标签列表与单词标签接口"""
+        tags = client.get("/api/v1/words/tags").json()
+        assert {tag["name"]: tag["word_count"] for tag in tags}["python"] == 3
+        
+        response = client.get(f"/api/v1/words/{words['promise'].id}/tags")
+        assert response.json() == ["concurrency", "javascript"]
@@ -0,0 +1,50 @@
+"""文本处理工具测试模块"""
+
+import pytest
+from app.utils.text_utils import (
+    normalize_answer, answers_match, find_term_spans, build_cloze_variants, BLANK
+)
+
+
+class TestTextUtils:
+    """文本处理工具测试类"""
+    
+    def test_normalize_answer(self):
+        """测试答案归一化"""
+        assert normalize_answer("  Hello,   World! ") == "hello world"
+        assert normalize_answer("my_function()") == "my_function"
+        assert normalize_answer(None) == ""
+    
+    def test_answers_match_ignores_case_and_punctuation(self):
+        """测试答案比较忽略大小写、空白和标点"""
+        assert answers_match("Function", " function. ") is True
+        assert answers_match("function", "functions") is False
+    
+    def test_find_term_spans_identifier_boundary(self):
+        """测试按标识符边界查找术语"""
+        text = "def my_function(): return function"
+        
+        spans = find_term_spans("function", text)
+        
+        assert [text[start:end] for start, end in spans] == ["function", "function"]
+        assert spans[0] == (7, 15)
+    
+    def test_find_term_spans_fallback_substring(self):
+        """测试找不到独立片段时退化为子串匹配"""
+        spans = find_term_spans("loop", "whileLoopRunner()")
+        
+        assert spans == [(5, 9)]
+    
+    def test_build_cloze_variants(self):
+        """测试每次出现生成一个填空变体"""
+        variants = build_cloze_variants("array", "const array = new Array(3);")
+        
+        assert len(variants) == 2
+        text, answer, start, end = variants[1]
+        assert text == f"const array = new {BLANK}(3);"
+        assert answer == "Array"
+        assert (start, end) == (18, 23)
+    
+    def test_build_cloze_variants_no_match(self):
+        """测试示例中不含术语时不生成填空"""
+        assert build_cloze_variants("loop", "for (let i = 0; i < 10; i++) {}") == []
@@ -0,0 +1,91 @@
+"""已验证令牌缓存测试模块"""
+
+import hashlib
+import time
+import threading
+from datetime import timedelta
+
+from app.core import security
+from app.core.metrics import metrics
+from app.utils import cache_utils
+from app.utils.jwt_utils import (
+    TOKEN_CACHE_HITS_METRIC, create_access_token, create_user_token, token_cache, verify_token
+)
+
+
+class TestTokenCache:
+    """已验证令牌缓存测试类"""
+    
+    def test_second_verify_hits_cache(self):
+        """测试重复验证同一令牌命中缓存"""
+        # Given: 新签发的令牌
+        token = create_user_token(1, "alice")
+        hits = metrics.get(TOKEN_CACHE_HITS_METRIC)
+        
+        # When: 验证两次
+        first = verify_token(token)
+        second = verify_token(token)
+        
+        # Then: 第二次命中缓存且claims一致
+        assert first == second
+        assert second["user_id"] == 1
+        assert len(token_cache) == 1
+        assert metrics.get(TOKEN_CACHE_HITS_METRIC) == hits + 1
+    
+    def test_cached_claims_are_copies(self):
+        """测试修改返回的claims不影响缓存"""
+        token = create_user_token(1, "alice")
+        verify_token(token)["sub"] = "mallory"
+        
+        assert verify_token(token)["sub"] == "alice"
+    
+    def test_security_verify_token_shares_cache(self):
+        """测试security.verify_token与jwt_utils共享缓存"""
+        token = create_user_token(1, "alice")
+        
+        assert security.verify_token(token) == "alice"
+        assert len(token_cache) == 1
+        assert verify_token(token)["sub"] == "alice"
+        assert token_cache.hits == 1
+    
+    def test_invalid_tokens_not_cached(self):
+        """测试伪造和已过期令牌不进入缓存"""
+        token = create_user_token(1, "alice")
+        tampered = token[:-2] + ("AA" if not token.endswith("AA") else "BB")
+        expired = create_access_token({"sub": "alice"}, expires_delta=timedelta(seconds=-1))
+        
+        assert verify_token(tampered) is None
+        assert verify_token(expired) is None
+        assert verify_token("") is None
+        assert len(token_cache) == 0
+    
+    def test_entry_expires_at_token_exp(self, monkeypatch):
+        """测试缓存条目在令牌过期时失效"""
+        # Given: 已缓存的2分钟令牌
+        token = create_access_token({"sub": "alice"}, expires_delta=timedelta(minutes=2))
+        verify_token(token)
+        now = time.monotonic()
+        
+        # When: 时间推进到令牌过期之后
+        monkeypatch.setattr(cache_utils.time, "monotonic", lambda: now + 121)
+        
+        # Then: 缓存条目失效
+        assert token_cache.get(hashlib.sha256(token.encode("utf-8")).digest()) is None
+    
+    def test_concurrent_verification(self):
+        """测试并发验证同一令牌结果一致"""
+        token = create_user_token(7, "bob")
+        results = []
+        
+        def worker():
+            for _ in range(50):
+                results.append(verify_token(token)["user_id"])
+        
+        threads = [threading.Thread(target=worker) for _ in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        
+        assert results == [7] * 400
+        assert len(token_cache) == 1
@@ -0,0 +1,137 @@
+"""令牌编解码与密钥轮换测试模块"""
+
+import os
+import time
+import jwt
+import pytest
+
+from app.core.tokens import KeySet, TokenCodec
+
+
+@pytest.fixture
+def legacy_codec():
+    """只使用共享密钥的编解码器"""
+    return TokenCodec(KeySet(legacy_secret="shared-secret"))
+
+
+def _exp(seconds: int = 600) -> int:
+    return int(time.time()) + seconds
+
+
+class TestLegacyCodec:
+    """共享密钥编解码测试类"""
+    
+    def test_round_trip_without_kid(self, legacy_codec: TokenCodec):
+        """测试共享密钥签发的令牌没有kid头且可以验证"""
+        token = legacy_codec.encode({"sub": "alice", "exp": _exp()})
+        
+        assert "kid" not in jwt.get_unverified_header(token)
+        assert legacy_codec.decode(token)["sub"] == "alice"
+        assert legacy_codec.keys.can_sign
+    
+    def test_rejects_wrong_secret_and_unknown_kid(self, legacy_codec: TokenCodec):
+        """测试其他密钥签发或带未知kid的令牌被拒绝"""
+        forged = jwt.encode({"sub": "alice", "exp": _exp()}, "other-secret", algorithm="HS256")
+        unknown_kid = jwt.encode(
+            {"sub": "alice", "exp": _exp()}, "shared-secret", algorithm="HS256", headers={"kid": "k9"}
+        )
+        
+        with pytest.raises(jwt.InvalidSignatureError):
+            legacy_codec.decode(forged)
+        with pytest.raises(jwt.InvalidKeyError):
+            legacy_codec.decode(unknown_kid)
+        with pytest.raises(jwt.DecodeError):
+            legacy_codec.decode("not-a-token")
+    
+    def test_verify_only_without_secret(self):
+        """测试未配置任何密钥时不能签发"""
+        codec = TokenCodec(KeySet())
+        
+        assert not codec.keys.can_sign
+        with pytest.raises(RuntimeError):
+            codec.encode({"sub": "alice"})
+
+
+@pytest.fixture
+def write_key():
+    """返回在目录中生成Ed25519密钥对的函数（需要cryptography）"""
+    pytest.importorskip("cryptography")
+    from generate_jwt_key import generate_key_pair
+    
+    def write(directory, kid: str, private: bool = True):
+        private_pem, public_pem = generate_key_pair("EdDSA")
+        (directory / f"{kid}.pub").write_bytes(public_pem)
+        if private:
+            (directory / f"{kid}.pem").write_bytes(private_pem)
+        return private_pem, public_pem
+    
+    return write
+
+
+class TestKeyRotation:
+    """非对称密钥轮换测试类"""
+    
+    def test_verifier_node_with_public_keys_only(self, tmp_path, write_key):
+        """测试只持有公钥的验证节点可以验证但不能签发"""
+        # Given: 签发节点持有k1私钥，验证节点只有k1公钥
+        signer_dir, verifier_dir = tmp_path / "signer", tmp_path / "verifier"
+        signer_dir.mkdir()
+        verifier_dir.mkdir()
+        _, public_pem = write_key(signer_dir, "k1")
+        (verifier_dir / "k1.pub").write_bytes(public_pem)
+        signer = TokenCodec(KeySet(str(signer_dir), active_kid="k1"))
+        verifier = TokenCodec(KeySet(str(verifier_dir)))
+        
+        # When: 签发令牌
+        token = signer.encode({"sub": "alice", "exp": _exp()})
+        
+        # Then: 验证节点可以验证，但不能签发
+        assert jwt.get_unverified_header(token)["kid"] == "k1"
+        assert verifier.decode(token)["sub"] == "alice"
+        assert not verifier.keys.can_sign
+        with pytest.raises(RuntimeError):
+            verifier.encode({"sub": "alice"})
+    
+    def test_overlapping_rotation(self, tmp_path, write_key):
+        """测试轮换期间新旧令牌均有效，旧公钥删除后旧令牌失效"""
+        # Given: 使用k1签发的令牌
+        write_key(tmp_path, "k1")
+        keys = KeySet(str(tmp_path), active_kid="k1", reload_interval=0)
+        codec = TokenCodec(keys)
+        old_token = codec.encode({"sub": "alice", "exp": _exp()})
+        
+        # When: 分发k2并切换签发密钥
+        write_key(tmp_path, "k2")
+        keys.active_kid = "k2"
+        keys.reload()
+        new_token = codec.encode({"sub": "bob", "exp": _exp()})
+        
+        # Then: 新旧令牌都能验证
+        assert jwt.get_unverified_header(new_token)["kid"] == "k2"
+        assert codec.decode(old_token)["sub"] == "alice"
+        assert codec.decode(new_token)["sub"] == "bob"
+        
+        # When: 旧令牌过期后删除k1公钥
+        os.remove(tmp_path / "k1.pub")
+        os.remove(tmp_path / "k1.pem")
+        keys.reload()
+        
+        # Then: k1令牌不再有效
+        assert keys.kids == ("k2",)
+        with pytest.raises(jwt.InvalidKeyError):
+            codec.decode(old_token)
+    
+    def test_new_kid_picked_up_without_restart(self, tmp_path, write_key):
+        """测试遇到未知kid时按扫描间隔加载新公钥，未修改的密钥不重复解析"""
+        signer_dir = tmp_path / "signer"
+        signer_dir.mkdir()
+        _, public_pem = write_key(signer_dir, "k2")
+        write_key(tmp_path, "k1", private=False)
+        verifier = KeySet(str(tmp_path), reload_interval=0)
+        k1 = verifier.verification_key("k1")
+        token = TokenCodec(KeySet(str(signer_dir), active_kid="k2")).encode({"sub": "alice", "exp": _exp()})
+        
+        (tmp_path / "k2.pub").write_bytes(public_pem)
+        
+        assert TokenCodec(verifier).decode(token)["sub"] == "alice"
+        assert verifier.verification_key("k1").key is k1.key
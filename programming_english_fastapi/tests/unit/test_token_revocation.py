@@ -0,0 +1,160 @@
+"""刷新令牌与令牌撤销测试模块"""
+
+import pytest
+from datetime import datetime, timedelta
+from fastapi.testclient import TestClient
+from sqlalchemy import event
+from sqlmodel import Session
+
+from app.core.exception_handlers import AuthenticationException
+from app.services.token_service import TokenService, revocation_list
+from app.services.user_service import UserService
+from app.utils.cache_utils import BloomFilter
+from app.utils.jwt_utils import verify_token
+
+
+@pytest.fixture
+def tokens(client: TestClient, user, test_user_data: dict):
+    """登录获取令牌对"""
+    return client.post("/api/v1/auth/login", json={
+        "username": test_user_data["username"],
+        "password": test_user_data["password"]
+    }).json()
+
+
+def _auth(token: str) -> dict:
+    return {"Authorization": f"Bearer {token}"}
+
+
+class TestBloomFilter:
+    """布隆过滤器测试类"""
+    
+    def test_no_false_negatives_and_bounded_error(self):
+        """测试已添加元素一定命中，误判率接近目标值"""
+        bloom = BloomFilter(capacity=2000, error_rate=0.01)
+        for i in range(2000):
+            bloom.add(f"jti-{i}")
+        
+        assert all(f"jti-{i}" in bloom for i in range(2000))
+        false_positives = sum(f"other-{i}" in bloom for i in range(20000))
+        assert false_positives / 20000 < 0.03
+        assert len(bloom) == 2000
+    
+    def test_invalid_arguments(self):
+        """测试非法参数"""
+        with pytest.raises(ValueError):
+            BloomFilter(capacity=0)
+        with pytest.raises(ValueError):
+            BloomFilter(error_rate=1.5)
+
+
+class TestRefreshTokens:
+    """刷新令牌测试类"""
+    
+    def test_login_issues_refresh_token(self, tokens: dict):
+        """测试登录返回刷新令牌"""
+        assert tokens["refresh_token"]
+        assert tokens["expires_in"] > 0
+        assert verify_token(tokens["refresh_token"])["type"] == "refresh"
+    
+    def test_refresh_rotates_and_rejects_reuse(self, client: TestClient, tokens: dict):
+        """测试刷新令牌轮换后旧刷新令牌不能再次使用"""
+        # When: 使用刷新令牌换取新令牌对
+        response = client.post("/api/v1/auth/refresh", json={"refresh_token": tokens["refresh_token"]})
+        
+        # Then: 新访问令牌可用，新旧刷新令牌不同
+        assert response.status_code == 200
+        rotated = response.json()
+        assert rotated["refresh_token"] != tokens["refresh_token"]
+        assert client.get("/api/v1/me/favorites/", headers=_auth(rotated["access_token"])).status_code == 200
+        
+        # When: 再次使用旧刷新令牌
+        reused = client.post("/api/v1/auth/refresh", json={"refresh_token": tokens["refresh_token"]})
+        
+        # Then: 被拒绝
+        assert reused.status_code == 401
+    
+    def test_access_token_cannot_refresh(self, client: TestClient, tokens: dict):
+        """测试访问令牌不能当作刷新令牌，刷新令牌不能访问接口"""
+        assert client.post(
+            "/api/v1/auth/refresh", json={"refresh_token": tokens["access_token"]}
+        ).status_code == 401
+        assert client.get("/api/v1/me/favorites/", headers=_auth(tokens["refresh_token"])).status_code == 401
+    
+    def test_refresh_rejected_for_deactivated_user(self, db_session: Session, user, tokens: dict):
+        """测试禁用用户不能刷新令牌"""
+        UserService(db_session).deactivate_user(user.id)
+        
+        with pytest.raises(AuthenticationException):
+            TokenService(db_session).refresh(tokens["refresh_token"])
+
+
+class TestRevocation:
+    """令牌撤销测试类"""
+    
+    def test_logout_revokes_tokens(self, client: TestClient, tokens: dict):
+        """测试登出后访问令牌和刷新令牌均失效"""
+        # Given: 令牌可用
+        headers = _auth(tokens["access_token"])
+        assert client.get("/api/v1/me/favorites/", headers=headers).status_code == 200
+        
+        # When: 登出并撤销刷新令牌
+        response = client.post(
+            "/api/v1/auth/logout", headers=headers, json={"refresh_token": tokens["refresh_token"]}
+        )
+        
+        # Then: 两个令牌都不能再使用
+        assert response.status_code == 200
+        assert client.get("/api/v1/me/favorites/", headers=headers).status_code == 401
+        assert client.post(
+            "/api/v1/auth/refresh", json={"refresh_token": tokens["refresh_token"]}
+        ).status_code == 401
+    
+    def test_logout_without_token(self, client: TestClient):
+        """测试未携带令牌登出仍然成功"""
+        assert client.post("/api/v1/auth/logout").status_code == 200
+    
+    def test_not_revoked_check_skips_database(self, db_session: Session, tokens: dict):
+        """测试过滤器重建后，未撤销令牌的检查不访问数据库"""
+        # Given: 过滤器已重建
+        token_service = TokenService(db_session)
+        revocation_list.rebuild(db_session)
+        jti = verify_token(tokens["access_token"])["jti"]
+        statements = []
+        connection = db_session.connection()
+        listener = lambda *args: statements.append(args[2])
+        event.listen(connection, "before_cursor_execute", listener)
+        
+        # When: 检查未撤销的jti
+        try:
+            revoked = token_service.is_revoked(jti)
+        finally:
+            event.remove(connection, "before_cursor_execute", listener)
+        
+        # Then: 未撤销且没有SQL
+        assert revoked is False
+        assert statements == []
+    
+    def test_rebuild_loads_revocations_from_table(self, db_session: Session, tokens: dict):
+        """测试重建后包含其他进程写入撤销表的jti"""
+        # Given: 撤销记录已在表中，但本进程过滤器为空（模拟其他进程撤销）
+        claims = verify_token(tokens["access_token"])
+        TokenService(db_session).revoke(claims)
+        revocation_list.reset()
+        
+        # When: 重建过滤器
+        count = revocation_list.rebuild(db_session)
+        
+        # Then: 撤销生效
+        assert count == 1
+        assert TokenService(db_session).is_revoked(claims["jti"])
+    
+    def test_revoke_is_idempotent_and_purge(self, db_session: Session, tokens: dict):
+        """测试重复撤销返回False，过期记录可以清理"""
+        token_service = TokenService(db_session)
+        claims = verify_token(tokens["refresh_token"])
+        
+        assert token_service.revoke(claims) is True
+        assert token_service.revoke(claims) is False
+        assert token_service.purge_expired() == 0
+        assert token_service.purge_expired(now=datetime.utcnow() + timedelta(days=365)) == 1
@@ -0,0 +1,248 @@
+"""用户批量导入测试模块"""
+
+import csv
+import io
+from datetime import datetime, timedelta
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy import event
+from sqlmodel import Session
+
+from app.core.hashing import HashingExecutor, PasswordHasher
+from app.models.user import UserCreate
+from app.models.report import JobStatus
+from app.models.user_import import UserImportJob
+from app.services.user_import_service import (
+    ImportJobManager, RESULT_TTL, STALE_AFTER, UserImportJobService, UserImportService, import_jobs
+)
+from app.services.user_service import UserService
+
+
+# 降低哈希成本，测试只关心流程
+FAST_HASHER = PasswordHasher("pbkdf2_sha256", pbkdf2_iterations=1000)
+FAST_HASHING = HashingExecutor(FAST_HASHER, max_workers=2)
+
+
+def make_csv(rows) -> io.StringIO:
+    """构造用户CSV"""
+    source = io.StringIO()
+    writer = csv.writer(source)
+    writer.writerow(["username", "email", "password", "full_name"])
+    writer.writerows(rows)
+    source.seek(0)
+    return source
+
+
+def read_results(result: io.StringIO) -> list:
+    """解析结果CSV"""
+    result.seek(0)
+    return list(csv.DictReader(result))
+
+
+class TestUserImportService:
+    """用户批量导入服务测试类"""
+    
+    def test_import_with_row_results(self, db_session: Session, user_service: UserService, user):
+        """测试导入结果逐行记录创建、重复和无效"""
+        # Given: 包含新用户、已存在用户、文件内重复和无效邮箱的CSV
+        source = make_csv([
+            ["alice", "alice@example.com", "pw-alice", "Alice"],
+            ["TestUser", "new@example.com", "pw", ""],
+            ["bob", "ALICE@example.com", "pw-bob", ""],
+            ["carol", "not-an-email", "pw", ""],
+            ["dave", "dave@example.com", "", ""],
+            ["erin", "erin@example.com", "pw-erin", ""],
+        ])
+        result = io.StringIO()
+        
+        # When: 以每块2行导入
+        summary = UserImportService(db_session, FAST_HASHING, chunk_size=2).import_csv(source, result)
+        
+        # Then: 汇总与逐行结果一致，新用户可以登录
+        rows = read_results(result)
+        assert [row["status"] for row in rows] == ["created", "duplicate", "duplicate", "invalid", "invalid", "created"]
+        assert [row["line"] for row in rows] == ["2", "3", "4", "5", "6", "7"]
+        assert (summary.total, summary.created, summary.duplicate, summary.invalid) == (6, 2, 2, 2)
+        alice = user_service.get_user_by_login("Alice@Example.com")
+        assert alice.full_name == "Alice"
+        assert FAST_HASHER.verify("pw-alice", alice.hashed_password)
+    
+    def test_set_based_queries_per_chunk(self, db_session: Session):
+        """测试每块一次查重查询和一次批量插入"""
+        # Given: 统计SQL执行次数
+        source = make_csv([[f"user{i}", f"user{i}@example.com", "pw", ""] for i in range(10)])
+        statements = []
+        connection = db_session.connection()
+        listener = lambda *args: statements.append(args[2])
+        event.listen(connection, "before_cursor_execute", listener)
+        
+        # When: 以每块5行导入10个用户
+        try:
+            summary = UserImportService(db_session, FAST_HASHING, chunk_size=5).import_csv(
+                source, io.StringIO()
+            )
+        finally:
+            event.remove(connection, "before_cursor_execute", listener)
+        
+        # Then: 两块各一次SELECT和一次INSERT
+        assert summary.created == 10
+        assert len([sql for sql in statements if sql.startswith("SELECT")]) == 2
+        assert len([sql for sql in statements if sql.startswith("INSERT")]) == 2
+    
+    def test_shared_hashing_pool(self, db_session: Session, user_service: UserService):
+        """测试在共用的哈希线程池中哈希密码，同时占用的名额不超过线程数"""
+        # Given: 记录每次哈希时线程池的排队数
+        depths = []
+        
+        class RecordingHasher(PasswordHasher):
+            def hash(self, password: str) -> str:
+                depths.append(hashing.queue_depth)
+                return super().hash(password)
+        hashing = HashingExecutor(RecordingHasher("pbkdf2_sha256", pbkdf2_iterations=1000),
+                                  max_workers=2, max_pending=4)
+        source = make_csv([[f"pool{i}", f"pool{i}@example.com", f"secret{i}", ""] for i in range(6)])
+        
+        # When: 导入6个用户
+        summary = UserImportService(db_session, hashing).import_csv(source, io.StringIO())
+        
+        # Then: 排队数没有超过线程数，不会挤占登录请求的名额
+        assert summary.created == 6
+        assert summary.users_per_second > 0
+        assert max(depths) <= 2
+        assert FAST_HASHER.verify("secret5", user_service.get_user_by_login("pool5").hashed_password)
+    
+    def test_insert_without_returning(self, db_session: Session, user_service: UserService, user, monkeypatch):
+        """测试数据库不支持RETURNING（MySQL）时找回本次插入的行，并发注册的冲突记为重复"""
+        monkeypatch.setattr(db_session.get_bind().dialect, "insert_returning", False)
+        service = UserImportService(db_session, FAST_HASHING)
+        # 跳过预查重，模拟查重之后才被并发注册的用户
+        monkeypatch.setattr(service, "_mark_existing", lambda rows: None)
+        source = make_csv([["henry", "henry@example.com", "pw", ""], ["TestUser", "x@example.com", "pw", ""]])
+        result = io.StringIO()
+        
+        summary = service.import_csv(source, result)
+        
+        assert (summary.created, summary.duplicate) == (1, 1)
+        assert [row["status"] for row in read_results(result)] == ["created", "duplicate"]
+        assert user_service.get_user_by_login("henry") is not None
+    
+    def test_missing_columns(self, db_session: Session):
+        """测试缺少必需的列"""
+        with pytest.raises(ValueError, match="password"):
+            UserImportService(db_session, FAST_HASHING).import_csv(io.StringIO("username,email\n"), io.StringIO())
+
+
+@pytest.fixture
+def idle_jobs(tmp_path, db_session: Session):
+    """只记录不执行的导入任务，由测试显式调用run"""
+    manager = ImportJobManager(max_pending=2, output_dir=str(tmp_path),
+                               session_factory=lambda: Session(bind=db_session.connection()),
+                               hashing=FAST_HASHING)
+    manager.submit = lambda job_id: None
+    return manager
+
+
+class TestUserImportJobService:
+    """用户导入任务测试类"""
+    
+    def test_run_job(self, db_session: Session, user, idle_jobs: ImportJobManager, tmp_path):
+        """测试后台任务导入并回写汇总，上传文件在导入后删除"""
+        upload = io.BytesIO(make_csv([["gina", "gina@example.com", "pw-gina", ""]]).getvalue().encode("utf-8"))
+        service = UserImportJobService(db_session, idle_jobs)
+        job = service.create_job(user.id, upload)
+        
+        idle_jobs.run(job.id)
+        
+        job = service.get_job(user.id, job.id)
+        assert (job.status, job.created, job.total) == (JobStatus.SUCCEEDED, 1, 1)
+        assert [path.name for path in tmp_path.iterdir()] == [f"import_{job.id}.csv"]
+    
+    def test_stale_job_and_expired_result(self, db_session: Session, user, idle_jobs: ImportJobManager, tmp_path):
+        """测试超时未结束的任务标记为中断，过期未下载的结果文件被删除"""
+        service = UserImportJobService(db_session, idle_jobs)
+        stale = service.create_job(user.id, io.BytesIO(b"username,email,password\n"))
+        stale.created_at = datetime.utcnow() - STALE_AFTER - timedelta(seconds=1)
+        db_session.add(stale)
+        result = tmp_path / "import_old.csv"
+        result.write_text("line\n")
+        db_session.add(UserImportJob(user_id=user.id, source_path="", status=JobStatus.SUCCEEDED,
+                                     file_path=str(result), finished_at=datetime.utcnow() - RESULT_TTL * 2))
+        db_session.commit()
+        
+        assert service.get_job(user.id, stale.id).status == JobStatus.FAILED
+        assert service.purge_expired_results() == 1
+        assert list(tmp_path.iterdir()) == []
+
+
+class TestUserImportAPI:
+    """用户批量导入接口测试类"""
+    
+    @staticmethod
+    def login(client: TestClient, username: str, password: str) -> dict:
+        token = client.post("/api/v1/auth/login", json={"username": username, "password": password}).json()
+        return {"Authorization": f"Bearer {token['access_token']}"}
+    
+    @pytest.fixture
+    def superuser_headers(self, client: TestClient, user_service: UserService, superuser_config: dict) -> dict:
+        """超级用户的认证头"""
+        user_service.create_user(UserCreate(
+            username=superuser_config["username"], email=superuser_config["email"],
+            password=superuser_config["password"]
+        ))
+        return self.login(client, superuser_config["username"], superuser_config["password"])
+    
+    def test_superuser_import(self, client: TestClient, db_session: Session, superuser_headers: dict,
+                              tmp_path, monkeypatch):
+        """测试超级用户提交导入任务、轮询并下载一次结果文件"""
+        # Given: 使用临时目录、与测试共用连接的导入任务
+        monkeypatch.setattr(import_jobs, "output_dir", tmp_path)
+        monkeypatch.setattr(import_jobs, "session_factory", lambda: Session(bind=db_session.connection()))
+        csv_bytes = make_csv([["frank", "frank@example.com", "pw-frank", ""], ["bad", "bad", "pw", ""]]).getvalue()
+        
+        try:
+            # When: 上传CSV
+            response = client.post("/api/v1/users/import", headers=superuser_headers,
+                                   files={"file": ("users.csv", csv_bytes.encode("utf-8-sig"), "text/csv")})
+            assert response.status_code == 202
+            job_id = response.json()["data"]["id"]
+            future = import_jobs.get_future(job_id)
+            if future is not None:
+                future.result(timeout=30)
+            
+            # Then: 任务完成，汇总可轮询，上传文件已删除
+            job = client.get(f"/api/v1/users/import/{job_id}", headers=superuser_headers).json()["data"]
+            assert job["status"] == "succeeded"
+            assert (job["created"], job["invalid"], job["result_available"]) == (1, 1, True)
+            assert [path.name for path in tmp_path.iterdir()] == [f"import_{job_id}.csv"]
+            
+            # When: 下载结果
+            response = client.get(f"/api/v1/users/import/{job_id}/file", headers=superuser_headers)
+            
+            # Then: 返回逐行结果，文件发送后删除，不能重复下载
+            assert response.status_code == 200
+            rows = list(csv.DictReader(io.StringIO(response.text)))
+            assert [row["status"] for row in rows] == ["created", "invalid"]
+            assert list(tmp_path.iterdir()) == []
+            assert client.get(f"/api/v1/users/import/{job_id}/file", headers=superuser_headers).status_code == 410
+        finally:
+            import_jobs.shutdown()
+    
+    def test_missing_columns_rejected_on_upload(self, client: TestClient, superuser_headers: dict,
+                                                tmp_path, monkeypatch):
+        """测试表头缺列时直接返回400，不创建任务"""
+        monkeypatch.setattr(import_jobs, "output_dir", tmp_path)
+        
+        response = client.post("/api/v1/users/import", headers=superuser_headers,
+                               files={"file": ("users.csv", b"username,email\n", "text/csv")})
+        
+        assert response.status_code == 400
+        assert list(tmp_path.iterdir()) == []
+    
+    def test_regular_user_forbidden(self, client: TestClient, user, test_user_data: dict):
+        """测试普通用户不能批量导入"""
+        headers = self.login(client, test_user_data["username"], test_user_data["password"])
+        
+        response = client.post("/api/v1/users/import", headers=headers,
+                               files={"file": ("users.csv", b"username,email,password\n", "text/csv")})
+        
+        assert response.status_code == 403